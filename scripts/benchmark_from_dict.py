@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Validierung von Berechnungsanfragen (`BerechnungsAnfrage.from_dict`).
+
+Misst die mittlere Zeit pro Aufruf für typische Nutzlasten: numerische
+JSON-Werte, deutsch formatierte Zahlenstrings, vollständige
+Verkürzungsgründe und ungültige Nutzlasten (Fehlerpfad).
+
+Aufruf aus dem Projektwurzelverzeichnis:
+    python scripts/benchmark_from_dict.py [--wiederholungen 5] [--aufrufe 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api.calculation_service import (  # noqa: E402
+    BerechnungsAnfrage,
+    BerechnungsDienstFehler,
+)
+
+NUTZLASTEN: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    (
+        "minimal",
+        {
+            "basis_dauer_monate": 36,
+            "vollzeit_stunden": 40,
+            "teilzeit_eingabe": 75,
+            "eingabetyp": "prozent",
+            "verkuerzungsgruende": {},
+        },
+    ),
+    (
+        "deutsche Zahlen",
+        {
+            "basis_dauer_monate": "36",
+            "vollzeit_stunden": "38,5",
+            "teilzeit_eingabe": "28,75",
+            "eingabetyp": "stunden",
+            "verkuerzungsgruende": {"abitur": True},
+        },
+    ),
+    (
+        "alle Gründe",
+        {
+            "basis_dauer_monate": 42,
+            "vollzeit_stunden": 40.0,
+            "teilzeit_eingabe": 60.0,
+            "eingabetyp": "prozent",
+            "verkuerzungsgruende": {
+                "abitur": False,
+                "realschule": True,
+                "alter_ueber_21": True,
+                "familien_kinderbetreuung": False,
+                "familien_pflegeverantwortung": False,
+                "vorkenntnisse_monate": "6",
+                "beruf_q1": False,
+                "beruf_q2": True,
+                "beruf_q2_dauer_monate": "12",
+                "beruf_q3": False,
+                "beruf_q4": False,
+                "berufliche_verkuerzung_monate": 0,
+                "beruf_q5": True,
+            },
+        },
+    ),
+    (
+        "ungültig",
+        {
+            "basis_dauer_monate": 36,
+            "vollzeit_stunden": 40,
+            "teilzeit_eingabe": 75,
+            "eingabetyp": "prozent",
+            "verkuerzungsgruende": {"abitur": "ja"},
+        },
+    ),
+)
+
+
+def messe(nutzlast: Dict[str, Any], aufrufe: int, wiederholungen: int) -> float:
+    """Bestzeit pro Aufruf in Nanosekunden über mehrere Wiederholungen."""
+    beste = float("inf")
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        for _ in range(aufrufe):
+            try:
+                BerechnungsAnfrage.from_dict(nutzlast)
+            except BerechnungsDienstFehler:
+                pass
+        beste = min(beste, time.perf_counter() - start)
+    return beste / aufrufe * 1e9
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Führt die Laufzeitmessung für alle Nutzlasten aus."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--wiederholungen", type=int, default=5)
+    parser.add_argument("--aufrufe", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    for name, nutzlast in NUTZLASTEN:
+        ns = messe(nutzlast, args.aufrufe, args.wiederholungen)
+        print(f"{name:<16} {ns:8.1f} ns/Aufruf")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
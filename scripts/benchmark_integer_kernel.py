@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Ganzzahl-Kernel vs. Einzelschritte für Schritt 1-3.
+
+Vergleicht `berechne_schritte_ganzzahlig()` mit der Kette
+`berechne_teilzeit_schritt1()` → `obergrenze_anwenden_schritt2()` →
+`rundung_anwenden_schritt3()` über den gesamten ganzzahligen
+Definitionsbereich (AO-Dauer × effektive Verkürzung × Prozent bzw.
+Vollzeit-/Teilzeitstunden):
+
+1. Exaktheit: der Kernel muss in jeder Zelle der Rechnung mit Brüchen
+   (`fractions.Fraction`) entsprechen (sonst Exit-Code 1)
+2. Gleitkomma-Kette: Anzahl der Zellen, in denen sie einen Monat zu tief
+   abrundet (rechnerisch ganzzahlige Dauer knapp unterschritten)
+3. Laufzeit: mittlere Zeit pro Aufruf beider Varianten
+
+Aufruf aus dem Projektwurzelverzeichnis:
+    python scripts/benchmark_integer_kernel.py [--wiederholungen 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from fractions import Fraction
+from pathlib import Path
+from typing import List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.calculation_logic import (  # noqa: E402
+    MAX_AO_DAUER_MONATE,
+    MAX_GESAMT_VERKUERZUNG_MONATE,
+    MAX_VERLAENGERUNG_FAKTOR,
+    MAX_VOLLZEIT_STUNDEN,
+    MIN_AO_DAUER_MONATE,
+    MIN_TEILZEIT_PROZENT,
+    MIN_VOLLZEIT_STUNDEN,
+    berechne_schritte_ganzzahlig,
+    berechne_teilzeit_prozent,
+    berechne_teilzeit_schritt1,
+    obergrenze_anwenden_schritt2,
+    rundung_anwenden_schritt3,
+)
+
+# (verkürzte Dauer, AO-Dauer, Zähler, Nenner, Prozent als float)
+Zelle = Tuple[int, int, int, int, float]
+
+
+def definitionsbereich() -> List[Zelle]:
+    """Erzeugt alle ganzzahligen Kombinationen des Definitionsbereichs."""
+    zellen: List[Zelle] = []
+    for basis in range(MIN_AO_DAUER_MONATE, MAX_AO_DAUER_MONATE + 1):
+        for verkuerzung in range(MAX_GESAMT_VERKUERZUNG_MONATE + 1):
+            verkuerzte = basis - verkuerzung
+            for prozent in range(MIN_TEILZEIT_PROZENT, 101):
+                zellen.append((verkuerzte, basis, prozent, 100, float(prozent)))
+            for vollzeit in range(MIN_VOLLZEIT_STUNDEN, MAX_VOLLZEIT_STUNDEN + 1):
+                for stunden in range(math.ceil(vollzeit / 2), vollzeit + 1):
+                    zellen.append((
+                        verkuerzte,
+                        basis,
+                        stunden,
+                        vollzeit,
+                        berechne_teilzeit_prozent(vollzeit, stunden),
+                    ))
+    return zellen
+
+
+def einzelschritte(zellen: List[Zelle]) -> List[int]:
+    """Bestehende Gleitkomma-Kette (Schritt 1 → 2 → 3)."""
+    return [
+        rundung_anwenden_schritt3(
+            obergrenze_anwenden_schritt2(
+                berechne_teilzeit_schritt1(verkuerzte, prozent), basis
+            )
+        )
+        for verkuerzte, basis, _, _, prozent in zellen
+    ]
+
+
+def exakt(zellen: List[Zelle]) -> List[int]:
+    """Referenz: Schritt 1-3 mit Brüchen (`fractions.Fraction`)."""
+    faktor = Fraction(MAX_VERLAENGERUNG_FAKTOR)
+    return [
+        math.floor(min(Fraction(verkuerzte * nenner, zaehler), basis * faktor))
+        for verkuerzte, basis, zaehler, nenner, _ in zellen
+    ]
+
+
+def ganzzahl_kernel(zellen: List[Zelle]) -> List[int]:
+    """Exakter Ganzzahl-Kernel."""
+    return [
+        berechne_schritte_ganzzahlig(verkuerzte, basis, zaehler, nenner)
+        for verkuerzte, basis, zaehler, nenner, _ in zellen
+    ]
+
+
+def messe(funktion, zellen: List[Zelle], wiederholungen: int) -> float:
+    """Bestzeit pro Aufruf in Nanosekunden über mehrere Wiederholungen."""
+    beste = float("inf")
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion(zellen)
+        beste = min(beste, time.perf_counter() - start)
+    return beste / len(zellen) * 1e9
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Führt Übereinstimmungsprüfung und Laufzeitmessung aus."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--wiederholungen", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    zellen = definitionsbereich()
+    kernel = ganzzahl_kernel(zellen)
+    abweichungen = [
+        (zelle, referenz, neu)
+        for zelle, referenz, neu in zip(zellen, exakt(zellen), kernel)
+        if referenz != neu
+    ]
+    zu_tief = sum(
+        alt < neu for alt, neu in zip(einzelschritte(zellen), kernel)
+    )
+    print(f"Zellen im Definitionsbereich: {len(zellen)}")
+    print(f"Abweichungen Kernel/exakt:    {len(abweichungen)}")
+    for zelle, referenz, neu in abweichungen[:20]:
+        print(f"  {zelle}: exakt={referenz} Kernel={neu}")
+    print(f"Gleitkomma-Kette zu tief:     {zu_tief}")
+
+    alt_ns = messe(einzelschritte, zellen, args.wiederholungen)
+    neu_ns = messe(ganzzahl_kernel, zellen, args.wiederholungen)
+    print(f"Einzelschritte:  {alt_ns:8.1f} ns/Aufruf")
+    print(f"Ganzzahl-Kernel: {neu_ns:8.1f} ns/Aufruf")
+    print(f"Beschleunigung:  {alt_ns / neu_ns:8.2f}x")
+
+    return 1 if abweichungen else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
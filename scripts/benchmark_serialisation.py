@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Anteil der JSON-Serialisierung an der Request-Latenz.
+
+Ruft die WSGI-App direkt auf (ohne Test-Client und Netzwerk) und misst für
+``POST /api/calculate`` (Treffer im Ergebniscache) und eine Fehlerantwort
+(``missing_fields``):
+
+1. die Zeit pro Request mit vorkodierten Bytes (`json_encoding`)
+2. die Zeit pro Request mit ``jsonify(response.body)`` (bisheriger Weg)
+3. die reine Serialisierungszeit beider Varianten und ihren Anteil
+
+Aufruf aus dem Projektwurzelverzeichnis:
+    python scripts/benchmark_serialisation.py [--wiederholungen 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from flask import jsonify  # noqa: E402
+from werkzeug.test import EnvironBuilder  # noqa: E402
+
+import src.app as app_modul  # noqa: E402
+from src.api import verarbeite_berechnungsanfrage  # noqa: E402
+from src.api.json_encoding import encoder_name  # noqa: E402
+
+NUTZLASTEN: Dict[str, Dict[str, Any]] = {
+    "Ergebnis (Cache)": {
+        "basis_dauer_monate": 36,
+        "vollzeit_stunden": 40,
+        "teilzeit_eingabe": 75,
+        "eingabetyp": "prozent",
+        "verkuerzungsgruende": {"abitur": True},
+    },
+    "missing_fields": {},
+}
+
+
+def _jsonify_antwort(response):
+    """Bisheriger Weg: ``jsonify(response.body)`` je Request."""
+    antwort = jsonify(response.body)
+    antwort.status_code = response.status_code
+    return antwort
+
+
+def messe(funktion: Callable[[], Any], aufrufe: int, wiederholungen: int) -> float:
+    """Bestzeit pro Aufruf in Mikrosekunden über mehrere Wiederholungen."""
+    beste = float("inf")
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        for _ in range(aufrufe):
+            funktion()
+        beste = min(beste, time.perf_counter() - start)
+    return beste / aufrufe * 1e6
+
+
+def request_funktion(app, nutzlast: Dict[str, Any]) -> Callable[[], Any]:
+    """Ein POST /api/calculate direkt über die WSGI-Schnittstelle."""
+    body = json.dumps(nutzlast).encode("utf-8")
+    environ = EnvironBuilder(
+        path="/api/calculate",
+        method="POST",
+        data=body,
+        content_type="application/json",
+    ).get_environ()
+
+    def start_response(status, headers, exc_info=None):
+        return None
+
+    def aufruf():
+        umgebung = dict(environ)
+        umgebung["wsgi.input"] = io.BytesIO(body)
+        return b"".join(app(umgebung, start_response))
+
+    return aufruf
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Misst Request- und Serialisierungszeit beider Varianten."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--wiederholungen", type=int, default=5)
+    parser.add_argument("--aufrufe", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    app = app_modul.create_app()
+    vorkodiert = app_modul._json_antwort
+    print(f"Encoder: {encoder_name()}")
+
+    for name, nutzlast in NUTZLASTEN.items():
+        response = verarbeite_berechnungsanfrage(nutzlast)
+        aufruf = request_funktion(app, nutzlast)
+        with app.test_request_context():
+            ser_neu = messe(
+                lambda: vorkodiert(response), args.aufrufe, args.wiederholungen
+            )
+            ser_alt = messe(
+                lambda: _jsonify_antwort(response),
+                args.aufrufe,
+                args.wiederholungen,
+            )
+        req_neu = messe(aufruf, args.aufrufe, args.wiederholungen)
+        app_modul._json_antwort = _jsonify_antwort
+        try:
+            req_alt = messe(aufruf, args.aufrufe, args.wiederholungen)
+        finally:
+            app_modul._json_antwort = vorkodiert
+
+        print(f"{name}:")
+        print(
+            f"  jsonify:    {req_alt:7.1f} µs/Request, Serialisierung "
+            f"{ser_alt:6.1f} µs ({ser_alt / req_alt:5.1%})"
+        )
+        print(
+            f"  vorkodiert: {req_neu:7.1f} µs/Request, Serialisierung "
+            f"{ser_neu:6.1f} µs ({ser_neu / req_neu:5.1%})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: schneller WSGI-Pfad vs. Flask für POST /api/calculate.
+
+Ruft beide WSGI-Anwendungen direkt auf (ohne Test-Client und Netzwerk) und
+misst die Zeit pro Request für:
+
+1. ein Ergebnis aus dem Ergebniscache
+2. einen Validierungsfehler (422)
+3. fehlende Felder (400)
+4. einen falschen Content-Type (400, fester Fehler-Body)
+
+Aufruf aus dem Projektwurzelverzeichnis:
+    python scripts/benchmark_wsgi_fast_path.py [--wiederholungen 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from werkzeug.test import EnvironBuilder  # noqa: E402
+
+from src.app import create_app  # noqa: E402
+from src.wsgi_fast_path import SchnellerPfad  # noqa: E402
+
+ANFRAGE = {
+    "basis_dauer_monate": 36,
+    "vollzeit_stunden": 40,
+    "teilzeit_eingabe": 75,
+    "eingabetyp": "prozent",
+    "verkuerzungsgruende": {"abitur": True},
+}
+
+FAELLE: Dict[str, Tuple[bytes, str]] = {
+    "Ergebnis (Cache)": (json.dumps(ANFRAGE).encode(), "application/json"),
+    "validation_error": (
+        json.dumps(dict(ANFRAGE, teilzeit_eingabe=40)).encode(),
+        "application/json",
+    ),
+    "missing_fields": (b"{}", "application/json"),
+    "invalid_request": (b"x", "text/plain"),
+}
+
+
+def messe(funktion: Callable[[], Any], aufrufe: int, wiederholungen: int) -> float:
+    """Bestzeit pro Aufruf in Mikrosekunden über mehrere Wiederholungen."""
+    beste = float("inf")
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        for _ in range(aufrufe):
+            funktion()
+        beste = min(beste, time.perf_counter() - start)
+    return beste / aufrufe * 1e6
+
+
+def request_funktion(app, body: bytes, content_type: str) -> Callable[[], bytes]:
+    """Ein POST /api/calculate direkt über die WSGI-Schnittstelle."""
+    environ = EnvironBuilder(
+        path="/api/calculate",
+        method="POST",
+        data=body,
+        content_type=content_type,
+    ).get_environ()
+    status: List[str] = []
+
+    def start_response(zeile, headers, exc_info=None):
+        status.append(zeile)
+
+    def aufruf():
+        umgebung = dict(environ)
+        umgebung["wsgi.input"] = io.BytesIO(body)
+        return b"".join(app(umgebung, start_response))
+
+    aufruf.status = status
+    return aufruf
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Misst beide Anwendungen und prüft, dass die Antworten identisch sind."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--wiederholungen", type=int, default=5)
+    parser.add_argument("--aufrufe", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    flask_app = create_app()
+    schnell = SchnellerPfad(flask_app)
+
+    for name, (body, content_type) in FAELLE.items():
+        ueber_flask = request_funktion(flask_app, body, content_type)
+        direkt = request_funktion(schnell, body, content_type)
+        if ueber_flask() != direkt() or ueber_flask.status != direkt.status:
+            print(f"{name}: Antworten unterscheiden sich", file=sys.stderr)
+            return 1
+        zeit_flask = messe(ueber_flask, args.aufrufe, args.wiederholungen)
+        zeit_direkt = messe(direkt, args.aufrufe, args.wiederholungen)
+        print(
+            f"{name:18s} Flask {zeit_flask:7.1f} µs  schneller Pfad "
+            f"{zeit_direkt:6.1f} µs  (-{1 - zeit_direkt / zeit_flask:5.1%}, "
+            f"{zeit_flask / zeit_direkt:4.1f}x)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Golden Snapshot des gesamten Definitionsbereichs der Berechnung.
+
+Zählt den gültigen Eingaberaum von `berechne_gesamtdauer()` vollständig auf,
+berechnet ihn verteilt auf einen Prozesspool und legt die Ergebnisse als
+komprimierten Snapshot ab (``schreiben``). Spätere Läufe rechnen denselben
+Bereich erneut und listen jede abweichende Zelle (``pruefen``, Exit-Code 1
+bei Abweichungen). Vor jeder Optimierung im Berechnungspfad einen Snapshot
+schreiben, danach prüfen.
+
+Der Bereich besteht aus zwei Teilen, die zusammen jede Kombination abdecken,
+ohne das volle Kreuzprodukt zu rechnen (die Verkürzungsgründe wirken nur
+über die effektive Verkürzung auf Schritt 1-3):
+
+1. ``gruende``: jede AO-Dauer × jede Kombination der Verkürzungsgründe
+   (allgemeine Gründe, Vorkenntnisse, berufliche Fragen inkl. q2-Stufe,
+   vorkalkulierte berufliche Monate), jeweils als Bitmaske und als
+   Dictionary, bei 100 %.
+2. ``raster``: jede AO-Dauer × effektive Verkürzung 0-12 Monate ×
+   Teilzeit-Prozent 50-100 in 0,5er-Schritten bzw. Vollzeit 10-48 h ×
+   Teilzeitstunden in 0,5er-Schritten zwischen halber und voller Vollzeit.
+
+Je Zelle werden alle unabhängigen Werte des `Berechnungsergebnis` bitgenau
+gespeichert (ZIP mit einer LZMA-komprimierten Spalte je Wert).
+
+Aufruf aus dem Projektwurzelverzeichnis:
+    python scripts/verify_domain.py schreiben [--snapshot PFAD] [--prozesse N]
+    python scripts/verify_domain.py pruefen [--snapshot PFAD] [--max-ausgabe 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+import zipfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.api.calculation_service import dekodiere_verkuerzungsmaske  # noqa: E402
+from src.calculation_logic import (  # noqa: E402
+    BERUF_MONATE_SHIFT,
+    BERUF_Q2_STUFE_SHIFT,
+    GRUND_BERUF_FELDER,
+    GRUND_BERUF_Q1,
+    GRUND_BERUF_Q2,
+    GRUND_BERUF_Q3,
+    GRUND_BERUF_Q4,
+    GRUND_VORKENNTNISSE,
+    MAX_AO_DAUER_MONATE,
+    MAX_GESAMT_VERKUERZUNG_MONATE,
+    MAX_VOLLZEIT_STUNDEN,
+    MIN_AO_DAUER_MONATE,
+    MIN_TEILZEIT_PROZENT,
+    MIN_VOLLZEIT_STUNDEN,
+    berechne_gesamtdauer,
+)
+
+STANDARD_SNAPSHOT = PROJECT_ROOT / "tests" / "golden" / "berechnungsdomaene.zip"
+SNAPSHOT_FORMAT = 1
+
+# Gespeicherte Werte je Zelle und ihr array-Typcode
+SPALTEN = (
+    ("verkuerzte_dauer_monate", "B"),
+    ("verkuerzung_gesamt_ohne_begrenzung", "H"),
+    ("teilzeit_prozent", "d"),
+    ("teilzeit_stunden", "d"),
+    ("nach_schritt1_monate", "d"),
+    ("nach_schritt2_monate", "d"),
+    ("finale_dauer_monate", "B"),
+    ("regel_8_abs_3_angewendet", "B"),
+)
+
+# (AO-Dauer, Vollzeit, Teilzeit, Eingabetyp, Bitmaske, als Dictionary)
+Zelle = Tuple[int, float, float, str, int, bool]
+
+_ALLGEMEINE_GRUENDE = GRUND_VORKENNTNISSE - 1  # Bits 0-4
+_SCHRITTE_JE_EINHEIT = 2  # Raster in 0,5er-Schritten
+
+
+def verkuerzungs_masken() -> List[int]:
+    """Alle unterscheidbaren Kombinationen der Verkürzungsgründe als Bitmaske."""
+    berufliche = [0, GRUND_VORKENNTNISSE]
+    for fragen in range(8):
+        basis = GRUND_BERUF_FELDER
+        for index, bit in enumerate((GRUND_BERUF_Q1, GRUND_BERUF_Q3, GRUND_BERUF_Q4)):
+            if fragen >> index & 1:
+                basis |= bit
+        berufliche.append(basis)
+        berufliche.extend(
+            basis | GRUND_BERUF_Q2 | stufe << BERUF_Q2_STUFE_SHIFT
+            for stufe in range(3)
+        )
+    berufliche.extend(
+        GRUND_BERUF_FELDER | monate << BERUF_MONATE_SHIFT
+        for monate in range(1, MAX_GESAMT_VERKUERZUNG_MONATE + 1)
+    )
+    return [
+        allgemein | beruflich
+        for allgemein in range(_ALLGEMEINE_GRUENDE + 1)
+        for beruflich in berufliche
+    ]
+
+
+def _raster(von: float, bis: float) -> Iterator[float]:
+    """Werte von ``von`` bis ``bis`` in 0,5er-Schritten (ganzzahlig gezählt)."""
+    start = int(von * _SCHRITTE_JE_EINHEIT + 0.5)
+    for schritt in range(start, int(bis * _SCHRITTE_JE_EINHEIT) + 1):
+        yield schritt / _SCHRITTE_JE_EINHEIT
+
+
+def zellen_fuer_ao_dauer(basis: int) -> Iterator[Zelle]:
+    """Zählt alle Zellen einer AO-Dauer in fester Reihenfolge auf."""
+    for maske in verkuerzungs_masken():
+        yield basis, 40, 100, "prozent", maske, False
+        yield basis, 40, 100, "prozent", maske, True
+    for verkuerzung in range(MAX_GESAMT_VERKUERZUNG_MONATE + 1):
+        maske = GRUND_BERUF_FELDER | verkuerzung << BERUF_MONATE_SHIFT
+        for prozent in _raster(MIN_TEILZEIT_PROZENT, 100):
+            yield basis, 40, prozent, "prozent", maske, False
+        for vollzeit in range(MIN_VOLLZEIT_STUNDEN, MAX_VOLLZEIT_STUNDEN + 1):
+            for stunden in _raster(vollzeit / 2, vollzeit):
+                yield basis, vollzeit, stunden, "stunden", maske, False
+
+
+def berechne_ao_dauer(basis: int) -> Dict[str, bytes]:
+    """Berechnet alle Zellen einer AO-Dauer (läuft im Worker-Prozess)."""
+    logging.disable(logging.INFO)
+    spalten = {name: array(typ) for name, typ in SPALTEN}
+    werte = [(spalten[name].append, name) for name, _ in SPALTEN]
+    for _, vollzeit, teilzeit, eingabetyp, maske, als_dict in zellen_fuer_ao_dauer(
+        basis
+    ):
+        ergebnis = berechne_gesamtdauer(
+            basis,
+            vollzeit,
+            teilzeit,
+            dekodiere_verkuerzungsmaske(maske) if als_dict else maske,
+            eingabetyp,
+        )
+        for anhaengen, name in werte:
+            anhaengen(getattr(ergebnis, name))
+    return {name: spalte.tobytes() for name, spalte in spalten.items()}
+
+
+def berechne_bereich(
+    ao_dauern: Sequence[int], prozesse: int
+) -> Dict[str, array]:
+    """Berechnet den Bereich, je AO-Dauer ein Auftrag im Prozesspool."""
+    spalten = {name: array(typ) for name, typ in SPALTEN}
+    if prozesse <= 1:
+        teile = map(berechne_ao_dauer, ao_dauern)
+        return _fuege_zusammen(spalten, teile)
+    with ProcessPoolExecutor(max_workers=prozesse) as pool:
+        return _fuege_zusammen(spalten, pool.map(berechne_ao_dauer, ao_dauern))
+
+
+def _fuege_zusammen(spalten, teile) -> Dict[str, array]:
+    """Hängt die Spalten der Teilergebnisse in Auftragsreihenfolge an."""
+    for teil in teile:
+        for name, daten in teil.items():
+            spalten[name].frombytes(daten)
+    return spalten
+
+
+def schreibe_snapshot(
+    pfad: Path, ao_dauern: Sequence[int], spalten: Dict[str, array]
+) -> None:
+    """Schreibt den Snapshot (Metadaten + je Spalte ein LZMA-Eintrag)."""
+    pfad.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "ao_dauern": list(ao_dauern),
+        "zellen": len(next(iter(spalten.values()))),
+        "spalten": [[name, typ] for name, typ in SPALTEN],
+    }
+    with zipfile.ZipFile(pfad, "w", compression=zipfile.ZIP_LZMA) as archiv:
+        archiv.writestr("meta.json", json.dumps(meta, indent=2))
+        for name, spalte in spalten.items():
+            archiv.writestr(f"{name}.bin", spalte.tobytes())
+
+
+def lese_snapshot(pfad: Path) -> Tuple[dict, Dict[str, array]]:
+    """Liest Metadaten und Spalten eines Snapshots."""
+    with zipfile.ZipFile(pfad) as archiv:
+        meta = json.loads(archiv.read("meta.json"))
+        if meta.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unbekanntes Snapshot-Format: {meta.get('format')}")
+        spalten = {}
+        for name, typ in meta["spalten"]:
+            spalte = array(typ)
+            spalte.frombytes(archiv.read(f"{name}.bin"))
+            spalten[name] = spalte
+    return meta, spalten
+
+
+def vergleiche(
+    ao_dauern: Sequence[int],
+    alt: Dict[str, array],
+    neu: Dict[str, array],
+) -> List[Tuple[Zelle, Dict[str, Tuple[object, object]]]]:
+    """
+    Liefert jede abweichende Zelle mit ihren geänderten Werten.
+
+    Unveränderte Spalten werden als Ganzes verglichen; nur bei Abweichungen
+    wird die Zellenfolge erneut aufgezählt, um die Eingaben zu benennen.
+    """
+    geaendert = [
+        name for name, _ in SPALTEN
+        if name not in alt or alt[name].tobytes() != neu[name].tobytes()
+    ]
+    if not geaendert:
+        return []
+    abweichungen = []
+    zellen = (zelle for basis in ao_dauern for zelle in zellen_fuer_ao_dauer(basis))
+    for index, zelle in enumerate(zellen):
+        unterschiede = {
+            name: (alt[name][index] if name in alt else None, neu[name][index])
+            for name in geaendert
+            if name not in alt or _unterscheidet(alt[name][index], neu[name][index])
+        }
+        if unterschiede:
+            abweichungen.append((zelle, unterschiede))
+    return abweichungen
+
+
+def _unterscheidet(alt: object, neu: object) -> bool:
+    """Bitgenauer Vergleich (auch -0.0 gegen 0.0)."""
+    return alt != neu or repr(alt) != repr(neu)
+
+
+def _beschreibe(zelle: Zelle) -> str:
+    """Lesbare Eingabe einer Zelle für die Ausgabe."""
+    basis, vollzeit, teilzeit, eingabetyp, maske, als_dict = zelle
+    form = "dict" if als_dict else "maske"
+    return (
+        f"AO={basis} vollzeit={vollzeit} {eingabetyp}={teilzeit} "
+        f"{form}=0x{maske:x}"
+    )
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Schreibt oder prüft den Golden Snapshot."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("aktion", choices=("schreiben", "pruefen"))
+    parser.add_argument("--snapshot", type=Path, default=STANDARD_SNAPSHOT)
+    parser.add_argument("--prozesse", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--ao-dauer",
+        type=int,
+        action="append",
+        help="Nur diese AO-Dauer(n) schreiben (Standard: 24-42)",
+    )
+    parser.add_argument("--max-ausgabe", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.aktion == "schreiben":
+        ao_dauern = sorted(set(
+            args.ao_dauer
+            or range(MIN_AO_DAUER_MONATE, MAX_AO_DAUER_MONATE + 1)
+        ))
+        spalten = berechne_bereich(ao_dauern, args.prozesse)
+        schreibe_snapshot(args.snapshot, ao_dauern, spalten)
+        anzahl = len(spalten[SPALTEN[0][0]])
+        print(f"Snapshot geschrieben: {args.snapshot} ({anzahl} Zellen, "
+              f"{args.snapshot.stat().st_size / 1024:.0f} KiB, "
+              f"{time.perf_counter() - start:.1f} s)")
+        return 0
+
+    meta, alt = lese_snapshot(args.snapshot)
+    ao_dauern = meta["ao_dauern"]
+    neu = berechne_bereich(ao_dauern, args.prozesse)
+    anzahl = len(neu[SPALTEN[0][0]])
+    if anzahl != meta["zellen"]:
+        print(f"Definitionsbereich geändert: {meta['zellen']} Zellen im Snapshot, "
+              f"{anzahl} jetzt - Snapshot neu schreiben")
+        return 2
+    abweichungen = vergleiche(ao_dauern, alt, neu)
+    print(f"Zellen geprüft: {anzahl} ({time.perf_counter() - start:.1f} s)")
+    print(f"Abweichungen:   {len(abweichungen)}")
+    for zelle, unterschiede in abweichungen[:args.max_ausgabe]:
+        werte = ", ".join(
+            f"{name}: {vorher!r} -> {nachher!r}"
+            for name, (vorher, nachher) in unterschiede.items()
+        )
+        print(f"  {_beschreibe(zelle)}: {werte}")
+    if len(abweichungen) > args.max_ausgabe:
+        print(f"  ... {len(abweichungen) - args.max_ausgabe} weitere")
+    return 1 if abweichungen else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
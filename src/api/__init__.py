@@ -1,10 +1,57 @@
 """API-Service-Schicht für das Teilzeitrechner-Backend."""
 
+from .batch_service import verarbeite_batchanfrage
 from .calculation_service import (BerechnungsAnfrage, BerechnungsDienstAntwort,
-                                  verarbeite_berechnungsanfrage)
+                                  buendelungs_statistik, cache_statistik,
+                                  dekodiere_verkuerzungsmaske,
+                                  kanonischer_schluessel,
+                                  kodiere_verkuerzungsgruende,
+                                  konfiguriere_ergebnis_cache,
+                                  konfiguriere_schattenauswertung,
+                                  leere_ergebnis_cache, schatten_abweichungen,
+                                  schatten_statistik,
+                                  verarbeite_berechnungsabfrage,
+                                  verarbeite_berechnungsanfrage,
+                                  warte_auf_schattenauswertung)
+from .comparison_service import VergleichsAnfrage, verarbeite_vergleichsanfrage
+from .exam_service import verarbeite_pruefungsanfrage
+from .inverse_service import (MindestTeilzeitAnfrage,
+                              verarbeite_mindest_teilzeit_anfrage)
+from .optimization_service import verarbeite_optimierungsanfrage
+from .phase_service import (PhasenAnfrage, verarbeite_phasenanfrage,
+                            verarbeite_phasenplananfrage)
+from .stream_service import verarbeite_stromanfrage
+from .sweep_service import KurvenAnfrage, verarbeite_kurvenanfrage
+from .timeline_service import verarbeite_zeitleistenanfrage
 
 __all__ = [
     "BerechnungsAnfrage",
     "BerechnungsDienstAntwort",
+    "KurvenAnfrage",
+    "MindestTeilzeitAnfrage",
+    "PhasenAnfrage",
+    "VergleichsAnfrage",
+    "buendelungs_statistik",
+    "cache_statistik",
+    "dekodiere_verkuerzungsmaske",
+    "kanonischer_schluessel",
+    "kodiere_verkuerzungsgruende",
+    "konfiguriere_ergebnis_cache",
+    "konfiguriere_schattenauswertung",
+    "leere_ergebnis_cache",
+    "schatten_abweichungen",
+    "schatten_statistik",
+    "verarbeite_batchanfrage",
+    "verarbeite_berechnungsabfrage",
     "verarbeite_berechnungsanfrage",
+    "verarbeite_kurvenanfrage",
+    "verarbeite_mindest_teilzeit_anfrage",
+    "verarbeite_optimierungsanfrage",
+    "verarbeite_phasenanfrage",
+    "verarbeite_phasenplananfrage",
+    "verarbeite_pruefungsanfrage",
+    "verarbeite_stromanfrage",
+    "verarbeite_vergleichsanfrage",
+    "verarbeite_zeitleistenanfrage",
+    "warte_auf_schattenauswertung",
 ]
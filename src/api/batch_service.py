@@ -0,0 +1,131 @@
+"""Service-Schicht für Sammelberechnungen des Teilzeitrechners.
+
+Partnersysteme (Kammerportale, Schulverwaltungen) berechnen oft Hunderte
+Verträge auf einmal. Statt einer HTTP-Anfrage je Vertrag nimmt dieser
+Service eine Liste von Payloads wie ``/api/calculate`` entgegen, validiert
+sie in einem Durchlauf, berechnet jede eindeutige Anfrage (gleicher
+`kanonischer_schluessel`) nur einmal und liefert je Eintrag das Ergebnis
+oder die Fehlerantwort einer Einzelanfrage.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from ..calculation_logic import Berechnungsergebnis
+from .calculation_service import (BerechnungsAnfrage, BerechnungsDienstAntwort,
+                                  berechne_eindeutige, fehlerantwort)
+from .validation import (BerechnungsDienstFehler, NutzlastValidierungsFehler,
+                         benoetige_dictionary)
+
+logger = logging.getLogger(__name__)
+
+# Standard-Obergrenze je Sammelanfrage, überschreibbar über ``BATCH_MAX_SIZE``
+STANDARD_MAX_BATCH_GROESSE = 500
+
+
+def batch_groesse_aus_umgebung(default: int = STANDARD_MAX_BATCH_GROESSE) -> int:
+    """Liest die Obergrenze aus ``BATCH_MAX_SIZE`` (ungültige Werte → Default)."""
+    wert = os.getenv("BATCH_MAX_SIZE")
+    if not wert:
+        return default
+    try:
+        groesse = int(wert)
+    except ValueError:
+        return default
+    return groesse if groesse > 0 else default
+
+
+# Obergrenze je Sammelanfrage (schützt den Prozess vor sehr großen Payloads)
+MAX_BATCH_GROESSE = batch_groesse_aus_umgebung()
+
+
+def verarbeite_batchanfrage(payload: Any) -> BerechnungsDienstAntwort:
+    """Berechnet eine Liste von Berechnungsanfragen.
+
+    Antwort (``result``):
+
+    - ``anzahl``: Anzahl der Einträge
+    - ``eindeutige_anfragen``: Anzahl tatsächlich berechneter Anfragen
+    - ``fehler``: Anzahl ungültiger Einträge
+    - ``ergebnisse``: je Eintrag ``index`` und ``status_code`` sowie
+      ``result`` und ``duplikat_von`` (Index des ersten gleichwertigen
+      Eintrags oder ``None``) bzw. ``error`` wie bei einer Einzelanfrage
+
+    Ungültige Einträge brechen die Sammelanfrage nicht ab. Ist die Liste
+    selbst ungültig (kein Array, leer oder länger als
+    `MAX_BATCH_GROESSE`), antwortet der Service mit 422.
+
+    Args:
+        payload: Bereits geparstes JSON des Requests (Liste von Payloads).
+
+    Returns:
+        BerechnungsDienstAntwort: Normalisierte Antwort mit Statuscode.
+    """
+    if not isinstance(payload, list) or not payload:
+        return fehlerantwort(NutzlastValidierungsFehler(
+            "Erwarte eine nicht-leere Liste von Berechnungsanfragen",
+            details={"field": "payload"},
+        ))
+    if len(payload) > MAX_BATCH_GROESSE:
+        return fehlerantwort(NutzlastValidierungsFehler(
+            f"Höchstens {MAX_BATCH_GROESSE} Anfragen je Sammelanfrage",
+            details={"field": "payload", "max": MAX_BATCH_GROESSE},
+        ))
+    logger.info("Sammelanfrage eingegangen | anfragen=%d", len(payload))
+
+    anfragen: List[Any] = []
+    for eintrag in payload:
+        try:
+            anfragen.append(BerechnungsAnfrage.from_dict(
+                benoetige_dictionary(eintrag, "anfrage")
+            ))
+        except BerechnungsDienstFehler as exc:
+            anfragen.append(exc)
+
+    ergebnisse, duplikat_von, eindeutige = berechne_eindeutige(tuple(anfragen))
+
+    zeilen = []
+    dicts: Dict[int, Dict[str, Any]] = {}
+    for index, ergebnis in enumerate(ergebnisse):
+        zeilen.append(_batchzeile(index, ergebnis, duplikat_von[index], dicts))
+    fehler = sum(zeile["status_code"] != 200 for zeile in zeilen)
+    logger.info(
+        "Sammelanfrage berechnet | eindeutige=%d fehler=%d", eindeutige, fehler
+    )
+    return BerechnungsDienstAntwort(
+        status_code=200,
+        ergebnis={
+            "anzahl": len(zeilen),
+            "eindeutige_anfragen": eindeutige,
+            "fehler": fehler,
+            "ergebnisse": zeilen,
+        },
+    )
+
+
+def _batchzeile(
+    index: int,
+    ergebnis: Any,
+    duplikat_von: Optional[int],
+    dicts: Dict[int, Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Baut den Antworteintrag; gleiche Ergebnisse teilen ihr Dictionary."""
+    if not isinstance(ergebnis, Berechnungsergebnis):
+        antwort = fehlerantwort(ergebnis)
+        return {
+            "index": index,
+            "status_code": antwort.status_code,
+            "error": antwort.fehler.to_dict(),
+        }
+    result = dicts.get(id(ergebnis))
+    if result is None:
+        result = dicts[id(ergebnis)] = ergebnis.to_dict()
+    return {
+        "index": index,
+        "status_code": 200,
+        "duplikat_von": duplikat_von,
+        "result": result,
+    }
@@ -7,14 +7,51 @@ schlank und verlässlich für alle Konsumenten bleibt.
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import os
 from dataclasses import dataclass
-from typing import Any, Dict, Mapping, Optional
-
-from ..calculation_logic import berechne_gesamtdauer
+from fractions import Fraction
+from typing import (Any, Callable, Dict, Hashable, Iterable, List, Mapping,
+                    Optional, Tuple, Union)
+
+from ..calculation_logic import (BERUF_MONATE_SHIFT, BERUF_Q2_STUFE_MASKE,
+                                 BERUF_Q2_STUFE_SHIFT, GRUND_ABITUR,
+                                 GRUND_ALTER_21, GRUND_BERUF_FELDER,
+                                 GRUND_BERUF_Q1, GRUND_BERUF_Q2,
+                                 GRUND_BERUF_Q3, GRUND_BERUF_Q4,
+                                 GRUND_FAMILIEN_PFLEGE, GRUND_KINDERBETREUUNG,
+                                 GRUND_REALSCHULE, GRUND_VORKENNTNISSE,
+                                 Berechnungsergebnis, berechne_gesamtdauer,
+                                 berechne_teilzeit_prozent,
+                                 berechne_teilzeit_stunden,
+                                 berechne_verkuerzung_aus_maske,
+                                 teilzeit_anteil)
+from ..rule_sets import Regelwerk, lade_regelwerk, verfuegbare_regelwerke
+from .json_encoding import KodierungsCache, kodiere_json
+from .request_coalescing import Buendelung, BuendelungsStatistik
+from .result_cache import (CacheStatistik, ErgebnisCache,
+                           cache_groesse_aus_umgebung)
+from .shadow_evaluation import (Kandidat, SchattenAuswertung,
+                                SchattenStatistik, anteil_aus_umgebung,
+                                geheimnis_aus_umgebung,
+                                warteschlange_aus_umgebung)
+from .validation import (BerechnungsDienstFehler, FehlendeFelderFehler,
+                         NutzlastValidierungsFehler, coerce_float, coerce_int,
+                         ganzzahl)
 
 logger = logging.getLogger(__name__)
 
+# Prozessweiter Ergebniscache (Größe über ``RESULT_CACHE_SIZE`` konfigurierbar)
+_ergebnis_cache = ErgebnisCache(cache_groesse_aus_umgebung())
+
+# Bündelung gleichzeitiger Berechnungen mit gleichem kanonischen Schlüssel
+_buendelung = Buendelung()
+
+# Kodierte Response-Bodies der Ergebnisse (gleiche Größe wie der Ergebniscache)
+_kodierungs_cache = KodierungsCache(cache_groesse_aus_umgebung())
+
 
 # ---------------------------------------------------------------------------
 # Datenmodelle
@@ -33,6 +70,51 @@ PFLICHTFELDER = (
 # `beruf_q4` wurde reaktiviert; `beruf_q5` bleibt legacy
 LEGACY_IGNORED_KEYS = {"beruf_q5"}
 
+# Ja/Nein-Felder in `verkuerzungsgruende` und ihr Bit in der Verkürzungsmaske
+GRUND_BITS = (
+    ("abitur", GRUND_ABITUR),
+    ("realschule", GRUND_REALSCHULE),
+    ("alter_ueber_21", GRUND_ALTER_21),
+    ("familien_kinderbetreuung", GRUND_KINDERBETREUUNG),
+    ("familien_pflegeverantwortung", GRUND_FAMILIEN_PFLEGE),
+    ("beruf_q1", GRUND_BERUF_Q1),
+    ("beruf_q2", GRUND_BERUF_Q2),
+    ("beruf_q3", GRUND_BERUF_Q3),
+    ("beruf_q4", GRUND_BERUF_Q4),
+)
+
+# Erlaubte Felder in `verkuerzungsgruende` (Legacy-Felder werden ignoriert)
+VERKUERZUNGS_FELDER = frozenset(
+    [key for key, _ in GRUND_BITS]
+    + [
+        "vorkenntnisse_monate",
+        "beruf_q2_dauer_monate",
+        "berufliche_verkuerzung_monate",
+    ]
+)
+_ZULAESSIGE_VERKUERZUNGS_FELDER = VERKUERZUNGS_FELDER | LEGACY_IGNORED_KEYS
+
+EINGABETYPEN = frozenset({"prozent", "stunden"})
+
+# Flache Text-Felder (CSV-Spalten, Query-Parameter): Felder auf oberster Ebene,
+# alle übrigen gehören zu `verkuerzungsgruende`
+FLACHE_ANFRAGE_FELDER = frozenset(
+    [field for field in PFLICHTFELDER if field != "verkuerzungsgruende"]
+    + ["regelwerk"]
+)
+_JA_NEIN_FELDER = frozenset(key for key, _ in GRUND_BITS)
+_JA_WERTE = frozenset({"true", "wahr", "ja", "x", "1"})
+_NEIN_WERTE = frozenset({"false", "falsch", "nein", "0"})
+
+# Version der Rechenlogik im ETag; bei jeder Änderung an Ergebnissen oder an
+# `kanonischer_schluessel` erhöhen, damit HTTP-Caches keine veralteten
+# Antworten mehr bestätigen (2: exakte Abrundung in Schritt 3, Anteil im
+# Schlüssel)
+ETAG_VERSION = 2
+
+# Monatswert je Stufe von `beruf_q2_dauer_monate` (< 6, 6..11, >= 12 Monate)
+BERUF_Q2_STUFEN_MONATE = (0, 6, 12)
+
 
 @dataclass(frozen=True)
 class BerechnungsAnfrage:
@@ -42,15 +124,24 @@ class BerechnungsAnfrage:
     vollzeit_stunden: float
     teilzeit_eingabe: float
     eingabetyp: str
-    verkuerzungsgruende: Dict[str, Any]
+    verkuerzungs_maske: int
+    # Gewähltes Regelwerk (`None`: fest eingebaute Werte von calculation_logic)
+    regelwerk: Optional[Regelwerk] = None
+
+    @property
+    def verkuerzungsgruende(self) -> Dict[str, Any]:
+        """Normalisierte Verkürzungsgründe als Dictionary (aus der Bitmaske)."""
+        return dekodiere_verkuerzungsmaske(self.verkuerzungs_maske)
 
     @staticmethod
     def from_dict(payload: Mapping[str, Any]) -> "BerechnungsAnfrage":
         """Erzeuge ein validiertes `BerechnungsAnfrage`-Objekt aus rohem Payload.
 
-        Validiert Pflichtfelder, normalisiert `verkuerzungsgruende` und konvertiert
-        numerische Werte. Wirft `FehlendeFelderFehler` oder
-        `NutzlastValidierungsFehler` bei Problemen.
+        Validiert Pflichtfelder, kodiert `verkuerzungsgruende` in einem
+        Durchlauf als Bitmaske und konvertiert numerische Werte. Das optionale
+        Feld ``regelwerk`` wählt ein versioniertes Regelwerk (siehe
+        `src.rule_sets`). Wirft
+        `FehlendeFelderFehler` oder `NutzlastValidierungsFehler` bei Problemen.
 
         Args:
             payload: Rohes Mapping (z.B. von JSON-parsing)
@@ -63,29 +154,26 @@ class BerechnungsAnfrage:
         if missing:
             raise FehlendeFelderFehler(missing)
 
-        verkuerzungsgruende = _benoetige_dictionary(
-            payload["verkuerzungsgruende"],
-            "verkuerzungsgruende",
+        verkuerzungs_maske = kodiere_verkuerzungsgruende(
+            payload["verkuerzungsgruende"]
         )
-        _validiere_verkuerzungsgruende(verkuerzungsgruende)
-        verkuerzungsgruende = _normalisiere_verkuerzungsgruende(verkuerzungsgruende)
 
         eingabetyp = payload["eingabetyp"]
-        if eingabetyp not in {"prozent", "stunden"}:
+        if eingabetyp not in EINGABETYPEN:
             raise NutzlastValidierungsFehler(
                 "eingabetyp muss 'prozent' oder 'stunden' sein",
                 code="ungültiger_eingabetyp",
             )
 
-        basis_dauer_monate = _coerce_int(
+        basis_dauer_monate = coerce_int(
             payload["basis_dauer_monate"],
             "basis_dauer_monate",
         )
-        vollzeit_stunden = _coerce_float(
+        vollzeit_stunden = coerce_float(
             payload["vollzeit_stunden"],
             "vollzeit_stunden",
         )
-        teilzeit_eingabe = _coerce_float(
+        teilzeit_eingabe = coerce_float(
             payload["teilzeit_eingabe"],
             "teilzeit_eingabe",
         )
@@ -95,13 +183,17 @@ class BerechnungsAnfrage:
             vollzeit_stunden=vollzeit_stunden,
             teilzeit_eingabe=teilzeit_eingabe,
             eingabetyp=eingabetyp,
-            verkuerzungsgruende=verkuerzungsgruende,
+            verkuerzungs_maske=verkuerzungs_maske,
+            regelwerk=_waehle_regelwerk(payload.get("regelwerk")),
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DienstFehler:
-    """Repräsentiert einen Fehler, der für die API-Antwort serialisiert wird."""
+    """Repräsentiert einen Fehler, der für die API-Antwort serialisiert wird.
+
+    Die Dictionary-Form wird erst bei Bedarf über `to_dict()` erzeugt.
+    """
 
     code: str
     message: str
@@ -119,54 +211,49 @@ class DienstFehler:
             payload["details"] = self.details
         return payload
 
+    def to_json(self) -> str:
+        """Serialisiert die Fehlerinformationen als JSON-String."""
+        return json.dumps(self.to_dict())
 
-@dataclass(frozen=True)
-class BerechnungsDienstAntwort:
-    """Container für das Zurückgeben der Ergebnisse an die Transportschicht."""
-
-    status_code: int
-    body: Dict[str, Any]
-
-
-# ---------------------------------------------------------------------------
-# Ausnahmen
-# ---------------------------------------------------------------------------
-
-
-class BerechnungsDienstFehler(Exception):
-    """Basisklasse für Service-spezifische Ausnahmen."""
 
+@dataclass(frozen=True, slots=True)
+class BerechnungsDienstAntwort:
+    """Container für das Zurückgeben der Ergebnisse an die Transportschicht.
 
-class FehlendeFelderFehler(BerechnungsDienstFehler):
-    """Fehler für fehlende Pflichtfelder im Request.
-
-    Dieses Exception-Objekt enthält das Attribut `missing` mit der Liste
-    der nicht vorhandenen Felder, damit die API eine strukturierte
-    Fehlermeldung zurückgeben kann.
+    Hält entweder ein Ergebnis (z.B. `Berechnungsergebnis`) oder einen
+    `DienstFehler`. Der Response-Body (`body`) bzw. seine JSON-Form
+    (`to_json()`) wird erst beim Zugriff erzeugt.
     """
-    def __init__(self, missing: Any) -> None:
-        self.missing = list(missing)
-        message = f"Fehlende Felder: {', '.join(self.missing)}"
-        super().__init__(message)
 
-
-class NutzlastValidierungsFehler(BerechnungsDienstFehler):
-    """Validierungsfehler für ungültige Request-Werte.
-
-    Beinhaltet einen optionalen `code` und `details`, die in der
-    API-Antwort zurückgegeben werden können, um die Ursache strukturiert
-    darzustellen.
-    """
-    def __init__(
-        self,
-        message: str,
-        *,
-        code: str = "validation_error",
-        details: Optional[Dict[str, Any]] = None,
-    ) -> None:
-        self.code = code
-        self.details = details
-        super().__init__(message)
+    status_code: int
+    ergebnis: Any = None
+    fehler: Optional[DienstFehler] = None
+    # Starkes ETag (ohne Anführungszeichen) für cachebare Antworten
+    etag: Optional[str] = None
+
+    @property
+    def body(self) -> Dict[str, Any]:
+        """Response-Body: ``{"result": ...}`` bzw. ``{"error": ...}``."""
+        if self.fehler is not None:
+            return {"error": self.fehler.to_dict()}
+        ergebnis = self.ergebnis
+        if hasattr(ergebnis, "to_dict"):
+            ergebnis = ergebnis.to_dict()
+        return {"result": ergebnis}
+
+    def to_json(self) -> str:
+        """Serialisiert den Response-Body als JSON-String."""
+        return json.dumps(self.body)
+
+    def to_bytes(self) -> bytes:
+        """Kodiert den Response-Body als JSON-Bytes (siehe `json_encoding`).
+
+        Der Body eines `Berechnungsergebnis` wird je Ergebnisobjekt nur
+        einmal kodiert; Treffer im Ergebniscache liefern die Bytes direkt.
+        """
+        if self.fehler is None and isinstance(self.ergebnis, Berechnungsergebnis):
+            return _kodierungs_cache.kodiere(self.ergebnis, _ergebnis_body)
+        return kodiere_json(self.body)
 
 
 # ---------------------------------------------------------------------------
@@ -199,7 +286,7 @@ def verarbeite_berechnungsanfrage(
         )
         return BerechnungsDienstAntwort(
             status_code=400,
-            body={"error": error.to_dict()},
+            fehler=error,
         )
     except NutzlastValidierungsFehler as exc:
         logger.warning("validation_error:%s", exc.code or "validation_error")
@@ -210,282 +297,576 @@ def verarbeite_berechnungsanfrage(
         )
         return BerechnungsDienstAntwort(
             status_code=422,
-            body={"error": error.to_dict()},
+            fehler=error,
         )
 
     try:
-        result = berechne_gesamtdauer(
-            basis_dauer_monate=request_model.basis_dauer_monate,
-            vollzeit_stunden=request_model.vollzeit_stunden,
-            teilzeit_eingabe=request_model.teilzeit_eingabe,
-            verkuerzungsgruende=request_model.verkuerzungsgruende,
-            eingabetyp=request_model.eingabetyp,
-        )
+        result = berechne_anfrage(request_model)
     except (TypeError, ValueError) as exc:
         logger.warning("validation_error")
         error = DienstFehler(code="validation_error", message=str(exc))
         return BerechnungsDienstAntwort(
             status_code=422,
-            body={"error": error.to_dict()},
+            fehler=error,
         )
     except Exception:  # pragma: no cover - Catch-All zur Sicherheit
-        logger.exception(
-            "Unerwarteter Fehler während berechne_gesamtdauer",
-        )
-        error = DienstFehler(
-            code="internal_error",
-            message="Unerwarteter Serverfehler",
-        )
-        return BerechnungsDienstAntwort(
-            status_code=500,
-            body={"error": error.to_dict()},
-        )
+        return _interner_fehler()
     logger.info("Berechnung erfolgreich")
-    return BerechnungsDienstAntwort(status_code=200, body={"result": result})
+    _schattenauswertung.beobachte(request_model, result)
+    return BerechnungsDienstAntwort(status_code=200, ergebnis=result)
 
 
-# ---------------------------------------------------------------------------
-# Hilfsfunktionen
-# ---------------------------------------------------------------------------
+def verarbeite_berechnungsabfrage(
+    felder: Iterable[Tuple[str, str]],
+    etag_bekannt: Callable[[str], bool] = lambda etag: False,
+) -> BerechnungsDienstAntwort:
+    """Einstieg für ``GET /api/calculate`` (Felder als Query-Parameter).
 
+    Die Felder werden wie bei `nutzlast_aus_feldern` zu einer Nutzlast
+    zusammengesetzt und validiert. Erfolgreiche Antworten tragen ein starkes
+    ETag aus dem kanonischen Schlüssel; kennt der Client es bereits
+    (``If-None-Match``), wird ohne Berechnung mit 304 geantwortet.
 
-def _benoetige_dictionary(value: Any, field_name: str) -> Dict[str, Any]:
-    """Stellt sicher, dass ein Feld ein Mapping/Objekt ist.
+    Args:
+        felder: Paare aus Feldname und Textwert.
+        etag_bekannt: Prüft, ob der Client das ETag bereits hat.
+
+    Returns:
+        BerechnungsDienstAntwort: 200 (mit ``etag``), 304 oder Fehlerantwort.
+    """
+    logger.info("Berechnungsabfrage eingegangen")
+    try:
+        request_model = BerechnungsAnfrage.from_dict(nutzlast_aus_feldern(felder))
+    except BerechnungsDienstFehler as exc:
+        return fehlerantwort(exc)
+    etag = etag_fuer_anfrage(request_model)
+    if etag is not None and etag_bekannt(etag):
+        return BerechnungsDienstAntwort(status_code=304, etag=etag)
+    try:
+        result = berechne_anfrage(request_model)
+    except (TypeError, ValueError) as exc:
+        return fehlerantwort(exc)
+    except Exception:
+        return _interner_fehler()
+    _schattenauswertung.beobachte(request_model, result)
+    return BerechnungsDienstAntwort(status_code=200, ergebnis=result, etag=etag)
+
+
+def berechne_anfrage(request_model: BerechnungsAnfrage) -> Berechnungsergebnis:
+    """Berechnet eine validierte Anfrage über den Ergebniscache.
+
+    Gleichwertige Anfragen (gleicher `kanonischer_schluessel`) werden nur
+    einmal berechnet; weitere Aufrufe liefern das gespeicherte Ergebnis.
+    Gleichzeitige Aufrufe, während die Berechnung noch läuft, warten auf sie
+    (`Buendelung`) und erhalten dasselbe Ergebnis bzw. dieselbe Ausnahme.
 
     Args:
-        value: Der zu prüfende Wert aus der Nutzlast.
-        field_name: Name des Feldes (für die Fehlermeldung).
+        request_model: Validierte Anfrage.
 
     Returns:
-        dict: Ein normales Python-`dict`, erzeugt aus dem Mapping.
+        Berechnungsergebnis: Ergebnis von `berechne_gesamtdauer`.
 
     Raises:
-        NutzlastValidierungsFehler: Falls `value` kein Mapping ist.
+        TypeError, ValueError: Bei fachlich ungültigen Werten.
     """
-    if not isinstance(value, Mapping):
-        raise NutzlastValidierungsFehler(
-            f"{field_name} muss ein Objekt sein",
-            details={"field": field_name},
+    try:
+        schluessel = kanonischer_schluessel(request_model)
+    except ArithmeticError:
+        # z.B. 0 Vollzeitstunden: die Fehlermeldung liefert berechne_gesamtdauer
+        schluessel = None
+    if schluessel is None:
+        return _berechne_ohne_cache(request_model)
+    cached = _ergebnis_cache.hole(schluessel)
+    if cached is not None:
+        logger.info("Berechnung aus Cache")
+        return cached
+
+    def berechne_und_speichere() -> Berechnungsergebnis:
+        result = _berechne_ohne_cache(request_model)
+        _ergebnis_cache.speichere(schluessel, result)
+        return result
+
+    return _buendelung.fuehre_aus(schluessel, berechne_und_speichere)
+
+
+def berechne_eindeutige(
+    anfragen: Tuple[Any, ...],
+) -> Tuple[List[Any], List[Optional[int]], int]:
+    """Berechnet jede eindeutige Anfrage einer Liste nur einmal.
+
+    Gleichwertige Anfragen (gleicher `kanonischer_schluessel`) teilen sich
+    das Ergebnis der ersten. Bereits bei der Validierung gescheiterte
+    Einträge (Ausnahmen) werden unverändert übernommen; Fehler der
+    Berechnung (`TypeError`/`ValueError`) stehen als Ausnahme in der Liste.
+
+    Returns:
+        tuple: (Ergebnis oder Ausnahme je Anfrage, Index der ersten
+        gleichwertigen Anfrage je Anfrage, Anzahl Berechnungen)
+    """
+    erste_fundstelle: Dict[Hashable, int] = {}
+    ergebnisse: List[Any] = []
+    duplikat_von: List[Optional[int]] = []
+    for index, anfrage in enumerate(anfragen):
+        if isinstance(anfrage, Exception):
+            ergebnisse.append(anfrage)
+            duplikat_von.append(None)
+            continue
+        try:
+            schluessel = kanonischer_schluessel(anfrage)
+        except ArithmeticError:
+            schluessel = None
+        if schluessel is not None and schluessel in erste_fundstelle:
+            original = erste_fundstelle[schluessel]
+            ergebnisse.append(ergebnisse[original])
+            duplikat_von.append(original)
+            continue
+        try:
+            ergebnisse.append(berechne_anfrage(anfrage))
+        except (TypeError, ValueError) as exc:
+            ergebnisse.append(exc)
+        if schluessel is not None:
+            erste_fundstelle[schluessel] = index
+        duplikat_von.append(None)
+    eindeutige = duplikat_von.count(None) - sum(
+        isinstance(anfrage, Exception) for anfrage in anfragen
+    )
+    return ergebnisse, duplikat_von, eindeutige
+
+
+def _interner_fehler() -> BerechnungsDienstAntwort:
+    """Strukturierte 500-Antwort für unerwartete Fehler (protokolliert sie)."""
+    logger.exception(
+        "Unerwarteter Fehler während berechne_gesamtdauer",
+    )
+    error = DienstFehler(
+        code="internal_error",
+        message="Unerwarteter Serverfehler",
+    )
+    return BerechnungsDienstAntwort(
+        status_code=500,
+        fehler=error,
+    )
+
+
+def _berechne_ohne_cache(request_model: BerechnungsAnfrage) -> Berechnungsergebnis:
+    """Berechnet eine validierte Anfrage (Standardlogik oder Regelwerk)."""
+    if request_model.regelwerk is None:
+        return berechne_gesamtdauer(
+            basis_dauer_monate=request_model.basis_dauer_monate,
+            vollzeit_stunden=request_model.vollzeit_stunden,
+            teilzeit_eingabe=request_model.teilzeit_eingabe,
+            verkuerzungsgruende=request_model.verkuerzungs_maske,
+            eingabetyp=request_model.eingabetyp,
         )
-    return dict(value)
+    return request_model.regelwerk.berechne(
+        request_model.basis_dauer_monate,
+        request_model.vollzeit_stunden,
+        request_model.teilzeit_eingabe,
+        request_model.verkuerzungs_maske,
+        request_model.eingabetyp,
+    )
 
 
-def _validiere_verkuerzungsgruende(data: Mapping[str, Any]) -> None:
-    """Validiert die Struktur und Typen in `verkuerzungsgruende`.
+def fehlerantwort(exc: Exception) -> BerechnungsDienstAntwort:
+    """Übersetzt eine Validierungsausnahme in eine strukturierte Fehlerantwort.
 
-    Prüft erlaubte Keys, entfernt Legacy-Felder und stellt sicher, dass
-    erwartete Felder den korrekten Typ (bool oder Zahl) haben. Wirft eine
-    `NutzlastValidierungsFehler` bei unerwarteten oder falsch typisierten
-    Feldern.
+    Gemeinsame Fehlerabbildung für alle Service-Funktionen:
+
+    - `FehlendeFelderFehler` → 400 ``missing_fields``
+    - `NutzlastValidierungsFehler` → 422 mit dessen ``code``/``details``
+    - `TypeError`/`ValueError` der Berechnungslogik → 422 ``validation_error``
+
+    Args:
+        exc: Die abgefangene Ausnahme.
+
+    Returns:
+        BerechnungsDienstAntwort: Fehlerantwort mit passendem Statuscode.
     """
-    # Entferne Alt-Felder laut User Story 2.3
-    data = dict(data)
-    for legacy_key in LEGACY_IGNORED_KEYS:
-        data.pop(legacy_key, None)
-
-    allowed_keys = {
-        "abitur",
-        "realschule",
-        "alter_ueber_21",
-        "familien_kinderbetreuung",
-        "familien_pflegeverantwortung",
-        "vorkenntnisse_monate",
-        "beruf_q1",
-        "beruf_q2",
-        "beruf_q2_dauer_monate",
-        "beruf_q3",
-        "beruf_q4",
-        "berufliche_verkuerzung_monate",
-    }
-    unexpected_keys = sorted(set(data.keys()) - allowed_keys)
-    if unexpected_keys:
-        raise NutzlastValidierungsFehler(
-            "Unbekannte Felder in verkuerzungsgruende",
-            details={"field": "verkuerzungsgruende", "unexpected": unexpected_keys},
+    if isinstance(exc, FehlendeFelderFehler):
+        logger.warning("missing_fields")
+        error = DienstFehler(
+            code="missing_fields",
+            message=str(exc),
+            details={"missing": exc.missing},
         )
+        return BerechnungsDienstAntwort(status_code=400, fehler=error)
+    if isinstance(exc, NutzlastValidierungsFehler):
+        logger.warning("validation_error:%s", exc.code or "validation_error")
+        error = DienstFehler(code=exc.code, message=str(exc), details=exc.details)
+        return BerechnungsDienstAntwort(status_code=422, fehler=error)
+    logger.warning("validation_error")
+    error = DienstFehler(code="validation_error", message=str(exc))
+    return BerechnungsDienstAntwort(status_code=422, fehler=error)
 
-    bool_keys = {
-        "abitur",
-        "realschule",
-        "alter_ueber_21",
-        "familien_kinderbetreuung",
-        "familien_pflegeverantwortung",
-        # berufliche Ja/Nein-Antworten
-        "beruf_q1",
-        "beruf_q2",
-        "beruf_q3",
-        "beruf_q4",
-    }
-    for key in bool_keys:
-        value = data.get(key, False)
-        if not isinstance(value, bool):
-            raise NutzlastValidierungsFehler(
-                f"{key} muss bool sein",
-                details={"field": f"verkuerzungsgruende.{key}"},
-            )
 
-    if "vorkenntnisse_monate" in data:
-        _coerce_float(
-            data["vorkenntnisse_monate"],
-            "verkuerzungsgruende.vorkenntnisse_monate",
-        )
+def kanonischer_schluessel(anfrage: BerechnungsAnfrage) -> Tuple[Hashable, ...]:
+    """Bildet den kanonischen Cache-Schlüssel einer validierten Anfrage.
 
-    # beruf_q2_dauer_monate ist optional, muss aber eine Zahl sein, wenn vorhanden
-    if "beruf_q2_dauer_monate" in data:
-        _coerce_float(
-            data["beruf_q2_dauer_monate"],
-            "verkuerzungsgruende.beruf_q2_dauer_monate",
-        )
+    Gleichwertige Payloads teilen sich einen Schlüssel:
 
-    # berufliche_verkuerzung_monate kann vom Client als Vorkalkulation geliefert werden
-    if "berufliche_verkuerzung_monate" in data:
-        _coerce_float(
-            data["berufliche_verkuerzung_monate"],
-            "verkuerzungsgruende.berufliche_verkuerzung_monate",
-        )
+    - Verkürzungsgründe werden auf ihre Summe in Monaten reduziert (z.B.
+      Abitur, Alter über 21 oder `beruf_q1` ergeben jeweils 12 Monate); die
+      effektive Verkürzung ergibt sich daraus über die 12-Monats-Begrenzung.
+    - Die Teilzeit wird als exakter Anteil (`Fraction` aus `teilzeit_anteil`)
+      geführt, mit dem Schritt 3 rechnet, sodass z.B. 75 % und 30 von 40
+      Stunden denselben Schlüssel ergeben. Die abgeleiteten Prozent- und
+      Stundenwerte (float) allein genügen nicht: 5,5 von 10 Stunden und
+      55.00000000000001 % liefern dieselben floats, runden aber verschieden.
+      Beide floats bleiben Teil des Schlüssels, da sie im Ergebnis erscheinen.
 
+    - Bei gewähltem Regelwerk wird die Verkürzungssumme mit dessen Werten
+      gebildet und die Version angehängt.
 
-def _normalisiere_verkuerzungsgruende(data: Mapping[str, Any]) -> Dict[str, Any]:
-    """Normalisiert und coerce't Eingabewerte in `verkuerzungsgruende`.
+    Anfragen mit gleichem Schlüssel liefern dasselbe Ergebnis von
+    `berechne_gesamtdauer()`; ändert sich die Rechnung oder der Schlüssel,
+    muss `ETAG_VERSION` erhöht werden.
 
-    Wandelt optionale Felder in konsistente Typen um (bools, ints) und
-    bildet freie Angaben wie `vorkenntnisse_monate` auf die internen
-    Repräsentationen (z.B. 12 Monate) ab.
+    Args:
+        anfrage: Validierte Anfrage (siehe `BerechnungsAnfrage.from_dict`).
 
     Returns:
-        dict: Normalisiertes Dictionary mit erwarteten Keys und Typen.
+        tuple: (AO-Dauer, Vollzeit, Prozent, Stunden, exakter Anteil,
+        Verkürzungssumme), bei gewähltem Regelwerk zusätzlich dessen Version
     """
-    data = dict(data)
-    for legacy_key in LEGACY_IGNORED_KEYS:
-        data.pop(legacy_key, None)
-
-    # Berufserfahrung/Vorkenntnisse: Wenn > 0, wird auf festen 12-Monats-Wert abgebildet
-    vorkenntnisse = _coerce_float(
-        data.get("vorkenntnisse_monate", 0),
-        "verkuerzungsgruende.vorkenntnisse_monate",
+    vollzeit = float(anfrage.vollzeit_stunden)
+    if anfrage.eingabetyp == "stunden":
+        prozent = berechne_teilzeit_prozent(vollzeit, anfrage.teilzeit_eingabe)
+        stunden = float(anfrage.teilzeit_eingabe)
+    else:
+        prozent = float(anfrage.teilzeit_eingabe)
+        stunden = berechne_teilzeit_stunden(vollzeit, anfrage.teilzeit_eingabe)
+    zaehler, nenner = teilzeit_anteil(
+        vollzeit, anfrage.teilzeit_eingabe, anfrage.eingabetyp
     )
-    vorkenntnisse_monate = 12 if vorkenntnisse and vorkenntnisse > 0 else 0
-
-    # Normalisiere die neuen beruflichen Felder (bools und Zahlen)
-    beruf_q1 = bool(data.get("beruf_q1", False))
-    beruf_q2 = bool(data.get("beruf_q2", False))
-    beruf_q2_dauer = _coerce_int(
-        data.get("beruf_q2_dauer_monate", 0) or 0,
-        "verkuerzungsgruende.beruf_q2_dauer_monate",
+    anteil = Fraction(zaehler) / Fraction(nenner)
+    if anfrage.regelwerk is not None:
+        _, verkuerzung_summe = anfrage.regelwerk.berechne_verkuerzung(
+            anfrage.basis_dauer_monate,
+            anfrage.verkuerzungs_maske,
+        )
+        return (
+            anfrage.basis_dauer_monate,
+            vollzeit,
+            prozent,
+            stunden,
+            anteil,
+            verkuerzung_summe,
+            anfrage.regelwerk.version,
+        )
+    _, verkuerzung_summe = berechne_verkuerzung_aus_maske(
+        anfrage.basis_dauer_monate,
+        anfrage.verkuerzungs_maske,
     )
-    beruf_q3 = bool(data.get("beruf_q3", False))
-    # beruf_q4: direkt aus dem Payload (default False)
-    beruf_q4 = bool(data.get("beruf_q4", False))
-    wert = data.get("berufliche_verkuerzung_monate", 0) or 0
-    berufliche_verkuerzung_monate = _coerce_int(
-        wert,
-        "verkuerzungsgruende.berufliche_verkuerzung_monate",
+    return (
+        anfrage.basis_dauer_monate,
+        vollzeit,
+        prozent,
+        stunden,
+        anteil,
+        verkuerzung_summe,
     )
 
-    return {
-        "abitur": bool(data.get("abitur", False)),
-        "realschule": bool(data.get("realschule", False)),
-        "alter_ueber_21": bool(data.get("alter_ueber_21", False)),
-        "familien_pflegeverantwortung": bool(
-            data.get("familien_pflegeverantwortung", False)
-        ),
-        "familien_kinderbetreuung": bool(
-            data.get("familien_kinderbetreuung", False)
-        ),
-        "vorkenntnisse_monate": vorkenntnisse_monate,
-        # berufliche Fragen
-        "beruf_q1": beruf_q1,
-        "beruf_q2": beruf_q2,
-        "beruf_q2_dauer_monate": beruf_q2_dauer,
-        "beruf_q3": beruf_q3,
-        # Verwende `beruf_q4` als Standard-Key intern
-        "beruf_q4": beruf_q4,
-        "berufliche_verkuerzung_monate": berufliche_verkuerzung_monate,
-    }
-
-
-def _normalize_numeric_string(raw: str) -> str:
-    """Normalisiert Zahlenstrings für float/int.
-
-    - entfernt Spaces (inkl. NBSP)
-    - bei Komma: interpretiert Punkte als Tausendertrennzeichen ("1.234,5" -> "1234.5")
+
+def etag_fuer_anfrage(anfrage: BerechnungsAnfrage) -> Optional[str]:
+    """Starkes ETag einer validierten Anfrage (`None`, falls nicht berechenbar).
+
+    Abgeleitet aus `kanonischer_schluessel` und `ETAG_VERSION`:
+    gleichwertige Anfragen teilen sich ein ETag.
     """
+    try:
+        schluessel = kanonischer_schluessel(anfrage)
+    except ArithmeticError:
+        return None
+    roh = repr((ETAG_VERSION, schluessel)).encode("utf-8")
+    return hashlib.sha256(roh).hexdigest()[:32]
+
+
+def nutzlast_aus_feldern(
+    felder: Iterable[Tuple[str, str]],
+    oberste_ebene: frozenset = FLACHE_ANFRAGE_FELDER,
+) -> Dict[str, Any]:
+    """Baut aus flachen Text-Feldern eine Nutzlast wie bei ``/api/calculate``.
+
+    Felder aus `oberste_ebene` bleiben auf oberster Ebene, alle übrigen
+    werden zu `verkuerzungsgruende` (Ja/Nein-Felder aus ``ja``/``nein``,
+    ``true``/``false``, ``1``/``0``; Zahlen bleiben Text und werden von
+    `BerechnungsAnfrage.from_dict` gelesen). Leere Werte gelten als nicht
+    angegeben.
+    """
+    nutzlast: Dict[str, Any] = {}
+    gruende: Dict[str, Any] = {}
+    for feld, wert in felder:
+        wert = wert.strip()
+        if not wert:
+            continue
+        if feld in oberste_ebene:
+            nutzlast[feld] = wert
+        elif feld in _JA_NEIN_FELDER:
+            klein = wert.lower()
+            gruende[feld] = (
+                True if klein in _JA_WERTE
+                else False if klein in _NEIN_WERTE
+                else wert
+            )
+        else:
+            gruende[feld] = wert
+    nutzlast["verkuerzungsgruende"] = gruende
+    return nutzlast
+
 
-    value = raw.strip().replace("\u00A0", "").replace(" ", "")
-    if "," in value:
-        value = value.replace(".", "")
-        value = value.replace(",", ".")
-    return value
+def cache_statistik() -> CacheStatistik:
+    """Liefert Treffer-, Fehlschlag- und Verdrängungszahlen des Ergebniscaches."""
+    return _ergebnis_cache.statistik()
 
 
-def _coerce_float(value: Any, field_name: str) -> float:
-    """Konvertiert `value` sicher zu `float`.
+def buendelungs_statistik() -> BuendelungsStatistik:
+    """Liefert die Zähler der Bündelung gleichzeitiger Berechnungen."""
+    return _buendelung.statistik()
 
-    Unterstützt ints, floats und Strings mit deutscher Formatierung
-    (Tausenderpunkte, Komma als Dezimaltrennzeichen). Bei ungültigen
-    Eingaben wird `NutzlastValidierungsFehler` geworfen.
+
+def konfiguriere_ergebnis_cache(max_eintraege: int) -> None:
+    """Setzt die Maximalgröße des Ergebniscaches (0 deaktiviert ihn)."""
+    _ergebnis_cache.konfiguriere(max_eintraege)
+
+
+def leere_ergebnis_cache() -> None:
+    """Leert den Ergebniscache und setzt seine Statistik zurück."""
+    _ergebnis_cache.leere()
+    _kodierungs_cache.leere()
+
+
+# ---------------------------------------------------------------------------
+# Schattenauswertung
+# ---------------------------------------------------------------------------
+
+# Prozessweite Schattenauswertung (Kandidat über ``SHADOW_REGELWERK``,
+# Anteil über ``SHADOW_SAMPLE_RATE``, Warteschlange über ``SHADOW_QUEUE_SIZE``,
+# Schlüssel der Pseudonyme über ``SHADOW_PSEUDONYM_KEY``)
+_schattenauswertung = SchattenAuswertung(
+    warteschlange_aus_umgebung(),
+    schluessel=kanonischer_schluessel,
+    geheimnis=geheimnis_aus_umgebung(),
+)
+
+
+def regelwerk_kandidat(version: str) -> Kandidat:
+    """Kandidat für die Schattenauswertung, der mit einem Regelwerk rechnet.
+
+    Raises:
+        TypeError, ValueError: Bei unbekannter oder ungültiger Version.
     """
-    if isinstance(value, bool):
-        raise NutzlastValidierungsFehler(
-            f"{field_name} muss eine Zahl sein",
-            details={"field": field_name},
+    regelwerk = lade_regelwerk(version)
+
+    def kandidat(anfrage: BerechnungsAnfrage) -> Berechnungsergebnis:
+        return regelwerk.berechne(
+            anfrage.basis_dauer_monate,
+            anfrage.vollzeit_stunden,
+            anfrage.teilzeit_eingabe,
+            anfrage.verkuerzungs_maske,
+            anfrage.eingabetyp,
         )
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        normalized = _normalize_numeric_string(value)
-        try:
-            return float(normalized)
-        except ValueError as exc:
-            raise NutzlastValidierungsFehler(
-                f"{field_name} muss eine Zahl sein",
-                details={"field": field_name},
-            ) from exc
 
-    raise NutzlastValidierungsFehler(
-        f"{field_name} muss eine Zahl sein",
-        details={"field": field_name},
-    )
+    kandidat.__name__ = f"regelwerk:{regelwerk.version}"
+    return kandidat
+
+
+def konfiguriere_schattenauswertung(
+    kandidat: Optional[Union[str, Kandidat]],
+    anteil: float,
+) -> None:
+    """Wertet einen Anteil der Berechnungsanfragen zusätzlich im Hintergrund aus.
+
+    Args:
+        kandidat: Version eines Regelwerks, Funktion
+            ``BerechnungsAnfrage -> Berechnungsergebnis`` oder `None` (aus).
+        anteil: Stichprobenanteil zwischen 0.0 und 1.0.
+    """
+    if isinstance(kandidat, str):
+        kandidat = regelwerk_kandidat(kandidat)
+    _schattenauswertung.konfiguriere(kandidat, anteil)
+
+
+def schatten_statistik() -> SchattenStatistik:
+    """Liefert Stichproben-, Verwerfungs- und Abweichungszahlen."""
+    return _schattenauswertung.statistik()
+
+
+def schatten_abweichungen() -> List[Dict[str, Any]]:
+    """Liefert die letzten anonymisierten Abweichungsdatensätze."""
+    return _schattenauswertung.abweichungen()
+
+
+def warte_auf_schattenauswertung() -> None:
+    """Blockiert, bis alle gezogenen Stichproben ausgewertet sind."""
+    _schattenauswertung.warte_bis_leer()
+
+
+if os.getenv("SHADOW_REGELWERK"):
+    try:
+        konfiguriere_schattenauswertung(
+            os.environ["SHADOW_REGELWERK"], anteil_aus_umgebung()
+        )
+    except (TypeError, ValueError):
+        logger.warning("Schattenauswertung nicht aktiviert: ungültiges Regelwerk")
+
+
+# ---------------------------------------------------------------------------
+# Hilfsfunktionen
+# ---------------------------------------------------------------------------
+
+
+def _ergebnis_body(ergebnis: Berechnungsergebnis) -> Dict[str, Any]:
+    """Response-Body eines erfolgreichen Berechnungsergebnisses."""
+    return {"result": ergebnis.to_dict()}
+
+
+def _waehle_regelwerk(value: Any) -> Optional[Regelwerk]:
+    """Liefert das übersetzte Regelwerk zum Feld ``regelwerk`` (oder `None`).
 
+    Raises:
+        NutzlastValidierungsFehler: Bei unbekannter oder ungültiger Version.
+    """
+    if value is None:
+        return None
+    try:
+        return lade_regelwerk(value)
+    except (TypeError, ValueError) as exc:
+        raise NutzlastValidierungsFehler(
+            str(exc),
+            code="unbekanntes_regelwerk",
+            details={"field": "regelwerk", "available": verfuegbare_regelwerke()},
+        ) from None
+
+
+def pruefe_standard_regelwerk(payload: Mapping[str, Any]) -> None:
+    """Für Endpunkte, die nur mit den Standardwerten rechnen.
 
-def _coerce_int(value: Any, field_name: str) -> int:
-    """Konvertiert `value` zu `int`, nur wenn ganzzahlig.
+    Ein Feld ``regelwerk`` ist erlaubt, wenn das Regelwerk den Werten von
+    `src.calculation_logic` entspricht (z.B. ``bbig-2020``).
 
-    Akzeptiert ints sowie numerische Strings (inkl. deutscher Formatierung).
-    Bei Nicht-Ganzzahlen oder ungültigen Werten wird
-    `NutzlastValidierungsFehler` geworfen.
+    Raises:
+        NutzlastValidierungsFehler: Bei unbekanntem oder abweichendem
+            Regelwerk (``regelwerk_nicht_unterstuetzt``).
     """
-    if isinstance(value, bool):
+    regelwerk = _waehle_regelwerk(payload.get("regelwerk"))
+    if regelwerk is not None and not regelwerk.entspricht_standard:
         raise NutzlastValidierungsFehler(
-            f"{field_name} muss eine ganze Zahl sein",
-            details={"field": field_name},
+            f"Regelwerk '{regelwerk.version}' wird von diesem Endpunkt "
+            "nicht unterstützt",
+            code="regelwerk_nicht_unterstuetzt",
+            details={"field": "regelwerk"},
         )
-    if isinstance(value, int):
-        return value
-    if isinstance(value, float):
-        if value.is_integer():
-            return int(value)
+
+
+def kodiere_verkuerzungsgruende(data: Any) -> int:
+    """Validiert `verkuerzungsgruende` und kodiert sie als Bitmaske.
+
+    Ein Durchlauf über das beim Import aufgebaute Schema
+    (`VERKUERZUNGS_FELDER`, `GRUND_BITS`): Legacy-Felder werden ignoriert,
+    unbekannte Felder abgelehnt, Ja/Nein-Felder auf ihr Bit abgebildet,
+    `vorkenntnisse_monate` > 0 auf `GRUND_VORKENNTNISSE`, die Dauer zu
+    `beruf_q2` auf eine Stufe (0/6/12 Monate) und
+    `berufliche_verkuerzung_monate` als ganze Zahl in die oberen Bits. Da
+    normalisierte Gründe stets die beruflichen Felder enthalten, ist
+    `GRUND_BERUF_FELDER` immer gesetzt.
+
+    Args:
+        data: Mapping aus der Nutzlast (Zahlen auch deutsch formatiert).
+
+    Returns:
+        int: Bitmaske für `berechne_verkuerzung_aus_maske` bzw.
+        `berechne_gesamtdauer`.
+
+    Raises:
+        NutzlastValidierungsFehler: Bei fehlendem Objekt, unbekannten Feldern
+            oder falsch typisierten Werten.
+    """
+    if type(data) is not dict and not isinstance(data, Mapping):
         raise NutzlastValidierungsFehler(
-            f"{field_name} muss eine ganze Zahl sein",
-            details={"field": field_name},
+            "verkuerzungsgruende muss ein Objekt sein",
+            details={"field": "verkuerzungsgruende"},
         )
-    if isinstance(value, str):
-        normalized = _normalize_numeric_string(value)
-        try:
-            parsed = float(normalized)
-        except ValueError as exc:
-            raise NutzlastValidierungsFehler(
-                f"{field_name} muss eine ganze Zahl sein",
-                details={"field": field_name},
-            ) from exc
-        if parsed.is_integer():
-            return int(parsed)
+    unexpected_keys = data.keys() - _ZULAESSIGE_VERKUERZUNGS_FELDER
+    if unexpected_keys:
         raise NutzlastValidierungsFehler(
-            f"{field_name} muss eine ganze Zahl sein",
-            details={"field": field_name},
+            "Unbekannte Felder in verkuerzungsgruende",
+            details={
+                "field": "verkuerzungsgruende",
+                "unexpected": sorted(unexpected_keys),
+            },
         )
 
-    raise NutzlastValidierungsFehler(
-        f"{field_name} muss eine ganze Zahl sein",
-        details={"field": field_name},
+    maske = GRUND_BERUF_FELDER
+    for key, bit in GRUND_BITS:
+        value = data.get(key, False)
+        if value is True:
+            maske |= bit
+        elif value is not False:
+            raise NutzlastValidierungsFehler(
+                f"{key} muss bool sein",
+                details={"field": f"verkuerzungsgruende.{key}"},
+            )
+
+    vorkenntnisse_roh = data.get("vorkenntnisse_monate", 0)
+    beruf_q2_dauer_roh = data.get("beruf_q2_dauer_monate", 0)
+    berufliche_roh = data.get("berufliche_verkuerzung_monate", 0)
+    vorkenntnisse = coerce_float(
+        vorkenntnisse_roh, "verkuerzungsgruende.vorkenntnisse_monate"
     )
+    beruf_q2_dauer = coerce_float(
+        beruf_q2_dauer_roh, "verkuerzungsgruende.beruf_q2_dauer_monate"
+    )
+    berufliche = coerce_float(
+        berufliche_roh, "verkuerzungsgruende.berufliche_verkuerzung_monate"
+    )
+
+    # Berufserfahrung/Vorkenntnisse: Wenn > 0, wird auf festen 12-Monats-Wert abgebildet
+    if vorkenntnisse > 0:
+        maske |= GRUND_VORKENNTNISSE
+
+    beruf_q2_dauer = ganzzahl(
+        beruf_q2_dauer_roh,
+        beruf_q2_dauer,
+        "verkuerzungsgruende.beruf_q2_dauer_monate",
+    )
+    if maske & GRUND_BERUF_Q2:
+        stufe = 2 if beruf_q2_dauer >= 12 else 1 if beruf_q2_dauer >= 6 else 0
+        maske |= stufe << BERUF_Q2_STUFE_SHIFT
+
+    berufliche_verkuerzung_monate = ganzzahl(
+        berufliche_roh,
+        berufliche,
+        "verkuerzungsgruende.berufliche_verkuerzung_monate",
+    )
+    return maske | (berufliche_verkuerzung_monate << BERUF_MONATE_SHIFT)
+
+
+def dekodiere_verkuerzungsmaske(maske: int) -> Dict[str, Any]:
+    """Wandelt eine Bitmaske zurück in normalisierte `verkuerzungsgruende`.
+
+    Die Dauer zu `beruf_q2` wird als Monatswert ihrer Stufe (0/6/12)
+    zurückgegeben; das Berechnungsergebnis bleibt dadurch unverändert.
+
+    Returns:
+        dict: Normalisiertes Dictionary mit allen erwarteten Keys.
+    """
+    gruende: Dict[str, Any] = {key: bool(maske & bit) for key, bit in GRUND_BITS}
+    stufe = (maske >> BERUF_Q2_STUFE_SHIFT) & BERUF_Q2_STUFE_MASKE
+    gruende["vorkenntnisse_monate"] = 12 if maske & GRUND_VORKENNTNISSE else 0
+    gruende["beruf_q2_dauer_monate"] = BERUF_Q2_STUFEN_MONATE[min(stufe, 2)]
+    gruende["berufliche_verkuerzung_monate"] = maske >> BERUF_MONATE_SHIFT
+    return gruende
+
+
+def _normalisiere_verkuerzungsgruende(data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Normalisiert und coerce't Eingabewerte in `verkuerzungsgruende`.
+
+    Wandelt optionale Felder in konsistente Typen um (bools, ints) und
+    bildet freie Angaben wie `vorkenntnisse_monate` auf die internen
+    Repräsentationen (z.B. 12 Monate) ab. Entspricht dem Weg über die
+    Bitmaske (`kodiere_verkuerzungsgruende` / `dekodiere_verkuerzungsmaske`).
+
+    Returns:
+        dict: Normalisiertes Dictionary mit erwarteten Keys und Typen.
+    """
+    return dekodiere_verkuerzungsmaske(kodiere_verkuerzungsgruende(data))
@@ -0,0 +1,217 @@
+"""Service-Schicht für den Szenarienvergleich des Teilzeitrechners.
+
+Berater vergleichen mehrere Varianten (andere Verkürzungsgründe, Stunden oder
+AO-Dauern) nebeneinander. Statt einer Anfrage je Variante nimmt dieser Service
+alle Szenarien auf einmal entgegen, validiert sie wie ``/api/calculate``,
+berechnet jedes eindeutige Szenario (gleicher `kanonischer_schluessel`) nur
+einmal und liefert eine kompakte Vergleichstabelle relativ zu einem
+Referenzszenario.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from ..calculation_logic import Berechnungsergebnis, teilzeit_anteil
+from .calculation_service import (BerechnungsAnfrage, BerechnungsDienstAntwort,
+                                  DienstFehler, berechne_eindeutige,
+                                  fehlerantwort)
+from .validation import (BerechnungsDienstFehler, FehlendeFelderFehler,
+                         NutzlastValidierungsFehler, benoetige_dictionary,
+                         coerce_int)
+
+logger = logging.getLogger(__name__)
+
+# Obergrenze je Vergleichsanfrage (schützt den Prozess vor sehr großen Payloads)
+MAX_SZENARIEN = 100
+
+
+def _schritt3(anfrage: BerechnungsAnfrage, ergebnis: Berechnungsergebnis) -> int:
+    """Dauer nach Schritt 3 (vor § 8 Abs. 3), exakt wie in der Berechnung.
+
+    Nutzt denselben Teilzeitanteil wie die Berechnung (`teilzeit_anteil`),
+    bei Stundeneingabe also Teilzeit- durch Vollzeitstunden statt des
+    gerundeten Prozentwerts.
+    """
+    if not ergebnis.regel_8_abs_3_angewendet:
+        return ergebnis.finale_dauer_monate
+    if ergebnis.nach_schritt2_monate < ergebnis.nach_schritt1_monate:
+        return math.floor(ergebnis.nach_schritt2_monate)
+    zaehler, nenner = teilzeit_anteil(
+        anfrage.vollzeit_stunden, anfrage.teilzeit_eingabe, anfrage.eingabetyp
+    )
+    return (
+        Fraction(ergebnis.verkuerzte_dauer_monate)
+        * Fraction(nenner)
+        // Fraction(zaehler)
+    )
+
+
+# Zwischenschritte in Reihenfolge der Berechnung:
+# (Name, Wert aus Anfrage und Ergebnis)
+SCHRITTE = (
+    ("verkuerzung", lambda a, e: e.verkuerzte_dauer_monate),
+    ("schritt1", lambda a, e: e.nach_schritt1_monate),
+    ("schritt2", lambda a, e: e.nach_schritt2_monate),
+    ("schritt3", _schritt3),
+    ("regel_8_abs_3", lambda a, e: e.regel_8_abs_3_angewendet),
+)
+
+
+@dataclass(frozen=True)
+class VergleichsAnfrage:
+    """Validierte Vergleichsanfrage.
+
+    ``szenarien`` enthält je Eingabeszenario entweder die validierte
+    `BerechnungsAnfrage` oder die Ausnahme, mit der die Validierung scheiterte.
+    """
+
+    szenarien: Tuple[Any, ...]
+    referenz: int = 0
+
+    @staticmethod
+    def from_dict(payload: Mapping[str, Any]) -> "VergleichsAnfrage":
+        """Erzeuge eine `VergleichsAnfrage` aus rohem Payload.
+
+        Erwartet ``szenarien`` als Liste von Berechnungs-Payloads (wie bei
+        ``/api/calculate``) und optional den Index ``referenz`` (Standard 0).
+        Ungültige Einzelszenarien brechen die Anfrage nicht ab.
+
+        Raises:
+            FehlendeFelderFehler: Wenn ``szenarien`` fehlt.
+            NutzlastValidierungsFehler: Bei leerer/zu langer Liste oder
+                ungültigem Referenzindex.
+        """
+        payload = benoetige_dictionary(payload, "payload")
+        if "szenarien" not in payload:
+            raise FehlendeFelderFehler(["szenarien"])
+        rohe_szenarien = payload["szenarien"]
+        if not isinstance(rohe_szenarien, list) or not rohe_szenarien:
+            raise NutzlastValidierungsFehler(
+                "szenarien muss eine nicht-leere Liste sein",
+                details={"field": "szenarien"},
+            )
+        if len(rohe_szenarien) > MAX_SZENARIEN:
+            raise NutzlastValidierungsFehler(
+                f"Höchstens {MAX_SZENARIEN} Szenarien je Anfrage",
+                details={"field": "szenarien", "max": MAX_SZENARIEN},
+            )
+
+        referenz = coerce_int(payload.get("referenz", 0), "referenz")
+        if not 0 <= referenz < len(rohe_szenarien):
+            raise NutzlastValidierungsFehler(
+                "referenz muss ein gültiger Index in szenarien sein",
+                details={"field": "referenz"},
+            )
+
+        szenarien = []
+        for szenario in rohe_szenarien:
+            try:
+                szenarien.append(BerechnungsAnfrage.from_dict(
+                    benoetige_dictionary(szenario, "szenario")
+                ))
+            except BerechnungsDienstFehler as exc:
+                szenarien.append(exc)
+        return VergleichsAnfrage(szenarien=tuple(szenarien), referenz=referenz)
+
+
+def verarbeite_vergleichsanfrage(
+    payload: Mapping[str, Any],
+) -> BerechnungsDienstAntwort:
+    """Vergleicht mehrere Szenarien mit einem Referenzszenario.
+
+    Antwort (``result``):
+
+    - ``referenz``: Index des Referenzszenarios
+    - ``eindeutige_szenarien``: Anzahl tatsächlich berechneter Szenarien
+    - ``szenarien``: je Eingabeszenario eine Zeile mit ``finale_dauer_monate``,
+      ``delta_finale_dauer_monate``, ``obergrenze_angewendet``,
+      ``regel_8_abs_3_angewendet``, ``geaenderte_schritte`` (gegenüber der
+      Referenz) und ``duplikat_von`` (Index des ersten gleichwertigen
+      Szenarios oder ``None``); ungültige Szenarien enthalten stattdessen
+      ``status_code`` und ``error`` wie eine Einzelanfrage.
+
+    Ist das Referenzszenario selbst ungültig, antwortet der Service mit 422.
+
+    Args:
+        payload: Bereits geparstes JSON des Requests.
+
+    Returns:
+        BerechnungsDienstAntwort: Normalisierte Antwort mit Statuscode.
+    """
+    logger.info("Vergleichsanfrage eingegangen")
+    try:
+        anfrage = VergleichsAnfrage.from_dict(payload)
+    except BerechnungsDienstFehler as exc:
+        return fehlerantwort(exc)
+
+    ergebnisse, duplikat_von, eindeutige = berechne_eindeutige(anfrage.szenarien)
+
+    referenz = ergebnisse[anfrage.referenz]
+    if not isinstance(referenz, Berechnungsergebnis):
+        fehler = fehlerantwort(referenz).fehler
+        error = DienstFehler(
+            code="validation_error",
+            message="Referenzszenario ist ungültig",
+            details={"referenz": anfrage.referenz, "error": fehler.to_dict()},
+        )
+        return BerechnungsDienstAntwort(status_code=422, fehler=error)
+
+    zeilen = [
+        _vergleichszeile(
+            index,
+            anfrage.szenarien[index],
+            ergebnis,
+            anfrage.szenarien[anfrage.referenz],
+            referenz,
+            duplikat_von[index],
+        )
+        for index, ergebnis in enumerate(ergebnisse)
+    ]
+    return BerechnungsDienstAntwort(
+        status_code=200,
+        ergebnis={
+            "referenz": anfrage.referenz,
+            "eindeutige_szenarien": eindeutige,
+            "szenarien": zeilen,
+        },
+    )
+
+
+def _vergleichszeile(
+    index: int,
+    szenario: Any,
+    ergebnis: Any,
+    referenz_szenario: BerechnungsAnfrage,
+    referenz: Berechnungsergebnis,
+    duplikat_von: Optional[int],
+) -> Dict[str, Any]:
+    """Baut eine Zeile der Vergleichstabelle."""
+    if not isinstance(ergebnis, Berechnungsergebnis):
+        antwort = fehlerantwort(ergebnis)
+        return {
+            "index": index,
+            "status_code": antwort.status_code,
+            "error": antwort.fehler.to_dict(),
+        }
+    return {
+        "index": index,
+        "duplikat_von": duplikat_von,
+        "finale_dauer_monate": ergebnis.finale_dauer_monate,
+        "delta_finale_dauer_monate": (
+            ergebnis.finale_dauer_monate - referenz.finale_dauer_monate
+        ),
+        "obergrenze_angewendet": (
+            ergebnis.nach_schritt2_monate < ergebnis.nach_schritt1_monate
+        ),
+        "regel_8_abs_3_angewendet": ergebnis.regel_8_abs_3_angewendet,
+        "geaenderte_schritte": [
+            name
+            for name, wert in SCHRITTE
+            if wert(szenario, ergebnis) != wert(referenz_szenario, referenz)
+        ],
+    }
@@ -0,0 +1,69 @@
+"""Service-Schicht für Schritt 4 (Verlängerung bis zur nächsten Prüfung).
+
+Berechnet eine Anfrage wie ``/api/calculate`` und verlängert das Ergebnis
+anschließend anhand des Prüfungskalenders der angegebenen Kammer (siehe
+`src.exam_calendar`). Der Kalender wird erst bei der ersten solchen Anfrage
+geladen.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Mapping
+
+from ..exam_calendar import verlaengere_bis_pruefung
+from .calculation_service import (BerechnungsAnfrage, BerechnungsDienstAntwort,
+                                  berechne_anfrage, fehlerantwort)
+from .validation import (BerechnungsDienstFehler, FehlendeFelderFehler,
+                         benoetige_dictionary, coerce_datum)
+
+logger = logging.getLogger(__name__)
+
+PFLICHTFELDER_SCHRITT4 = ("ausbildungsbeginn", "kammer")
+
+
+def verarbeite_pruefungsanfrage(
+    payload: Mapping[str, Any],
+) -> BerechnungsDienstAntwort:
+    """Berechnet die Dauer inklusive Schritt 4.
+
+    Der Payload entspricht ``/api/calculate`` und enthält zusätzlich
+    ``ausbildungsbeginn`` (ISO-Datum) und ``kammer`` (Kennung des
+    Prüfungskalenders).
+
+    Antwort (``result``): alle Felder von ``/api/calculate`` sowie
+    ``schritt4`` mit ``regulaeres_ende``, ``pruefungstermin``,
+    ``ende_nach_schritt4``, ``verlaengerung_monate`` und
+    ``dauer_nach_schritt4_monate``.
+
+    Args:
+        payload: Bereits geparstes JSON des Requests.
+
+    Returns:
+        BerechnungsDienstAntwort: Normalisierte Antwort mit Statuscode; 422 bei
+        unbekannter Kammer oder fehlendem Folgetermin im Kalender.
+    """
+    logger.info("Anfrage mit Schritt 4 eingegangen")
+    try:
+        payload = benoetige_dictionary(payload, "payload")
+        missing = [
+            field for field in PFLICHTFELDER_SCHRITT4 if field not in payload
+        ]
+        if missing:
+            raise FehlendeFelderFehler(missing)
+        ausbildungsbeginn = coerce_datum(
+            payload["ausbildungsbeginn"], "ausbildungsbeginn"
+        )
+        anfrage = BerechnungsAnfrage.from_dict(payload)
+        ergebnis = berechne_anfrage(anfrage)
+        schritt4 = verlaengere_bis_pruefung(
+            ausbildungsbeginn,
+            ergebnis.finale_dauer_monate,
+            payload["kammer"],
+        )
+    except (BerechnungsDienstFehler, TypeError, ValueError) as exc:
+        return fehlerantwort(exc)
+
+    antwort = ergebnis.to_dict()
+    antwort["schritt4"] = schritt4.to_dict()
+    return BerechnungsDienstAntwort(status_code=200, ergebnis=antwort)
@@ -0,0 +1,104 @@
+"""Service-Schicht für die Umkehrrechnung (minimale Teilzeit).
+
+Beantwortet die Frage nach der geringsten Teilzeit, mit der eine gewünschte
+Gesamtdauer nicht überschritten wird, über `berechne_mindest_teilzeit`
+(geschlossene Schranke statt wiederholter Einzelberechnungen).
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from ..inverse_calculation import berechne_mindest_teilzeit
+from .calculation_service import (BerechnungsDienstAntwort, fehlerantwort,
+                                  kodiere_verkuerzungsgruende,
+                                  pruefe_standard_regelwerk)
+from .validation import (BerechnungsDienstFehler, FehlendeFelderFehler,
+                         benoetige_dictionary, coerce_float, coerce_int)
+
+logger = logging.getLogger(__name__)
+
+PFLICHTFELDER_MINDEST_TEILZEIT = (
+    "basis_dauer_monate",
+    "vollzeit_stunden",
+    "ziel_dauer_monate",
+)
+
+
+@dataclass(frozen=True)
+class MindestTeilzeitAnfrage:
+    """Validierte Anfrage für die Umkehrrechnung."""
+
+    basis_dauer_monate: int
+    vollzeit_stunden: float
+    ziel_dauer_monate: int
+    verkuerzungs_maske: int = 0
+
+    @staticmethod
+    def from_dict(payload: Mapping[str, Any]) -> "MindestTeilzeitAnfrage":
+        """Erzeuge eine `MindestTeilzeitAnfrage` aus rohem Payload.
+
+        ``verkuerzungsgruende`` ist optional und wird wie bei
+        ``/api/calculate`` validiert und als Bitmaske kodiert. ``regelwerk``
+        ist nur mit den Standardwerten erlaubt (`pruefe_standard_regelwerk`).
+
+        Raises:
+            FehlendeFelderFehler: Wenn Pflichtfelder fehlen.
+            NutzlastValidierungsFehler: Bei ungültigen Werten.
+        """
+        payload = benoetige_dictionary(payload, "payload")
+        missing = [
+            field for field in PFLICHTFELDER_MINDEST_TEILZEIT
+            if field not in payload
+        ]
+        if missing:
+            raise FehlendeFelderFehler(missing)
+        pruefe_standard_regelwerk(payload)
+
+        verkuerzungs_maske = 0
+        if "verkuerzungsgruende" in payload:
+            verkuerzungs_maske = kodiere_verkuerzungsgruende(
+                payload["verkuerzungsgruende"]
+            )
+
+        return MindestTeilzeitAnfrage(
+            basis_dauer_monate=coerce_int(
+                payload["basis_dauer_monate"], "basis_dauer_monate"
+            ),
+            vollzeit_stunden=coerce_float(
+                payload["vollzeit_stunden"], "vollzeit_stunden"
+            ),
+            ziel_dauer_monate=coerce_int(
+                payload["ziel_dauer_monate"], "ziel_dauer_monate"
+            ),
+            verkuerzungs_maske=verkuerzungs_maske,
+        )
+
+
+def verarbeite_mindest_teilzeit_anfrage(
+    payload: Mapping[str, Any],
+) -> BerechnungsDienstAntwort:
+    """Berechnet die minimale Teilzeit für eine Zieldauer.
+
+    Args:
+        payload: Bereits geparstes JSON des Requests.
+
+    Returns:
+        BerechnungsDienstAntwort: ``result`` mit minimalem ``teilzeit_prozent``
+        und ``teilzeit_stunden`` samt resultierender Dauer; 422, wenn die
+        Zieldauer selbst in Vollzeit nicht erreichbar ist.
+    """
+    logger.info("Umkehrrechnung angefragt")
+    try:
+        anfrage = MindestTeilzeitAnfrage.from_dict(payload)
+        ergebnis = berechne_mindest_teilzeit(
+            anfrage.basis_dauer_monate,
+            anfrage.vollzeit_stunden,
+            anfrage.ziel_dauer_monate,
+            anfrage.verkuerzungs_maske,
+        )
+    except (BerechnungsDienstFehler, TypeError, ValueError) as exc:
+        return fehlerantwort(exc)
+    return BerechnungsDienstAntwort(status_code=200, ergebnis=ergebnis)
@@ -0,0 +1,104 @@
+"""JSON-Kodierung der API-Antworten.
+
+Kodiert Response-Bodies direkt zu Bytes, mit ``orjson``, falls installiert,
+sonst mit einem vorkonfigurierten Encoder der Standardbibliothek. Beide
+Varianten liefern kompaktes JSON mit sortierten Keys.
+
+Ergebnisse aus dem Ergebniscache sind bei Wiederholungen dasselbe Objekt; ihre
+kodierten Bytes werden deshalb nach Objektidentität zwischengespeichert
+(`KodierungsCache`), sodass ein Cache-Treffer nicht erneut serialisiert wird.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Tuple
+
+try:  # optional: deutlich schnellerer Encoder
+    import orjson
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    orjson = None
+
+# Standardgröße des Caches kodierter Ergebnisse (wie der Ergebniscache)
+STANDARD_KODIERUNGS_CACHE_GROESSE = 1024
+
+_stdlib_encoder = json.JSONEncoder(
+    ensure_ascii=False,
+    separators=(",", ":"),
+    sort_keys=True,
+)
+
+
+def encoder_name() -> str:
+    """Name des verwendeten Encoders (``orjson`` oder ``json``)."""
+    return "json" if orjson is None else "orjson"
+
+
+def kodiere_json(wert: Any) -> bytes:
+    """Kodiert einen JSON-fähigen Wert als UTF-8-Bytes (kompakt, sortiert).
+
+    Werte, die ``orjson`` ablehnt (z.B. Ganzzahlen über 64 Bit), kodiert der
+    Encoder der Standardbibliothek.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(wert, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass
+    return _stdlib_encoder.encode(wert).encode("utf-8")
+
+
+class KodierungsCache:
+    """LRU-Cache kodierter Bytes nach Objektidentität.
+
+    Hält neben den Bytes eine Referenz auf das Objekt selbst, damit dessen
+    ``id()`` nicht für ein anderes Objekt wiederverwendet werden kann,
+    solange der Eintrag besteht. Die Objekte müssen unveränderlich sein.
+    """
+
+    def __init__(
+        self, max_eintraege: int = STANDARD_KODIERUNGS_CACHE_GROESSE
+    ) -> None:
+        if max_eintraege < 0:
+            raise ValueError("max_eintraege darf nicht negativ sein")
+        self._max_eintraege = max_eintraege
+        self._eintraege: "OrderedDict[int, Tuple[Any, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def kodiere(self, objekt: Any, erzeuge: Callable[[Any], Any]) -> bytes:
+        """Liefert die Bytes von ``erzeuge(objekt)``, kodiert nur beim ersten Mal."""
+        schluessel = id(objekt)
+        with self._lock:
+            eintrag = self._eintraege.get(schluessel)
+            if eintrag is not None and eintrag[0] is objekt:
+                self._eintraege.move_to_end(schluessel)
+                return eintrag[1]
+        daten = kodiere_json(erzeuge(objekt))
+        if self._max_eintraege:
+            with self._lock:
+                self._eintraege[schluessel] = (objekt, daten)
+                self._eintraege.move_to_end(schluessel)
+                if len(self._eintraege) > self._max_eintraege:
+                    self._eintraege.popitem(last=False)
+        return daten
+
+    def leere(self) -> None:
+        """Entfernt alle Einträge."""
+        with self._lock:
+            self._eintraege.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._eintraege)
+
+
+def konstante_fehlerantwort(
+    code: str, message: str, **details: Any
+) -> bytes:
+    """Kodiert einen festen Fehler-Body ``{"error": ...}`` einmalig vorab."""
+    fehler: Dict[str, Any] = {"code": code, "message": message}
+    if details:
+        fehler["details"] = details
+    return kodiere_json({"error": fehler})
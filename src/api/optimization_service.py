@@ -0,0 +1,69 @@
+"""Service-Schicht für den Optimierer der Verkürzungsgründe.
+
+Ermittelt für eine Berechnungsanfrage die kleinste Auswahl der angegebenen
+Verkürzungsgründe, mit der die kürzeste erreichbare Dauer (oder eine
+gewünschte Zieldauer) erreicht wird (siehe `optimiere_verkuerzungsgruende`).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Mapping
+
+from ..reason_optimizer import optimiere_verkuerzungsgruende
+from .calculation_service import (BerechnungsAnfrage, BerechnungsDienstAntwort,
+                                  dekodiere_verkuerzungsmaske, fehlerantwort)
+from .validation import (BerechnungsDienstFehler, benoetige_dictionary,
+                         coerce_int)
+
+logger = logging.getLogger(__name__)
+
+
+def verarbeite_optimierungsanfrage(
+    payload: Mapping[str, Any],
+) -> BerechnungsDienstAntwort:
+    """Liefert die kleinste ausreichende Auswahl an Verkürzungsgründen.
+
+    Der Payload entspricht ``/api/calculate``; ``verkuerzungsgruende`` enthält
+    alle erfüllten Gründe. Optional begrenzt ``ziel_dauer_monate`` die
+    gewünschte Dauer; mit ``regelwerk`` gelten dessen Monatswerte und
+    Berechnung.
+
+    Antwort (``result``): ``gruende`` (Namen der gewählten Gründe),
+    ``anzahl_gruende``, ``verkuerzungsgruende`` (als Payload für
+    ``/api/calculate``), ``finale_dauer_monate``, ``beste_dauer_monate``,
+    ``gepruefte_kombinationen`` und das vollständige ``ergebnis``.
+
+    Args:
+        payload: Bereits geparstes JSON des Requests.
+
+    Returns:
+        BerechnungsDienstAntwort: Normalisierte Antwort mit Statuscode; 422,
+        wenn die Zieldauer mit den Gründen nicht erreichbar ist.
+    """
+    logger.info("Optimierungsanfrage eingegangen")
+    try:
+        payload = benoetige_dictionary(payload, "payload")
+        anfrage = BerechnungsAnfrage.from_dict(payload)
+        ziel_dauer_monate = None
+        if payload.get("ziel_dauer_monate") is not None:
+            ziel_dauer_monate = coerce_int(
+                payload["ziel_dauer_monate"], "ziel_dauer_monate"
+            )
+        optimum = optimiere_verkuerzungsgruende(
+            anfrage.basis_dauer_monate,
+            anfrage.vollzeit_stunden,
+            anfrage.teilzeit_eingabe,
+            anfrage.verkuerzungs_maske,
+            anfrage.eingabetyp,
+            ziel_dauer_monate,
+            anfrage.regelwerk,
+        )
+    except (BerechnungsDienstFehler, TypeError, ValueError) as exc:
+        return fehlerantwort(exc)
+
+    ergebnis = optimum.to_dict()
+    ergebnis["verkuerzungsgruende"] = dekodiere_verkuerzungsmaske(
+        optimum.verkuerzungs_maske
+    )
+    return BerechnungsDienstAntwort(status_code=200, ergebnis=ergebnis)
@@ -0,0 +1,301 @@
+"""Service-Schicht für Verträge mit mehreren Teilzeitphasen.
+
+Nimmt einen Phasenplan (wechselnde Teilzeit-Anteile, Unterbrechungen wie
+Elternzeit) entgegen und berechnet die Gesamtdauer über
+`berechne_phasen_dauer`. Mit ``vertraege`` werden viele Verträge in einer
+Anfrage berechnet; gleiche Phasenpläne werden dabei nur einmal gerechnet.
+`verarbeite_phasenplananfrage` schlägt umgekehrt einen Plan für eine
+Zieldauer vor (siehe `optimiere_phasenplan`).
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Optional, Tuple
+
+from ..calculation_logic import (MAX_VOLLZEIT_STUNDEN, MIN_VOLLZEIT_STUNDEN,
+                                 berechne_teilzeit_prozent)
+from ..phase_calculation import (Teilzeitphase, berechne_phasen_dauer,
+                                 berechne_phasen_stapel)
+from ..phase_optimizer import (STANDARD_SCHRITTWEITE_PROZENT,
+                               optimiere_phasenplan)
+from .calculation_service import (BerechnungsDienstAntwort, fehlerantwort,
+                                  kodiere_verkuerzungsgruende,
+                                  pruefe_standard_regelwerk)
+from .validation import (BerechnungsDienstFehler, FehlendeFelderFehler,
+                         NutzlastValidierungsFehler, benoetige_dictionary,
+                         coerce_float, coerce_int)
+
+logger = logging.getLogger(__name__)
+
+# Obergrenzen je Anfrage (schützen den Prozess vor sehr großen Payloads)
+MAX_PHASEN = 24
+MAX_VERTRAEGE = 1000
+
+
+@dataclass(frozen=True)
+class PhasenAnfrage:
+    """Validierte Anfrage für einen Vertrag mit Teilzeitphasen."""
+
+    basis_dauer_monate: int
+    phasen: Tuple[Teilzeitphase, ...]
+    verkuerzungs_maske: int = 0
+
+    @staticmethod
+    def from_dict(payload: Mapping[str, Any]) -> "PhasenAnfrage":
+        """Erzeuge eine `PhasenAnfrage` aus rohem Payload.
+
+        Erwartet ``basis_dauer_monate`` und ``phasen`` als Liste von Objekten
+        mit ``monate`` (entfällt bei der letzten Phase) und entweder
+        ``teilzeit_prozent``, ``teilzeit_stunden`` (erfordert
+        ``vollzeit_stunden``) oder ``unterbrechung: true``.
+        ``verkuerzungsgruende`` ist optional; ``regelwerk`` ist nur mit den
+        Standardwerten erlaubt (`pruefe_standard_regelwerk`).
+
+        Raises:
+            FehlendeFelderFehler: Wenn Pflichtfelder fehlen.
+            NutzlastValidierungsFehler: Bei ungültigen Werten.
+        """
+        payload = benoetige_dictionary(payload, "payload")
+        missing = [
+            field for field in ("basis_dauer_monate", "phasen")
+            if field not in payload
+        ]
+        if missing:
+            raise FehlendeFelderFehler(missing)
+        pruefe_standard_regelwerk(payload)
+
+        rohe_phasen = payload["phasen"]
+        if not isinstance(rohe_phasen, list) or not rohe_phasen:
+            raise NutzlastValidierungsFehler(
+                "phasen muss eine nicht-leere Liste sein",
+                details={"field": "phasen"},
+            )
+        if len(rohe_phasen) > MAX_PHASEN:
+            raise NutzlastValidierungsFehler(
+                f"Höchstens {MAX_PHASEN} Phasen je Vertrag",
+                details={"field": "phasen", "max": MAX_PHASEN},
+            )
+
+        vollzeit_stunden = None
+        if payload.get("vollzeit_stunden") is not None:
+            vollzeit_stunden = coerce_float(
+                payload["vollzeit_stunden"], "vollzeit_stunden"
+            )
+            if not MIN_VOLLZEIT_STUNDEN <= vollzeit_stunden <= MAX_VOLLZEIT_STUNDEN:
+                raise NutzlastValidierungsFehler(
+                    "Vollzeit-Stunden müssen zwischen 10 und 48 Stunden liegen",
+                    details={"field": "vollzeit_stunden"},
+                )
+
+        verkuerzungs_maske = 0
+        if "verkuerzungsgruende" in payload:
+            verkuerzungs_maske = kodiere_verkuerzungsgruende(
+                payload["verkuerzungsgruende"]
+            )
+
+        return PhasenAnfrage(
+            basis_dauer_monate=coerce_int(
+                payload["basis_dauer_monate"], "basis_dauer_monate"
+            ),
+            phasen=tuple(
+                _parse_phase(phase, f"phasen[{index}]", vollzeit_stunden)
+                for index, phase in enumerate(rohe_phasen)
+            ),
+            verkuerzungs_maske=verkuerzungs_maske,
+        )
+
+
+def verarbeite_phasenanfrage(
+    payload: Mapping[str, Any],
+) -> BerechnungsDienstAntwort:
+    """Berechnet einen oder viele Verträge mit Teilzeitphasen.
+
+    Ein einzelner Vertrag wird wie in `PhasenAnfrage.from_dict` beschrieben
+    übergeben. Enthält der Payload stattdessen ``vertraege`` (Liste von
+    Vertrags-Payloads), lautet die Antwort ``{"vertraege": [...]}`` mit je
+    Vertrag ``index`` und ``result`` bzw. ``status_code`` und ``error``;
+    ungültige Verträge brechen den Stapel nicht ab.
+
+    Args:
+        payload: Bereits geparstes JSON des Requests.
+
+    Returns:
+        BerechnungsDienstAntwort: Normalisierte Antwort mit Statuscode.
+    """
+    logger.info("Phasenanfrage eingegangen")
+    try:
+        payload = benoetige_dictionary(payload, "payload")
+        if "vertraege" in payload:
+            pruefe_standard_regelwerk(payload)
+            return _verarbeite_stapel(payload["vertraege"])
+        anfrage = PhasenAnfrage.from_dict(payload)
+        ergebnis = berechne_phasen_dauer(
+            anfrage.basis_dauer_monate,
+            anfrage.phasen,
+            anfrage.verkuerzungs_maske,
+        )
+    except (BerechnungsDienstFehler, TypeError, ValueError) as exc:
+        return fehlerantwort(exc)
+    return BerechnungsDienstAntwort(status_code=200, ergebnis=ergebnis)
+
+
+def verarbeite_phasenplananfrage(
+    payload: Mapping[str, Any],
+) -> BerechnungsDienstAntwort:
+    """Schlägt einen Phasenplan mit möglichst wenigen Wechseln vor.
+
+    Erwartet ``basis_dauer_monate`` und ``ziel_dauer_monate``; optional
+    ``verkuerzungsgruende``, ``verfuegbarkeit`` (Liste mit ``monate`` und
+    ``max_prozent`` oder ``unterbrechung: true``) und
+    ``schrittweite_prozent`` (Standard 5).
+
+    Antwort (``result``): ``phasen`` (im Format von
+    ``/api/calculate/phases``), ``wechsel``, ``finale_dauer_monate`` und das
+    nachgerechnete ``ergebnis``; 422, wenn die Zieldauer nicht erreichbar ist.
+
+    Args:
+        payload: Bereits geparstes JSON des Requests.
+
+    Returns:
+        BerechnungsDienstAntwort: Normalisierte Antwort mit Statuscode.
+    """
+    logger.info("Phasenplananfrage eingegangen")
+    try:
+        payload = benoetige_dictionary(payload, "payload")
+        missing = [
+            field for field in ("basis_dauer_monate", "ziel_dauer_monate")
+            if field not in payload
+        ]
+        if missing:
+            raise FehlendeFelderFehler(missing)
+        pruefe_standard_regelwerk(payload)
+        verkuerzungs_maske = 0
+        if "verkuerzungsgruende" in payload:
+            verkuerzungs_maske = kodiere_verkuerzungsgruende(
+                payload["verkuerzungsgruende"]
+            )
+        verfuegbarkeit = payload.get("verfuegbarkeit") or []
+        if not isinstance(verfuegbarkeit, list) or len(verfuegbarkeit) > MAX_PHASEN:
+            raise NutzlastValidierungsFehler(
+                f"verfuegbarkeit muss eine Liste mit höchstens {MAX_PHASEN} "
+                f"Abschnitten sein",
+                details={"field": "verfuegbarkeit", "max": MAX_PHASEN},
+            )
+        plan = optimiere_phasenplan(
+            coerce_int(payload["basis_dauer_monate"], "basis_dauer_monate"),
+            coerce_int(payload["ziel_dauer_monate"], "ziel_dauer_monate"),
+            verkuerzungs_maske,
+            [
+                _parse_abschnitt(abschnitt, f"verfuegbarkeit[{index}]")
+                for index, abschnitt in enumerate(verfuegbarkeit)
+            ],
+            coerce_int(
+                payload.get("schrittweite_prozent", STANDARD_SCHRITTWEITE_PROZENT),
+                "schrittweite_prozent",
+            ),
+        )
+    except (BerechnungsDienstFehler, TypeError, ValueError) as exc:
+        return fehlerantwort(exc)
+    return BerechnungsDienstAntwort(status_code=200, ergebnis=plan)
+
+
+def _verarbeite_stapel(rohe_vertraege: Any) -> BerechnungsDienstAntwort:
+    """Berechnet eine Liste von Vertrags-Payloads."""
+    if not isinstance(rohe_vertraege, list) or not rohe_vertraege:
+        raise NutzlastValidierungsFehler(
+            "vertraege muss eine nicht-leere Liste sein",
+            details={"field": "vertraege"},
+        )
+    if len(rohe_vertraege) > MAX_VERTRAEGE:
+        raise NutzlastValidierungsFehler(
+            f"Höchstens {MAX_VERTRAEGE} Verträge je Anfrage",
+            details={"field": "vertraege", "max": MAX_VERTRAEGE},
+        )
+
+    anfragen: List[Any] = []
+    for vertrag in rohe_vertraege:
+        try:
+            anfragen.append(PhasenAnfrage.from_dict(vertrag))
+        except BerechnungsDienstFehler as exc:
+            anfragen.append(exc)
+
+    gueltige = [a for a in anfragen if isinstance(a, PhasenAnfrage)]
+    ergebnisse = iter(berechne_phasen_stapel(
+        (a.basis_dauer_monate, a.phasen, a.verkuerzungs_maske) for a in gueltige
+    ))
+    zeilen = []
+    for index, anfrage in enumerate(anfragen):
+        ergebnis = (
+            next(ergebnisse) if isinstance(anfrage, PhasenAnfrage) else anfrage
+        )
+        if isinstance(ergebnis, Exception):
+            antwort = fehlerantwort(ergebnis)
+            zeilen.append({
+                "index": index,
+                "status_code": antwort.status_code,
+                "error": antwort.fehler.to_dict(),
+            })
+        else:
+            zeilen.append({"index": index, "result": ergebnis.to_dict()})
+    return BerechnungsDienstAntwort(
+        status_code=200, ergebnis={"vertraege": zeilen}
+    )
+
+
+def _parse_phase(
+    value: Any,
+    field_name: str,
+    vollzeit_stunden: Optional[float],
+) -> Teilzeitphase:
+    """Wandelt ein Phasen-Objekt in eine `Teilzeitphase` um."""
+    phase = benoetige_dictionary(value, field_name)
+    monate = None
+    if phase.get("monate") is not None:
+        monate = coerce_int(phase["monate"], f"{field_name}.monate")
+
+    angaben = [
+        key for key in ("teilzeit_prozent", "teilzeit_stunden", "unterbrechung")
+        if phase.get(key) not in (None, False)
+    ]
+    if len(angaben) != 1:
+        raise NutzlastValidierungsFehler(
+            "Jede Phase benötigt genau eines von teilzeit_prozent, "
+            "teilzeit_stunden oder unterbrechung",
+            details={"field": field_name},
+        )
+    angabe = angaben[0]
+    if angabe == "unterbrechung":
+        if phase["unterbrechung"] is not True:
+            raise NutzlastValidierungsFehler(
+                f"{field_name}.unterbrechung muss true oder false sein",
+                details={"field": f"{field_name}.unterbrechung"},
+            )
+        return Teilzeitphase(monate, 0)
+    wert = coerce_float(phase[angabe], f"{field_name}.{angabe}")
+    if angabe == "teilzeit_prozent":
+        return Teilzeitphase(monate, wert)
+    if vollzeit_stunden is None:
+        raise FehlendeFelderFehler(["vollzeit_stunden"])
+    if wert <= 0:
+        raise NutzlastValidierungsFehler(
+            f"{field_name}.teilzeit_stunden muss positiv sein",
+            details={"field": f"{field_name}.teilzeit_stunden"},
+        )
+    return Teilzeitphase(monate, berechne_teilzeit_prozent(vollzeit_stunden, wert))
+
+
+def _parse_abschnitt(value: Any, field_name: str) -> Tuple[int, float]:
+    """Wandelt einen Abschnitt der Verfügbarkeit in ``(monate, max_prozent)``."""
+    abschnitt = benoetige_dictionary(value, field_name)
+    if "monate" not in abschnitt:
+        raise FehlendeFelderFehler([f"{field_name}.monate"])
+    monate = coerce_int(abschnitt["monate"], f"{field_name}.monate")
+    if abschnitt.get("unterbrechung") is True:
+        return monate, 0
+    if abschnitt.get("max_prozent") is None:
+        raise FehlendeFelderFehler([f"{field_name}.max_prozent"])
+    return monate, coerce_float(
+        abschnitt["max_prozent"], f"{field_name}.max_prozent"
+    )
@@ -0,0 +1,109 @@
+"""Bündelung gleichzeitiger gleichwertiger Berechnungen (Single-Flight).
+
+Unter einem Gunicorn-Worker mit Threads treffen bei Lastspitzen (z.B. nach
+dem Teilen eines Kampagnenlinks) viele identische Anfragen gleichzeitig ein.
+Solange die erste Berechnung eines Schlüssels noch läuft, findet der
+Ergebniscache nichts, und jede Anfrage würde erneut rechnen. `Buendelung`
+lässt nur den ersten Aufruf je Schlüssel rechnen; alle gleichzeitigen
+weiteren Aufrufe warten auf ihn und erhalten dasselbe Ergebnis bzw. dieselbe
+Ausnahme.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+@dataclass(frozen=True)
+class BuendelungsStatistik:
+    """Momentaufnahme der Bündelungs-Kennzahlen."""
+
+    berechnungen: int
+    gebuendelt: int
+    fehler: int
+    laufend: int
+
+
+class _Flug:
+    """Eine laufende Berechnung mit ihrem Ergebnis bzw. ihrer Ausnahme."""
+
+    __slots__ = ("fertig", "ergebnis", "fehler")
+
+    def __init__(self) -> None:
+        self.fertig = threading.Event()
+        self.ergebnis: Any = None
+        self.fehler: Optional[BaseException] = None
+
+
+class Buendelung:
+    """Thread-sichere Single-Flight-Bündelung nach Schlüssel.
+
+    ``berechnungen`` zählt tatsächlich ausgeführte Berechnungen,
+    ``gebuendelt`` Aufrufe, die auf eine laufende Berechnung gewartet haben,
+    ``fehler`` Berechnungen, die mit einer Ausnahme endeten.
+    """
+
+    def __init__(self) -> None:
+        self._fluege: Dict[Hashable, _Flug] = {}
+        self._lock = threading.Lock()
+        self._berechnungen = 0
+        self._gebuendelt = 0
+        self._fehler = 0
+
+    def fuehre_aus(self, schluessel: Hashable, berechne: Callable[[], Any]) -> Any:
+        """Führt ``berechne()`` aus oder wartet auf die laufende Berechnung.
+
+        Raises:
+            Exception: Die Ausnahme der Berechnung, bei wartenden Aufrufen
+                als Kopie (jeder Aufrufer erhält seinen eigenen Traceback).
+        """
+        with self._lock:
+            flug = self._fluege.get(schluessel)
+            if flug is None:
+                flug = self._fluege[schluessel] = _Flug()
+                self._berechnungen += 1
+                fuehrend = True
+            else:
+                self._gebuendelt += 1
+                fuehrend = False
+
+        if not fuehrend:
+            flug.fertig.wait()
+            if flug.fehler is not None:
+                raise _kopie(flug.fehler)
+            return flug.ergebnis
+
+        try:
+            flug.ergebnis = berechne()
+        except BaseException as exc:
+            flug.fehler = exc
+            with self._lock:
+                self._fehler += 1
+            raise
+        finally:
+            with self._lock:
+                del self._fluege[schluessel]
+            flug.fertig.set()
+        return flug.ergebnis
+
+    def statistik(self) -> BuendelungsStatistik:
+        """Liefert die aktuellen Kennzahlen."""
+        with self._lock:
+            return BuendelungsStatistik(
+                berechnungen=self._berechnungen,
+                gebuendelt=self._gebuendelt,
+                fehler=self._fehler,
+                laufend=len(self._fluege),
+            )
+
+
+def _kopie(fehler: BaseException) -> BaseException:
+    """Flache Kopie einer Ausnahme (das Original, falls nicht kopierbar)."""
+    try:
+        kopie = copy.copy(fehler)
+    except Exception:
+        return fehler
+    return kopie.with_traceback(None) if type(kopie) is type(fehler) else fehler
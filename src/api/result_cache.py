@@ -0,0 +1,118 @@
+"""In-Process-Ergebniscache für die Berechnungs-API.
+
+Der Cache speichert erfolgreiche Berechnungsergebnisse unter einem
+kanonischen Schlüssel (siehe `kanonischer_schluessel` in
+`calculation_service`). Er ist größenbeschränkt, verdrängt den am längsten
+nicht genutzten Eintrag (LRU) und führt Treffer-, Fehlschlag- und
+Verdrängungsstatistiken.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+# Standardgröße, überschreibbar über die Umgebungsvariable ``RESULT_CACHE_SIZE``
+STANDARD_CACHE_GROESSE = 1024
+
+
+@dataclass(frozen=True)
+class CacheStatistik:
+    """Momentaufnahme der Cache-Kennzahlen."""
+
+    treffer: int
+    fehlschlaege: int
+    verdraengungen: int
+    eintraege: int
+    max_eintraege: int
+
+    @property
+    def trefferquote(self) -> float:
+        """Anteil der Treffer an allen Zugriffen (0.0, wenn noch kein Zugriff)."""
+        zugriffe = self.treffer + self.fehlschlaege
+        return self.treffer / zugriffe if zugriffe else 0.0
+
+
+class ErgebnisCache:
+    """Thread-sicherer LRU-Cache mit fester Maximalgröße.
+
+    Eine Maximalgröße von 0 deaktiviert den Cache: Es wird nichts gespeichert
+    und jeder Zugriff zählt als Fehlschlag.
+    """
+
+    def __init__(self, max_eintraege: int = STANDARD_CACHE_GROESSE) -> None:
+        if max_eintraege < 0:
+            raise ValueError("max_eintraege darf nicht negativ sein")
+        self._max_eintraege = max_eintraege
+        self._eintraege: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._treffer = 0
+        self._fehlschlaege = 0
+        self._verdraengungen = 0
+
+    def hole(self, schluessel: Hashable) -> Optional[Any]:
+        """Liefert den gespeicherten Wert oder `None` (aktualisiert die LRU-Ordnung)."""
+        with self._lock:
+            try:
+                wert = self._eintraege[schluessel]
+            except KeyError:
+                self._fehlschlaege += 1
+                return None
+            self._eintraege.move_to_end(schluessel)
+            self._treffer += 1
+            return wert
+
+    def speichere(self, schluessel: Hashable, wert: Any) -> None:
+        """Legt `wert` ab und verdrängt bei Bedarf den ältesten Eintrag."""
+        if self._max_eintraege == 0:
+            return
+        with self._lock:
+            self._eintraege[schluessel] = wert
+            self._eintraege.move_to_end(schluessel)
+            while len(self._eintraege) > self._max_eintraege:
+                self._eintraege.popitem(last=False)
+                self._verdraengungen += 1
+
+    def konfiguriere(self, max_eintraege: int) -> None:
+        """Ändert die Maximalgröße; überzählige Einträge werden verdrängt."""
+        if max_eintraege < 0:
+            raise ValueError("max_eintraege darf nicht negativ sein")
+        with self._lock:
+            self._max_eintraege = max_eintraege
+            while len(self._eintraege) > max_eintraege:
+                self._eintraege.popitem(last=False)
+                self._verdraengungen += 1
+
+    def leere(self) -> None:
+        """Entfernt alle Einträge und setzt die Statistik zurück."""
+        with self._lock:
+            self._eintraege.clear()
+            self._treffer = 0
+            self._fehlschlaege = 0
+            self._verdraengungen = 0
+
+    def statistik(self) -> CacheStatistik:
+        """Liefert die aktuellen Kennzahlen des Caches."""
+        with self._lock:
+            return CacheStatistik(
+                treffer=self._treffer,
+                fehlschlaege=self._fehlschlaege,
+                verdraengungen=self._verdraengungen,
+                eintraege=len(self._eintraege),
+                max_eintraege=self._max_eintraege,
+            )
+
+
+def cache_groesse_aus_umgebung(default: int = STANDARD_CACHE_GROESSE) -> int:
+    """Liest die Cache-Größe aus ``RESULT_CACHE_SIZE`` (ungültige Werte → Default)."""
+    wert = os.getenv("RESULT_CACHE_SIZE")
+    if not wert:
+        return default
+    try:
+        groesse = int(wert)
+    except ValueError:
+        return default
+    return groesse if groesse >= 0 else default
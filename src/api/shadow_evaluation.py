@@ -0,0 +1,316 @@
+"""Schattenauswertung eines Kandidaten (Regelwerk oder Kernel) auf Live-Anfragen.
+
+Ein konfigurierbarer Anteil der erfolgreichen Berechnungsanfragen wird
+zusätzlich mit einem Kandidaten berechnet, z.B. einem neuen Regelwerk (siehe
+`src.rule_sets`) oder einer neuen Berechnungsfunktion. Die Kandidaten laufen
+in einem Hintergrund-Thread, nicht im Request-Pfad: Die Anfrage legt die
+Stichprobe nur in eine größenbeschränkte Warteschlange. Ist sie voll, wird
+die Stichprobe verworfen statt zu blockieren.
+
+Abweichungen werden gezählt und als anonymisierte Datensätze (Pseudonym der
+Anfrage statt Eingabewerten, abweichende Ergebnisfelder) in einem
+Ringpuffer gehalten. Das Pseudonym ist ein HMAC-SHA256 mit geheimem
+Schlüssel (``SHADOW_PSEUDONYM_KEY`` für die ganze Installation, sonst zufällig
+je Prozess); Ergebnisfelder, die nur Eingaben wiedergeben, werden nicht
+verglichen.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import logging
+import os
+import queue
+import random
+import secrets
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Standardwerte, überschreibbar über ``SHADOW_QUEUE_SIZE`` bzw. Konfiguration
+STANDARD_WARTESCHLANGE = 256
+STANDARD_MAX_ABWEICHUNGEN = 100
+
+# Ergebnisfelder, die nur Eingaben wiedergeben (nicht verglichen/gespeichert)
+EINGABE_FELDER: FrozenSet[str] = frozenset({
+    "original_dauer_monate",
+    "teilzeit_prozent",
+    "teilzeit_stunden",
+    "wochenstunden",
+})
+
+# Kandidat: erhält die validierte Anfrage, liefert ein Berechnungsergebnis
+Kandidat = Callable[[Any], Any]
+
+_STOPP = object()
+
+
+@dataclass(frozen=True)
+class SchattenStatistik:
+    """Momentaufnahme der Kennzahlen der Schattenauswertung."""
+
+    kandidat: Optional[str]
+    anteil: float
+    stichproben: int
+    verworfen: int
+    ausgewertet: int
+    uebereinstimmungen: int
+    abweichungen: int
+    fehler: int
+    warteschlange: int
+
+    @property
+    def abweichungsquote(self) -> float:
+        """Anteil der Abweichungen und Fehler an allen Auswertungen."""
+        if not self.ausgewertet:
+            return 0.0
+        return (self.abweichungen + self.fehler) / self.ausgewertet
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Erzeugt die Kennzahlen als Dictionary."""
+        return {
+            "kandidat": self.kandidat,
+            "anteil": self.anteil,
+            "stichproben": self.stichproben,
+            "verworfen": self.verworfen,
+            "ausgewertet": self.ausgewertet,
+            "uebereinstimmungen": self.uebereinstimmungen,
+            "abweichungen": self.abweichungen,
+            "fehler": self.fehler,
+            "warteschlange": self.warteschlange,
+            "abweichungsquote": self.abweichungsquote,
+        }
+
+
+class SchattenAuswertung:
+    """Wertet Stichproben im Hintergrund mit einem Kandidaten aus.
+
+    Ohne Kandidat oder mit Anteil 0 ist `beobachte()` ein reiner Vergleich
+    zweier Attribute; es wird weder gezogen noch ein Thread gestartet.
+    """
+
+    def __init__(
+        self,
+        max_warteschlange: int = STANDARD_WARTESCHLANGE,
+        max_abweichungen: int = STANDARD_MAX_ABWEICHUNGEN,
+        schluessel: Callable[[Any], Hashable] = repr,
+        zufall: Callable[[], float] = random.random,
+        geheimnis: Optional[bytes] = None,
+    ) -> None:
+        """
+        Args:
+            max_warteschlange: Höchstzahl wartender Stichproben.
+            max_abweichungen: Größe des Ringpuffers der Abweichungsdatensätze.
+            schluessel: Bildet die Anfrage auf den Wert ab, aus dem das
+                Pseudonym gehasht wird (läuft im Hintergrund-Thread).
+            zufall: Zufallsquelle im Intervall [0, 1) für die Stichprobe.
+            geheimnis: HMAC-Schlüssel der Pseudonyme; ohne Angabe zufällig
+                je Instanz (Pseudonyme sind dann nur im Prozess vergleichbar).
+        """
+        if max_warteschlange <= 0:
+            raise ValueError("max_warteschlange muss positiv sein")
+        self._warteschlange: "queue.Queue[Any]" = queue.Queue(max_warteschlange)
+        self._datensaetze: "deque[Dict[str, Any]]" = deque(maxlen=max_abweichungen)
+        self._schluessel = schluessel
+        self._zufall = zufall
+        self._geheimnis = geheimnis or secrets.token_bytes(32)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._kandidat: Optional[Kandidat] = None
+        self._name: Optional[str] = None
+        self._anteil = 0.0
+        self._setze_zaehler_zurueck()
+
+    def konfiguriere(
+        self,
+        kandidat: Optional[Kandidat],
+        anteil: float,
+        name: Optional[str] = None,
+    ) -> None:
+        """Setzt Kandidat und Stichprobenanteil (0.0-1.0); setzt Zähler zurück.
+
+        Args:
+            kandidat: Funktion ``anfrage -> Berechnungsergebnis`` oder `None`
+                (deaktiviert die Auswertung).
+            anteil: Anteil der Anfragen, die ausgewertet werden.
+            name: Bezeichnung für Statistik und Datensätze.
+        """
+        if not 0.0 <= anteil <= 1.0:
+            raise ValueError("anteil muss zwischen 0 und 1 liegen")
+        self.warte_bis_leer()
+        with self._lock:
+            self._kandidat = kandidat
+            self._name = name or getattr(kandidat, "__name__", None)
+            self._anteil = float(anteil) if kandidat is not None else 0.0
+            self._datensaetze.clear()
+            self._setze_zaehler_zurueck()
+
+    def beobachte(self, anfrage: Any, ergebnis: Any) -> bool:
+        """Zieht die Anfrage ggf. als Stichprobe (nie blockierend).
+
+        Args:
+            anfrage: Validierte Anfrage (Eingabe des Kandidaten).
+            ergebnis: Ergebnis der primären Berechnung.
+
+        Returns:
+            bool: True, wenn die Stichprobe in die Warteschlange gelegt wurde.
+        """
+        kandidat = self._kandidat
+        if kandidat is None or self._zufall() >= self._anteil:
+            return False
+        try:
+            self._warteschlange.put_nowait((kandidat, anfrage, ergebnis))
+        except queue.Full:
+            with self._lock:
+                self._verworfen += 1
+            return False
+        with self._lock:
+            self._stichproben += 1
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._arbeite,
+                    name="schattenauswertung",
+                    daemon=True,
+                )
+                self._thread.start()
+        return True
+
+    def warte_bis_leer(self) -> None:
+        """Blockiert, bis alle eingereihten Stichproben ausgewertet sind."""
+        if self._thread is not None:
+            self._warteschlange.join()
+
+    def stoppe(self) -> None:
+        """Wertet die restlichen Stichproben aus und beendet den Thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._warteschlange.put(_STOPP)
+            thread.join()
+
+    def statistik(self) -> SchattenStatistik:
+        """Liefert die aktuellen Kennzahlen."""
+        with self._lock:
+            return SchattenStatistik(
+                kandidat=self._name,
+                anteil=self._anteil,
+                stichproben=self._stichproben,
+                verworfen=self._verworfen,
+                ausgewertet=self._ausgewertet,
+                uebereinstimmungen=self._uebereinstimmungen,
+                abweichungen=self._abweichungen,
+                fehler=self._fehler,
+                warteschlange=self._warteschlange.qsize(),
+            )
+
+    def abweichungen(self) -> List[Dict[str, Any]]:
+        """Die letzten anonymisierten Abweichungsdatensätze (älteste zuerst)."""
+        with self._lock:
+            return list(self._datensaetze)
+
+    def _pseudonym(self, anfrage: Any) -> str:
+        """Stabiles Pseudonym der Anfrage (gleicher Schlüssel, gleicher Wert).
+
+        HMAC-SHA256 mit dem geheimen Schlüssel: ohne ihn lässt sich das
+        Pseudonym nicht durch Durchprobieren der Eingaben zurückrechnen.
+        """
+        try:
+            schluessel = self._schluessel(anfrage)
+        except ArithmeticError:
+            schluessel = anfrage
+        return hmac.new(
+            self._geheimnis, repr(schluessel).encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+
+    def _setze_zaehler_zurueck(self) -> None:
+        self._stichproben = 0
+        self._verworfen = 0
+        self._ausgewertet = 0
+        self._uebereinstimmungen = 0
+        self._abweichungen = 0
+        self._fehler = 0
+
+    def _arbeite(self) -> None:
+        """Hintergrund-Thread: wertet Stichproben der Reihe nach aus."""
+        while True:
+            eintrag = self._warteschlange.get()
+            try:
+                if eintrag is _STOPP:
+                    return
+                self._werte_aus(*eintrag)
+            except Exception:  # pragma: no cover - Thread darf nicht sterben
+                logger.exception("Schattenauswertung fehlgeschlagen")
+            finally:
+                self._warteschlange.task_done()
+
+    def _werte_aus(self, kandidat: Kandidat, anfrage: Any, ergebnis: Any) -> None:
+        """Berechnet eine Stichprobe mit dem Kandidaten und vergleicht."""
+        try:
+            felder = _unterschiede(ergebnis.to_dict(), kandidat(anfrage).to_dict())
+            fehler = None
+        except Exception as exc:
+            felder = {}
+            fehler = type(exc).__name__
+        with self._lock:
+            if kandidat is not self._kandidat:
+                return  # zwischenzeitlich umkonfiguriert
+            self._ausgewertet += 1
+            if fehler is None and not felder:
+                self._uebereinstimmungen += 1
+                return
+            if fehler is None:
+                self._abweichungen += 1
+            else:
+                self._fehler += 1
+            self._datensaetze.append({
+                "kandidat": self._name,
+                "anfrage": self._pseudonym(anfrage),
+                "felder": felder,
+                "fehler": fehler,
+            })
+        logger.info("shadow_mismatch | felder=%s fehler=%s", sorted(felder), fehler)
+
+
+def _unterschiede(
+    primaer: Dict[str, Any], kandidat: Dict[str, Any]
+) -> Dict[str, Dict[str, Any]]:
+    """Abweichende Ergebnisfelder mit beiden Werten (ohne `EINGABE_FELDER`)."""
+    return {
+        key: {"primaer": wert, "kandidat": kandidat.get(key)}
+        for key, wert in primaer.items()
+        if key not in EINGABE_FELDER and kandidat.get(key) != wert
+    }
+
+
+def anteil_aus_umgebung(default: float = 0.0) -> float:
+    """Liest den Stichprobenanteil aus ``SHADOW_SAMPLE_RATE`` (0.0-1.0)."""
+    wert = os.getenv("SHADOW_SAMPLE_RATE")
+    if not wert:
+        return default
+    try:
+        anteil = float(wert)
+    except ValueError:
+        return default
+    return anteil if 0.0 <= anteil <= 1.0 else default
+
+
+def geheimnis_aus_umgebung() -> Optional[bytes]:
+    """Liest den HMAC-Schlüssel der Pseudonyme aus ``SHADOW_PSEUDONYM_KEY``."""
+    wert = os.getenv("SHADOW_PSEUDONYM_KEY")
+    return wert.encode("utf-8") if wert else None
+
+
+def warteschlange_aus_umgebung(default: int = STANDARD_WARTESCHLANGE) -> int:
+    """Liest die Größe der Warteschlange aus ``SHADOW_QUEUE_SIZE``."""
+    wert = os.getenv("SHADOW_QUEUE_SIZE")
+    if not wert:
+        return default
+    try:
+        groesse = int(wert)
+    except ValueError:
+        return default
+    return groesse if groesse > 0 else default
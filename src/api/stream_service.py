@@ -0,0 +1,250 @@
+"""Service-Schicht für gestreamte Massenberechnungen (CSV/NDJSON).
+
+Jahrgangsimporte umfassen Zehntausende Zeilen. Statt den Body als eine große
+JSON-Liste zu puffern, liest dieser Service CSV- oder NDJSON-Bodies
+zeilenweise, validiert jede Zeile mit `BerechnungsAnfrage.from_dict`,
+berechnet sie über den Ergebniscache und liefert die Antwort als Generator
+(NDJSON oder CSV). Eingabe wird erst gelesen, wenn die Ausgabe abgeholt
+wird: Der Speicherbedarf hängt nicht von der Dateigröße ab, und ein langsam
+lesender Client bremst auch das Lesen des Bodies (Backpressure).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+from typing import (Any, BinaryIO, Dict, Iterable, Iterator, List, Mapping,
+                    Optional, Tuple, Union)
+
+from ..calculation_logic import ERGEBNIS_KEYS
+from ..csv_stream import csv_zeilenschreiber
+from .calculation_service import (FLACHE_ANFRAGE_FELDER, BerechnungsAnfrage,
+                                  BerechnungsDienstAntwort, berechne_anfrage,
+                                  fehlerantwort, nutzlast_aus_feldern)
+from .validation import (BerechnungsDienstFehler, NutzlastValidierungsFehler,
+                         benoetige_dictionary)
+
+logger = logging.getLogger(__name__)
+
+# Eingabeformate je Content-Type und mögliche Ausgabeformate
+EINGABEFORMATE = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+}
+AUSGABEFORMATE = ("ndjson", "csv")
+
+# Längste zulässige Eingabezeile in Bytes (begrenzt den Speicher je Zeile)
+MAX_ZEILENLAENGE = 64 * 1024
+
+# Ausgabezeilen je Block des Antwort-Streams
+ZEILEN_JE_BLOCK = 64
+
+# Spalten der CSV-Ausgabe
+CSV_AUSGABE_SPALTEN = (
+    ("zeile", "kennung", "status_code")
+    + ERGEBNIS_KEYS
+    + ("fehler_code", "fehler_meldung")
+)
+
+# CSV-Spalten auf oberster Ebene; alle übrigen gehören zu `verkuerzungsgruende`
+_CSV_ANFRAGE_SPALTEN = FLACHE_ANFRAGE_FELDER | {"kennung"}
+
+# Eingelesene Zeile: (Zeilennummer, Nutzlast oder Fehler der Zeile)
+Zeile = Tuple[int, Any]
+
+
+def verarbeite_stromanfrage(
+    stream: BinaryIO,
+    eingabeformat: str,
+    ausgabeformat: str = "ndjson",
+) -> Iterator[str]:
+    """Berechnet einen CSV- oder NDJSON-Body zeilenweise.
+
+    Jede Eingabezeile ergibt eine Ausgabezeile mit ``zeile`` (Zeilennummer
+    im Body), optional ``kennung`` (wird unverändert zurückgegeben),
+    ``status_code`` und ``result`` bzw. ``error`` wie bei
+    ``/api/calculate``. Ungültige Zeilen brechen den Stream nicht ab.
+
+    Args:
+        stream: Binärer Eingabestrom (z.B. ``request.stream``).
+        eingabeformat: ``csv`` oder ``ndjson``.
+        ausgabeformat: ``ndjson`` oder ``csv``.
+
+    Returns:
+        Iterator[str]: Blöcke der Antwort (je bis zu `ZEILEN_JE_BLOCK` Zeilen).
+
+    Raises:
+        ValueError: Bei unbekanntem Ein- oder Ausgabeformat.
+    """
+    if eingabeformat not in ("csv", "ndjson"):
+        raise ValueError(f"Unbekanntes Eingabeformat: {eingabeformat}")
+    if ausgabeformat not in AUSGABEFORMATE:
+        raise ValueError(f"Unbekanntes Ausgabeformat: {ausgabeformat}")
+    zeilen = lese_csv(stream) if eingabeformat == "csv" else lese_ndjson(stream)
+    antworten = berechne_zeilen(zeilen)
+    if ausgabeformat == "csv":
+        return _in_bloecken(als_csv(antworten))
+    return _in_bloecken(als_ndjson(antworten))
+
+
+def lese_ndjson(stream: BinaryIO) -> Iterator[Zeile]:
+    """Liest einen NDJSON-Body (ein JSON-Objekt je Zeile); Leerzeilen entfallen."""
+    for nummer, zeile in _lese_zeilen(stream):
+        if not isinstance(zeile, bytes):
+            yield nummer, zeile
+            continue
+        if not zeile.strip():
+            continue
+        try:
+            yield nummer, json.loads(zeile)
+        except ValueError:
+            yield nummer, NutzlastValidierungsFehler(
+                "Zeile ist kein gültiges JSON",
+                details={"zeile": nummer},
+            )
+
+
+def lese_csv(stream: BinaryIO) -> Iterator[Zeile]:
+    """Liest einen CSV-Body mit Kopfzeile (UTF-8, Trenner ``,`` oder ``;``).
+
+    Spalten wie die Felder von ``/api/calculate``; alle übrigen Spalten sind
+    Verkürzungsgründe (``ja``/``nein``, ``true``/``false``, ``1``/``0`` bzw.
+    Zahlen, auch deutsch formatiert). Leere Zellen gelten als nicht
+    angegeben. Felder dürfen keine Zeilenumbrüche enthalten.
+    """
+    kopf = None
+    trenner = ","
+    for nummer, zeile in _lese_zeilen(stream):
+        if not isinstance(zeile, bytes):
+            yield nummer, zeile
+            continue
+        try:
+            text = zeile.decode("utf-8-sig" if nummer == 1 else "utf-8")
+        except UnicodeDecodeError:
+            yield nummer, NutzlastValidierungsFehler(
+                "Zeile ist nicht UTF-8-kodiert",
+                details={"zeile": nummer},
+            )
+            continue
+        if not text.strip():
+            continue
+        if kopf is None:
+            trenner = ";" if text.count(";") > text.count(",") else ","
+            kopf = [spalte.strip() for spalte in _csv_felder(text, trenner)]
+            continue
+        werte = _csv_felder(text, trenner)
+        if len(werte) != len(kopf):
+            yield nummer, NutzlastValidierungsFehler(
+                f"Zeile hat {len(werte)} statt {len(kopf)} Spalten",
+                details={"zeile": nummer},
+            )
+            continue
+        yield nummer, nutzlast_aus_feldern(zip(kopf, werte), _CSV_ANFRAGE_SPALTEN)
+
+
+def berechne_zeilen(
+    zeilen: Iterable[Zeile],
+) -> Iterator[Tuple[int, Any, BerechnungsDienstAntwort]]:
+    """Validiert und berechnet Zeilen einzeln (Generator).
+
+    Yields:
+        tuple: (Zeilennummer, Kennung oder `None`, Antwort der Zeile)
+    """
+    anzahl = fehler = 0
+    for nummer, nutzlast in zeilen:
+        kennung = None
+        if isinstance(nutzlast, BerechnungsDienstFehler):
+            antwort = fehlerantwort(nutzlast)
+        else:
+            if isinstance(nutzlast, Mapping):
+                kennung = nutzlast.get("kennung")
+            antwort = _berechne_zeile(nutzlast)
+        anzahl += 1
+        fehler += antwort.status_code != 200
+        yield nummer, kennung, antwort
+    logger.info("Stromberechnung abgeschlossen | zeilen=%d fehler=%d", anzahl, fehler)
+
+
+def als_ndjson(
+    antworten: Iterable[Tuple[int, Any, BerechnungsDienstAntwort]],
+) -> Iterator[str]:
+    """Formatiert Antworten als NDJSON (ein Objekt je Zeile)."""
+    for nummer, kennung, antwort in antworten:
+        eintrag: Dict[str, Any] = {"zeile": nummer}
+        if kennung is not None:
+            eintrag["kennung"] = kennung
+        eintrag["status_code"] = antwort.status_code
+        eintrag.update(antwort.body)
+        yield json.dumps(eintrag) + "\n"
+
+
+def als_csv(
+    antworten: Iterable[Tuple[int, Any, BerechnungsDienstAntwort]],
+) -> Iterator[str]:
+    """Formatiert Antworten als CSV (Spalten siehe `CSV_AUSGABE_SPALTEN`)."""
+    schreiber = csv_zeilenschreiber()
+    leer = ("",) * len(ERGEBNIS_KEYS)
+    yield schreiber.writerow(CSV_AUSGABE_SPALTEN)
+    for nummer, kennung, antwort in antworten:
+        praefix = (nummer, "" if kennung is None else kennung, antwort.status_code)
+        if antwort.fehler is None:
+            ergebnis = antwort.ergebnis
+            werte = tuple(ergebnis[key] for key in ERGEBNIS_KEYS) + ("", "")
+        else:
+            werte = leer + (antwort.fehler.code, antwort.fehler.message)
+        yield schreiber.writerow(praefix + werte)
+
+
+def _berechne_zeile(nutzlast: Any) -> BerechnungsDienstAntwort:
+    """Berechnet eine Zeile wie eine Einzelanfrage (ohne Request-Logging)."""
+    try:
+        anfrage = BerechnungsAnfrage.from_dict(
+            benoetige_dictionary(nutzlast, "anfrage")
+        )
+        return BerechnungsDienstAntwort(
+            status_code=200, ergebnis=berechne_anfrage(anfrage)
+        )
+    except (BerechnungsDienstFehler, TypeError, ValueError) as exc:
+        return fehlerantwort(exc)
+
+
+def _lese_zeilen(
+    stream: BinaryIO,
+    max_laenge: Optional[int] = None,
+) -> Iterator[Tuple[int, Union[bytes, NutzlastValidierungsFehler]]]:
+    """Liest Zeilen begrenzter Länge; zu lange Zeilen werden übersprungen."""
+    max_laenge = max_laenge or MAX_ZEILENLAENGE
+    nummer = 0
+    while True:
+        zeile = stream.readline(max_laenge + 1)
+        if not zeile:
+            return
+        nummer += 1
+        if len(zeile) > max_laenge and not zeile.endswith(b"\n"):
+            while zeile and not zeile.endswith(b"\n"):
+                zeile = stream.readline(max_laenge)
+            yield nummer, NutzlastValidierungsFehler(
+                f"Zeile ist länger als {max_laenge} Bytes",
+                details={"zeile": nummer, "max": max_laenge},
+            )
+            continue
+        yield nummer, zeile
+
+
+def _csv_felder(text: str, trenner: str) -> List[str]:
+    """Zerlegt eine CSV-Zeile in ihre Felder."""
+    return next(csv.reader([text], delimiter=trenner), [])
+
+
+def _in_bloecken(teile: Iterable[str]) -> Iterator[str]:
+    """Fasst jeweils `ZEILEN_JE_BLOCK` Ausgabezeilen zu einem Block zusammen."""
+    block = []
+    for teil in teile:
+        block.append(teil)
+        if len(block) >= ZEILEN_JE_BLOCK:
+            yield "".join(block)
+            block = []
+    if block:
+        yield "".join(block)
@@ -0,0 +1,139 @@
+"""Service-Schicht für Dauerkurven (Teilzeit-Sweep) des Teilzeitrechners.
+
+Statt für jede Slider-Position eine eigene Berechnung anzufragen, liefert
+dieser Service die finale Dauer für alle Teilzeit-Prozente (50-100 %) in einer
+Antwort: als 1-D-Kurve für eine Verkürzung oder als 2-D-Raster über alle
+effektiven Verkürzungen (0-12 Monate). Die Kurven werden je AO-Dauer einmalig
+berechnet und zwischengespeichert (siehe `berechne_teilzeit_raster`).
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+from ..calculation_logic import (TEILZEIT_PROZENTE, VERKUERZUNGEN_MONATE,
+                                 berechne_teilzeit_kurve,
+                                 berechne_teilzeit_raster,
+                                 berechne_verkuerzung_aus_maske)
+from .calculation_service import (BerechnungsDienstAntwort, fehlerantwort,
+                                  kodiere_verkuerzungsgruende,
+                                  pruefe_standard_regelwerk)
+from .validation import (BerechnungsDienstFehler, FehlendeFelderFehler,
+                         NutzlastValidierungsFehler, benoetige_dictionary,
+                         coerce_int)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class KurvenAnfrage:
+    """Validierte Anfrage für eine Dauerkurve bzw. ein Dauerraster.
+
+    `verkuerzung_monate` ist die effektive Verkürzung; `None` fordert das
+    vollständige Raster über alle Verkürzungen an.
+    """
+
+    basis_dauer_monate: int
+    verkuerzung_monate: Optional[int] = None
+
+    @staticmethod
+    def from_dict(payload: Mapping[str, Any]) -> "KurvenAnfrage":
+        """Erzeuge eine `KurvenAnfrage` aus rohem Payload.
+
+        Pflichtfeld ist ``basis_dauer_monate``. Die Verkürzung kann optional
+        entweder als ``verkuerzungsgruende`` (wie bei ``/api/calculate``) oder
+        direkt als ``verkuerzung_monate`` angegeben werden. ``regelwerk`` ist
+        nur mit den Standardwerten erlaubt (`pruefe_standard_regelwerk`).
+
+        Raises:
+            FehlendeFelderFehler: Wenn ``basis_dauer_monate`` fehlt.
+            NutzlastValidierungsFehler: Bei ungültigen oder widersprüchlichen
+                Werten.
+        """
+        payload = benoetige_dictionary(payload, "payload")
+        if "basis_dauer_monate" not in payload:
+            raise FehlendeFelderFehler(["basis_dauer_monate"])
+        pruefe_standard_regelwerk(payload)
+        basis_dauer_monate = coerce_int(
+            payload["basis_dauer_monate"],
+            "basis_dauer_monate",
+        )
+
+        if "verkuerzungsgruende" in payload and "verkuerzung_monate" in payload:
+            raise NutzlastValidierungsFehler(
+                "Entweder verkuerzungsgruende oder verkuerzung_monate angeben",
+                details={"fields": ["verkuerzungsgruende", "verkuerzung_monate"]},
+            )
+
+        verkuerzung_monate = None
+        if "verkuerzungsgruende" in payload:
+            verkuerzte_dauer, _ = berechne_verkuerzung_aus_maske(
+                basis_dauer_monate,
+                kodiere_verkuerzungsgruende(payload["verkuerzungsgruende"]),
+            )
+            verkuerzung_monate = basis_dauer_monate - verkuerzte_dauer
+        elif "verkuerzung_monate" in payload:
+            verkuerzung_monate = coerce_int(
+                payload["verkuerzung_monate"],
+                "verkuerzung_monate",
+            )
+            if verkuerzung_monate < 0:
+                raise NutzlastValidierungsFehler(
+                    "verkuerzung_monate darf nicht negativ sein",
+                    details={"field": "verkuerzung_monate"},
+                )
+
+        return KurvenAnfrage(
+            basis_dauer_monate=basis_dauer_monate,
+            verkuerzung_monate=verkuerzung_monate,
+        )
+
+
+def verarbeite_kurvenanfrage(
+    payload: Mapping[str, Any],
+) -> BerechnungsDienstAntwort:
+    """Liefert Dauerkurve bzw. -raster für eine AO-Dauer.
+
+    Antwort (``result``):
+
+    - ``basis_dauer_monate`` und ``teilzeit_prozente`` (50-100)
+    - mit Verkürzung: ``verkuerzung_monate`` und ``finale_dauer_monate`` als
+      Liste (ein Wert je Prozent)
+    - ohne Verkürzung: ``verkuerzungen_monate`` (0-12) und
+      ``finale_dauer_monate`` als Liste von Listen (Zeile je Verkürzung)
+
+    Args:
+        payload: Bereits geparstes JSON des Requests.
+
+    Returns:
+        BerechnungsDienstAntwort: Normalisierte Antwort mit Statuscode.
+    """
+    logger.info("Kurvenanfrage eingegangen")
+    try:
+        anfrage = KurvenAnfrage.from_dict(payload)
+        ergebnis = _kurvenergebnis(anfrage)
+    except (BerechnungsDienstFehler, TypeError, ValueError) as exc:
+        return fehlerantwort(exc)
+    return BerechnungsDienstAntwort(status_code=200, ergebnis=ergebnis)
+
+
+def _kurvenergebnis(anfrage: KurvenAnfrage) -> Dict[str, Any]:
+    """Baut den Ergebnis-Body aus den zwischengespeicherten Kurven."""
+    ergebnis: Dict[str, Any] = {
+        "basis_dauer_monate": anfrage.basis_dauer_monate,
+        "teilzeit_prozente": TEILZEIT_PROZENTE,
+    }
+    if anfrage.verkuerzung_monate is None:
+        ergebnis["verkuerzungen_monate"] = VERKUERZUNGEN_MONATE
+        ergebnis["finale_dauer_monate"] = berechne_teilzeit_raster(
+            anfrage.basis_dauer_monate
+        )
+    else:
+        ergebnis["verkuerzung_monate"] = anfrage.verkuerzung_monate
+        ergebnis["finale_dauer_monate"] = berechne_teilzeit_kurve(
+            anfrage.basis_dauer_monate,
+            anfrage.verkuerzung_monate,
+        )
+    return ergebnis
@@ -0,0 +1,57 @@
+"""Service-Schicht für Ausbildungsende und Monats-Zeitleiste.
+
+Berechnet eine Anfrage wie ``/api/calculate`` und überträgt das Ergebnis auf
+einen konkreten ``ausbildungsbeginn`` (siehe `src.timeline`). Mit ``kammer``
+wird vorher Schritt 4 angewendet und die Zeitleiste bis zum Prüfungstermin
+verlängert.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Mapping
+
+from ..exam_calendar import verlaengere_bis_pruefung
+from ..timeline import erstelle_zeitleiste
+from .calculation_service import (BerechnungsAnfrage, BerechnungsDienstAntwort,
+                                  berechne_anfrage, fehlerantwort)
+from .validation import (BerechnungsDienstFehler, FehlendeFelderFehler,
+                         benoetige_dictionary, coerce_datum)
+
+logger = logging.getLogger(__name__)
+
+
+def verarbeite_zeitleistenanfrage(
+    payload: Mapping[str, Any],
+) -> BerechnungsDienstAntwort:
+    """Berechnet Ausbildungsende und Zeitleiste.
+
+    Der Payload entspricht ``/api/calculate`` und enthält zusätzlich
+    ``ausbildungsbeginn`` (ISO-Datum) sowie optional ``kammer`` für Schritt 4.
+
+    Returns:
+        BerechnungsDienstAntwort: ``ergebnis`` ist eine `Zeitleiste`; der
+        ``body`` enthält ``ausbildungsbeginn``, ``ausbildungsende``,
+        ``dauer_monate``, ``ausbildungsjahre`` und ``monate``.
+    """
+    logger.info("Zeitleistenanfrage eingegangen")
+    try:
+        payload = benoetige_dictionary(payload, "payload")
+        if "ausbildungsbeginn" not in payload:
+            raise FehlendeFelderFehler(["ausbildungsbeginn"])
+        ausbildungsbeginn = coerce_datum(
+            payload["ausbildungsbeginn"], "ausbildungsbeginn"
+        )
+        anfrage = BerechnungsAnfrage.from_dict(payload)
+        ergebnis = berechne_anfrage(anfrage)
+        dauer_monate = None
+        if payload.get("kammer") is not None:
+            dauer_monate = verlaengere_bis_pruefung(
+                ausbildungsbeginn,
+                ergebnis.finale_dauer_monate,
+                payload["kammer"],
+            ).dauer_nach_schritt4_monate
+        zeitleiste = erstelle_zeitleiste(ausbildungsbeginn, ergebnis, dauer_monate)
+    except (BerechnungsDienstFehler, TypeError, ValueError) as exc:
+        return fehlerantwort(exc)
+    return BerechnungsDienstAntwort(status_code=200, ergebnis=zeitleiste)
@@ -0,0 +1,197 @@
+"""Gemeinsame Validierung der Service-Schicht.
+
+Ausnahmen und Umwandlungsfunktionen für Request-Werte, die alle Services
+(`calculation_service`, `sweep_service`, `phase_service`, ...) verwenden.
+Fehler werden als `NutzlastValidierungsFehler` mit Feldbezug gemeldet und
+von `fehlerantwort` in strukturierte 400/422-Antworten übersetzt.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, Mapping, Optional
+
+# ---------------------------------------------------------------------------
+# Ausnahmen
+# ---------------------------------------------------------------------------
+
+
+class BerechnungsDienstFehler(Exception):
+    """Basisklasse für Service-spezifische Ausnahmen."""
+
+
+class FehlendeFelderFehler(BerechnungsDienstFehler):
+    """Fehler für fehlende Pflichtfelder im Request.
+
+    Dieses Exception-Objekt enthält das Attribut `missing` mit der Liste
+    der nicht vorhandenen Felder, damit die API eine strukturierte
+    Fehlermeldung zurückgeben kann.
+    """
+    def __init__(self, missing: Any) -> None:
+        self.missing = list(missing)
+        message = f"Fehlende Felder: {', '.join(self.missing)}"
+        super().__init__(message)
+
+
+class NutzlastValidierungsFehler(BerechnungsDienstFehler):
+    """Validierungsfehler für ungültige Request-Werte.
+
+    Beinhaltet einen optionalen `code` und `details`, die in der
+    API-Antwort zurückgegeben werden können, um die Ursache strukturiert
+    darzustellen.
+    """
+    def __init__(
+        self,
+        message: str,
+        *,
+        code: str = "validation_error",
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.code = code
+        self.details = details
+        super().__init__(message)
+
+
+# ---------------------------------------------------------------------------
+# Umwandlung von Request-Werten
+# ---------------------------------------------------------------------------
+
+
+def benoetige_dictionary(value: Any, field_name: str) -> Dict[str, Any]:
+    """Stellt sicher, dass ein Feld ein Mapping/Objekt ist.
+
+    Args:
+        value: Der zu prüfende Wert aus der Nutzlast.
+        field_name: Name des Feldes (für die Fehlermeldung).
+
+    Returns:
+        dict: Ein normales Python-`dict`, erzeugt aus dem Mapping.
+
+    Raises:
+        NutzlastValidierungsFehler: Falls `value` kein Mapping ist.
+    """
+    if not isinstance(value, Mapping):
+        raise NutzlastValidierungsFehler(
+            f"{field_name} muss ein Objekt sein",
+            details={"field": field_name},
+        )
+    return dict(value)
+
+
+def normalize_numeric_string(raw: str) -> str:
+    """Normalisiert Zahlenstrings für float/int.
+
+    - entfernt Spaces (inkl. NBSP)
+    - bei Komma: interpretiert Punkte als Tausendertrennzeichen ("1.234,5" -> "1234.5")
+    """
+
+    value = raw.strip().replace("\u00A0", "").replace(" ", "")
+    if "," in value:
+        value = value.replace(".", "")
+        value = value.replace(",", ".")
+    return value
+
+
+def coerce_float(value: Any, field_name: str) -> float:
+    """Konvertiert `value` sicher zu `float`.
+
+    Unterstützt ints, floats und Strings mit deutscher Formatierung
+    (Tausenderpunkte, Komma als Dezimaltrennzeichen). Bei ungültigen
+    Eingaben wird `NutzlastValidierungsFehler` geworfen.
+    """
+    if type(value) is int or type(value) is float:
+        return float(value)
+    if isinstance(value, bool):
+        raise NutzlastValidierungsFehler(
+            f"{field_name} muss eine Zahl sein",
+            details={"field": field_name},
+        )
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        normalized = normalize_numeric_string(value)
+        try:
+            return float(normalized)
+        except ValueError as exc:
+            raise NutzlastValidierungsFehler(
+                f"{field_name} muss eine Zahl sein",
+                details={"field": field_name},
+            ) from exc
+
+    raise NutzlastValidierungsFehler(
+        f"{field_name} muss eine Zahl sein",
+        details={"field": field_name},
+    )
+
+
+def coerce_int(value: Any, field_name: str) -> int:
+    """Konvertiert `value` zu `int`, nur wenn ganzzahlig.
+
+    Akzeptiert ints sowie numerische Strings (inkl. deutscher Formatierung).
+    Bei Nicht-Ganzzahlen oder ungültigen Werten wird
+    `NutzlastValidierungsFehler` geworfen.
+    """
+    if type(value) is int:
+        return value
+    if isinstance(value, bool):
+        raise NutzlastValidierungsFehler(
+            f"{field_name} muss eine ganze Zahl sein",
+            details={"field": field_name},
+        )
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        if value.is_integer():
+            return int(value)
+        raise NutzlastValidierungsFehler(
+            f"{field_name} muss eine ganze Zahl sein",
+            details={"field": field_name},
+        )
+    if isinstance(value, str):
+        normalized = normalize_numeric_string(value)
+        try:
+            parsed = float(normalized)
+        except ValueError as exc:
+            raise NutzlastValidierungsFehler(
+                f"{field_name} muss eine ganze Zahl sein",
+                details={"field": field_name},
+            ) from exc
+        if parsed.is_integer():
+            return int(parsed)
+        raise NutzlastValidierungsFehler(
+            f"{field_name} muss eine ganze Zahl sein",
+            details={"field": field_name},
+        )
+
+    raise NutzlastValidierungsFehler(
+        f"{field_name} muss eine ganze Zahl sein",
+        details={"field": field_name},
+    )
+
+
+def ganzzahl(value: Any, zahl: float, field_name: str) -> int:
+    """Ganzzahl zu einem bereits mit `coerce_float` gelesenen Wert.
+
+    Ganze Zahlen bleiben exakt erhalten; sonst wie `coerce_int`.
+    """
+    if type(value) is int:
+        return value
+    if zahl.is_integer():
+        return int(zahl)
+    raise NutzlastValidierungsFehler(
+        f"{field_name} muss eine ganze Zahl sein",
+        details={"field": field_name},
+    )
+
+
+def coerce_datum(value: Any, field_name: str) -> date:
+    """Konvertiert ein ISO-Datum (``JJJJ-MM-TT``) mit Feldbezug im Fehlerfall."""
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value.strip())
+        except ValueError:
+            pass
+    raise NutzlastValidierungsFehler(
+        f"{field_name} muss ein Datum im Format JJJJ-MM-TT sein",
+        details={"field": field_name},
+    )
@@ -7,6 +7,22 @@ Verbindung zwischen Frontend und Backend.
 Die Flask-App stellt folgende Funktionen bereit:
 - Liefert die HTML-UI (index.html) aus
 - Stellt eine REST-API für Berechnungen bereit (POST /api/calculate)
+- Cachebare Variante mit Query-Parametern, ETag und Cache-Control
+  (GET /api/calculate)
+- Liefert Dauerkurven über alle Teilzeit-Prozente (POST /api/calculate/sweep)
+- Berechnet die minimale Teilzeit für eine Zieldauer (POST /api/calculate/inverse)
+- Berechnet viele Verträge in einer Sammelanfrage (POST /api/calculate/batch)
+- Berechnet CSV-/NDJSON-Dateien zeilenweise als Stream
+  (POST /api/calculate/stream)
+- Vergleicht mehrere Szenarien nebeneinander (POST /api/calculate/compare)
+- Ermittelt die kleinste Auswahl an Verkürzungsgründen (POST /api/calculate/optimize)
+- Verlängert bis zum nächsten Prüfungstermin der Kammer (POST /api/calculate/exam)
+- Berechnet Verträge mit wechselnder Teilzeit und Unterbrechungen
+  (POST /api/calculate/phases)
+- Schlägt Phasenpläne mit wenigen Wechseln für eine Zieldauer vor
+  (POST /api/calculate/phases/plan)
+- Liefert Ausbildungsende und Monats-Zeitleiste als JSON, CSV oder ICS
+  (POST /api/calculate/timeline)
 - Validierung der Eingabedaten
 - Strukturierte Fehlerbehandlung
 """
@@ -43,13 +59,49 @@ setup_venv()
 
 import time  # noqa: E402
 
-from flask import Flask, g, jsonify, render_template, request  # noqa: E402
+from flask import (Flask, Response, g, render_template, request,  # noqa: E402
+                   stream_with_context)
 
 # Import der zentralen Berechnungslogik
 # Diese enthält die komplette Implementierung gemäß BBiG § 7a und § 8
+from .api import verarbeite_batchanfrage  # noqa: E402
+from .api import verarbeite_berechnungsabfrage  # noqa: E402
 from .api import verarbeite_berechnungsanfrage  # noqa: E402
+from .api import verarbeite_kurvenanfrage  # noqa: E402
+from .api import verarbeite_mindest_teilzeit_anfrage  # noqa: E402
+from .api import verarbeite_optimierungsanfrage  # noqa: E402
+from .api import verarbeite_phasenanfrage  # noqa: E402
+from .api import verarbeite_phasenplananfrage  # noqa: E402
+from .api import verarbeite_pruefungsanfrage  # noqa: E402
+from .api import verarbeite_stromanfrage  # noqa: E402
+from .api import verarbeite_vergleichsanfrage  # noqa: E402
+from .api import verarbeite_zeitleistenanfrage  # noqa: E402
+from .api.json_encoding import konstante_fehlerantwort  # noqa: E402
+from .api.stream_service import AUSGABEFORMATE  # noqa: E402
+from .api.stream_service import EINGABEFORMATE  # noqa: E402
 from .logging_config import configure_logging  # noqa: E402
 
+# HTTP-Caching von GET /api/calculate (Ergebnis hängt nur von der Eingabe ab)
+BERECHNUNG_CACHE_CONTROL = "public, max-age=86400"
+
+# Ausgabeformate von POST /api/calculate/timeline
+ZEITLEISTEN_FORMATE = ("json", "csv", "ics")
+
+# Feste Fehler-Bodies, einmalig beim Import kodiert
+FEHLER_CONTENT_TYPE = konstante_fehlerantwort(
+    "invalid_request", "Erwarte application/json im Request-Body"
+)
+FEHLER_STROM_CONTENT_TYPE = konstante_fehlerantwort(
+    "invalid_request",
+    "Erwarte text/csv oder application/x-ndjson im Request-Body",
+)
+FEHLER_STROM_FORMAT = konstante_fehlerantwort(
+    "validation_error", "format muss 'ndjson' oder 'csv' sein", field="format"
+)
+FEHLER_ZEITLEISTEN_FORMAT = konstante_fehlerantwort(
+    "validation_error", "format muss 'json', 'csv' oder 'ics' sein", field="format"
+)
+
 
 def create_app() -> Flask:
     """
@@ -175,17 +227,7 @@ def create_app() -> Flask:
         # Prüfen, ob der Request wirklich JSON enthält
         # Frontend sollte "Content-Type: application/json" senden
         if not request.is_json:
-            return (
-                jsonify({
-                    "error": {
-                        "code": "invalid_request",
-                        "message": (
-                            "Erwarte application/json im Request-Body"
-                        ),
-                    }
-                }),
-                400,
-            )
+            return _ungueltiger_content_type()
 
         # JSON-Daten extrahieren
         # force=True: ignoriert Content-Type, wenn JSON erkannt wird
@@ -198,11 +240,311 @@ def create_app() -> Flask:
         # ============================================================
         response = verarbeite_berechnungsanfrage(data)
 
-        return jsonify(response.body), response.status_code
+        return _json_antwort(response)
+
+    @app.get("/api/calculate")
+    def api_calculate_get():
+        """
+        API-Endpoint: Cachebare Berechnung über Query-Parameter
+
+        Felder wie bei POST /api/calculate als Query-Parameter; die
+        Verkürzungsgründe stehen flach daneben (z.B.
+        ``?basis_dauer_monate=36&vollzeit_stunden=40&teilzeit_eingabe=75
+        &eingabetyp=prozent&abitur=ja``).
+
+        Erfolgreiche Antworten tragen ein starkes ETag aus dem kanonischen
+        Schlüssel und ``Cache-Control: public``, damit Reverse-Proxy und
+        Browser wiederholte Abfragen selbst beantworten. Bei passendem
+        ``If-None-Match`` wird ohne Berechnung mit 304 geantwortet.
+
+        Responses:
+            200 OK: Berechnung erfolgreich
+            304 Not Modified: ETag unverändert
+            400 Bad Request: Fehlende Felder
+            422 Unprocessable Entity: Validierungsfehler
+        """
+        response = verarbeite_berechnungsabfrage(
+            request.args.items(), request.if_none_match.contains_weak
+        )
+        if response.status_code == 304:
+            antwort = Response(status=304)
+        else:
+            antwort = _json_antwort(response)
+        if response.etag is not None:
+            antwort.set_etag(response.etag)
+            antwort.headers["Cache-Control"] = BERECHNUNG_CACHE_CONTROL
+        return antwort
+
+    @app.post("/api/calculate/sweep")
+    def api_calculate_sweep():
+        """
+        API-Endpoint: Dauerkurven über alle Teilzeit-Prozente
+
+        Liefert die finale Dauer für 50-100 % Teilzeit in einer Antwort, damit
+        Slider-Interaktionen keine Einzelanfragen an /api/calculate auslösen.
+
+        Request Body (JSON):
+            {
+                "basis_dauer_monate": int,        # Reguläre Ausbildungsdauer (AO)
+                "verkuerzungsgruende": {...},     # optional, wie /api/calculate
+                "verkuerzung_monate": int         # optional, effektive Verkürzung
+            }
+
+        Ohne Verkürzungsangabe wird das Raster über alle effektiven
+        Verkürzungen (0-12 Monate) geliefert.
+
+        Responses:
+            200 OK: Kurve bzw. Raster
+            400 Bad Request: Kein JSON oder fehlende Felder
+            422 Unprocessable Entity: Validierungsfehler
+        """
+        if not request.is_json:
+            return _ungueltiger_content_type()
+        data = request.get_json(force=True, silent=True) or {}
+        response = verarbeite_kurvenanfrage(data)
+        return _json_antwort(response)
+
+    @app.post("/api/calculate/inverse")
+    def api_calculate_inverse():
+        """
+        API-Endpoint: Minimale Teilzeit für eine Zieldauer
+
+        Request Body (JSON):
+            {
+                "basis_dauer_monate": int,        # Reguläre Ausbildungsdauer (AO)
+                "vollzeit_stunden": float,        # Wochenstunden bei Vollzeit
+                "ziel_dauer_monate": int,         # Höchstens gewünschte Dauer
+                "verkuerzungsgruende": {...}      # optional, wie /api/calculate
+            }
+
+        Responses:
+            200 OK: Minimaler Prozentsatz und minimale Wochenstunden
+            400 Bad Request: Kein JSON oder fehlende Felder
+            422 Unprocessable Entity: Validierungsfehler oder Zieldauer
+            nicht erreichbar
+        """
+        if not request.is_json:
+            return _ungueltiger_content_type()
+        data = request.get_json(force=True, silent=True) or {}
+        response = verarbeite_mindest_teilzeit_anfrage(data)
+        return _json_antwort(response)
+
+    @app.post("/api/calculate/batch")
+    def api_calculate_batch():
+        """
+        API-Endpoint: Sammelberechnung
+
+        Request Body (JSON):
+            [ {...}, {...} ]                      # Payloads wie /api/calculate
+
+        Gleichwertige Einträge werden nur einmal berechnet. Die Antwort
+        enthält je Eintrag ``status_code`` und ``result`` bzw. ``error``
+        (wie bei /api/calculate); die Obergrenze der Listenlänge wird über
+        ``BATCH_MAX_SIZE`` gesteuert.
+
+        Responses:
+            200 OK: Ergebnisse je Eintrag (ungültige Einträge mit "error")
+            400 Bad Request: Kein JSON
+            422 Unprocessable Entity: Keine, leere oder zu lange Liste
+        """
+        if not request.is_json:
+            return _ungueltiger_content_type()
+        data = request.get_json(force=True, silent=True) or {}
+        response = verarbeite_batchanfrage(data)
+        return _json_antwort(response)
+
+    @app.post("/api/calculate/stream")
+    def api_calculate_stream():
+        """
+        API-Endpoint: Gestreamte Massenberechnung
+
+        Request Body: CSV (``text/csv``, Kopfzeile mit den Feldern von
+        /api/calculate, übrige Spalten sind Verkürzungsgründe) oder NDJSON
+        (``application/x-ndjson``, ein Payload je Zeile). Query-Parameter
+        ``format``: ``ndjson`` (Standard) oder ``csv``.
+
+        Der Body wird zeilenweise gelesen und die Antwort als Generator
+        gestreamt; je Zeile ``result`` bzw. ``error`` wie bei
+        /api/calculate. Eine Spalte bzw. ein Feld ``kennung`` wird
+        unverändert zurückgegeben.
+
+        Responses:
+            200 OK: Ergebnisse je Zeile (ungültige Zeilen mit "error")
+            400 Bad Request: Weder CSV noch NDJSON
+            422 Unprocessable Entity: Unbekanntes Ausgabeformat
+        """
+        eingabeformat = EINGABEFORMATE.get(request.mimetype)
+        if eingabeformat is None:
+            return _fehler(FEHLER_STROM_CONTENT_TYPE, 400)
+        ausgabeformat = request.args.get("format", "ndjson")
+        if ausgabeformat not in AUSGABEFORMATE:
+            return _fehler(FEHLER_STROM_FORMAT, 422)
+        zeilen = verarbeite_stromanfrage(
+            request.stream, eingabeformat, ausgabeformat
+        )
+        mimetype = "text/csv" if ausgabeformat == "csv" else "application/x-ndjson"
+        return Response(stream_with_context(zeilen), mimetype=mimetype)
+
+    @app.post("/api/calculate/compare")
+    def api_calculate_compare():
+        """
+        API-Endpoint: Szenarienvergleich
+
+        Request Body (JSON):
+            {
+                "szenarien": [ {...}, {...} ],    # Payloads wie /api/calculate
+                "referenz": int                   # optional, Standard 0
+            }
+
+        Gleichwertige Szenarien werden nur einmal berechnet. Die Antwort
+        enthält je Szenario die Differenz der finalen Dauer zur Referenz,
+        Obergrenze/§ 8 Abs. 3 und die geänderten Berechnungsschritte.
+
+        Responses:
+            200 OK: Vergleichstabelle (ungültige Szenarien mit "error")
+            400 Bad Request: Kein JSON oder fehlende Felder
+            422 Unprocessable Entity: Ungültige Liste oder Referenz
+        """
+        if not request.is_json:
+            return _ungueltiger_content_type()
+        data = request.get_json(force=True, silent=True) or {}
+        response = verarbeite_vergleichsanfrage(data)
+        return _json_antwort(response)
+
+    @app.post("/api/calculate/optimize")
+    def api_calculate_optimize():
+        """
+        API-Endpoint: Kleinste Auswahl an Verkürzungsgründen
+
+        Request Body (JSON): wie /api/calculate, ``verkuerzungsgruende`` mit
+        allen erfüllten Gründen; optional ``ziel_dauer_monate``.
+
+        Responses:
+            200 OK: Gewählte Gründe samt Ergebnis
+            400 Bad Request: Kein JSON oder fehlende Felder
+            422 Unprocessable Entity: Validierungsfehler oder Zieldauer
+            nicht erreichbar
+        """
+        if not request.is_json:
+            return _ungueltiger_content_type()
+        data = request.get_json(force=True, silent=True) or {}
+        response = verarbeite_optimierungsanfrage(data)
+        return _json_antwort(response)
+
+    @app.post("/api/calculate/exam")
+    def api_calculate_exam():
+        """
+        API-Endpoint: Dauer inklusive Schritt 4
+
+        Request Body (JSON): wie /api/calculate, zusätzlich
+        ``ausbildungsbeginn`` (JJJJ-MM-TT) und ``kammer``.
+
+        Responses:
+            200 OK: Berechnungsergebnis mit ``schritt4``
+            400 Bad Request: Kein JSON oder fehlende Felder
+            422 Unprocessable Entity: Validierungsfehler, unbekannte Kammer
+            oder kein Folgetermin im Prüfungskalender
+        """
+        if not request.is_json:
+            return _ungueltiger_content_type()
+        data = request.get_json(force=True, silent=True) or {}
+        response = verarbeite_pruefungsanfrage(data)
+        return _json_antwort(response)
+
+    @app.post("/api/calculate/phases")
+    def api_calculate_phases():
+        """
+        API-Endpoint: Verträge mit mehreren Teilzeitphasen
+
+        Request Body (JSON): ``basis_dauer_monate``, ``phasen`` (Liste mit
+        ``monate`` und ``teilzeit_prozent``/``teilzeit_stunden``/
+        ``unterbrechung``), optional ``vollzeit_stunden`` und
+        ``verkuerzungsgruende``; oder ``vertraege`` als Liste solcher Objekte.
+
+        Responses:
+            200 OK: Ergebnis bzw. eine Zeile je Vertrag
+            400 Bad Request: Kein JSON oder fehlende Felder
+            422 Unprocessable Entity: Validierungsfehler
+        """
+        if not request.is_json:
+            return _ungueltiger_content_type()
+        data = request.get_json(force=True, silent=True) or {}
+        response = verarbeite_phasenanfrage(data)
+        return _json_antwort(response)
+
+    @app.post("/api/calculate/phases/plan")
+    def api_calculate_phases_plan():
+        """
+        API-Endpoint: Phasenplan mit möglichst wenigen Wechseln
+
+        Request Body (JSON): ``basis_dauer_monate``, ``ziel_dauer_monate``,
+        optional ``verkuerzungsgruende``, ``verfuegbarkeit`` und
+        ``schrittweite_prozent``.
+
+        Responses:
+            200 OK: Vorgeschlagener Plan samt Ergebnis
+            400 Bad Request: Kein JSON oder fehlende Felder
+            422 Unprocessable Entity: Validierungsfehler oder Zieldauer
+            nicht erreichbar
+        """
+        if not request.is_json:
+            return _ungueltiger_content_type()
+        data = request.get_json(force=True, silent=True) or {}
+        response = verarbeite_phasenplananfrage(data)
+        return _json_antwort(response)
+
+    @app.post("/api/calculate/timeline")
+    def api_calculate_timeline():
+        """
+        API-Endpoint: Ausbildungsende und Monats-Zeitleiste
+
+        Request Body (JSON): wie /api/calculate, zusätzlich
+        ``ausbildungsbeginn`` (JJJJ-MM-TT) und optional ``kammer``
+        (Schritt 4). Query-Parameter ``format``: ``json`` (Standard),
+        ``csv`` oder ``ics``; CSV und ICS werden gestreamt.
+
+        Responses:
+            200 OK: Zeitleiste im gewünschten Format
+            400 Bad Request: Kein JSON oder fehlende Felder
+            422 Unprocessable Entity: Validierungsfehler oder
+            unbekanntes Format
+        """
+        if not request.is_json:
+            return _ungueltiger_content_type()
+        ausgabeformat = request.args.get("format", "json")
+        if ausgabeformat not in ZEITLEISTEN_FORMATE:
+            return _fehler(FEHLER_ZEITLEISTEN_FORMAT, 422)
+        data = request.get_json(force=True, silent=True) or {}
+        response = verarbeite_zeitleistenanfrage(data)
+        if response.status_code != 200 or ausgabeformat == "json":
+            return _json_antwort(response)
+        zeitleiste = response.ergebnis
+        if ausgabeformat == "csv":
+            return Response(zeitleiste.als_csv(), mimetype="text/csv")
+        return Response(zeitleiste.als_ics(), mimetype="text/calendar")
 
     return app
 
 
+def _json_antwort(response) -> Response:
+    """JSON-Response aus einer `BerechnungsDienstAntwort` (vorkodierte Bytes)."""
+    return Response(
+        response.to_bytes(),
+        status=response.status_code,
+        mimetype="application/json",
+    )
+
+
+def _fehler(body: bytes, status_code: int) -> Response:
+    """JSON-Response aus einem vorab kodierten Fehler-Body."""
+    return Response(body, status=status_code, mimetype="application/json")
+
+
+def _ungueltiger_content_type():
+    """Fehlerantwort (400) für Requests ohne JSON-Body."""
+    return _fehler(FEHLER_CONTENT_TYPE, 400)
+
+
 # ============================================================
 # Exportiere das Flask-App-Objekt für Tests und WSGI
 # ============================================================
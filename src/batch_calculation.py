@@ -0,0 +1,310 @@
+"""
+Vektorisierte Batch-Berechnung für Kohorten-Simulationen
+
+Berechnet die Gesamtdauer der Teilzeitausbildung für viele Verträge auf einmal.
+Statt `berechne_gesamtdauer()` pro Zeile in einer Python-Schleife aufzurufen,
+arbeiten Verkürzung, Schritt 1-3 und die Sonderregel § 8 Abs. 3 BBiG direkt auf
+NumPy-Spalten. Die Ergebnisse sind bitgleich zur skalaren Funktion.
+
+Die Verkürzungsgründe werden je Zeile als Bitmaske übergeben (siehe
+``GRUND_*``-Konstanten in `src.calculation_logic`).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict
+
+import numpy as np
+
+from .calculation_logic import (BERUF_MONATE_SHIFT, BERUF_Q2_STUFE_MASKE,
+                                BERUF_Q2_STUFE_SHIFT, GRUND_ABITUR,
+                                GRUND_ALTER_21, GRUND_BERUF_FELDER,
+                                GRUND_BERUF_Q1, GRUND_BERUF_Q3, GRUND_BERUF_Q4,
+                                GRUND_FAMILIEN_PFLEGE, GRUND_KINDERBETREUUNG,
+                                GRUND_REALSCHULE, GRUND_VORKENNTNISSE,
+                                MAX_AO_DAUER_MONATE,
+                                MAX_GESAMT_VERKUERZUNG_MONATE,
+                                MAX_VERLAENGERUNG_FAKTOR, MAX_VOLLZEIT_STUNDEN,
+                                MIN_AO_DAUER_MONATE, MIN_TEILZEIT_PROZENT,
+                                MIN_VOLLZEIT_STUNDEN,
+                                REGEL_8_ABS_3_TOLERANZ_MONATE,
+                                VERKUERZUNG_ABITUR, VERKUERZUNG_ALTER_21,
+                                VERKUERZUNG_FAMILIEN_PFLEGE,
+                                VERKUERZUNG_KINDERBETREUUNG,
+                                VERKUERZUNG_REALSCHULE,
+                                VERKUERZUNG_VORKENNTNISSE,
+                                berechne_schritte_exakt)
+
+logger = logging.getLogger(__name__)
+
+# Obergrenze als Bruch (1,5 = 3/2) für die Ganzzahlarithmetik in Schritt 3
+_OBERGRENZE_ZAEHLER, _OBERGRENZE_NENNER = MAX_VERLAENGERUNG_FAKTOR.as_integer_ratio()
+
+# Fehlercodes je Zeile (Reihenfolge entspricht der Prüfreihenfolge der Skalar-API)
+FEHLER_KEINER = 0
+FEHLER_AO_DAUER = 1
+FEHLER_VOLLZEIT = 2
+FEHLER_TEILZEIT_PROZENT = 3
+FEHLER_STUNDEN_MINIMUM = 4
+FEHLER_STUNDEN_MAXIMUM = 5
+FEHLER_EINGABETYP = 6
+
+FEHLERMELDUNGEN = {
+    FEHLER_AO_DAUER: (
+        "Ausbildungsdauer muss zwischen 24 und 42 Monaten liegen (IHK-Ausbildungen)"
+    ),
+    FEHLER_VOLLZEIT: "Vollzeit-Stunden müssen zwischen 10 und 48 Stunden liegen",
+    FEHLER_TEILZEIT_PROZENT: (
+        f"Teilzeit-Anteil muss zwischen {MIN_TEILZEIT_PROZENT}% "
+        f"und 100% liegen (§ 7a Abs. 1 Satz 3 BBiG)"
+    ),
+    FEHLER_STUNDEN_MINIMUM: (
+        "Wochenstunden müssen mindestens die Hälfte der regulären "
+        "Wochenstunden betragen (§ 7a Abs. 1 Satz 3 BBiG)"
+    ),
+    FEHLER_STUNDEN_MAXIMUM: (
+        "Wochenstunden dürfen die regulären Wochenstunden nicht überschreiten"
+    ),
+    FEHLER_EINGABETYP: "eingabetyp muss 'prozent' oder 'stunden' sein",
+}
+
+# Numerische Kodierung des Eingabetyps
+EINGABETYP_PROZENT = 0
+EINGABETYP_STUNDEN = 1
+
+# Monatswerte der beruflichen Einzelfragen (wie in `berechne_verkuerzung()`)
+_BERUF_Q1_Q3_MONATE = 12
+_BERUF_Q4_MONATE = 6
+_BERUF_Q2_STUFEN_MONATE = np.array([0, 6, 12, 12], dtype=np.int64)
+
+
+def _kodiere_eingabetyp(eingabetyp: Any) -> np.ndarray:
+    """Wandelt Eingabetypen ('prozent'/'stunden' oder 0/1) in Codes um.
+
+    Unbekannte Werte werden auf -1 abgebildet und später als
+    `FEHLER_EINGABETYP` markiert.
+    """
+    werte = np.asarray(eingabetyp)
+    if werte.dtype.kind in "USO":
+        return np.where(
+            werte == "prozent",
+            EINGABETYP_PROZENT,
+            np.where(werte == "stunden", EINGABETYP_STUNDEN, -1),
+        )
+    codes = werte.astype(np.int64)
+    gueltig = (codes == EINGABETYP_PROZENT) | (codes == EINGABETYP_STUNDEN)
+    return np.where(gueltig, codes, -1)
+
+
+def berechne_verkuerzung_batch(verkuerzungs_maske: Any) -> np.ndarray:
+    """
+    Berechnet die Summe der Verkürzungen (vor Begrenzung) je Bitmaske.
+
+    Entspricht dem zweiten Rückgabewert von `berechne_verkuerzung()`.
+
+    Args:
+        verkuerzungs_maske (array-like): Bitmasken der Verkürzungsgründe
+
+    Returns:
+        np.ndarray: Verkürzung in Monaten (int64) je Zeile
+    """
+    maske = np.asarray(verkuerzungs_maske, dtype=np.int64)
+
+    def gesetzt(bit: int) -> np.ndarray:
+        return (maske & bit) != 0
+
+    summe = (
+        gesetzt(GRUND_ABITUR) * VERKUERZUNG_ABITUR
+        + gesetzt(GRUND_REALSCHULE) * VERKUERZUNG_REALSCHULE
+        + gesetzt(GRUND_ALTER_21) * VERKUERZUNG_ALTER_21
+        + gesetzt(GRUND_KINDERBETREUUNG) * VERKUERZUNG_KINDERBETREUUNG
+        + gesetzt(GRUND_FAMILIEN_PFLEGE) * VERKUERZUNG_FAMILIEN_PFLEGE
+    )
+
+    # Vorkalkulierte Gesamtsumme des Clients hat Vorrang vor den Einzelfragen
+    beruf_monate = maske >> BERUF_MONATE_SHIFT
+    beruf_einzeln = (
+        gesetzt(GRUND_BERUF_Q1) * _BERUF_Q1_Q3_MONATE
+        + gesetzt(GRUND_BERUF_Q3) * _BERUF_Q1_Q3_MONATE
+        + gesetzt(GRUND_BERUF_Q4) * _BERUF_Q4_MONATE
+        + _BERUF_Q2_STUFEN_MONATE[
+            (maske >> BERUF_Q2_STUFE_SHIFT) & BERUF_Q2_STUFE_MASKE
+        ]
+    )
+    beruf_neu = np.where(beruf_monate != 0, beruf_monate, beruf_einzeln)
+    # Legacy-Verhalten: ohne neue Felder zählt nur 'vorkenntnisse_monate'
+    beruf_legacy = gesetzt(GRUND_VORKENNTNISSE) * VERKUERZUNG_VORKENNTNISSE
+    beruf = np.where(gesetzt(GRUND_BERUF_FELDER), beruf_neu, beruf_legacy)
+
+    return (summe + beruf).astype(np.int64)
+
+
+def _schritte_exakt_batch(
+    ok: np.ndarray, verkuerzte: Any, basis: Any, zaehler: Any, nenner: Any
+) -> np.ndarray:
+    """
+    Schritt 1-3 exakt je Zeile (0 in Fehlerzeilen).
+
+    Zeilen mit ganzzahligen Werten rechnet der Ganzzahl-Kernel vektorisiert in
+    ``int64``; die übrigen (z.B. 62,5 %) einzeln über `berechne_schritte_exakt()`.
+    """
+    werte = np.broadcast_arrays(verkuerzte, basis, zaehler, nenner)
+    finale_dauer = np.zeros(ok.shape, dtype=np.int64)
+    ganzzahlig = ok.copy()
+    for wert in werte:
+        ganzzahlig &= np.floor(wert) == wert
+    v, b, z, n = (wert[ganzzahlig].astype(np.int64) for wert in werte)
+    finale_dauer[ganzzahlig] = np.minimum(
+        v * n // z, b * _OBERGRENZE_ZAEHLER // _OBERGRENZE_NENNER
+    )
+    for index in zip(*np.nonzero(ok & ~ganzzahlig)):
+        finale_dauer[index] = berechne_schritte_exakt(
+            *(wert[index].item() for wert in werte)
+        )
+    return finale_dauer
+
+
+def berechne_gesamtdauer_batch(
+    basis_dauer_monate: Any,
+    vollzeit_stunden: Any,
+    teilzeit_eingabe: Any,
+    eingabetyp: Any,
+    verkuerzungs_maske: Any,
+) -> Dict[str, np.ndarray]:
+    """
+    Batch-Variante von `berechne_gesamtdauer()` über NumPy-Spalten.
+
+    Alle Argumente sind gleich lange Arrays (oder Skalare, die auf die
+    Batch-Länge gebroadcastet werden). Ungültige Zeilen lösen keine Exception
+    aus, sondern werden über die Spalte ``fehlercode`` markiert.
+
+    Args:
+        basis_dauer_monate (array-like): Reguläre Ausbildungsdauer (AO) je Zeile
+        vollzeit_stunden (array-like): Wochenstunden bei Vollzeit
+        teilzeit_eingabe (array-like): Teilzeit als Prozentsatz oder Stunden
+        eingabetyp (array-like): 'prozent'/'stunden' bzw. EINGABETYP_* Codes
+        verkuerzungs_maske (array-like): Bitmaske der Verkürzungsgründe
+
+    Returns:
+        dict: Spalten mit denselben Keys wie `berechne_gesamtdauer()` sowie
+        ``fehlercode`` (FEHLER_*). In Fehlerzeilen sind Monatswerte 0,
+        Gleitkommawerte NaN und Flags False.
+
+    Beispiel:
+        >>> spalten = berechne_gesamtdauer_batch(
+        ...     [36, 36], [40, 40], [75, 30], ["prozent", "stunden"],
+        ...     [GRUND_ABITUR, 0],
+        ... )
+        >>> spalten["finale_dauer_monate"]
+        array([32, 48])
+    """
+    basis, vollzeit, teilzeit, typ, maske = np.broadcast_arrays(
+        np.asarray(basis_dauer_monate),
+        np.asarray(vollzeit_stunden, dtype=np.float64),
+        np.asarray(teilzeit_eingabe, dtype=np.float64),
+        _kodiere_eingabetyp(eingabetyp),
+        np.asarray(verkuerzungs_maske, dtype=np.int64),
+    )
+    if basis.dtype.kind not in "iuf":
+        raise TypeError("Ausbildungsdauer muss eine Zahl sein")
+
+    ist_stunden = typ == EINGABETYP_STUNDEN
+
+    # Eingabevalidierung: erster zutreffender Fehler gewinnt (wie in der Skalar-API)
+    fehlercode = np.zeros(basis.shape, dtype=np.int8)
+    pruefungen = (
+        (
+            (basis < MIN_AO_DAUER_MONATE) | (basis > MAX_AO_DAUER_MONATE),
+            FEHLER_AO_DAUER,
+        ),
+        (
+            (vollzeit < MIN_VOLLZEIT_STUNDEN) | (vollzeit > MAX_VOLLZEIT_STUNDEN),
+            FEHLER_VOLLZEIT,
+        ),
+        (
+            (typ == EINGABETYP_PROZENT)
+            & ((teilzeit < MIN_TEILZEIT_PROZENT) | (teilzeit > 100)),
+            FEHLER_TEILZEIT_PROZENT,
+        ),
+        (ist_stunden & (teilzeit < vollzeit / 2), FEHLER_STUNDEN_MINIMUM),
+        (ist_stunden & (teilzeit > vollzeit), FEHLER_STUNDEN_MAXIMUM),
+        (typ == -1, FEHLER_EINGABETYP),
+    )
+    for bedingung, code in pruefungen:
+        fehlercode[(fehlercode == FEHLER_KEINER) & bedingung] = code
+    ok = fehlercode == FEHLER_KEINER
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Teilzeit-Eingabe verarbeiten (Prozentsatz oder Stunden)
+        teilzeit_prozent = np.where(ist_stunden, (teilzeit / vollzeit) * 100, teilzeit)
+        teilzeit_stunden = np.where(
+            ist_stunden, teilzeit, vollzeit * (teilzeit / 100.0)
+        )
+
+        # Schritt 0: Verkürzung anwenden
+        verkuerzung_ohne_begrenzung = berechne_verkuerzung_batch(maske)
+        verkuerzung_final = np.minimum(
+            verkuerzung_ohne_begrenzung, MAX_GESAMT_VERKUERZUNG_MONATE
+        )
+        verkuerzte_dauer = np.maximum(basis - verkuerzung_final, 0)
+
+        # Schritt 1: Automatische Verlängerung durch Teilzeit
+        nach_schritt1 = verkuerzte_dauer / (teilzeit_prozent / 100.0)
+
+        # Schritt 2: Gesetzliche Obergrenze anwenden
+        obergrenze = basis * MAX_VERLAENGERUNG_FAKTOR
+        nach_schritt2 = np.where(obergrenze < nach_schritt1, obergrenze, nach_schritt1)
+
+        # Schritt 3: Auf ganze Monate abrunden (exakt wie `berechne_schritte_exakt()`)
+        finale_dauer = _schritte_exakt_batch(
+            ok,
+            verkuerzte_dauer,
+            basis,
+            teilzeit,
+            np.where(ist_stunden, vollzeit, 100.0),
+        )
+
+    # Sonderregel § 8 Abs. 3 BBiG (nur ohne Verkürzung, Überschreitung höchstens
+    # REGEL_8_ABS_3_TOLERANZ_MONATE)
+    regel_8_abs_3 = (
+        ok
+        & (verkuerzte_dauer == basis)
+        & (finale_dauer > basis)
+        & (finale_dauer - basis <= REGEL_8_ABS_3_TOLERANZ_MONATE)
+    )
+    finale_dauer = np.where(regel_8_abs_3, basis, finale_dauer)
+
+    spalten = {
+        "original_dauer_monate": basis,
+        "verkuerzte_dauer_monate": verkuerzte_dauer,
+        "teilzeit_prozent": teilzeit_prozent,
+        "teilzeit_stunden": teilzeit_stunden,
+        "nach_schritt1_monate": nach_schritt1,
+        "nach_schritt2_monate": nach_schritt2,
+        "finale_dauer_monate": finale_dauer,
+        "finale_dauer_jahre": np.round(finale_dauer / 12.0, 1),
+        "wochenstunden": teilzeit_stunden,
+        "verkuerzung_gesamt_monate": basis - verkuerzte_dauer,
+        "verlaengerung_durch_teilzeit_monate": finale_dauer - verkuerzte_dauer,
+        "verkuerzung_gesamt_ohne_begrenzung": verkuerzung_ohne_begrenzung,
+        "regel_8_abs_3_angewendet": regel_8_abs_3,
+    }
+    # Fehlerzeilen neutralisieren, damit keine Teilergebnisse weiterverwendet werden
+    for key, spalte in spalten.items():
+        if key == "original_dauer_monate":
+            continue
+        if spalte.dtype.kind == "f":
+            spalten[key] = np.where(ok, spalte, np.nan)
+        elif spalte.dtype.kind == "b":
+            spalten[key] = spalte & ok
+        else:
+            spalten[key] = np.where(ok, spalte, 0)
+    spalten["fehlercode"] = fehlercode
+
+    logger.info(
+        "Batch-Berechnung abgeschlossen | zeilen=%d fehler=%d",
+        int(fehlercode.size),
+        int(np.count_nonzero(~ok)),
+    )
+    return spalten
@@ -9,6 +9,17 @@ Basierend auf der Empfehlung des Hauptausschusses des Bundesinstituts
 für Berufsbildung vom 10. Juni 2021
 """
 
+import json
+import logging
+import math
+from array import array
+from collections.abc import Mapping
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
 # ============================================================================
 # KONSTANTEN (gemäß BBiG § 7a und § 8)
 # ============================================================================
@@ -32,6 +43,118 @@ MIN_TEILZEIT_PROZENT = 50  # § 7a Abs. 1 Satz 3 BBiG - Mindestens 50% der Vollz
 MAX_VERLAENGERUNG_FAKTOR = (
     1.5  # § 7a Abs. 2 Satz 1 BBiG - Höchstens 1,5-fache der AO-Dauer
 )
+# § 8 Abs. 3 BBiG - Überschreitung der AO-Dauer, bei der die AO-Dauer gilt
+REGEL_8_ABS_3_TOLERANZ_MONATE = 6
+
+# Gültige Wertebereiche der Eingaben (gemäß HTML-Eingabefeldern, IHK: 24-42 Monate)
+MIN_AO_DAUER_MONATE = 24
+MAX_AO_DAUER_MONATE = 42
+MIN_VOLLZEIT_STUNDEN = 10
+MAX_VOLLZEIT_STUNDEN = 48
+
+# Bitmaske der Verkürzungsgründe (kompakte Darstellung für Batch-Berechnungen)
+GRUND_ABITUR = 1 << 0
+GRUND_REALSCHULE = 1 << 1
+GRUND_ALTER_21 = 1 << 2
+GRUND_KINDERBETREUUNG = 1 << 3
+GRUND_FAMILIEN_PFLEGE = 1 << 4
+GRUND_VORKENNTNISSE = 1 << 5  # Legacy-Feld 'vorkenntnisse_monate' > 0
+GRUND_BERUF_FELDER = 1 << 6  # Neue berufliche Felder vorhanden (beruf_q*)
+GRUND_BERUF_Q1 = 1 << 7
+GRUND_BERUF_Q3 = 1 << 8
+GRUND_BERUF_Q4 = 1 << 9
+GRUND_BERUF_Q2 = 1 << 10
+# Bits 11-12: Stufe von beruf_q2 (0 = unter 6, 1 = 6 Monate, 2 = 12 Monate)
+BERUF_Q2_STUFE_SHIFT = 11
+BERUF_Q2_STUFE_MASKE = 0b11
+# Ab Bit 13: 'berufliche_verkuerzung_monate' als ganze Zahl (mit Vorzeichen)
+BERUF_MONATE_SHIFT = 13
+
+# ============================================================================
+# ERGEBNISDATENSATZ
+# ============================================================================
+
+# Keys des Ergebnisses in der Reihenfolge des bisherigen Dictionaries
+ERGEBNIS_KEYS = (
+    "original_dauer_monate",
+    "verkuerzte_dauer_monate",
+    "teilzeit_prozent",
+    "teilzeit_stunden",
+    "nach_schritt1_monate",
+    "nach_schritt2_monate",
+    "finale_dauer_monate",
+    "finale_dauer_jahre",
+    "wochenstunden",
+    "verkuerzung_gesamt_monate",
+    "verlaengerung_durch_teilzeit_monate",
+    "verkuerzung_gesamt_ohne_begrenzung",
+    "regel_8_abs_3_angewendet",
+)
+_ERGEBNIS_KEY_MENGE = frozenset(ERGEBNIS_KEYS)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Berechnungsergebnis(Mapping):
+    """
+    Unveränderliches Ergebnis von `berechne_gesamtdauer()`.
+
+    Speichert nur die neun unabhängigen Werte in Slots; abgeleitete Werte
+    (Jahre, Verkürzung, Verlängerung, `wochenstunden`) werden bei Zugriff
+    berechnet. Für Kompatibilität verhält sich der Datensatz wie das
+    bisherige Dictionary (``ergebnis["finale_dauer_monate"]``, ``get``,
+    ``items``, Vergleich mit ``dict``); die Dictionary- bzw. JSON-Form wird
+    erst mit `to_dict()` / `to_json()` erzeugt.
+    """
+
+    original_dauer_monate: int
+    verkuerzte_dauer_monate: int
+    teilzeit_prozent: float
+    teilzeit_stunden: float
+    nach_schritt1_monate: float
+    nach_schritt2_monate: float
+    finale_dauer_monate: int
+    verkuerzung_gesamt_ohne_begrenzung: int
+    regel_8_abs_3_angewendet: bool
+
+    @property
+    def finale_dauer_jahre(self):
+        """Finale Dauer in Jahren (gerundet auf 1 Dezimale)."""
+        return round(self.finale_dauer_monate / 12.0, 1)
+
+    @property
+    def wochenstunden(self):
+        """Tatsächliche Wochenstunden (gleich `teilzeit_stunden`)."""
+        return self.teilzeit_stunden
+
+    @property
+    def verkuerzung_gesamt_monate(self):
+        """Gesamte (begrenzte) Verkürzung in Monaten."""
+        return self.original_dauer_monate - self.verkuerzte_dauer_monate
+
+    @property
+    def verlaengerung_durch_teilzeit_monate(self):
+        """Verlängerung durch Teilzeit gegenüber der verkürzten Dauer."""
+        return self.finale_dauer_monate - self.verkuerzte_dauer_monate
+
+    def __getitem__(self, key):
+        if key not in _ERGEBNIS_KEY_MENGE:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(ERGEBNIS_KEYS)
+
+    def __len__(self):
+        return len(ERGEBNIS_KEYS)
+
+    def to_dict(self):
+        """Erzeugt das Ergebnis als Dictionary (Keys wie `ERGEBNIS_KEYS`)."""
+        return {key: getattr(self, key) for key in ERGEBNIS_KEYS}
+
+    def to_json(self):
+        """Erzeugt das Ergebnis als JSON-String."""
+        return json.dumps(self.to_dict())
+
 
 # ============================================================================
 # BERECHNUNGSFUNKTIONEN
@@ -146,6 +269,79 @@ def berechne_verkuerzung(basis_dauer_monate, verkuerzungsgruende):
     return verkuerzte_dauer, verkuerzung_gesamt
 
 
+def _monate_allgemeiner_gruende(maske):
+    """Summe der nicht-beruflichen Verkürzungsgründe einer Bitmaske."""
+    return (
+        VERKUERZUNG_ABITUR * bool(maske & GRUND_ABITUR)
+        + VERKUERZUNG_REALSCHULE * bool(maske & GRUND_REALSCHULE)
+        + VERKUERZUNG_ALTER_21 * bool(maske & GRUND_ALTER_21)
+        + VERKUERZUNG_KINDERBETREUUNG * bool(maske & GRUND_KINDERBETREUUNG)
+        + VERKUERZUNG_FAMILIEN_PFLEGE * bool(maske & GRUND_FAMILIEN_PFLEGE)
+    )
+
+
+def _monate_beruflicher_fragen(maske):
+    """Summe der beruflichen Einzelfragen (q1, q3, q4, q2-Stufe) einer Bitmaske."""
+    stufe = (maske >> BERUF_Q2_STUFE_SHIFT) & BERUF_Q2_STUFE_MASKE
+    return (
+        12 * bool(maske & GRUND_BERUF_Q1)
+        + 12 * bool(maske & GRUND_BERUF_Q3)
+        + 6 * bool(maske & GRUND_BERUF_Q4)
+        + (12 if stufe >= 2 else 6 if stufe == 1 else 0)
+    )
+
+
+# Vorberechnete Monatssummen je Teilmaske (kleine Ganzzahl als Tabellenindex)
+_BITS_ALLGEMEIN = GRUND_BERUF_FELDER - 1 - GRUND_VORKENNTNISSE
+_BERUF_FRAGEN_SHIFT = 7  # Bit von GRUND_BERUF_Q1
+_MONATE_ALLGEMEIN = tuple(
+    _monate_allgemeiner_gruende(m) for m in range(_BITS_ALLGEMEIN + 1)
+)
+_MONATE_BERUF_FRAGEN = tuple(
+    _monate_beruflicher_fragen(m << _BERUF_FRAGEN_SHIFT)
+    for m in range(1 << (BERUF_MONATE_SHIFT - _BERUF_FRAGEN_SHIFT))
+)
+_BITS_BERUF_FRAGEN = len(_MONATE_BERUF_FRAGEN) - 1
+
+
+def berechne_verkuerzung_aus_maske(basis_dauer_monate, verkuerzungs_maske):
+    """
+    Berechnet die Verkürzung wie `berechne_verkuerzung()`, aber direkt auf
+    der Bitmaske der Verkürzungsgründe (``GRUND_*``-Konstanten).
+
+    Die Monatswerte der Teilmasken werden aus vorberechneten Tabellen gelesen,
+    es entstehen keine Dictionaries pro Aufruf.
+
+    Args:
+        basis_dauer_monate (int): Reguläre Ausbildungsdauer in Monaten (gemäß AO)
+        verkuerzungs_maske (int): Bitmaske der Verkürzungsgründe
+
+    Returns:
+        tuple: (verkürzte Dauer, Gesamtverkürzung vor Begrenzung)
+
+    Beispiel:
+        >>> berechne_verkuerzung_aus_maske(36, GRUND_ABITUR | GRUND_ALTER_21)
+        (24, 24)
+    """
+    verkuerzung_gesamt = _MONATE_ALLGEMEIN[verkuerzungs_maske & _BITS_ALLGEMEIN]
+
+    if verkuerzungs_maske & GRUND_BERUF_FELDER:
+        # Vorkalkulierte Gesamtsumme des Clients hat Vorrang vor den Einzelfragen
+        verkuerzung_gesamt += (
+            verkuerzungs_maske >> BERUF_MONATE_SHIFT
+            or _MONATE_BERUF_FRAGEN[
+                (verkuerzungs_maske >> _BERUF_FRAGEN_SHIFT) & _BITS_BERUF_FRAGEN
+            ]
+        )
+    elif verkuerzungs_maske & GRUND_VORKENNTNISSE:
+        verkuerzung_gesamt += VERKUERZUNG_VORKENNTNISSE
+
+    verkuerzung_final = min(verkuerzung_gesamt, MAX_GESAMT_VERKUERZUNG_MONATE)
+    verkuerzte_dauer = max(basis_dauer_monate - verkuerzung_final, 0)
+
+    return verkuerzte_dauer, verkuerzung_gesamt
+
+
 def berechne_teilzeit_schritt1(verkuerzte_dauer_monate, teilzeit_prozent):
     """
     Schritt 1: Berechnet die automatische Verlängerung durch Teilzeit
@@ -241,11 +437,110 @@ def rundung_anwenden_schritt3(dauer_monate: float) -> int:
         >>> rundung_anwenden_schritt3(48.0)
         48
     """
-    import math
-
     return math.floor(dauer_monate)
 
 
+# Obergrenze als Bruch (1,5 = 3/2) für die Ganzzahlarithmetik
+_OBERGRENZE_ZAEHLER, _OBERGRENZE_NENNER = MAX_VERLAENGERUNG_FAKTOR.as_integer_ratio()
+
+
+def berechne_schritte_ganzzahlig(
+    verkuerzte_dauer_monate: int,
+    original_ao_dauer_monate: int,
+    anteil_zaehler: int,
+    anteil_nenner: int = 100,
+) -> int:
+    """
+    Schritt 1-3 exakt in Ganzzahlarithmetik.
+
+    Der Teilzeitanteil wird als Bruch ``anteil_zaehler / anteil_nenner``
+    übergeben: Prozent als ``(prozent, 100)``, Stunden als
+    ``(teilzeit_stunden, vollzeit_stunden)``. Berechnet wird
+
+        min(floor(Dauer * Nenner / Zähler), floor(AO-Dauer * 3 / 2))
+
+    ohne Gleitkommazahlen, Importe oder Logger-Zugriffe pro Aufruf. Die
+    Kette `berechne_teilzeit_schritt1()` → `obergrenze_anwenden_schritt2()` →
+    `rundung_anwenden_schritt3()` liefert bei rechnerisch ganzzahligen Dauern,
+    die als Gleitkommazahl knapp darunter liegen (z.B. 17 / 0,68 =
+    24,999999999999996), einen Monat weniger; die Berechnung verwendet daher
+    den Kernel (siehe ``scripts/benchmark_integer_kernel.py``).
+
+    Args:
+        verkuerzte_dauer_monate (int): Verkürzte Ausbildungsdauer in Monaten
+        original_ao_dauer_monate (int): Original-Ausbildungsdauer gemäß AO
+        anteil_zaehler (int): Zähler des Teilzeitanteils (Prozent oder Stunden)
+        anteil_nenner (int): Nenner des Teilzeitanteils (100 oder Vollzeitstunden)
+
+    Returns:
+        int: Dauer nach Schritt 3 in ganzen Monaten
+
+    Beispiel:
+        >>> berechne_schritte_ganzzahlig(36, 36, 70)
+        51
+        >>> berechne_schritte_ganzzahlig(36, 36, 20, 40)
+        54
+    """
+    return min(
+        verkuerzte_dauer_monate * anteil_nenner // anteil_zaehler,
+        original_ao_dauer_monate * _OBERGRENZE_ZAEHLER // _OBERGRENZE_NENNER,
+    )
+
+
+def berechne_schritte_exakt(
+    verkuerzte_dauer_monate,
+    original_ao_dauer_monate,
+    anteil_zaehler,
+    anteil_nenner=100,
+) -> int:
+    """
+    Schritt 1-3 exakt, auch für Gleitkomma-Eingaben.
+
+    Ganzzahlige Eingaben rechnet `berechne_schritte_ganzzahlig()` direkt;
+    sonst werden alle Werte bitgenau als `fractions.Fraction` übergeben
+    (z.B. 62,5 % oder 37,5 Stunden).
+
+    Beispiel:
+        >>> berechne_schritte_exakt(17, 36, 68)
+        25
+        >>> berechne_schritte_exakt(30, 36, 62.5)
+        48
+    """
+    if (
+        type(verkuerzte_dauer_monate) is int
+        and type(original_ao_dauer_monate) is int
+        and type(anteil_zaehler) is int
+        and type(anteil_nenner) is int
+    ):
+        return berechne_schritte_ganzzahlig(
+            verkuerzte_dauer_monate,
+            original_ao_dauer_monate,
+            anteil_zaehler,
+            anteil_nenner,
+        )
+    return berechne_schritte_ganzzahlig(
+        Fraction(verkuerzte_dauer_monate),
+        Fraction(original_ao_dauer_monate),
+        Fraction(anteil_zaehler),
+        Fraction(anteil_nenner),
+    )
+
+
+def teilzeit_anteil(vollzeit_stunden, teilzeit_eingabe, eingabetyp="prozent"):
+    """
+    Teilzeitanteil als Bruch (Zähler, Nenner) für `berechne_schritte_exakt()`.
+
+    Beispiel:
+        >>> teilzeit_anteil(40, 75)
+        (75, 100)
+        >>> teilzeit_anteil(40, 30, "stunden")
+        (30, 40)
+    """
+    if eingabetyp == "stunden":
+        return teilzeit_eingabe, vollzeit_stunden
+    return teilzeit_eingabe, 100
+
+
 def berechne_teilzeit_prozent(vollzeit_stunden, teilzeit_stunden):
     """
     Berechnet den Teilzeit-Prozentsatz basierend auf Vollzeit- und Teilzeitstunden
@@ -303,18 +598,25 @@ def berechne_gesamtdauer(
     3. Gesetzliche Obergrenze prüfen (Schritt 2)
     4. Auf ganze Monate abrunden (Schritt 3)
 
-    Schritt 4 (Verlängerung bis zur nächsten Prüfung) ist optional und
-    wird hier nicht implementiert, da er von konkreten Prüfungsterminen abhängt.
+    Schritt 4 (Verlängerung bis zur nächsten Prüfung) ist optional und hängt
+    von den Prüfungsterminen der Kammer ab; er wird auf das Ergebnis über
+    `src.exam_calendar.verlaengere_bis_pruefung()` angewendet.
+
+    Bei ganzzahligen Eingaben werden Schritt 1-3 nicht einzeln ausgeführt,
+    sondern aus der vorberechneten Ergebnistabelle gelesen (siehe
+    `verifiziere_ergebnistabelle()`); alle übrigen Eingaben laufen live.
 
     Args:
         basis_dauer_monate (int): Reguläre Ausbildungsdauer in Monaten (gemäß AO)
         vollzeit_stunden (float): Wochenstunden bei Vollzeit
         teilzeit_eingabe (float): Teilzeit-Eingabe (Prozentsatz ODER Stunden)
-        verkuerzungsgruende (dict): Dictionary mit Verkürzungsgründen
+        verkuerzungsgruende (dict | int): Dictionary mit Verkürzungsgründen
+            oder deren Bitmaske (siehe ``GRUND_*``-Konstanten)
         eingabetyp (str): 'prozent' oder 'stunden' - Art der Teilzeit-Eingabe
 
     Returns:
-        dict: Alle Berechnungsergebnisse mit folgenden Keys:
+        Berechnungsergebnis: Alle Berechnungsergebnisse (dict-kompatibel,
+        siehe `Berechnungsergebnis.to_dict()`) mit folgenden Keys:
             - 'original_dauer_monate': Original AO-Dauer
             - 'verkuerzte_dauer_monate': Dauer nach Verkürzung
             - 'teilzeit_prozent': Vereinbarter Teilzeit-Prozentsatz
@@ -359,11 +661,17 @@ def berechne_gesamtdauer(
         raise TypeError("Teilzeit-Wert muss eine Zahl sein")
 
     # Wert-Validierung: Gültige Bereiche gemäß HTML-Eingabefeldern (IHK: 24-42 Monate)
-    if basis_dauer_monate < 24 or basis_dauer_monate > 42:
+    if (
+        basis_dauer_monate < MIN_AO_DAUER_MONATE
+        or basis_dauer_monate > MAX_AO_DAUER_MONATE
+    ):
         raise ValueError(
             "Ausbildungsdauer muss zwischen 24 und 42 Monaten liegen (IHK-Ausbildungen)"
         )
-    if vollzeit_stunden < 10 or vollzeit_stunden > 48:
+    if (
+        vollzeit_stunden < MIN_VOLLZEIT_STUNDEN
+        or vollzeit_stunden > MAX_VOLLZEIT_STUNDEN
+    ):
         raise ValueError("Vollzeit-Stunden müssen zwischen 10 und 48 Stunden liegen")
 
     # Zusätzliche Validierung je nach eingabetyp
@@ -402,68 +710,428 @@ def berechne_gesamtdauer(
         teilzeit_stunden = berechne_teilzeit_stunden(vollzeit_stunden, teilzeit_eingabe)
 
     # Schritt 0: Verkürzung anwenden (BEVOR Teilzeit berechnet wird)
-    verkuerzte_dauer, verkuerzung_gesamt_ohne_begrenzung = \
-        berechne_verkuerzung(
+    if isinstance(verkuerzungsgruende, int):
+        verkuerzte_dauer, verkuerzung_gesamt_ohne_begrenzung = \
+            berechne_verkuerzung_aus_maske(
+                basis_dauer_monate,
+                verkuerzungsgruende
+            )
+    else:
+        verkuerzte_dauer, verkuerzung_gesamt_ohne_begrenzung = \
+            berechne_verkuerzung(
+                basis_dauer_monate,
+                verkuerzungsgruende
+            )
+
+    # Schritt 1-3 und Sonderregel § 8 Abs. 3: Bei ganzzahligen Eingaben aus der
+    # vorberechneten Ergebnistabelle, sonst über die Einzelschritte
+    schritte = _schritte_aus_tabelle(
+        basis_dauer_monate,
+        verkuerzte_dauer,
+        vollzeit_stunden,
+        teilzeit_eingabe,
+        eingabetyp,
+    )
+    if schritte is None:
+        schritte = _fuehre_schritte_aus(
+            verkuerzte_dauer,
+            teilzeit_prozent,
             basis_dauer_monate,
-            verkuerzungsgruende
+            teilzeit_anteil(vollzeit_stunden, teilzeit_eingabe, eingabetyp),
         )
+    nach_schritt1, nach_schritt2, finale_dauer, regel_8_abs_3_angewendet = schritte
+
+    # Ergebnis zusammenstellen (abgeleitete Werte berechnet der Datensatz selbst)
+    result = Berechnungsergebnis(
+        original_dauer_monate=basis_dauer_monate,
+        verkuerzte_dauer_monate=verkuerzte_dauer,
+        teilzeit_prozent=teilzeit_prozent,
+        teilzeit_stunden=teilzeit_stunden,
+        nach_schritt1_monate=nach_schritt1,
+        nach_schritt2_monate=nach_schritt2,
+        finale_dauer_monate=finale_dauer,
+        verkuerzung_gesamt_ohne_begrenzung=verkuerzung_gesamt_ohne_begrenzung,
+        regel_8_abs_3_angewendet=regel_8_abs_3_angewendet,
+    )
 
+    # PII-sicheres Ergebnis-Logging (nur Flags/Verlauf, keine Rohinputs)
+    try:  # pragma: no cover - Logging darf Tests nicht beeinflussen
+        logger.info(
+            "Berechnung abgeschlossen | cap_applied=%s regel_8_abs_3=%s",
+            nach_schritt2 < nach_schritt1,
+            regel_8_abs_3_angewendet,
+        )
+    except Exception:
+        pass
+
+    return result
+
+
+def _fuehre_schritte_aus(
+    verkuerzte_dauer, teilzeit_prozent, basis_dauer_monate, anteil=None
+):
+    """
+    Führt Schritt 1-3 sowie die Sonderregel § 8 Abs. 3 BBiG live aus.
+
+    Schritt 1 und 2 liefern die ausgegebenen Gleitkommawerte; die finale Dauer
+    rechnet `berechne_schritte_exakt()` ohne Rundungsfehler.
+
+    Args:
+        verkuerzte_dauer (int): Dauer nach Verkürzung in Monaten
+        teilzeit_prozent (float): Teilzeit-Prozentsatz (50-100)
+        basis_dauer_monate (int): Original-Ausbildungsdauer gemäß AO
+        anteil (tuple | None): Teilzeitanteil als (Zähler, Nenner), z.B.
+            (Teilzeitstunden, Vollzeitstunden); Standard (teilzeit_prozent, 100)
+
+    Returns:
+        tuple: (nach_schritt1, nach_schritt2, finale_dauer, regel_8_abs_3_angewendet)
+    """
     # Schritt 1: Automatische Verlängerung durch Teilzeit
     nach_schritt1 = berechne_teilzeit_schritt1(verkuerzte_dauer, teilzeit_prozent)
 
     # Schritt 2: Gesetzliche Obergrenze anwenden
     nach_schritt2 = obergrenze_anwenden_schritt2(nach_schritt1, basis_dauer_monate)
 
-    # Schritt 3: Auf ganze Monate abrunden
-    finale_dauer = rundung_anwenden_schritt3(nach_schritt2)
+    # Schritt 3: Auf ganze Monate abrunden (exakt über den Ganzzahl-Kernel)
+    finale_dauer = berechne_schritte_exakt(
+        verkuerzte_dauer, basis_dauer_monate, *(anteil or (teilzeit_prozent, 100))
+    )
+
+    finale_dauer, regel_8_abs_3_angewendet = _wende_regel_8_abs_3_an(
+        verkuerzte_dauer, finale_dauer, basis_dauer_monate
+    )
+
+    return nach_schritt1, nach_schritt2, finale_dauer, regel_8_abs_3_angewendet
+
 
-    # Sonderregel § 8 Abs. 3 BBiG:
+def _wende_regel_8_abs_3_an(verkuerzte_dauer, finale_dauer, basis_dauer_monate):
+    """
+    Sonderregel § 8 Abs. 3 BBiG auf die Dauer nach Schritt 3 anwenden.
+
+    Returns:
+        tuple: (finale Dauer, regel_8_abs_3_angewendet)
+    """
     # Nur anwenden, wenn KEINE Verkürzungsgründe die Regeldauer bereits verkürzt haben.
     # Wenn die berechnete Ausbildungsdauer die Regelausbildungszeit um höchstens
     # 6 Monate überschreitet, ist die Regelausbildungszeit als Ergebnis zu setzen.
-    regel_8_abs_3_angewendet = False
     if verkuerzte_dauer == basis_dauer_monate and finale_dauer > basis_dauer_monate:
         differenz = finale_dauer - basis_dauer_monate
-        if differenz <= 6:
-            finale_dauer = basis_dauer_monate
-            regel_8_abs_3_angewendet = True
-
-    # Zusätzliche Informationen berechnen
-    verkuerzung_gesamt = basis_dauer_monate - verkuerzte_dauer
-    verlaengerung_durch_teilzeit = finale_dauer - verkuerzte_dauer
-
-    # Ergebnis zusammenstellen
-    result = {
-        "original_dauer_monate": basis_dauer_monate,
-        "verkuerzte_dauer_monate": verkuerzte_dauer,
-        "teilzeit_prozent": teilzeit_prozent,
-        "teilzeit_stunden": teilzeit_stunden,
-        "nach_schritt1_monate": nach_schritt1,
-        "nach_schritt2_monate": nach_schritt2,
-        "finale_dauer_monate": finale_dauer,
-        "finale_dauer_jahre": round(finale_dauer / 12.0, 1),
-        "wochenstunden": teilzeit_stunden,  # Gleiche wie teilzeit_stunden
-        "verkuerzung_gesamt_monate": verkuerzung_gesamt,
-        "verlaengerung_durch_teilzeit_monate": verlaengerung_durch_teilzeit,
-        "verkuerzung_gesamt_ohne_begrenzung": verkuerzung_gesamt_ohne_begrenzung,
-        "regel_8_abs_3_angewendet": regel_8_abs_3_angewendet,
-    }
+        if differenz <= REGEL_8_ABS_3_TOLERANZ_MONATE:
+            return basis_dauer_monate, True
+    return finale_dauer, False
 
-    # PII-sicheres Ergebnis-Logging (nur Flags/Verlauf, keine Rohinputs)
-    try:  # pragma: no cover - Logging darf Tests nicht beeinflussen
-        import logging as _logging
 
-        logger = _logging.getLogger("src.calculation_logic")
-        cap_applied = nach_schritt2 < nach_schritt1
-        logger.info(
-            "Berechnung abgeschlossen | cap_applied=%s regel_8_abs_3=%s",
-            str(bool(cap_applied)),
-            str(bool(regel_8_abs_3_angewendet)),
+# ============================================================================
+# ERGEBNISTABELLE (vorberechneter Definitionsbereich)
+# ============================================================================
+#
+# Der gültige Eingaberaum ist klein und beschränkt: AO-Dauer 24-42 Monate,
+# effektive Verkürzung 0-MAX_GESAMT_VERKUERZUNG_MONATE, Teilzeit 50-100 %
+# bzw. ganzzahlige Stunden zwischen halber und voller Vollzeit (10-48 h).
+# Für jede ganzzahlige Kombination werden die Ergebnisse von Schritt 1-3 einmalig
+# berechnet und kompakt in Arrays abgelegt:
+#   - ``array('d')``: Dauer nach Schritt 1 (Gleitkommawert, bitgenau)
+#   - ``array('B')``: Bits 0-5 finale Dauer, Bit 6 Obergrenze, Bit 7 § 8 Abs. 3
+
+_ANZAHL_AO_DAUERN = MAX_AO_DAUER_MONATE - MIN_AO_DAUER_MONATE + 1
+_ANZAHL_VERKUERZUNGEN = MAX_GESAMT_VERKUERZUNG_MONATE + 1
+_ANZAHL_PROZENTE = 100 - MIN_TEILZEIT_PROZENT + 1
+
+_BIT_OBERGRENZE = 1 << 6
+_BIT_REGEL_8_ABS_3 = 1 << 7
+_MASKE_FINALE_DAUER = _BIT_OBERGRENZE - 1
+
+
+def _stunden_bereiche():
+    """Ermittelt je Vollzeit-Stundenzahl den Offset und die Mindeststunden."""
+    offsets = {}
+    offset = 0
+    for vollzeit in range(MIN_VOLLZEIT_STUNDEN, MAX_VOLLZEIT_STUNDEN + 1):
+        min_stunden = math.ceil(vollzeit / 2)
+        offsets[vollzeit] = (offset, min_stunden)
+        offset += vollzeit - min_stunden + 1
+    return offsets, offset
+
+
+_STUNDEN_OFFSETS, _ANZAHL_STUNDEN_PAARE = _stunden_bereiche()
+
+
+def _kodiere_zelle(schritte):
+    """Packt (Schritt 1, Schritt 2, finale Dauer, § 8 Abs. 3) in eine Zelle."""
+    nach_schritt1, nach_schritt2, finale_dauer, regel_8_abs_3 = schritte
+    if not 0 <= finale_dauer <= _MASKE_FINALE_DAUER:
+        raise ValueError("Finale Dauer passt nicht in die Ergebnistabelle")
+    code = finale_dauer
+    if nach_schritt2 < nach_schritt1:
+        code |= _BIT_OBERGRENZE
+    if regel_8_abs_3:
+        code |= _BIT_REGEL_8_ABS_3
+    return nach_schritt1, code
+
+
+def _zeilen_der_tabelle():
+    """Iteriert über alle (AO-Dauer, effektive Verkürzung) in Tabellenreihenfolge."""
+    for basis in range(MIN_AO_DAUER_MONATE, MAX_AO_DAUER_MONATE + 1):
+        for verkuerzung in range(_ANZAHL_VERKUERZUNGEN):
+            yield basis, basis - verkuerzung
+
+
+@lru_cache(maxsize=None)
+def _prozent_tabelle():
+    """Baut die Tabelle für ganzzahlige Prozent-Eingaben (einmalig, lazy)."""
+    schritt1 = array("d")
+    codes = array("B")
+    for basis, verkuerzte in _zeilen_der_tabelle():
+        for prozent in range(MIN_TEILZEIT_PROZENT, 101):
+            wert, code = _kodiere_zelle(
+                _fuehre_schritte_aus(verkuerzte, prozent, basis)
+            )
+            schritt1.append(wert)
+            codes.append(code)
+    return schritt1, codes
+
+
+@lru_cache(maxsize=None)
+def _stunden_tabelle():
+    """Baut die Tabelle für ganzzahlige Stunden-Eingaben (einmalig, lazy)."""
+    schritt1 = array("d")
+    codes = array("B")
+    for basis, verkuerzte in _zeilen_der_tabelle():
+        for vollzeit in range(MIN_VOLLZEIT_STUNDEN, MAX_VOLLZEIT_STUNDEN + 1):
+            for stunden in range(_STUNDEN_OFFSETS[vollzeit][1], vollzeit + 1):
+                prozent = berechne_teilzeit_prozent(vollzeit, stunden)
+                wert, code = _kodiere_zelle(
+                    _fuehre_schritte_aus(
+                        verkuerzte, prozent, basis, (stunden, vollzeit)
+                    )
+                )
+                schritt1.append(wert)
+                codes.append(code)
+    return schritt1, codes
+
+
+def _als_ganzzahl(wert):
+    """Liefert `wert` als int, falls ganzzahlig (int oder glatter float), sonst None."""
+    if type(wert) is int:
+        return wert
+    if type(wert) is float and wert.is_integer():
+        return int(wert)
+    return None
+
+
+def _tabellen_index(basis, verkuerzte, vollzeit, teilzeit, eingabetyp):
+    """
+    Ermittelt Tabelle und Index für eine Eingabe.
+
+    Returns:
+        tuple: (Tabelle, Index) oder None, falls die Eingabe nicht abgedeckt ist
+    """
+    basis = _als_ganzzahl(basis)
+    verkuerzte = _als_ganzzahl(verkuerzte)
+    teilzeit = _als_ganzzahl(teilzeit)
+    if basis is None or verkuerzte is None or teilzeit is None:
+        return None
+    if not MIN_AO_DAUER_MONATE <= basis <= MAX_AO_DAUER_MONATE:
+        return None
+    verkuerzung = basis - verkuerzte
+    if not 0 <= verkuerzung < _ANZAHL_VERKUERZUNGEN:
+        return None
+    zeile = (basis - MIN_AO_DAUER_MONATE) * _ANZAHL_VERKUERZUNGEN + verkuerzung
+
+    if eingabetyp == "prozent":
+        if not MIN_TEILZEIT_PROZENT <= teilzeit <= 100:
+            return None
+        index = zeile * _ANZAHL_PROZENTE + teilzeit - MIN_TEILZEIT_PROZENT
+        return _prozent_tabelle(), index
+
+    if eingabetyp == "stunden":
+        bereich = _STUNDEN_OFFSETS.get(_als_ganzzahl(vollzeit))
+        if bereich is None:
+            return None
+        offset, min_stunden = bereich
+        if not min_stunden <= teilzeit <= vollzeit:
+            return None
+        index = zeile * _ANZAHL_STUNDEN_PAARE + offset + teilzeit - min_stunden
+        return _stunden_tabelle(), index
+
+    return None
+
+
+def _schritte_aus_tabelle(basis, verkuerzte, vollzeit, teilzeit, eingabetyp):
+    """
+    Schlägt Schritt 1-3 und § 8 Abs. 3 in der Ergebnistabelle nach.
+
+    Returns:
+        tuple: Wie `_fuehre_schritte_aus()` oder None, falls nicht tabelliert
+    """
+    treffer = _tabellen_index(basis, verkuerzte, vollzeit, teilzeit, eingabetyp)
+    if treffer is None:
+        return None
+    (schritt1, codes), index = treffer
+    nach_schritt1 = schritt1[index]
+    code = codes[index]
+    if code & _BIT_OBERGRENZE:
+        nach_schritt2 = basis * MAX_VERLAENGERUNG_FAKTOR
+    else:
+        nach_schritt2 = nach_schritt1
+    return (
+        nach_schritt1,
+        nach_schritt2,
+        code & _MASKE_FINALE_DAUER,
+        bool(code & _BIT_REGEL_8_ABS_3),
+    )
+
+
+def verifiziere_ergebnistabelle():
+    """
+    Prüft die Ergebnistabelle Zelle für Zelle gegen die Live-Berechnung.
+
+    Für jede tabellierte Kombination aus AO-Dauer, effektiver Verkürzung und
+    Prozent- bzw. Stunden-Eingabe werden Schritt 1-3 und § 8 Abs. 3 live
+    berechnet und mit dem Tabellenwert verglichen.
+
+    Returns:
+        list: Abweichende Zellen als Tupel (eingabetyp, basis, verkuerzte,
+        vollzeit, teilzeit, live, tabelle); leer, wenn alle Zellen übereinstimmen
+
+    Beispiel:
+        >>> verifiziere_ergebnistabelle()
+        []
+    """
+    abweichungen = []
+    for basis, verkuerzte in _zeilen_der_tabelle():
+        for prozent in range(MIN_TEILZEIT_PROZENT, 101):
+            live = _fuehre_schritte_aus(verkuerzte, prozent, basis)
+            tabelle = _schritte_aus_tabelle(
+                basis, verkuerzte, None, prozent, "prozent"
+            )
+            if tabelle != live:
+                abweichungen.append(
+                    ("prozent", basis, verkuerzte, None, prozent, live, tabelle)
+                )
+        for vollzeit, (_, min_stunden) in _STUNDEN_OFFSETS.items():
+            for stunden in range(min_stunden, vollzeit + 1):
+                live = _fuehre_schritte_aus(
+                    verkuerzte,
+                    berechne_teilzeit_prozent(vollzeit, stunden),
+                    basis,
+                    (stunden, vollzeit),
+                )
+                tabelle = _schritte_aus_tabelle(
+                    basis, verkuerzte, vollzeit, stunden, "stunden"
+                )
+                if tabelle != live:
+                    abweichungen.append(
+                        ("stunden", basis, verkuerzte, vollzeit, stunden, live,
+                         tabelle)
+                    )
+    return abweichungen
+
+
+# ============================================================================
+# DAUERKURVEN (finale Dauer über alle Teilzeit-Prozente)
+# ============================================================================
+
+TEILZEIT_PROZENTE = tuple(range(MIN_TEILZEIT_PROZENT, 101))
+VERKUERZUNGEN_MONATE = tuple(range(_ANZAHL_VERKUERZUNGEN))
+
+
+def _pruefe_ao_dauer(basis_dauer_monate):
+    """Validiert die AO-Dauer für Kurven/Raster und liefert sie als int."""
+    if not isinstance(basis_dauer_monate, (int, float)):
+        raise TypeError("Ausbildungsdauer muss eine Zahl sein")
+    basis = _als_ganzzahl(basis_dauer_monate)
+    if basis is None:
+        raise ValueError("Ausbildungsdauer muss eine ganze Zahl sein")
+    if not MIN_AO_DAUER_MONATE <= basis <= MAX_AO_DAUER_MONATE:
+        raise ValueError(
+            "Ausbildungsdauer muss zwischen 24 und 42 Monaten liegen (IHK-Ausbildungen)"
         )
-    except Exception:
-        pass
+    return basis
+
+
+@lru_cache(maxsize=None)
+def _raster_fuer_ao_dauer(basis):
+    """Schneidet die Zeilen einer AO-Dauer aus der Prozent-Tabelle heraus."""
+    _, codes = _prozent_tabelle()
+    start = (basis - MIN_AO_DAUER_MONATE) * _ANZAHL_VERKUERZUNGEN * _ANZAHL_PROZENTE
+    return tuple(
+        tuple(
+            code & _MASKE_FINALE_DAUER
+            for code in codes[zeile:zeile + _ANZAHL_PROZENTE]
+        )
+        for zeile in range(
+            start,
+            start + _ANZAHL_VERKUERZUNGEN * _ANZAHL_PROZENTE,
+            _ANZAHL_PROZENTE,
+        )
+    )
 
-    return result
+
+def berechne_teilzeit_raster(basis_dauer_monate):
+    """
+    Liefert die finale Dauer für alle Teilzeit-Prozente und Verkürzungen.
+
+    Das Raster wird je AO-Dauer einmalig aus der Ergebnistabelle gelesen und
+    zwischengespeichert; weitere Aufrufe kosten nur noch einen Dictionary-Zugriff.
+
+    Args:
+        basis_dauer_monate (int): Reguläre Ausbildungsdauer in Monaten (24-42)
+
+    Returns:
+        tuple: Je effektiver Verkürzung (`VERKUERZUNGEN_MONATE`, 0-12 Monate)
+        ein Tupel der finalen Dauern für `TEILZEIT_PROZENTE` (50-100 %)
+
+    Raises:
+        TypeError: Wenn die AO-Dauer keine Zahl ist
+        ValueError: Wenn die AO-Dauer nicht ganzzahlig oder außerhalb 24-42 ist
+
+    Beispiel:
+        >>> raster = berechne_teilzeit_raster(36)
+        >>> raster[12][TEILZEIT_PROZENTE.index(75)]
+        32
+    """
+    return _raster_fuer_ao_dauer(_pruefe_ao_dauer(basis_dauer_monate))
+
+
+def berechne_teilzeit_kurve(basis_dauer_monate, verkuerzung_monate=0):
+    """
+    Liefert die finale Dauer für alle Teilzeit-Prozente (50-100 %).
+
+    Für effektive Verkürzungen von 0-12 Monaten ist die Kurve eine Zeile aus
+    `berechne_teilzeit_raster()`. Negative Verkürzungen (vorkalkulierte
+    berufliche Monate des Clients) werden live über Schritt 1-3 berechnet.
+
+    Args:
+        basis_dauer_monate (int): Reguläre Ausbildungsdauer in Monaten (24-42)
+        verkuerzung_monate (int): Effektive Verkürzung in Monaten (max. 12)
+
+    Returns:
+        tuple: Finale Dauer in Monaten je Eintrag von `TEILZEIT_PROZENTE`
+
+    Raises:
+        TypeError: Wenn die Eingaben keine Zahlen sind
+        ValueError: Wenn die Eingaben außerhalb des gültigen Bereichs liegen
+
+    Beispiel:
+        >>> berechne_teilzeit_kurve(36)[:3]
+        (54, 54, 54)
+    """
+    basis = _pruefe_ao_dauer(basis_dauer_monate)
+    verkuerzung = _als_ganzzahl(verkuerzung_monate)
+    if verkuerzung is None:
+        raise TypeError("Verkürzung muss eine ganze Zahl sein")
+    if verkuerzung > MAX_GESAMT_VERKUERZUNG_MONATE:
+        raise ValueError(
+            f"Verkürzung darf höchstens {MAX_GESAMT_VERKUERZUNG_MONATE} Monate "
+            f"betragen"
+        )
+    if verkuerzung >= 0:
+        return _raster_fuer_ao_dauer(basis)[verkuerzung]
+    return tuple(
+        _fuehre_schritte_aus(basis - verkuerzung, prozent, basis)[2]
+        for prozent in TEILZEIT_PROZENTE
+    )
 
 
 # Hilfsfunktionen
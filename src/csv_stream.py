@@ -0,0 +1,29 @@
+"""
+Zeilenweises Schreiben von CSV für gestreamte Antworten
+
+`csv.writer` schreibt in ein Dateiobjekt. Für Generatoren, die eine CSV-Datei
+Zeile für Zeile ausliefern (Zeitleisten-Export, Stromberechnung), gibt
+`Zeilenpuffer` jede geschriebene Zeile direkt zurück, statt sie zu sammeln.
+"""
+
+from __future__ import annotations
+
+import csv
+from typing import Any
+
+
+class Zeilenpuffer:
+    """Schreibziel für `csv.writer`, das jede Zeile direkt zurückgibt."""
+
+    def write(self, zeile: str) -> str:
+        return zeile
+
+
+def csv_zeilenschreiber(**optionen: Any):
+    """`csv.writer`, dessen ``writerow()`` die formatierte Zeile liefert.
+
+    Beispiel:
+        >>> csv_zeilenschreiber().writerow(["a", 1])
+        'a,1\\r\\n'
+    """
+    return csv.writer(Zeilenpuffer(), **optionen)
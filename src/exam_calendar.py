@@ -0,0 +1,310 @@
+"""
+Prüfungskalender und Schritt 4 (Verlängerung bis zur nächsten Prüfung)
+
+Endet die Teilzeitausbildung nach Schritt 1-3 vor dem nächsten Termin der
+Abschlussprüfung, wird sie bis zu diesem Termin verlängert (§ 21 Abs. 3
+BBiG, Schritt 4 der Empfehlung des BIBB-Hauptausschusses). Die Termine sind
+je zuständiger Stelle (Kammer) verschieden und werden aus lokalen Dateien
+gelesen:
+
+    <PRUEFUNGSKALENDER_DIR>/<kammer>.csv
+
+Jede Datei ist eine CSV-Datei mit Kopfzeile und einer Spalte ``datum``
+(ISO-Format ``JJJJ-MM-TT``); weitere Spalten (z.B. Beruf, Prüfungsteil) werden
+ignoriert. Ohne Umgebungsvariable ``PRUEFUNGSKALENDER_DIR`` wird
+``data/pruefungskalender`` im Projektverzeichnis verwendet.
+
+Ein Kalender wird erst bei der ersten Abfrage seiner Kammer geladen, danach
+als sortierter Index im Prozess gehalten; Abfragen laufen per Binärsuche in
+O(log n).
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+STANDARD_KALENDER_VERZEICHNIS = (
+    Path(__file__).resolve().parents[1] / "data" / "pruefungskalender"
+)
+
+# Kammerkennungen werden zu Dateinamen; nur einfache Bezeichner zulassen
+_KAMMER_MUSTER = re.compile(r"^[a-z0-9][a-z0-9_-]*$")
+
+
+@dataclass(frozen=True, slots=True)
+class Pruefungskalender:
+    """Sortierter, duplikatfreier Index der Prüfungstermine einer Kammer."""
+
+    kammer: str
+    termine: Tuple[date, ...]
+
+    def naechster_termin(self, ab: date) -> Optional[date]:
+        """Erster Prüfungstermin am oder nach ``ab`` (`None`, wenn keiner folgt)."""
+        index = bisect_left(self.termine, ab)
+        return self.termine[index] if index < len(self.termine) else None
+
+    def naechste_termine(self, daten: Sequence[date]) -> List[Optional[date]]:
+        """
+        `naechster_termin()` für viele Daten auf einmal.
+
+        Die Daten werden aufsteigend abgearbeitet, sodass jede Binärsuche erst
+        hinter dem vorherigen Treffer beginnt.
+        """
+        ergebnis: List[Optional[date]] = [None] * len(daten)
+        untergrenze = 0
+        anzahl = len(self.termine)
+        for position in sorted(range(len(daten)), key=daten.__getitem__):
+            untergrenze = bisect_left(self.termine, daten[position], untergrenze)
+            if untergrenze < anzahl:
+                ergebnis[position] = self.termine[untergrenze]
+        return ergebnis
+
+
+@dataclass(frozen=True, slots=True)
+class Schritt4Ergebnis:
+    """Ergebnis von Schritt 4 für einen Ausbildungsbeginn."""
+
+    kammer: str
+    ausbildungsbeginn: date
+    dauer_nach_schritt3_monate: int
+    regulaeres_ende: date
+    pruefungstermin: date
+    ende_nach_schritt4: date
+    verlaengerung_tage: int
+    verlaengerung_monate: int
+    dauer_nach_schritt4_monate: int
+
+    @property
+    def verlaengert(self) -> bool:
+        """True, wenn Schritt 4 das Ausbildungsende verschiebt."""
+        return self.verlaengerung_tage > 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Erzeugt das Ergebnis als Dictionary (Daten im ISO-Format)."""
+        return {
+            "kammer": self.kammer,
+            "ausbildungsbeginn": self.ausbildungsbeginn.isoformat(),
+            "dauer_nach_schritt3_monate": self.dauer_nach_schritt3_monate,
+            "regulaeres_ende": self.regulaeres_ende.isoformat(),
+            "pruefungstermin": self.pruefungstermin.isoformat(),
+            "ende_nach_schritt4": self.ende_nach_schritt4.isoformat(),
+            "verlaengert": self.verlaengert,
+            "verlaengerung_tage": self.verlaengerung_tage,
+            "verlaengerung_monate": self.verlaengerung_monate,
+            "dauer_nach_schritt4_monate": self.dauer_nach_schritt4_monate,
+        }
+
+
+# ============================================================
+# KALENDER LADEN
+# ============================================================
+
+def pruefungskalender_verzeichnis() -> Path:
+    """Verzeichnis der Kalenderdateien (``PRUEFUNGSKALENDER_DIR`` oder Standard)."""
+    wert = os.getenv("PRUEFUNGSKALENDER_DIR")
+    return Path(wert) if wert else STANDARD_KALENDER_VERZEICHNIS
+
+
+def normalisiere_kammer(kammer: str) -> str:
+    """
+    Normalisiert eine Kammerkennung (Kleinschreibung, ohne Leerraum).
+
+    Raises:
+        TypeError: Wenn ``kammer`` kein String ist
+        ValueError: Bei leerer oder ungültiger Kennung
+    """
+    if not isinstance(kammer, str):
+        raise TypeError("Kammer muss ein String sein")
+    kennung = kammer.strip().lower()
+    if not _KAMMER_MUSTER.match(kennung):
+        raise ValueError(
+            "Kammer darf nur Buchstaben, Ziffern, '-' und '_' enthalten"
+        )
+    return kennung
+
+
+def verfuegbare_kammern() -> Tuple[str, ...]:
+    """Kennungen aller Kammern mit Kalenderdatei (sortiert)."""
+    verzeichnis = pruefungskalender_verzeichnis()
+    if not verzeichnis.is_dir():
+        return ()
+    return tuple(sorted(pfad.stem for pfad in verzeichnis.glob("*.csv")))
+
+
+def lade_pruefungskalender(kammer: str) -> Pruefungskalender:
+    """
+    Liefert den Prüfungskalender einer Kammer.
+
+    Die Datei wird beim ersten Zugriff gelesen und anschließend je Verzeichnis
+    und Kammer zwischengespeichert (siehe `leere_pruefungskalender_cache()`).
+
+    Raises:
+        TypeError, ValueError: Bei ungültiger Kammer, fehlender Kalenderdatei
+            oder fehlerhaften Einträgen
+    """
+    return _lade_kalender(str(pruefungskalender_verzeichnis()),
+                          normalisiere_kammer(kammer))
+
+
+def leere_pruefungskalender_cache() -> None:
+    """Verwirft alle geladenen Kalender (z.B. nach Aktualisierung der Dateien)."""
+    _lade_kalender.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _lade_kalender(verzeichnis: str, kammer: str) -> Pruefungskalender:
+    """Liest und indiziert eine Kalenderdatei."""
+    pfad = Path(verzeichnis) / f"{kammer}.csv"
+    if not pfad.is_file():
+        raise ValueError(f"Kein Prüfungskalender für Kammer '{kammer}' vorhanden")
+
+    termine = set()
+    with pfad.open(newline="", encoding="utf-8") as datei:
+        leser = csv.DictReader(datei)
+        if not leser.fieldnames or "datum" not in leser.fieldnames:
+            raise ValueError(f"{pfad.name}: Spalte 'datum' fehlt")
+        for zeile in leser:
+            wert = (zeile["datum"] or "").strip()
+            if not wert:
+                continue
+            try:
+                termine.add(date.fromisoformat(wert))
+            except ValueError:
+                raise ValueError(
+                    f"{pfad.name}, Zeile {leser.line_num}: ungültiges Datum "
+                    f"'{wert}'"
+                ) from None
+    return Pruefungskalender(kammer=kammer, termine=tuple(sorted(termine)))
+
+
+# ============================================================
+# SCHRITT 4
+# ============================================================
+
+def addiere_monate(datum: date, monate: int) -> date:
+    """
+    Verschiebt ein Datum um ganze Monate (Monatsende wird begrenzt).
+
+    Beispiel:
+        >>> addiere_monate(date(2024, 1, 31), 1)
+        datetime.date(2024, 2, 29)
+    """
+    monatsindex = datum.year * 12 + datum.month - 1 + monate
+    jahr, monat = divmod(monatsindex, 12)
+    monat += 1
+    naechster = date(jahr + monat // 12, monat % 12 + 1, 1)
+    letzter_tag = (naechster - timedelta(days=1)).day
+    return date(jahr, monat, min(datum.day, letzter_tag))
+
+
+def ausbildungsende(ausbildungsbeginn: date, dauer_monate: int) -> date:
+    """
+    Letzter Ausbildungstag bei gegebener Dauer.
+
+    Beispiel:
+        >>> ausbildungsende(date(2024, 8, 1), 36)
+        datetime.date(2027, 7, 31)
+    """
+    return addiere_monate(ausbildungsbeginn, dauer_monate) - timedelta(days=1)
+
+
+def verlaengere_bis_pruefung(
+    ausbildungsbeginn: date,
+    dauer_monate: int,
+    kammer: str,
+) -> Schritt4Ergebnis:
+    """
+    Schritt 4: Verlängerung bis zur nächsten Prüfung.
+
+    Maßgeblich ist der erste Prüfungstermin der Kammer am oder nach dem
+    regulären Ausbildungsende (Dauer nach Schritt 3). Liegt er danach, endet
+    die Ausbildung am Prüfungstermin; ``verlaengerung_monate`` gibt die dafür
+    angefangenen Monate an.
+
+    Args:
+        ausbildungsbeginn (date): Erster Ausbildungstag
+        dauer_monate (int): Dauer nach Schritt 3 (``finale_dauer_monate``)
+        kammer (str): Kennung der zuständigen Kammer (Name der Kalenderdatei)
+
+    Returns:
+        Schritt4Ergebnis: Ende vor und nach Schritt 4
+
+    Raises:
+        TypeError, ValueError: Bei ungültigen Eingaben, unbekannter Kammer oder
+            wenn der Kalender keinen späteren Termin enthält
+    """
+    return verlaengere_bis_pruefung_stapel(
+        [(ausbildungsbeginn, dauer_monate)], kammer
+    )[0]
+
+
+def verlaengere_bis_pruefung_stapel(
+    faelle: Iterable[Tuple[date, int]],
+    kammer: str,
+) -> List[Schritt4Ergebnis]:
+    """
+    Schritt 4 für viele ``(ausbildungsbeginn, dauer_monate)``-Paare einer Kammer.
+
+    Der Kalender wird einmal geladen, die Termine werden gemeinsam über
+    `Pruefungskalender.naechste_termine()` gesucht.
+
+    Raises:
+        TypeError, ValueError: Wie `verlaengere_bis_pruefung()`
+    """
+    faelle = list(faelle)
+    for beginn, dauer in faelle:
+        _pruefe_fall(beginn, dauer)
+    kalender = lade_pruefungskalender(kammer)
+
+    enden = [ausbildungsende(beginn, dauer) for beginn, dauer in faelle]
+    ergebnisse = []
+    for (beginn, dauer), ende, termin in zip(
+        faelle, enden, kalender.naechste_termine(enden)
+    ):
+        if termin is None:
+            raise ValueError(
+                f"Prüfungskalender '{kalender.kammer}' enthält keinen Termin "
+                f"ab dem {ende.isoformat()}"
+            )
+        zusatz = _angefangene_monate(beginn, dauer, termin)
+        ergebnisse.append(Schritt4Ergebnis(
+            kammer=kalender.kammer,
+            ausbildungsbeginn=beginn,
+            dauer_nach_schritt3_monate=dauer,
+            regulaeres_ende=ende,
+            pruefungstermin=termin,
+            ende_nach_schritt4=termin if termin > ende else ende,
+            verlaengerung_tage=max((termin - ende).days, 0),
+            verlaengerung_monate=zusatz,
+            dauer_nach_schritt4_monate=dauer + zusatz,
+        ))
+    return ergebnisse
+
+
+def _pruefe_fall(ausbildungsbeginn: Any, dauer_monate: Any) -> None:
+    """Validiert ein ``(ausbildungsbeginn, dauer_monate)``-Paar."""
+    if not isinstance(ausbildungsbeginn, date):
+        raise TypeError("Ausbildungsbeginn muss ein Datum sein")
+    if isinstance(dauer_monate, bool) or not isinstance(dauer_monate, int):
+        raise TypeError("Dauer muss in ganzen Monaten angegeben werden")
+    if dauer_monate <= 0:
+        raise ValueError("Dauer muss positiv sein")
+
+
+def _angefangene_monate(beginn: date, dauer_monate: int, termin: date) -> int:
+    """Kleinste Zahl zusätzlicher Monate, deren Ende den Termin erreicht."""
+    ende = ausbildungsende(beginn, dauer_monate)
+    if termin <= ende:
+        return 0
+    zusatz = max((termin.year - ende.year) * 12 + termin.month - ende.month - 1, 1)
+    while ausbildungsende(beginn, dauer_monate + zusatz) < termin:
+        zusatz += 1
+    return zusatz
@@ -0,0 +1,326 @@
+"""
+Umkehrrechnung: minimale Teilzeit für eine gewünschte Gesamtdauer
+
+Beantwortet die Frage "Mit wie wenig Wochenstunden ist die Ausbildung noch in
+N Monaten abgeschlossen?". Statt `berechne_gesamtdauer()` für jeden
+Prozent-/Stundenwert aufzurufen, wird die Schranke geschlossen berechnet:
+
+Die finale Dauer ``min(floor(verkürzte Dauer / Anteil), floor(1,5 × AO))``
+fällt monoton mit dem Teilzeit-Anteil. Sie liegt genau dann bei höchstens
+``Z`` Monaten, wenn die Obergrenze (§ 7a Abs. 1 Satz 4 BBiG) schon ``≤ Z`` ist
+oder ``Anteil > verkürzte Dauer / (Z + 1)`` gilt. Die Sonderregel § 8 Abs. 3
+BBiG hebt ohne Verkürzung die Schranke ``Z`` auf ``AO + 6``, sobald
+``Z ≥ AO``. Die Schranke wird exakt mit `fractions.Fraction` ausgewertet und
+auf ganze Prozent bzw. ganze Wochenstunden (Schrittweite der Eingabefelder)
+aufgerundet.
+
+Aus derselben Überlegung folgt der Bruchstellenindex (`berechne_bruchstellen`):
+``floor(verkürzte Dauer / Anteil)`` springt genau an den Anteilen
+``verkürzte Dauer / (k + 1)``. Nach Anwendung von Obergrenze und Sonderregel
+bleiben nur die Schwellen übrig, an denen sich die finale Dauer tatsächlich
+ändert; sie werden sortiert abgelegt und mit `bisect` durchsucht.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from dataclasses import asdict, dataclass
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+from .calculation_logic import (MAX_AO_DAUER_MONATE,
+                                MAX_GESAMT_VERKUERZUNG_MONATE,
+                                MAX_VERLAENGERUNG_FAKTOR, MAX_VOLLZEIT_STUNDEN,
+                                MIN_AO_DAUER_MONATE, MIN_TEILZEIT_PROZENT,
+                                MIN_VOLLZEIT_STUNDEN,
+                                REGEL_8_ABS_3_TOLERANZ_MONATE,
+                                berechne_gesamtdauer, berechne_verkuerzung,
+                                berechne_verkuerzung_aus_maske)
+
+
+@dataclass(frozen=True, slots=True)
+class MindestTeilzeit:
+    """Ergebnis von `berechne_mindest_teilzeit()`.
+
+    ``teilzeit_prozent`` und ``teilzeit_stunden`` sind die kleinsten ganzen
+    Prozent- bzw. Stundenwerte, mit denen die Zieldauer nicht überschritten
+    wird; ``finale_dauer_*`` ist die tatsächliche Dauer bei diesem Wert.
+    """
+
+    ziel_dauer_monate: int
+    verkuerzte_dauer_monate: int
+    teilzeit_prozent: int
+    finale_dauer_bei_prozent_monate: int
+    teilzeit_stunden: float
+    finale_dauer_bei_stunden_monate: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Erzeugt das Ergebnis als Dictionary."""
+        return asdict(self)
+
+
+def berechne_mindest_teilzeit(
+    basis_dauer_monate: int,
+    vollzeit_stunden: float,
+    ziel_dauer_monate: int,
+    verkuerzungsgruende: Optional[Union[int, Mapping[str, Any]]] = None,
+) -> MindestTeilzeit:
+    """
+    Berechnet die minimale Teilzeit, mit der die Zieldauer erreicht wird.
+
+    Args:
+        basis_dauer_monate (int): Reguläre Ausbildungsdauer in Monaten (24-42)
+        vollzeit_stunden (float): Reguläre Wochenstunden bei Vollzeit (10-48)
+        ziel_dauer_monate (int): Höchstens gewünschte Gesamtdauer in Monaten
+        verkuerzungsgruende (dict | int | None): Wie bei `berechne_gesamtdauer()`
+            (Dictionary oder Bitmaske); ``None`` bedeutet keine Verkürzung
+
+    Returns:
+        MindestTeilzeit: Minimaler Prozentsatz und minimale Wochenstunden
+
+    Raises:
+        TypeError: Wenn die Eingaben keine Zahlen sind
+        ValueError: Wenn die Eingaben ungültig sind oder die Zieldauer selbst
+            in Vollzeit nicht erreichbar ist
+
+    Beispiel:
+        >>> ergebnis = berechne_mindest_teilzeit(36, 40, 32, {'abitur': True})
+        >>> ergebnis.teilzeit_prozent, ergebnis.teilzeit_stunden
+        (73, 30)
+    """
+    for wert, name in (
+        (basis_dauer_monate, "Ausbildungsdauer"),
+        (vollzeit_stunden, "Vollzeit-Stunden"),
+        (ziel_dauer_monate, "Zieldauer"),
+    ):
+        if isinstance(wert, bool) or not isinstance(wert, (int, float)):
+            raise TypeError(f"{name} muss eine Zahl sein")
+    if not MIN_AO_DAUER_MONATE <= basis_dauer_monate <= MAX_AO_DAUER_MONATE:
+        raise ValueError(
+            "Ausbildungsdauer muss zwischen 24 und 42 Monaten liegen (IHK-Ausbildungen)"
+        )
+    if not MIN_VOLLZEIT_STUNDEN <= vollzeit_stunden <= MAX_VOLLZEIT_STUNDEN:
+        raise ValueError("Vollzeit-Stunden müssen zwischen 10 und 48 Stunden liegen")
+    if not float(basis_dauer_monate).is_integer():
+        raise ValueError("Ausbildungsdauer muss eine ganze Zahl sein")
+    if not float(ziel_dauer_monate).is_integer():
+        raise ValueError("Zieldauer muss eine ganze Zahl sein")
+    basis = int(basis_dauer_monate)
+    ziel = int(ziel_dauer_monate)
+
+    if verkuerzungsgruende is None:
+        verkuerzungsgruende = 0
+    if isinstance(verkuerzungsgruende, int):
+        verkuerzte, _ = berechne_verkuerzung_aus_maske(basis, verkuerzungsgruende)
+    else:
+        verkuerzte, _ = berechne_verkuerzung(basis, verkuerzungsgruende)
+
+    kuerzeste = berechne_gesamtdauer(
+        basis, vollzeit_stunden, 100, verkuerzungsgruende, "prozent"
+    )["finale_dauer_monate"]
+    if ziel < kuerzeste:
+        raise ValueError(
+            f"Zieldauer von {ziel} Monaten ist nicht erreichbar "
+            f"(mindestens {kuerzeste} Monate in Vollzeit)"
+        )
+
+    # Kleinster Anteil (exakt), oberhalb dessen die Zieldauer eingehalten wird;
+    # None: jeder zulässige Anteil genügt (Obergrenze bereits ≤ Zieldauer)
+    schranke = _anteil_schranke(basis, verkuerzte, ziel)
+
+    vollzeit = Fraction(vollzeit_stunden)
+    min_stunden = math.ceil(vollzeit / 2)
+    if schranke is None:
+        prozent = MIN_TEILZEIT_PROZENT
+        stunden = min_stunden
+    else:
+        prozent = max(MIN_TEILZEIT_PROZENT, math.floor(schranke * 100) + 1)
+        stunden = max(min_stunden, math.floor(schranke * vollzeit) + 1)
+    prozent = min(prozent, 100)
+    # Bei gebrochener Vollzeit (z.B. 37,5 h) kann nur Vollzeit selbst genügen
+    stunden = stunden if stunden <= vollzeit else vollzeit_stunden
+
+    return MindestTeilzeit(
+        ziel_dauer_monate=ziel,
+        verkuerzte_dauer_monate=verkuerzte,
+        teilzeit_prozent=prozent,
+        finale_dauer_bei_prozent_monate=berechne_gesamtdauer(
+            basis, vollzeit_stunden, prozent, verkuerzungsgruende, "prozent"
+        )["finale_dauer_monate"],
+        teilzeit_stunden=stunden,
+        finale_dauer_bei_stunden_monate=berechne_gesamtdauer(
+            basis, vollzeit_stunden, stunden, verkuerzungsgruende, "stunden"
+        )["finale_dauer_monate"],
+    )
+
+
+def _anteil_schranke(basis, verkuerzte, ziel):
+    """
+    Liefert die exakte untere (offene) Schranke des Teilzeit-Anteils.
+
+    Returns:
+        Fraction | None: Anteil ``a`` mit ``Dauer ≤ ziel ⇔ Anteil > a``;
+        None, wenn bereits die Obergrenze die Zieldauer einhält
+    """
+    schranke = ziel
+    if verkuerzte == basis and ziel >= basis:
+        schranke = max(ziel, basis + REGEL_8_ABS_3_TOLERANZ_MONATE)
+    if math.floor(basis * MAX_VERLAENGERUNG_FAKTOR) <= schranke:
+        return None
+    return Fraction(verkuerzte, schranke + 1)
+
+
+# Teilzeit-Anteil als exakter Bruch (Prozent / 100 bzw. Stunden / Vollzeit)
+Intervall = Tuple[Optional[Fraction], Optional[Fraction]]
+
+
+@dataclass(frozen=True, slots=True)
+class Bruchstellenindex:
+    """Sortierte Schwellen des Teilzeit-Anteils, an denen sich die Dauer ändert.
+
+    ``anteil_schwellen`` ist aufsteigend sortiert; ``dauern`` hat einen
+    Eintrag mehr. Für einen Anteil ``a`` (0,5 ≤ a ≤ 1) gilt
+    ``dauer = dauern[bisect_left(anteil_schwellen, a)]``: Die Dauer ist auf
+    jedem Intervall ``(schwelle[i - 1], schwelle[i]]`` konstant und fällt
+    unmittelbar oberhalb einer Schwelle.
+    """
+
+    basis_dauer_monate: int
+    verkuerzte_dauer_monate: int
+    anteil_schwellen: Tuple[Fraction, ...]
+    dauern: Tuple[int, ...]
+
+    def prozent_schwellen(self) -> Tuple[Fraction, ...]:
+        """Schwellen als Teilzeit-Prozentsätze."""
+        return tuple(schwelle * 100 for schwelle in self.anteil_schwellen)
+
+    def stunden_schwellen(self, vollzeit_stunden: float) -> Tuple[Fraction, ...]:
+        """Schwellen als Wochenstunden bei der gegebenen Vollzeit."""
+        vollzeit = Fraction(vollzeit_stunden)
+        return tuple(schwelle * vollzeit for schwelle in self.anteil_schwellen)
+
+    def dauer_bei_anteil(self, anteil: Union[Fraction, float]) -> int:
+        """Finale Dauer in Monaten für einen Teilzeit-Anteil (O(log n))."""
+        return self.dauern[bisect_left(self.anteil_schwellen, anteil)]
+
+    def dauer_bei_prozent(self, teilzeit_prozent: float) -> int:
+        """Finale Dauer in Monaten für einen Teilzeit-Prozentsatz."""
+        return self.dauer_bei_anteil(Fraction(teilzeit_prozent) / 100)
+
+    def dauer_bei_stunden(
+        self, vollzeit_stunden: float, teilzeit_stunden: float
+    ) -> int:
+        """Finale Dauer in Monaten für Teilzeit-Wochenstunden."""
+        return self.dauer_bei_anteil(
+            Fraction(teilzeit_stunden) / Fraction(vollzeit_stunden)
+        )
+
+    def intervall_bei_anteil(self, anteil: Union[Fraction, float]) -> Intervall:
+        """
+        Liefert die benachbarten Schwellen ``(untere, obere)`` eines Anteils.
+
+        Die Dauer bleibt für alle Anteile in ``(untere, obere]`` gleich; erst
+        oberhalb von ``obere`` (bzw. ab ``untere`` abwärts) ändert sie sich.
+        ``None`` steht für den Rand des Definitionsbereichs ohne Schwelle.
+        """
+        index = bisect_left(self.anteil_schwellen, anteil)
+        untere = self.anteil_schwellen[index - 1] if index > 0 else None
+        obere = (
+            self.anteil_schwellen[index]
+            if index < len(self.anteil_schwellen)
+            else None
+        )
+        return untere, obere
+
+    def intervall_bei_stunden(
+        self, vollzeit_stunden: float, teilzeit_stunden: float
+    ) -> Intervall:
+        """Wie `intervall_bei_anteil()`, aber in Wochenstunden."""
+        vollzeit = Fraction(vollzeit_stunden)
+        untere, obere = self.intervall_bei_anteil(
+            Fraction(teilzeit_stunden) / vollzeit
+        )
+        return (
+            None if untere is None else untere * vollzeit,
+            None if obere is None else obere * vollzeit,
+        )
+
+
+def berechne_bruchstellen(
+    basis_dauer_monate: int, verkuerzung_monate: int = 0
+) -> Bruchstellenindex:
+    """
+    Berechnet alle exakten Bruchstellen der finalen Dauer.
+
+    Der Index wird je (AO-Dauer, Verkürzung) einmalig analytisch erzeugt
+    und zwischengespeichert.
+
+    Args:
+        basis_dauer_monate (int): Reguläre Ausbildungsdauer in Monaten (24-42)
+        verkuerzung_monate (int): Effektive Verkürzung in Monaten (max. 12;
+            negative Werte für vorkalkulierte berufliche Monate)
+
+    Returns:
+        Bruchstellenindex: Sortierte Schwellen und Dauern
+
+    Raises:
+        TypeError: Wenn die Eingaben keine ganzen Zahlen sind
+        ValueError: Wenn die Eingaben außerhalb des gültigen Bereichs liegen
+
+    Beispiel:
+        >>> index = berechne_bruchstellen(36, 12)
+        >>> [float(s) for s in index.stunden_schwellen(40)][-3:]
+        [35.55555555555556, 36.92307692307692, 38.4]
+        >>> index.dauer_bei_stunden(40, 30), index.dauer_bei_stunden(40, 30.5)
+        (32, 31)
+    """
+    for wert, name in (
+        (basis_dauer_monate, "Ausbildungsdauer"),
+        (verkuerzung_monate, "Verkürzung"),
+    ):
+        if isinstance(wert, bool) or not isinstance(wert, int):
+            raise TypeError(f"{name} muss eine ganze Zahl sein")
+    if not MIN_AO_DAUER_MONATE <= basis_dauer_monate <= MAX_AO_DAUER_MONATE:
+        raise ValueError(
+            "Ausbildungsdauer muss zwischen 24 und 42 Monaten liegen (IHK-Ausbildungen)"
+        )
+    if verkuerzung_monate > MAX_GESAMT_VERKUERZUNG_MONATE:
+        raise ValueError(
+            f"Verkürzung darf höchstens {MAX_GESAMT_VERKUERZUNG_MONATE} Monate "
+            f"betragen"
+        )
+    return _bruchstellenindex(basis_dauer_monate, verkuerzung_monate)
+
+
+@lru_cache(maxsize=None)
+def _bruchstellenindex(basis, verkuerzung):
+    """Erzeugt den Index (zwischengespeichert je AO-Dauer und Verkürzung)."""
+    verkuerzte = basis - verkuerzung
+    obergrenze = math.floor(basis * MAX_VERLAENGERUNG_FAKTOR)
+
+    def finale_dauer(schritt1_monate):
+        dauer = min(schritt1_monate, obergrenze)
+        if (
+            verkuerzte == basis
+            and basis < dauer <= basis + REGEL_8_ABS_3_TOLERANZ_MONATE
+        ):
+            return basis
+        return dauer
+
+    # Beim Mindestanteil (50 %) ist floor(verkürzte / 0,5) = 2 × verkürzte;
+    # der Wert k gilt für Anteile in (verkürzte / (k + 1), verkürzte / k]
+    schwellen = []
+    dauern = [finale_dauer(2 * verkuerzte)]
+    for k in range(2 * verkuerzte - 1, verkuerzte - 1, -1):
+        dauer = finale_dauer(k)
+        if dauer != dauern[-1]:
+            schwellen.append(Fraction(verkuerzte, k + 1))
+            dauern.append(dauer)
+    return Bruchstellenindex(
+        basis_dauer_monate=basis,
+        verkuerzte_dauer_monate=verkuerzte,
+        anteil_schwellen=tuple(schwellen),
+        dauern=tuple(dauern),
+    )
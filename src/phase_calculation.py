@@ -0,0 +1,284 @@
+"""
+Teilzeitphasen: wechselnde Teilzeit-Anteile und Unterbrechungen
+
+Verträge wechseln oft den Teilzeit-Anteil (z.B. 50 % im ersten Jahr mit
+kleinem Kind, danach 75 %) oder ruhen wegen Elternzeit. Die Phasenrechnung
+verallgemeinert Schritt 1-3 auf eine Folge von Phasen:
+
+- Schritt 1: Die Phasen werden der Reihe nach durchlaufen; jeder Monat mit
+  Anteil ``p`` leistet ``p / 100`` Monate Ausbildungszeit, bis die verkürzte
+  Dauer erreicht ist. Das Ergebnis ist die Zahl der Teilzeitmonate.
+- Schritt 2 und 3: Obergrenze (§ 7a Abs. 2 BBiG) und Abrundung sowie die
+  Sonderregel § 8 Abs. 3 BBiG wirken wie bei `berechne_gesamtdauer()` auf die
+  Teilzeitmonate.
+- Unterbrechungen (Anteil 0, z.B. Elternzeit) zählen nicht als
+  Ausbildungszeit (§ 20 Abs. 1 BEEG) und unterliegen nicht der Obergrenze; sie
+  verlängern die Gesamtdauer, soweit sie vor dem Ausbildungsende beginnen.
+
+Alle Phasen außer der letzten haben eine feste Dauer in ganzen Monaten; die
+letzte Phase ist eine Teilzeitphase und gilt bis zum Ausbildungsende. Die
+Rechnung benötigt zwei Durchläufe über die Phasen, also O(Anzahl Phasen).
+Mit nur einer Phase ist das Ergebnis identisch mit `berechne_gesamtdauer()`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import (Any, Dict, Hashable, Iterable, Iterator, Optional,
+                    Sequence, Tuple, Union)
+
+from .calculation_logic import (MIN_TEILZEIT_PROZENT, _pruefe_ao_dauer,
+                                _wende_regel_8_abs_3_an,
+                                berechne_schritte_ganzzahlig,
+                                berechne_verkuerzung,
+                                berechne_verkuerzung_aus_maske,
+                                obergrenze_anwenden_schritt2)
+
+
+@dataclass(frozen=True, slots=True)
+class Teilzeitphase:
+    """
+    Eine Vertragsphase.
+
+    ``monate`` ist die Dauer in ganzen Monaten (``None`` nur für die letzte
+    Phase); ``teilzeit_prozent`` ist 50-100 oder 0 für eine Unterbrechung.
+    """
+
+    monate: Optional[int]
+    teilzeit_prozent: float
+
+    @property
+    def unterbrechung(self) -> bool:
+        """True für Unterbrechungen (z.B. Elternzeit)."""
+        return self.teilzeit_prozent == 0
+
+
+@dataclass(frozen=True, slots=True)
+class Phasenergebnis:
+    """
+    Ergebnis von `berechne_phasen_dauer()`.
+
+    ``nach_schritt1_monate`` bis ``teilzeit_monate`` beziehen sich nur auf die
+    Teilzeitmonate; ``finale_dauer_monate`` enthält zusätzlich die
+    Unterbrechungen. ``phasen_monate`` gibt je Phase die tatsächlich
+    verbrachten Monate an (0 für Phasen nach dem Ausbildungsende).
+    """
+
+    original_dauer_monate: int
+    verkuerzte_dauer_monate: int
+    verkuerzung_gesamt_ohne_begrenzung: int
+    nach_schritt1_monate: float
+    nach_schritt2_monate: float
+    teilzeit_monate: int
+    unterbrechung_monate: int
+    finale_dauer_monate: int
+    regel_8_abs_3_angewendet: bool
+    phasen: Tuple[Teilzeitphase, ...]
+    phasen_monate: Tuple[int, ...]
+
+    @property
+    def obergrenze_angewendet(self) -> bool:
+        """True, wenn die Obergrenze (Schritt 2) gegriffen hat."""
+        return self.nach_schritt2_monate < self.nach_schritt1_monate
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Erzeugt das Ergebnis als Dictionary."""
+        return {
+            "original_dauer_monate": self.original_dauer_monate,
+            "verkuerzte_dauer_monate": self.verkuerzte_dauer_monate,
+            "verkuerzung_gesamt_ohne_begrenzung": (
+                self.verkuerzung_gesamt_ohne_begrenzung
+            ),
+            "nach_schritt1_monate": self.nach_schritt1_monate,
+            "nach_schritt2_monate": self.nach_schritt2_monate,
+            "teilzeit_monate": self.teilzeit_monate,
+            "unterbrechung_monate": self.unterbrechung_monate,
+            "finale_dauer_monate": self.finale_dauer_monate,
+            "finale_dauer_jahre": round(self.finale_dauer_monate / 12, 1),
+            "obergrenze_angewendet": self.obergrenze_angewendet,
+            "regel_8_abs_3_angewendet": self.regel_8_abs_3_angewendet,
+            "phasen": [
+                {
+                    "monate": monate,
+                    "teilzeit_prozent": phase.teilzeit_prozent,
+                    "unterbrechung": phase.unterbrechung,
+                }
+                for phase, monate in zip(self.phasen, self.phasen_monate)
+            ],
+        }
+
+
+def berechne_phasen_dauer(
+    basis_dauer_monate: int,
+    phasen: Sequence[Teilzeitphase],
+    verkuerzungsgruende: Union[int, Dict[str, Any]] = 0,
+) -> Phasenergebnis:
+    """
+    Berechnet die Gesamtdauer für einen Vertrag mit mehreren Teilzeitphasen.
+
+    Args:
+        basis_dauer_monate (int): Reguläre Ausbildungsdauer in Monaten (24-42)
+        phasen (Sequence[Teilzeitphase]): Phasen in zeitlicher Reihenfolge
+        verkuerzungsgruende (dict | int): Verkürzungsgründe oder deren
+            Bitmaske (wie bei `berechne_gesamtdauer()`)
+
+    Returns:
+        Phasenergebnis: Teilzeit-, Unterbrechungs- und Gesamtmonate
+
+    Raises:
+        TypeError, ValueError: Bei ungültiger AO-Dauer oder ungültigen Phasen
+
+    Beispiel:
+        >>> ergebnis = berechne_phasen_dauer(36, [
+        ...     Teilzeitphase(12, 50),
+        ...     Teilzeitphase(6, 0),
+        ...     Teilzeitphase(None, 75),
+        ... ])
+        >>> ergebnis.teilzeit_monate, ergebnis.finale_dauer_monate
+        (52, 58)
+    """
+    basis = _pruefe_ao_dauer(basis_dauer_monate)
+    phasen = tuple(phasen)
+    _pruefe_phasen(phasen)
+    if isinstance(verkuerzungsgruende, int):
+        verkuerzte, ohne_begrenzung = berechne_verkuerzung_aus_maske(
+            basis, verkuerzungsgruende
+        )
+    else:
+        verkuerzte, ohne_begrenzung = berechne_verkuerzung(
+            basis, verkuerzungsgruende
+        )
+    return _berechne(basis, verkuerzte, ohne_begrenzung, phasen)
+
+
+def berechne_phasen_stapel(
+    vertraege: Iterable[
+        Tuple[int, Sequence[Teilzeitphase], Union[int, Dict[str, Any]]]
+    ],
+) -> Iterator[Union[Phasenergebnis, Exception]]:
+    """
+    Berechnet viele Verträge ``(basis_dauer_monate, phasen, verkuerzungsgruende)``.
+
+    Die Ergebnisse werden der Reihe nach erzeugt. Für ungültige Verträge wird
+    statt eines Ergebnisses die Ausnahme (`TypeError`/`ValueError`) geliefert,
+    sodass ein einzelner Fehler den Stapel nicht abbricht. Verträge mit
+    gleicher AO-Dauer, gleicher Verkürzung und gleichem Phasenplan (typisch
+    für Kohorten) werden nur einmal berechnet.
+    """
+    bekannt: Dict[Hashable, Phasenergebnis] = {}
+    for basis_dauer_monate, phasen, verkuerzungsgruende in vertraege:
+        try:
+            basis = _pruefe_ao_dauer(basis_dauer_monate)
+            phasen = tuple(phasen)
+            if isinstance(verkuerzungsgruende, int):
+                verkuerzung = berechne_verkuerzung_aus_maske(
+                    basis, verkuerzungsgruende
+                )
+            else:
+                verkuerzung = berechne_verkuerzung(basis, verkuerzungsgruende)
+            schluessel = (basis, verkuerzung, phasen)
+            if schluessel not in bekannt:
+                _pruefe_phasen(phasen)
+                bekannt[schluessel] = _berechne(basis, *verkuerzung, phasen)
+        except (TypeError, ValueError) as exc:
+            yield exc
+            continue
+        yield bekannt[schluessel]
+
+
+def _pruefe_phasen(phasen: Tuple[Teilzeitphase, ...]) -> None:
+    """Validiert einen Phasenplan."""
+    if not phasen:
+        raise ValueError("Mindestens eine Teilzeitphase erforderlich")
+    for nummer, phase in enumerate(phasen, start=1):
+        if not isinstance(phase, Teilzeitphase):
+            raise TypeError("Phasen müssen Teilzeitphase-Objekte sein")
+        prozent = phase.teilzeit_prozent
+        if isinstance(prozent, bool) or not isinstance(prozent, (int, float)):
+            raise TypeError(f"Phase {nummer}: Teilzeit-Anteil muss eine Zahl sein")
+        if prozent != 0 and not MIN_TEILZEIT_PROZENT <= prozent <= 100:
+            raise ValueError(
+                f"Phase {nummer}: Teilzeit-Anteil muss 0 (Unterbrechung) oder "
+                f"zwischen {MIN_TEILZEIT_PROZENT}% und 100% liegen "
+                f"(§ 7a Abs. 1 Satz 3 BBiG)"
+            )
+        if nummer == len(phasen):
+            break
+        monate = phase.monate
+        if isinstance(monate, bool) or not isinstance(monate, int):
+            raise TypeError(
+                f"Phase {nummer}: Dauer muss in ganzen Monaten angegeben werden"
+            )
+        if monate <= 0:
+            raise ValueError(f"Phase {nummer}: Dauer muss positiv sein")
+
+    letzte = phasen[-1]
+    if letzte.monate is not None:
+        raise ValueError("Die letzte Phase gilt bis zum Ausbildungsende (ohne Dauer)")
+    if letzte.unterbrechung:
+        raise ValueError("Die letzte Phase darf keine Unterbrechung sein")
+
+
+def _berechne(
+    basis: int,
+    verkuerzte: int,
+    ohne_begrenzung: int,
+    phasen: Tuple[Teilzeitphase, ...],
+) -> Phasenergebnis:
+    """Schritt 1-3 und § 8 Abs. 3 für einen validierten Phasenplan."""
+    # Schritt 1: Teilzeitmonate, bis die verkürzte Dauer geleistet ist (exakt
+    # als Bruch; ``nach_schritt1`` ist der ausgegebene Gleitkommawert)
+    offen = Fraction(verkuerzte)
+    vorherige_monate = 0
+    letzte = phasen[-1]
+    for phase in phasen[:-1]:
+        if phase.unterbrechung:
+            continue
+        anteil = Fraction(phase.teilzeit_prozent) / 100
+        if phase.monate * anteil >= offen:
+            letzte = phase
+            break
+        vorherige_monate += phase.monate
+        offen -= phase.monate * anteil
+    nach_schritt1 = vorherige_monate + float(offen) / (letzte.teilzeit_prozent / 100.0)
+
+    # Schritt 2, 3 und Sonderregel; der Ganzzahl-Kernel rundet die exakten
+    # Teilzeitmonate (Zähler / Nenner, Anteil 1) ab und begrenzt sie
+    nach_schritt2 = obergrenze_anwenden_schritt2(nach_schritt1, basis)
+    exakt = vorherige_monate + offen * 100 / Fraction(letzte.teilzeit_prozent)
+    teilzeit_monate, regel_8_abs_3 = _wende_regel_8_abs_3_an(
+        verkuerzte,
+        berechne_schritte_ganzzahlig(exakt.numerator, basis, exakt.denominator, 1),
+        basis,
+    )
+
+    # Zweiter Durchlauf: Monate je Phase und Unterbrechungen vor dem Ende
+    rest = teilzeit_monate
+    unterbrechung = 0
+    phasen_monate = []
+    for phase in phasen[:-1]:
+        if rest <= 0:
+            monate = 0
+        elif phase.unterbrechung:
+            monate = phase.monate
+            unterbrechung += monate
+        else:
+            monate = min(phase.monate, rest)
+            rest -= monate
+        phasen_monate.append(monate)
+    phasen_monate.append(rest)
+
+    return Phasenergebnis(
+        original_dauer_monate=basis,
+        verkuerzte_dauer_monate=verkuerzte,
+        verkuerzung_gesamt_ohne_begrenzung=ohne_begrenzung,
+        nach_schritt1_monate=nach_schritt1,
+        nach_schritt2_monate=nach_schritt2,
+        teilzeit_monate=teilzeit_monate,
+        unterbrechung_monate=unterbrechung,
+        finale_dauer_monate=teilzeit_monate + unterbrechung,
+        regel_8_abs_3_angewendet=regel_8_abs_3,
+        phasen=phasen,
+        phasen_monate=tuple(phasen_monate),
+    )
@@ -0,0 +1,293 @@
+"""
+Phasenplan-Optimierer: Zieldauer mit möglichst wenigen Wechseln
+
+Schlägt für eine gewünschte Höchstdauer einen Phasenplan (siehe
+`src.phase_calculation`) vor, der mit möglichst wenigen Wechseln des
+Teilzeit-Anteils auskommt. Vorgaben wie "im ersten Jahr höchstens 50 %" oder
+feste Unterbrechungen werden als Verfügbarkeitsprofil übergeben.
+
+Ansatz: Die Ausbildung ist spätestens im Monat ``Z`` beendet, wenn die
+Teilzeitmonate nach Schritt 1-3 höchstens ``a`` betragen (``a`` = Zahl der
+Teilzeitmonate unter den ersten ``Z`` Kalendermonaten). Das gilt, sobald
+die Obergrenze ``floor(1,5 × AO)`` (Schritt 2) oder die Sonderregel
+§ 8 Abs. 3 BBiG greift, oder wenn die Prozentsumme der ersten ``a + 1``
+Teilzeitmonate die verkürzte Dauer × 100 übersteigt (dann liegt Schritt 1
+unter ``a + 1``). Gesucht ist also eine Folge von Prozentstufen je Monat mit
+dieser Mindestsumme und möglichst wenigen Wechseln.
+
+Die dynamische Programmierung läuft über Monate × Prozentstufen × Wechsel;
+die erreichbaren Prozentsummen je Zustand werden als Bitmenge (``int``)
+geführt. Unter den Plänen mit den wenigsten Wechseln wird der mit der
+kleinsten Prozentsumme (geringste Arbeitszeit) gewählt. Ergebnisse werden
+je Eingabe zwischengespeichert.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .calculation_logic import (MAX_VERLAENGERUNG_FAKTOR, MIN_TEILZEIT_PROZENT,
+                                REGEL_8_ABS_3_TOLERANZ_MONATE,
+                                _pruefe_ao_dauer, berechne_verkuerzung,
+                                berechne_verkuerzung_aus_maske,
+                                rundung_anwenden_schritt3)
+from .phase_calculation import (Phasenergebnis, Teilzeitphase,
+                                berechne_phasen_dauer)
+
+# Standard-Schrittweite der Prozentstufen (50, 55, ..., 100)
+STANDARD_SCHRITTWEITE_PROZENT = 5
+
+# Abschnitt des Verfügbarkeitsprofils: (Monate, höchster Anteil; 0 = Unterbrechung)
+Verfuegbarkeit = Tuple[int, float]
+
+
+@dataclass(frozen=True, slots=True)
+class Phasenplan:
+    """Ergebnis von `optimiere_phasenplan()`."""
+
+    ziel_dauer_monate: int
+    phasen: Tuple[Teilzeitphase, ...]
+    wechsel: int
+    ergebnis: Phasenergebnis
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Erzeugt den Plan als Dictionary."""
+        return {
+            "ziel_dauer_monate": self.ziel_dauer_monate,
+            "wechsel": self.wechsel,
+            "phasen": [
+                {
+                    "monate": phase.monate,
+                    "teilzeit_prozent": phase.teilzeit_prozent,
+                    "unterbrechung": phase.unterbrechung,
+                }
+                for phase in self.phasen
+            ],
+            "finale_dauer_monate": self.ergebnis.finale_dauer_monate,
+            "ergebnis": self.ergebnis.to_dict(),
+        }
+
+
+def optimiere_phasenplan(
+    basis_dauer_monate: int,
+    ziel_dauer_monate: int,
+    verkuerzungsgruende: Union[int, Dict[str, Any]] = 0,
+    verfuegbarkeit: Sequence[Verfuegbarkeit] = (),
+    schrittweite_prozent: int = STANDARD_SCHRITTWEITE_PROZENT,
+) -> Phasenplan:
+    """
+    Ermittelt den Phasenplan mit den wenigsten Wechseln für eine Zieldauer.
+
+    Args:
+        basis_dauer_monate (int): Reguläre Ausbildungsdauer in Monaten (24-42)
+        ziel_dauer_monate (int): Späteste Gesamtdauer in Kalendermonaten
+        verkuerzungsgruende (dict | int): Verkürzungsgründe oder Bitmaske
+        verfuegbarkeit: Profil ab Ausbildungsbeginn als ``(monate,
+            max_prozent)``-Abschnitte; ``max_prozent`` 0 ist eine feste
+            Unterbrechung. Nach dem Profil ist jeder Anteil bis 100 % möglich.
+        schrittweite_prozent (int): Abstand der Prozentstufen ab 50 %
+            (muss 50 teilen)
+
+    Returns:
+        Phasenplan: Phasen, Zahl der Wechsel und nachgerechnetes Ergebnis
+
+    Raises:
+        TypeError, ValueError: Bei ungültigen Eingaben oder wenn die Zieldauer
+            mit dem Profil nicht erreichbar ist
+
+    Beispiel:
+        >>> plan = optimiere_phasenplan(36, 48, verfuegbarkeit=[(12, 50)])
+        >>> [(p.monate, p.teilzeit_prozent) for p in plan.phasen]
+        [(16, 50), (None, 85)]
+    """
+    basis = _pruefe_ao_dauer(basis_dauer_monate)
+    if isinstance(ziel_dauer_monate, bool) or not isinstance(ziel_dauer_monate, int):
+        raise TypeError("Zieldauer muss eine ganze Zahl sein")
+    if ziel_dauer_monate <= 0:
+        raise ValueError("Zieldauer muss positiv sein")
+    if (
+        isinstance(schrittweite_prozent, bool)
+        or not isinstance(schrittweite_prozent, int)
+    ):
+        raise TypeError("Schrittweite muss eine ganze Zahl sein")
+    if (
+        schrittweite_prozent <= 0
+        or (100 - MIN_TEILZEIT_PROZENT) % schrittweite_prozent
+    ):
+        raise ValueError(
+            f"Schrittweite muss {100 - MIN_TEILZEIT_PROZENT} ohne Rest teilen"
+        )
+    profil = tuple(_pruefe_abschnitt(abschnitt) for abschnitt in verfuegbarkeit)
+
+    if isinstance(verkuerzungsgruende, int):
+        verkuerzte, _ = berechne_verkuerzung_aus_maske(basis, verkuerzungsgruende)
+    else:
+        verkuerzte, _ = berechne_verkuerzung(basis, verkuerzungsgruende)
+
+    phasen, wechsel = _optimiere(
+        basis, verkuerzte, ziel_dauer_monate, profil, schrittweite_prozent
+    )
+    return Phasenplan(
+        ziel_dauer_monate=ziel_dauer_monate,
+        phasen=phasen,
+        wechsel=wechsel,
+        ergebnis=berechne_phasen_dauer(basis, phasen, verkuerzungsgruende),
+    )
+
+
+def _pruefe_abschnitt(abschnitt: Any) -> Verfuegbarkeit:
+    """Validiert einen Abschnitt des Verfügbarkeitsprofils."""
+    try:
+        monate, max_prozent = abschnitt
+    except (TypeError, ValueError):
+        raise TypeError(
+            "Verfügbarkeit besteht aus (monate, max_prozent)-Paaren"
+        ) from None
+    if isinstance(monate, bool) or not isinstance(monate, int):
+        raise TypeError("Verfügbarkeit: Monate müssen ganze Zahlen sein")
+    if monate <= 0:
+        raise ValueError("Verfügbarkeit: Monate müssen positiv sein")
+    if isinstance(max_prozent, bool) or not isinstance(max_prozent, (int, float)):
+        raise TypeError("Verfügbarkeit: max_prozent muss eine Zahl sein")
+    if max_prozent != 0 and not MIN_TEILZEIT_PROZENT <= max_prozent <= 100:
+        raise ValueError(
+            f"Verfügbarkeit: max_prozent muss 0 (Unterbrechung) oder zwischen "
+            f"{MIN_TEILZEIT_PROZENT}% und 100% liegen"
+        )
+    return monate, max_prozent
+
+
+@lru_cache(maxsize=1024)
+def _optimiere(
+    basis: int,
+    verkuerzte: int,
+    ziel: int,
+    profil: Tuple[Verfuegbarkeit, ...],
+    schrittweite: int,
+) -> Tuple[Tuple[Teilzeitphase, ...], int]:
+    """Kern des Optimierers (Phasen, Wechsel) für validierte Eingaben."""
+    # Kalendermonate des Profils: höchster Anteil je Monat (0 = Unterbrechung)
+    kalender = [max_prozent for monate, max_prozent in profil for _ in range(monate)]
+
+    # Teilzeitmonate bis zur Zieldauer und zulässige Schranke nach Schritt 3
+    aktiv_bis_ziel = sum(1 for m in kalender[:ziel] if m) + max(ziel - len(kalender), 0)
+    if aktiv_bis_ziel == 0:
+        raise ValueError("Zieldauer liegt vollständig in Unterbrechungen")
+    schranke = aktiv_bis_ziel
+    if verkuerzte == basis and schranke >= basis:
+        schranke = max(schranke, basis + REGEL_8_ABS_3_TOLERANZ_MONATE)
+    obergrenze = rundung_anwenden_schritt3(basis * MAX_VERLAENGERUNG_FAKTOR)
+    if obergrenze <= schranke:
+        # Obergrenze (Schritt 2) erreicht die Zieldauer mit jedem Plan
+        anzahl, benoetigt = obergrenze + 1, 0
+    else:
+        anzahl, benoetigt = schranke + 1, 100 * verkuerzte + 1
+
+    # Höchster Anteil je Teilzeitmonat (Unterbrechungen übersprungen)
+    max_je_monat = [m for m in kalender if m][:anzahl]
+    max_je_monat += [100] * (anzahl - len(max_je_monat))
+    stufen = tuple(range(MIN_TEILZEIT_PROZENT, 101, schrittweite))
+
+    if sum(max(s for s in stufen if s <= m) for m in max_je_monat) < benoetigt:
+        raise ValueError(
+            f"Zieldauer von {ziel} Monaten ist mit dem Verfügbarkeitsprofil "
+            f"nicht erreichbar"
+        )
+
+    # Iterative Vertiefung über die erlaubte Zahl an Wechseln
+    wechsel = 0
+    while True:
+        folge = _suche_folge(max_je_monat, stufen, benoetigt, wechsel)
+        if folge is not None:
+            break
+        wechsel += 1
+    return _als_phasen(folge, kalender), wechsel
+
+
+def _suche_folge(
+    max_je_monat: List[float],
+    stufen: Tuple[int, ...],
+    benoetigt: int,
+    max_wechsel: int,
+) -> Optional[List[int]]:
+    """
+    Sucht eine Stufenfolge mit höchstens ``max_wechsel`` Wechseln und einer
+    Summe von mindestens ``benoetigt`` (kleinste solche Summe).
+
+    ``tabellen[i][stufe][w]`` ist die Bitmenge der Summen nach Monat ``i``,
+    die mit Stufe ``stufe`` in Monat ``i`` und genau ``w`` Wechseln erreichbar
+    sind.
+    """
+    breite = max_wechsel + 1
+    tabellen: List[List[List[int]]] = []
+    vorher: Optional[List[List[int]]] = None
+    for index, maximum in enumerate(max_je_monat):
+        aktuell = [[0] * breite for _ in stufen]
+        for s, stufe in enumerate(stufen):
+            if stufe > maximum:
+                continue
+            if vorher is None:
+                aktuell[s][0] = 1 << stufe
+                continue
+            for w in range(breite):
+                summen = vorher[s][w]
+                if w:
+                    for t in range(len(stufen)):
+                        if t != s:
+                            summen |= vorher[t][w - 1]
+                aktuell[s][w] = summen << stufe
+        tabellen.append(aktuell)
+        vorher = aktuell
+
+    # Kleinste Summe >= benoetigt über alle Endzustände
+    bestes = None
+    for s in range(len(stufen)):
+        for w in range(breite):
+            oberhalb = tabellen[-1][s][w] >> benoetigt
+            if oberhalb:
+                summe = benoetigt + (oberhalb & -oberhalb).bit_length() - 1
+                if bestes is None or summe < bestes[0]:
+                    bestes = (summe, s, w)
+    if bestes is None:
+        return None
+
+    # Rückverfolgung: bevorzugt ohne Wechsel, sonst niedrigste Stufe
+    summe, s, w = bestes
+    folge = [stufen[s]]
+    for index in range(len(tabellen) - 1, 0, -1):
+        summe -= stufen[s]
+        vorher = tabellen[index - 1]
+        if vorher[s][w] >> summe & 1:
+            folge.append(stufen[s])
+            continue
+        for t in range(len(stufen)):
+            if t != s and vorher[t][w - 1] >> summe & 1:
+                s, w = t, w - 1
+                break
+        folge.append(stufen[s])
+    folge.reverse()
+    return folge
+
+
+def _als_phasen(
+    folge: List[int], kalender: List[float]
+) -> Tuple[Teilzeitphase, ...]:
+    """Fügt Stufenfolge und Unterbrechungen des Profils zu Phasen zusammen."""
+    phasen: List[List[Any]] = []
+    position = 0
+    for stufe in folge:
+        while position < len(kalender) and kalender[position] == 0:
+            if phasen and phasen[-1][1] == 0:
+                phasen[-1][0] += 1
+            else:
+                phasen.append([1, 0])
+            position += 1
+        if phasen and phasen[-1][1] == stufe:
+            phasen[-1][0] += 1
+        else:
+            phasen.append([1, stufe])
+        position += 1
+    phasen[-1][0] = None
+    return tuple(Teilzeitphase(monate, prozent) for monate, prozent in phasen)
@@ -0,0 +1,294 @@
+"""
+Optimierer: kleinste Auswahl an Verkürzungsgründen
+
+Wer mehrere Verkürzungsgründe erfüllt, muss wegen der Begrenzung auf
+`MAX_GESAMT_VERKUERZUNG_MONATE` oft nicht alle nachweisen. Der Optimierer
+ermittelt die kleinste Teilmenge der angegebenen Gründe, mit der die bestmögliche
+(kürzeste) Gesamtdauer bzw. eine gewünschte Zieldauer erreicht wird.
+
+Statt alle 2^k Teilmengen zu prüfen, werden die Gründe nach ihrem Monatswert
+in Äquivalenzklassen zusammengefasst (z.B. Abitur, Alter über 21 und
+Kinderbetreuung je 12 Monate). Entscheidend ist nur, wie viele Gründe je Klasse
+gewählt werden; die finale Dauer hängt ihrerseits nur von der effektiven
+Verkürzung ab und wird je Wert einmal berechnet.
+
+Die Gründe werden als Bitmaske übergeben (siehe ``GRUND_*``-Konstanten in
+`src.calculation_logic`). Mit einem `Regelwerk` gelten dessen Monatswerte,
+Höchstgrenze und Berechnung (`Regelwerk.berechne`).
+"""
+
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .calculation_logic import (BERUF_MONATE_SHIFT, BERUF_Q2_STUFE_MASKE,
+                                BERUF_Q2_STUFE_SHIFT, GRUND_ABITUR,
+                                GRUND_ALTER_21, GRUND_BERUF_FELDER,
+                                GRUND_BERUF_Q1, GRUND_BERUF_Q2, GRUND_BERUF_Q3,
+                                GRUND_BERUF_Q4, GRUND_FAMILIEN_PFLEGE,
+                                GRUND_KINDERBETREUUNG, GRUND_REALSCHULE,
+                                GRUND_VORKENNTNISSE,
+                                MAX_GESAMT_VERKUERZUNG_MONATE,
+                                VERKUERZUNG_ABITUR, VERKUERZUNG_ALTER_21,
+                                VERKUERZUNG_FAMILIEN_PFLEGE,
+                                VERKUERZUNG_KINDERBETREUUNG,
+                                VERKUERZUNG_REALSCHULE,
+                                VERKUERZUNG_VORKENNTNISSE, Berechnungsergebnis,
+                                berechne_gesamtdauer)
+from .rule_sets import Regelwerk
+
+# Allgemeine Gründe in Prioritätsreihenfolge: (Name, Bit, Monate)
+_ALLGEMEINE_GRUENDE = (
+    ("abitur", GRUND_ABITUR, VERKUERZUNG_ABITUR),
+    ("realschule", GRUND_REALSCHULE, VERKUERZUNG_REALSCHULE),
+    ("alter_ueber_21", GRUND_ALTER_21, VERKUERZUNG_ALTER_21),
+    (
+        "familien_kinderbetreuung",
+        GRUND_KINDERBETREUUNG,
+        VERKUERZUNG_KINDERBETREUUNG,
+    ),
+    (
+        "familien_pflegeverantwortung",
+        GRUND_FAMILIEN_PFLEGE,
+        VERKUERZUNG_FAMILIEN_PFLEGE,
+    ),
+)
+
+# Berufliche Einzelfragen (nur bei gesetztem GRUND_BERUF_FELDER)
+_BERUF_FRAGEN = (
+    ("beruf_q1", GRUND_BERUF_Q1, 12),
+    ("beruf_q3", GRUND_BERUF_Q3, 12),
+    ("beruf_q4", GRUND_BERUF_Q4, 6),
+)
+_BERUF_Q2_MONATE_JE_STUFE = (0, 6, 12)
+_BERUF_Q2_BITS = GRUND_BERUF_Q2 | (BERUF_Q2_STUFE_MASKE << BERUF_Q2_STUFE_SHIFT)
+
+# Ein Grund: (Name, Bits in der Maske, Monate)
+Grund = Tuple[str, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class Verkuerzungsoptimum:
+    """Ergebnis von `optimiere_verkuerzungsgruende()`.
+
+    ``verkuerzungs_maske``/``gruende`` beschreiben die kleinste ausreichende
+    Auswahl, ``ergebnis`` die Berechnung damit. ``beste_dauer_monate`` ist die
+    kürzeste mit allen angegebenen Gründen erreichbare Dauer.
+    """
+
+    verkuerzungs_maske: int
+    gruende: Tuple[str, ...]
+    finale_dauer_monate: int
+    beste_dauer_monate: int
+    ziel_dauer_monate: Optional[int]
+    gepruefte_kombinationen: int
+    ergebnis: Berechnungsergebnis
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Erzeugt das Ergebnis als Dictionary."""
+        return {
+            "verkuerzungs_maske": self.verkuerzungs_maske,
+            "gruende": list(self.gruende),
+            "anzahl_gruende": len(self.gruende),
+            "finale_dauer_monate": self.finale_dauer_monate,
+            "beste_dauer_monate": self.beste_dauer_monate,
+            "ziel_dauer_monate": self.ziel_dauer_monate,
+            "gepruefte_kombinationen": self.gepruefte_kombinationen,
+            "ergebnis": self.ergebnis.to_dict(),
+        }
+
+
+def zerlege_verkuerzungsmaske(
+    verkuerzungs_maske: int,
+    regelwerk: Optional[Regelwerk] = None,
+) -> Tuple[int, List[Grund]]:
+    """
+    Zerlegt eine Verkürzungsmaske in einzeln wählbare Gründe.
+
+    Mit ``regelwerk`` sind die Monate je Grund die des Regelwerks.
+
+    Returns:
+        tuple: (Basisbits, die jede Teilmenge behält; Liste der Gründe als
+        ``(Name, Bits, Monate)`` in Prioritätsreihenfolge)
+
+    Beispiel:
+        >>> zerlege_verkuerzungsmaske(GRUND_ABITUR | GRUND_REALSCHULE)
+        (0, [('abitur', 1, 12), ('realschule', 2, 6)])
+    """
+    basis_bits = verkuerzungs_maske & GRUND_BERUF_FELDER
+    monate_von = _monate_je_grund(basis_bits, regelwerk)
+    gruende = [
+        (name, bit, monate_von(bit, monate))
+        for name, bit, monate in _ALLGEMEINE_GRUENDE
+        if verkuerzungs_maske & bit
+    ]
+    if not verkuerzungs_maske & GRUND_BERUF_FELDER:
+        if verkuerzungs_maske & GRUND_VORKENNTNISSE:
+            gruende.append((
+                "vorkenntnisse_monate",
+                GRUND_VORKENNTNISSE,
+                monate_von(GRUND_VORKENNTNISSE, VERKUERZUNG_VORKENNTNISSE),
+            ))
+        return basis_bits, gruende
+
+    # Vorkalkulierte Gesamtsumme ersetzt die beruflichen Einzelfragen
+    berufliche_monate = verkuerzungs_maske >> BERUF_MONATE_SHIFT
+    if berufliche_monate:
+        gruende.append((
+            "berufliche_verkuerzung_monate",
+            berufliche_monate << BERUF_MONATE_SHIFT,
+            berufliche_monate,
+        ))
+        return basis_bits, gruende
+
+    gruende.extend(
+        (name, bit, monate_von(bit, monate))
+        for name, bit, monate in _BERUF_FRAGEN
+        if verkuerzungs_maske & bit
+    )
+    if verkuerzungs_maske & GRUND_BERUF_Q2:
+        stufe = (verkuerzungs_maske >> BERUF_Q2_STUFE_SHIFT) & BERUF_Q2_STUFE_MASKE
+        monate = monate_von(
+            verkuerzungs_maske & _BERUF_Q2_BITS,
+            _BERUF_Q2_MONATE_JE_STUFE[min(stufe, 2)],
+        )
+        if monate:
+            gruende.append(
+                ("beruf_q2", verkuerzungs_maske & _BERUF_Q2_BITS, monate)
+            )
+    return basis_bits, gruende
+
+
+def optimiere_verkuerzungsgruende(
+    basis_dauer_monate: int,
+    vollzeit_stunden: float,
+    teilzeit_eingabe: float,
+    verkuerzungs_maske: int,
+    eingabetyp: str = "prozent",
+    ziel_dauer_monate: Optional[int] = None,
+    regelwerk: Optional[Regelwerk] = None,
+) -> Verkuerzungsoptimum:
+    """
+    Ermittelt die kleinste Auswahl an Verkürzungsgründen.
+
+    Ohne ``ziel_dauer_monate`` wird die kürzeste mit allen Gründen erreichbare
+    Dauer angestrebt, sonst höchstens die Zieldauer. Unter gleich großen
+    Auswahlen gewinnt die mit der kürzeren Dauer, danach die mit weniger
+    (unbegrenzten) Verkürzungsmonaten.
+
+    Args:
+        basis_dauer_monate (int): Reguläre Ausbildungsdauer in Monaten
+        vollzeit_stunden (float): Reguläre Wochenstunden bei Vollzeit
+        teilzeit_eingabe (float): Teilzeit als Prozent oder Stunden
+        verkuerzungs_maske (int): Alle erfüllten Verkürzungsgründe als Bitmaske
+        eingabetyp (str): 'prozent' oder 'stunden'
+        ziel_dauer_monate (int | None): Optionale Höchstdauer in Monaten
+        regelwerk (Regelwerk | None): Regelwerk statt der Standardwerte
+
+    Returns:
+        Verkuerzungsoptimum: Kleinste ausreichende Auswahl samt Ergebnis
+
+    Raises:
+        TypeError, ValueError: Bei ungültigen Eingaben (wie
+            `berechne_gesamtdauer()`) oder unerreichbarer Zieldauer
+
+    Beispiel:
+        >>> optimum = optimiere_verkuerzungsgruende(
+        ...     36, 40, 75, GRUND_ABITUR | GRUND_REALSCHULE | GRUND_ALTER_21
+        ... )
+        >>> optimum.gruende, optimum.finale_dauer_monate
+        (('abitur',), 32)
+    """
+    basis_bits, gruende = zerlege_verkuerzungsmaske(verkuerzungs_maske, regelwerk)
+    if regelwerk is None:
+        basis_monate = 0
+        max_verkuerzung = MAX_GESAMT_VERKUERZUNG_MONATE
+        rechne = berechne_gesamtdauer
+    else:
+        _, basis_monate = regelwerk.berechne_verkuerzung(0, basis_bits)
+        max_verkuerzung = regelwerk.max_gesamt_verkuerzung_monate
+        rechne = regelwerk.berechne
+
+    # Äquivalenzklassen: Gründe mit gleichem Monatswert sind austauschbar
+    klassen: Dict[int, List[Grund]] = {}
+    for grund in gruende:
+        klassen.setdefault(grund[2], []).append(grund)
+    monatswerte = sorted(klassen)
+
+    # Finale Dauer hängt nur von der (begrenzten) Verkürzung ab
+    dauer_je_verkuerzung: Dict[int, int] = {}
+
+    def berechne(maske: int) -> Berechnungsergebnis:
+        return rechne(
+            basis_dauer_monate,
+            vollzeit_stunden,
+            teilzeit_eingabe,
+            maske,
+            eingabetyp,
+        )
+
+    kandidaten = []
+    for anzahlen in itertools.product(
+        *(range(len(klassen[wert]) + 1) for wert in monatswerte)
+    ):
+        summe = basis_monate + sum(
+            wert * n for wert, n in zip(monatswerte, anzahlen)
+        )
+        auswahl = [
+            grund
+            for wert, n in zip(monatswerte, anzahlen)
+            for grund in klassen[wert][:n]
+        ]
+        maske = basis_bits
+        for _, bits, _ in auswahl:
+            maske |= bits
+        effektiv = min(summe, max_verkuerzung)
+        if effektiv not in dauer_je_verkuerzung:
+            dauer_je_verkuerzung[effektiv] = berechne(maske)["finale_dauer_monate"]
+        kandidaten.append(
+            (sum(anzahlen), dauer_je_verkuerzung[effektiv], summe, maske, auswahl)
+        )
+
+    beste_dauer = min(k[1] for k in kandidaten)
+    schranke = beste_dauer if ziel_dauer_monate is None else ziel_dauer_monate
+    ausreichend = [k for k in kandidaten if k[1] <= schranke]
+    if not ausreichend:
+        raise ValueError(
+            f"Zieldauer von {ziel_dauer_monate} Monaten ist mit den angegebenen "
+            f"Verkürzungsgründen nicht erreichbar (bestenfalls {beste_dauer} "
+            f"Monate)"
+        )
+    _, finale_dauer, _, maske, auswahl = min(ausreichend, key=lambda k: k[:3])
+    # Reihenfolge der Gründe wie in der Eingabe
+    gewaehlt = {name for name, _, _ in auswahl}
+    return Verkuerzungsoptimum(
+        verkuerzungs_maske=maske,
+        gruende=tuple(name for name, _, _ in gruende if name in gewaehlt),
+        finale_dauer_monate=finale_dauer,
+        beste_dauer_monate=beste_dauer,
+        ziel_dauer_monate=ziel_dauer_monate,
+        gepruefte_kombinationen=len(kandidaten),
+        ergebnis=berechne(maske),
+    )
+
+
+def _monate_je_grund(
+    basis_bits: int, regelwerk: Optional[Regelwerk]
+) -> Callable[[int, int], int]:
+    """Monate eines Grundes (Bits) ohne bzw. mit Regelwerk.
+
+    Ohne Regelwerk gilt der Standardwert; mit Regelwerk der Zuwachs der
+    ungekürzten Gesamtverkürzung (`Regelwerk.berechne_verkuerzung`), den die
+    Bits des Grundes zu den Basisbits beitragen.
+    """
+    if regelwerk is None:
+        return lambda bits, standard: standard
+    _, basis_monate = regelwerk.berechne_verkuerzung(0, basis_bits)
+
+    def monate(bits: int, standard: int) -> int:
+        _, gesamt = regelwerk.berechne_verkuerzung(0, basis_bits | bits)
+        return gesamt - basis_monate
+
+    return monate
@@ -0,0 +1,445 @@
+"""
+Versionierte Regelwerke für die Berechnung
+
+Die gesetzlichen Konstanten (Monatswerte der Verkürzungsgründe, Höchstgrenze
+der Verkürzung, Mindest-Teilzeit, Obergrenze nach § 7a Abs. 2 BBiG, zulässige
+AO-Dauern, Toleranz nach § 8 Abs. 3 BBiG) können je Kammer oder für
+Altverträge abweichen. Sie werden als versionierte Regelwerke aus
+JSON-Dateien geladen:
+
+    <REGELWERK_DIR>/<version>.json
+
+Ohne Umgebungsvariable ``REGELWERK_DIR`` wird ``data/regelwerke`` im
+Projektverzeichnis verwendet. Jede Datei wird beim ersten Zugriff auf ihre
+Version gelesen, validiert und einmalig in ein `Regelwerk` übersetzt
+(Monatstabellen je Teilmaske der Verkürzungsgründe, Obergrenzen je AO-Dauer).
+Weitere Anfragen mit derselben Version verwenden das zwischengespeicherte
+Objekt, ohne die Datei erneut zu lesen.
+
+Ein Regelwerk mit denselben Werten wie `src.calculation_logic` (z.B.
+``bbig-2020``) rechnet über `berechne_gesamtdauer()` und deren
+vorberechnete Ergebnistabelle.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Mapping, Tuple
+
+from .calculation_logic import (_BERUF_FRAGEN_SHIFT, _BITS_ALLGEMEIN,
+                                _BITS_BERUF_FRAGEN, _MONATE_ALLGEMEIN,
+                                _MONATE_BERUF_FRAGEN, BERUF_MONATE_SHIFT,
+                                BERUF_Q2_STUFE_MASKE, BERUF_Q2_STUFE_SHIFT,
+                                GRUND_ABITUR, GRUND_ALTER_21,
+                                GRUND_BERUF_FELDER, GRUND_BERUF_Q1,
+                                GRUND_BERUF_Q3, GRUND_BERUF_Q4,
+                                GRUND_FAMILIEN_PFLEGE, GRUND_KINDERBETREUUNG,
+                                GRUND_REALSCHULE, GRUND_VORKENNTNISSE,
+                                MAX_AO_DAUER_MONATE,
+                                MAX_GESAMT_VERKUERZUNG_MONATE,
+                                MAX_VERLAENGERUNG_FAKTOR, MAX_VOLLZEIT_STUNDEN,
+                                MIN_AO_DAUER_MONATE, MIN_TEILZEIT_PROZENT,
+                                MIN_VOLLZEIT_STUNDEN,
+                                REGEL_8_ABS_3_TOLERANZ_MONATE,
+                                VERKUERZUNG_VORKENNTNISSE, Berechnungsergebnis,
+                                berechne_gesamtdauer,
+                                berechne_teilzeit_prozent,
+                                berechne_teilzeit_stunden, teilzeit_anteil)
+
+STANDARD_REGELWERK_VERZEICHNIS = (
+    Path(__file__).resolve().parents[1] / "data" / "regelwerke"
+)
+
+# Version, deren Werte `src.calculation_logic` fest eingebaut hat
+STANDARD_REGELWERK = "bbig-2020"
+
+# Versionskennungen werden zu Dateinamen; nur einfache Bezeichner zulassen
+_VERSION_MUSTER = re.compile(r"^[a-z0-9][a-z0-9._-]*$")
+
+# Ja/Nein-Gründe der Bitmaske und ihr Schlüssel in ``verkuerzung_monate``
+_ALLGEMEINE_GRUENDE = (
+    (GRUND_ABITUR, "abitur"),
+    (GRUND_REALSCHULE, "realschule"),
+    (GRUND_ALTER_21, "alter_ueber_21"),
+    (GRUND_KINDERBETREUUNG, "familien_kinderbetreuung"),
+    (GRUND_FAMILIEN_PFLEGE, "familien_pflegeverantwortung"),
+)
+_BERUF_FRAGEN = (
+    (GRUND_BERUF_Q1, "beruf_q1"),
+    (GRUND_BERUF_Q3, "beruf_q3"),
+    (GRUND_BERUF_Q4, "beruf_q4"),
+)
+_VERKUERZUNG_SCHLUESSEL = tuple(
+    name for _, name in _ALLGEMEINE_GRUENDE + _BERUF_FRAGEN
+) + ("vorkenntnisse", "beruf_q2_stufen")
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Regelwerk:
+    """
+    Übersetztes Regelwerk einer Version (siehe `lade_regelwerk()`).
+
+    Neben den Werten der Datei hält es die daraus vorberechneten Tabellen;
+    `berechne()` liest nur noch Tabellenwerte und rechnet Schritt 1-3.
+    """
+
+    version: str
+    bezeichnung: str
+    max_gesamt_verkuerzung_monate: int
+    min_teilzeit_prozent: float
+    max_verlaengerung_faktor: float
+    min_ao_dauer_monate: int
+    max_ao_dauer_monate: int
+    regel_8_abs_3_toleranz_monate: int
+    vorkenntnisse_monate: int
+    # Monatssumme je Teilmaske der allgemeinen Gründe bzw. beruflichen Fragen
+    monate_allgemein: Tuple[int, ...]
+    monate_beruf_fragen: Tuple[int, ...]
+    # Obergrenze nach Schritt 2 je AO-Dauer (Index: AO-Dauer - Minimum)
+    obergrenzen: Tuple[float, ...]
+    # True, wenn alle Werte denen von `src.calculation_logic` entsprechen
+    entspricht_standard: bool
+
+    def berechne_verkuerzung(
+        self, basis_dauer_monate: int, verkuerzungs_maske: int
+    ) -> Tuple[int, int]:
+        """
+        Wie `berechne_verkuerzung_aus_maske()`, mit den Werten dieses Regelwerks.
+
+        Returns:
+            tuple: (verkürzte Dauer, Gesamtverkürzung vor Begrenzung)
+        """
+        verkuerzung_gesamt = self.monate_allgemein[verkuerzungs_maske & _BITS_ALLGEMEIN]
+        if verkuerzungs_maske & GRUND_BERUF_FELDER:
+            verkuerzung_gesamt += (
+                verkuerzungs_maske >> BERUF_MONATE_SHIFT
+                or self.monate_beruf_fragen[
+                    (verkuerzungs_maske >> _BERUF_FRAGEN_SHIFT) & _BITS_BERUF_FRAGEN
+                ]
+            )
+        elif verkuerzungs_maske & GRUND_VORKENNTNISSE:
+            verkuerzung_gesamt += self.vorkenntnisse_monate
+        verkuerzung_final = min(
+            verkuerzung_gesamt, self.max_gesamt_verkuerzung_monate
+        )
+        return max(basis_dauer_monate - verkuerzung_final, 0), verkuerzung_gesamt
+
+    def berechne(
+        self,
+        basis_dauer_monate,
+        vollzeit_stunden,
+        teilzeit_eingabe,
+        verkuerzungs_maske: int,
+        eingabetyp: str = "prozent",
+    ) -> Berechnungsergebnis:
+        """
+        Wie `berechne_gesamtdauer()`, mit den Werten dieses Regelwerks.
+
+        Die Verkürzungsgründe werden als Bitmaske (``GRUND_*``-Konstanten)
+        übergeben.
+
+        Raises:
+            TypeError, ValueError: Bei ungültigen Eingaben (Bereiche gemäß
+                Regelwerk)
+        """
+        if self.entspricht_standard:
+            return berechne_gesamtdauer(
+                basis_dauer_monate,
+                vollzeit_stunden,
+                teilzeit_eingabe,
+                verkuerzungs_maske,
+                eingabetyp,
+            )
+        teilzeit_prozent, teilzeit_stunden = self._pruefe_eingaben(
+            basis_dauer_monate, vollzeit_stunden, teilzeit_eingabe, eingabetyp
+        )
+        if isinstance(verkuerzungs_maske, bool) or not isinstance(
+            verkuerzungs_maske, int
+        ):
+            raise TypeError("Verkürzungsgründe müssen als Bitmaske übergeben werden")
+        verkuerzte_dauer, verkuerzung_gesamt = self.berechne_verkuerzung(
+            basis_dauer_monate, verkuerzungs_maske
+        )
+
+        # Schritt 1-3 wie `_fuehre_schritte_aus()`, Obergrenze aus der Tabelle;
+        # Schritt 3 rundet die exakte Dauer ab (wie `berechne_schritte_exakt()`)
+        nach_schritt1 = verkuerzte_dauer / (teilzeit_prozent / 100.0)
+        obergrenze = self.obergrenzen[
+            int(basis_dauer_monate) - self.min_ao_dauer_monate
+        ]
+        nach_schritt2 = min(nach_schritt1, obergrenze)
+        zaehler, nenner = teilzeit_anteil(
+            vollzeit_stunden, teilzeit_eingabe, eingabetyp
+        )
+        finale_dauer = min(
+            Fraction(verkuerzte_dauer) * Fraction(nenner) // Fraction(zaehler),
+            math.floor(obergrenze),
+        )
+
+        # Sonderregel § 8 Abs. 3 BBiG mit der Toleranz des Regelwerks
+        regel_8_abs_3_angewendet = (
+            verkuerzte_dauer == basis_dauer_monate
+            and basis_dauer_monate < finale_dauer
+            <= basis_dauer_monate + self.regel_8_abs_3_toleranz_monate
+        )
+        if regel_8_abs_3_angewendet:
+            finale_dauer = basis_dauer_monate
+
+        return Berechnungsergebnis(
+            original_dauer_monate=basis_dauer_monate,
+            verkuerzte_dauer_monate=verkuerzte_dauer,
+            teilzeit_prozent=teilzeit_prozent,
+            teilzeit_stunden=teilzeit_stunden,
+            nach_schritt1_monate=nach_schritt1,
+            nach_schritt2_monate=nach_schritt2,
+            finale_dauer_monate=finale_dauer,
+            verkuerzung_gesamt_ohne_begrenzung=verkuerzung_gesamt,
+            regel_8_abs_3_angewendet=regel_8_abs_3_angewendet,
+        )
+
+    def _pruefe_eingaben(
+        self, basis_dauer_monate, vollzeit_stunden, teilzeit_eingabe, eingabetyp
+    ) -> Tuple[float, float]:
+        """Validiert wie `berechne_gesamtdauer()`; liefert (Prozent, Stunden)."""
+        if not isinstance(basis_dauer_monate, (int, float)):
+            raise TypeError("Ausbildungsdauer muss eine Zahl sein")
+        if not isinstance(vollzeit_stunden, (int, float)):
+            raise TypeError("Vollzeit-Stunden müssen eine Zahl sein")
+        if not isinstance(teilzeit_eingabe, (int, float)):
+            raise TypeError("Teilzeit-Wert muss eine Zahl sein")
+        if (
+            basis_dauer_monate != int(basis_dauer_monate)
+            or not self.min_ao_dauer_monate
+            <= basis_dauer_monate
+            <= self.max_ao_dauer_monate
+        ):
+            raise ValueError(
+                f"Ausbildungsdauer muss zwischen {self.min_ao_dauer_monate} und "
+                f"{self.max_ao_dauer_monate} Monaten liegen "
+                f"(Regelwerk {self.version})"
+            )
+        if not MIN_VOLLZEIT_STUNDEN <= vollzeit_stunden <= MAX_VOLLZEIT_STUNDEN:
+            raise ValueError(
+                "Vollzeit-Stunden müssen zwischen 10 und 48 Stunden liegen"
+            )
+
+        if eingabetyp == "prozent":
+            teilzeit_prozent = teilzeit_eingabe
+            teilzeit_stunden = berechne_teilzeit_stunden(
+                vollzeit_stunden, teilzeit_eingabe
+            )
+        elif eingabetyp == "stunden":
+            if teilzeit_eingabe > vollzeit_stunden:
+                raise ValueError(
+                    f"Wochenstunden dürfen die regulären Wochenstunden "
+                    f"({vollzeit_stunden}) nicht überschreiten"
+                )
+            teilzeit_prozent = berechne_teilzeit_prozent(
+                vollzeit_stunden, teilzeit_eingabe
+            )
+            teilzeit_stunden = teilzeit_eingabe
+        else:
+            raise ValueError("eingabetyp muss 'prozent' oder 'stunden' sein")
+
+        if not self.min_teilzeit_prozent <= teilzeit_prozent <= 100:
+            raise ValueError(
+                f"Teilzeit-Anteil muss zwischen {self.min_teilzeit_prozent}% "
+                f"und 100% liegen (Regelwerk {self.version})"
+            )
+        return teilzeit_prozent, teilzeit_stunden
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Erzeugt die Werte des Regelwerks als Dictionary (ohne Tabellen)."""
+        return {
+            "version": self.version,
+            "bezeichnung": self.bezeichnung,
+            "max_gesamt_verkuerzung_monate": self.max_gesamt_verkuerzung_monate,
+            "min_teilzeit_prozent": self.min_teilzeit_prozent,
+            "max_verlaengerung_faktor": self.max_verlaengerung_faktor,
+            "ao_dauer_monate": [self.min_ao_dauer_monate, self.max_ao_dauer_monate],
+            "regel_8_abs_3_toleranz_monate": self.regel_8_abs_3_toleranz_monate,
+        }
+
+
+# ============================================================
+# REGELWERKE LADEN
+# ============================================================
+
+def regelwerk_verzeichnis() -> Path:
+    """Verzeichnis der Regelwerk-Dateien (``REGELWERK_DIR`` oder Standard)."""
+    wert = os.getenv("REGELWERK_DIR")
+    return Path(wert) if wert else STANDARD_REGELWERK_VERZEICHNIS
+
+
+def normalisiere_version(version: str) -> str:
+    """
+    Normalisiert eine Versionskennung (Kleinschreibung, ohne Leerraum).
+
+    Raises:
+        TypeError: Wenn ``version`` kein String ist
+        ValueError: Bei leerer oder ungültiger Kennung
+    """
+    if not isinstance(version, str):
+        raise TypeError("Regelwerk muss ein String sein")
+    kennung = version.strip().lower()
+    if not _VERSION_MUSTER.match(kennung):
+        raise ValueError(f"Ungültige Regelwerk-Version: '{version}'")
+    return kennung
+
+
+def verfuegbare_regelwerke() -> Tuple[str, ...]:
+    """Versionen aller Regelwerke mit Datei (sortiert)."""
+    verzeichnis = regelwerk_verzeichnis()
+    if not verzeichnis.is_dir():
+        return ()
+    return tuple(sorted(pfad.stem for pfad in verzeichnis.glob("*.json")))
+
+
+def lade_regelwerk(version: str = STANDARD_REGELWERK) -> Regelwerk:
+    """
+    Liefert das übersetzte Regelwerk einer Version.
+
+    Die Datei wird beim ersten Zugriff gelesen und übersetzt, anschließend je
+    Verzeichnis und Version zwischengespeichert (siehe
+    `leere_regelwerk_cache()`).
+
+    Raises:
+        TypeError, ValueError: Bei ungültiger Version, fehlender Datei oder
+            fehlerhaften Werten
+
+    Beispiel:
+        >>> lade_regelwerk("bbig-2020").entspricht_standard
+        True
+    """
+    return _lade_regelwerk(str(regelwerk_verzeichnis()), normalisiere_version(version))
+
+
+def leere_regelwerk_cache() -> None:
+    """Verwirft alle geladenen Regelwerke (z.B. nach Aktualisierung der Dateien)."""
+    _lade_regelwerk.cache_clear()
+
+
+@lru_cache(maxsize=None)
+def _lade_regelwerk(verzeichnis: str, version: str) -> Regelwerk:
+    """Liest eine Regelwerk-Datei und übersetzt sie."""
+    pfad = Path(verzeichnis) / f"{version}.json"
+    if not pfad.is_file():
+        raise ValueError(f"Kein Regelwerk '{version}' vorhanden")
+    try:
+        with pfad.open(encoding="utf-8") as datei:
+            daten = json.load(datei)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"{pfad.name}: ungültiges JSON ({exc.msg})") from None
+    try:
+        return _uebersetze(version, daten)
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"{pfad.name}: {exc}") from None
+
+
+def _uebersetze(version: str, daten: Mapping[str, Any]) -> Regelwerk:
+    """Validiert die Werte einer Regelwerk-Datei und baut die Tabellen."""
+    if not isinstance(daten, Mapping):
+        raise TypeError("Regelwerk muss ein JSON-Objekt sein")
+    if daten.get("version", version) != version:
+        raise ValueError(
+            f"Version '{daten['version']}' passt nicht zum Dateinamen"
+        )
+    monate = daten["verkuerzung_monate"]
+    if not isinstance(monate, Mapping):
+        raise TypeError("verkuerzung_monate muss ein Objekt sein")
+    unbekannt = sorted(set(monate) - set(_VERKUERZUNG_SCHLUESSEL))
+    if unbekannt:
+        raise ValueError(f"Unbekannte Verkürzungsgründe: {', '.join(unbekannt)}")
+    werte = {
+        name: _monate(monate.get(name, 0), f"verkuerzung_monate.{name}")
+        for name in _VERKUERZUNG_SCHLUESSEL[:-1]
+    }
+    stufen = tuple(monate.get("beruf_q2_stufen", (0, 0, 0)))
+    if len(stufen) != 3:
+        raise ValueError("beruf_q2_stufen braucht drei Werte (< 6, 6-11, ab 12)")
+    stufen = tuple(
+        _monate(wert, "verkuerzung_monate.beruf_q2_stufen") for wert in stufen
+    )
+
+    max_gesamt = _monate(
+        daten["max_gesamt_verkuerzung_monate"], "max_gesamt_verkuerzung_monate"
+    )
+    toleranz = _monate(
+        daten["regel_8_abs_3_toleranz_monate"], "regel_8_abs_3_toleranz_monate"
+    )
+    min_prozent = daten["min_teilzeit_prozent"]
+    if (
+        isinstance(min_prozent, bool)
+        or not isinstance(min_prozent, (int, float))
+        or not 0 < min_prozent <= 100
+    ):
+        raise ValueError("min_teilzeit_prozent muss zwischen 0 und 100 liegen")
+    faktor = daten["max_verlaengerung_faktor"]
+    if (
+        isinstance(faktor, bool)
+        or not isinstance(faktor, (int, float))
+        or faktor < 1
+    ):
+        raise ValueError("max_verlaengerung_faktor muss mindestens 1 sein")
+    min_ao, max_ao = daten["ao_dauer_monate"]
+    min_ao = _monate(min_ao, "ao_dauer_monate")
+    max_ao = _monate(max_ao, "ao_dauer_monate")
+    if not 0 < min_ao <= max_ao:
+        raise ValueError(
+            "ao_dauer_monate muss [Minimum, Maximum] mit 0 < Min <= Max sein"
+        )
+
+    monate_allgemein = tuple(
+        sum(werte[name] for bit, name in _ALLGEMEINE_GRUENDE if teilmaske & bit)
+        for teilmaske in range(_BITS_ALLGEMEIN + 1)
+    )
+    monate_beruf_fragen = []
+    for teilmaske in range(_BITS_BERUF_FRAGEN + 1):
+        maske = teilmaske << _BERUF_FRAGEN_SHIFT
+        stufe = (maske >> BERUF_Q2_STUFE_SHIFT) & BERUF_Q2_STUFE_MASKE
+        monate_beruf_fragen.append(
+            sum(werte[name] for bit, name in _BERUF_FRAGEN if maske & bit)
+            + stufen[min(stufe, 2)]
+        )
+
+    entspricht_standard = (
+        monate_allgemein == _MONATE_ALLGEMEIN
+        and tuple(monate_beruf_fragen) == _MONATE_BERUF_FRAGEN
+        and werte["vorkenntnisse"] == VERKUERZUNG_VORKENNTNISSE
+        and max_gesamt == MAX_GESAMT_VERKUERZUNG_MONATE
+        and min_prozent == MIN_TEILZEIT_PROZENT
+        and faktor == MAX_VERLAENGERUNG_FAKTOR
+        and (min_ao, max_ao) == (MIN_AO_DAUER_MONATE, MAX_AO_DAUER_MONATE)
+        and toleranz == REGEL_8_ABS_3_TOLERANZ_MONATE
+    )
+    return Regelwerk(
+        version=version,
+        bezeichnung=str(daten.get("bezeichnung", version)),
+        max_gesamt_verkuerzung_monate=max_gesamt,
+        min_teilzeit_prozent=min_prozent,
+        max_verlaengerung_faktor=faktor,
+        min_ao_dauer_monate=min_ao,
+        max_ao_dauer_monate=max_ao,
+        regel_8_abs_3_toleranz_monate=toleranz,
+        vorkenntnisse_monate=werte["vorkenntnisse"],
+        monate_allgemein=monate_allgemein,
+        monate_beruf_fragen=tuple(monate_beruf_fragen),
+        obergrenzen=tuple(
+            basis * faktor for basis in range(min_ao, max_ao + 1)
+        ),
+        entspricht_standard=entspricht_standard,
+    )
+
+
+def _monate(wert: Any, feld: str) -> int:
+    """Prüft eine Monatsangabe (nicht-negative ganze Zahl)."""
+    if isinstance(wert, bool) or not isinstance(wert, int) or wert < 0:
+        raise ValueError(f"{feld} muss eine nicht-negative ganze Zahl sein")
+    return wert
@@ -0,0 +1,269 @@
+"""
+Datums-Engine: Ausbildungsende und Monats-Zeitleiste
+
+Übersetzt ein Ergebnis von `berechne_gesamtdauer()` (bzw. die Dauer nach
+Schritt 4) und einen Ausbildungsbeginn in konkrete Daten: das Ausbildungsende
+und eine Zeitleiste mit einem Eintrag je Ausbildungsmonat (Ausbildungsjahr,
+Teilzeit, Art des Monats).
+
+Die Zeitleiste wird als Generator erzeugt und kann zeilenweise als CSV oder
+iCalendar (ICS) exportiert werden; auch Stapel über viele Auszubildende
+werden gestreamt, ohne alle Monate gleichzeitig im Speicher zu halten.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+from .csv_stream import csv_zeilenschreiber
+from .exam_calendar import addiere_monate, ausbildungsende
+
+MONATE_JE_AUSBILDUNGSJAHR = 12
+
+# Art eines Ausbildungsmonats
+MONAT_AUSBILDUNG = "ausbildung"
+MONAT_TEILZEITVERLAENGERUNG = "teilzeitverlaengerung"
+MONAT_PRUEFUNGSVERLAENGERUNG = "pruefungsverlaengerung"
+
+CSV_SPALTEN = (
+    "monat",
+    "beginn",
+    "ende",
+    "ausbildungsjahr",
+    "monat_im_ausbildungsjahr",
+    "art",
+    "teilzeit_prozent",
+    "wochenstunden",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Ausbildungsmonat:
+    """Ein Monat der Zeitleiste (``monat`` beginnt bei 1)."""
+
+    monat: int
+    beginn: date
+    ende: date
+    ausbildungsjahr: int
+    monat_im_ausbildungsjahr: int
+    art: str
+    teilzeit_prozent: float
+    wochenstunden: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Erzeugt den Monat als Dictionary (Daten im ISO-Format)."""
+        return {
+            "monat": self.monat,
+            "beginn": self.beginn.isoformat(),
+            "ende": self.ende.isoformat(),
+            "ausbildungsjahr": self.ausbildungsjahr,
+            "monat_im_ausbildungsjahr": self.monat_im_ausbildungsjahr,
+            "art": self.art,
+            "teilzeit_prozent": self.teilzeit_prozent,
+            "wochenstunden": self.wochenstunden,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Zeitleiste:
+    """
+    Ausbildungszeitraum mit bei Bedarf erzeugter Monatsliste.
+
+    ``verkuerzte_dauer_monate`` und ``finale_dauer_monate`` stammen aus dem
+    Berechnungsergebnis; ``dauer_monate`` ist die tatsächliche Dauer (nach
+    Schritt 4 ggf. länger als ``finale_dauer_monate``).
+    """
+
+    ausbildungsbeginn: date
+    ausbildungsende: date
+    dauer_monate: int
+    verkuerzte_dauer_monate: int
+    finale_dauer_monate: int
+    teilzeit_prozent: float
+    wochenstunden: float
+
+    def monate(self) -> Iterator[Ausbildungsmonat]:
+        """Erzeugt die Ausbildungsmonate der Reihe nach."""
+        beginn = self.ausbildungsbeginn
+        for index in range(self.dauer_monate):
+            naechster_beginn = addiere_monate(self.ausbildungsbeginn, index + 1)
+            jahr, monat_im_jahr = divmod(index, MONATE_JE_AUSBILDUNGSJAHR)
+            if index < self.verkuerzte_dauer_monate:
+                art = MONAT_AUSBILDUNG
+            elif index < self.finale_dauer_monate:
+                art = MONAT_TEILZEITVERLAENGERUNG
+            else:
+                art = MONAT_PRUEFUNGSVERLAENGERUNG
+            yield Ausbildungsmonat(
+                monat=index + 1,
+                beginn=beginn,
+                ende=naechster_beginn - timedelta(days=1),
+                ausbildungsjahr=jahr + 1,
+                monat_im_ausbildungsjahr=monat_im_jahr + 1,
+                art=art,
+                teilzeit_prozent=self.teilzeit_prozent,
+                wochenstunden=self.wochenstunden,
+            )
+            beginn = naechster_beginn
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Erzeugt die Zeitleiste samt aller Monate als Dictionary."""
+        return {
+            "ausbildungsbeginn": self.ausbildungsbeginn.isoformat(),
+            "ausbildungsende": self.ausbildungsende.isoformat(),
+            "dauer_monate": self.dauer_monate,
+            "ausbildungsjahre": -(-self.dauer_monate // MONATE_JE_AUSBILDUNGSJAHR),
+            "monate": [monat.to_dict() for monat in self.monate()],
+        }
+
+    def als_csv(self) -> Iterator[str]:
+        """Streamt die Zeitleiste als CSV (Kopfzeile, dann ein Monat je Zeile)."""
+        return zeitleisten_als_csv([(None, self)])
+
+    def als_ics(self, zeitstempel: Optional[datetime] = None) -> Iterator[str]:
+        """Streamt die Zeitleiste als iCalendar (siehe `zeitleiste_als_ics()`)."""
+        return zeitleiste_als_ics(self, zeitstempel)
+
+
+def erstelle_zeitleiste(
+    ausbildungsbeginn: date,
+    ergebnis: Mapping[str, Any],
+    dauer_monate: Optional[int] = None,
+) -> Zeitleiste:
+    """
+    Verknüpft ein Berechnungsergebnis mit einem Ausbildungsbeginn.
+
+    Args:
+        ausbildungsbeginn (date): Erster Ausbildungstag
+        ergebnis (Mapping): Ergebnis von `berechne_gesamtdauer()`
+        dauer_monate (int | None): Abweichende tatsächliche Dauer, z.B.
+            ``dauer_nach_schritt4_monate``; Standard ist
+            ``finale_dauer_monate``
+
+    Returns:
+        Zeitleiste: Ausbildungszeitraum mit Monatsgenerator
+
+    Raises:
+        TypeError, ValueError: Bei ungültigem Datum oder ungültiger Dauer
+
+    Beispiel:
+        >>> from src.calculation_logic import berechne_gesamtdauer
+        >>> ergebnis = berechne_gesamtdauer(36, 40, 75, 0)
+        >>> erstelle_zeitleiste(date(2024, 8, 1), ergebnis).ausbildungsende
+        datetime.date(2028, 7, 31)
+    """
+    if not isinstance(ausbildungsbeginn, date):
+        raise TypeError("Ausbildungsbeginn muss ein Datum sein")
+    finale_dauer = ergebnis["finale_dauer_monate"]
+    if dauer_monate is None:
+        dauer_monate = finale_dauer
+    if isinstance(dauer_monate, bool) or not isinstance(dauer_monate, int):
+        raise TypeError("Dauer muss in ganzen Monaten angegeben werden")
+    if dauer_monate < finale_dauer:
+        raise ValueError("Dauer darf nicht kürzer als die finale Dauer sein")
+    return Zeitleiste(
+        ausbildungsbeginn=ausbildungsbeginn,
+        ausbildungsende=ausbildungsende(ausbildungsbeginn, dauer_monate),
+        dauer_monate=dauer_monate,
+        verkuerzte_dauer_monate=ergebnis["verkuerzte_dauer_monate"],
+        finale_dauer_monate=finale_dauer,
+        teilzeit_prozent=ergebnis["teilzeit_prozent"],
+        wochenstunden=ergebnis["wochenstunden"],
+    )
+
+
+# ============================================================
+# EXPORT
+# ============================================================
+
+def zeitleisten_als_csv(
+    zeitleisten: Iterable[Tuple[Optional[str], Zeitleiste]],
+) -> Iterator[str]:
+    """
+    Streamt mehrere Zeitleisten als eine CSV-Datei.
+
+    Jedes Element ist ein Paar ``(kennung, zeitleiste)``. Ist die erste
+    Kennung nicht ``None``, beginnt jede Zeile mit einer Spalte ``kennung``.
+    Die Eingabe wird nur einmal durchlaufen und darf selbst ein Generator sein.
+    """
+    schreiber = csv_zeilenschreiber()
+    mit_kennung = None
+    for kennung, zeitleiste in zeitleisten:
+        if mit_kennung is None:
+            mit_kennung = kennung is not None
+            praefix = ("kennung",) if mit_kennung else ()
+            yield schreiber.writerow(praefix + CSV_SPALTEN)
+        praefix = (kennung,) if mit_kennung else ()
+        for monat in zeitleiste.monate():
+            yield schreiber.writerow(praefix + (
+                monat.monat,
+                monat.beginn.isoformat(),
+                monat.ende.isoformat(),
+                monat.ausbildungsjahr,
+                monat.monat_im_ausbildungsjahr,
+                monat.art,
+                monat.teilzeit_prozent,
+                monat.wochenstunden,
+            ))
+
+
+def zeitleiste_als_ics(
+    zeitleiste: Zeitleiste,
+    zeitstempel: Optional[datetime] = None,
+) -> Iterator[str]:
+    """
+    Streamt die Zeitleiste als iCalendar (RFC 5545).
+
+    Enthält je Ausbildungsjahr ein ganztägiges Ereignis über den gesamten
+    Zeitraum sowie ein Ereignis für den letzten Ausbildungstag. Zeilen enden
+    mit CRLF.
+
+    Args:
+        zeitleiste (Zeitleiste): Zu exportierende Zeitleiste
+        zeitstempel (datetime | None): Wert für ``DTSTAMP`` (Standard: jetzt)
+    """
+    zeitstempel = zeitstempel or datetime.now(timezone.utc)
+    dtstamp = zeitstempel.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    uid_praefix = f"{zeitleiste.ausbildungsbeginn:%Y%m%d}-{zeitleiste.dauer_monate}"
+
+    yield "BEGIN:VCALENDAR\r\n"
+    yield "VERSION:2.0\r\n"
+    yield "PRODID:-//Teilzeitrechner//Zeitleiste//DE\r\n"
+
+    jahr_beginn = None
+    jahr = 0
+    letzter = None
+    for monat in zeitleiste.monate():
+        if monat.ausbildungsjahr != jahr:
+            if letzter is not None:
+                yield from _ics_ereignis(
+                    f"{uid_praefix}-jahr{jahr}", dtstamp, jahr_beginn,
+                    letzter.ende, f"{jahr}. Ausbildungsjahr",
+                )
+            jahr, jahr_beginn = monat.ausbildungsjahr, monat.beginn
+        letzter = monat
+    if letzter is not None:
+        yield from _ics_ereignis(
+            f"{uid_praefix}-jahr{jahr}", dtstamp, jahr_beginn, letzter.ende,
+            f"{jahr}. Ausbildungsjahr",
+        )
+    yield from _ics_ereignis(
+        f"{uid_praefix}-ende", dtstamp, zeitleiste.ausbildungsende,
+        zeitleiste.ausbildungsende, "Ende der Ausbildung",
+    )
+    yield "END:VCALENDAR\r\n"
+
+
+def _ics_ereignis(
+    uid: str, dtstamp: str, beginn: date, ende: date, titel: str
+) -> Iterator[str]:
+    """Ganztägiges Ereignis von ``beginn`` bis einschließlich ``ende``."""
+    yield "BEGIN:VEVENT\r\n"
+    yield f"UID:{uid}@teilzeitrechner\r\n"
+    yield f"DTSTAMP:{dtstamp}\r\n"
+    yield f"DTSTART;VALUE=DATE:{beginn:%Y%m%d}\r\n"
+    yield f"DTEND;VALUE=DATE:{ende + timedelta(days=1):%Y%m%d}\r\n"
+    yield f"SUMMARY:{titel}\r\n"
+    yield "END:VEVENT\r\n"
@@ -0,0 +1,113 @@
+"""Schneller WSGI-Pfad für ``POST /api/calculate``.
+
+Jede Berechnung durchläuft in Flask Routing, Request-Kontext,
+``before_request``/``after_request`` und ``request.get_json``. Die
+Berechnung selbst dauert (mit Ergebniscache) nur wenige Mikrosekunden, der
+Rahmen ein Vielfaches davon. `SchnellerPfad` wird in ``wsgi.py`` vor die
+Flask-App gesetzt, beantwortet ``POST /api/calculate`` direkt (Body einmal
+lesen, Service-Schicht aufrufen, Bytes schreiben) und reicht alle übrigen
+Requests unverändert an Flask weiter.
+
+Statuscodes, Bodies, ``Content-Type`` und die Zugriffs-Logzeile entsprechen
+der Flask-Route. Unerwartete Ausnahmen beantwortet weiterhin Flask (mit dem
+bereits gelesenen Body), ebenso alle Requests, wenn ``MAX_CONTENT_LENGTH``
+gesetzt ist. Der Pfad ist optional und nur mit ``WSGI_FAST_PATH=1`` aktiv;
+ohne die Variable bedient Flask alle Requests samt Hooks.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+from flask import Flask
+from werkzeug.http import HTTP_STATUS_CODES, parse_options_header
+from werkzeug.wsgi import get_input_stream
+
+from .api import verarbeite_berechnungsanfrage
+from .app import FEHLER_CONTENT_TYPE
+
+# Gleicher Logger wie das Request-Logging der App (`_log_request_end`)
+logger = logging.getLogger("src.app")
+
+BERECHNUNGS_PFAD = "/api/calculate"
+
+# Statuszeilen wie von Werkzeug erzeugt (z.B. "422 UNPROCESSABLE ENTITY")
+_STATUSZEILEN: Dict[int, str] = {
+    code: f"{code} {text.upper()}" for code, text in HTTP_STATUS_CODES.items()
+}
+
+_AN_WERTE = frozenset({"1", "true", "ja", "yes", "on"})
+
+
+def schneller_pfad_aus_umgebung() -> bool:
+    """Liest ``WSGI_FAST_PATH`` (Default: aus; ``1``/``true``/``on`` → aktiv)."""
+    return os.getenv("WSGI_FAST_PATH", "").strip().lower() in _AN_WERTE
+
+
+class SchnellerPfad:
+    """WSGI-Middleware, die ``POST /api/calculate`` ohne Flask beantwortet."""
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+
+    def __call__(
+        self, environ: Dict[str, Any], start_response: Callable[..., Any]
+    ) -> Iterable[bytes]:
+        if (
+            environ.get("PATH_INFO") != BERECHNUNGS_PFAD
+            or environ.get("REQUEST_METHOD") != "POST"
+            or self.app.config["MAX_CONTENT_LENGTH"] is not None
+        ):
+            return self.app(environ, start_response)
+
+        start = time.perf_counter()
+        if not _ist_json(environ.get("CONTENT_TYPE", "")):
+            status_code, body = 400, FEHLER_CONTENT_TYPE
+        else:
+            daten = get_input_stream(environ).read()
+            try:
+                status_code, body = self._berechne(daten)
+            except Exception:
+                # Fehlerseite, Fehlerprotokoll und Hooks wie bisher über Flask
+                environ["wsgi.input"] = io.BytesIO(daten)
+                environ["CONTENT_LENGTH"] = str(len(daten))
+                return self.app(environ, start_response)
+
+        start_response(
+            _STATUSZEILEN[status_code],
+            [
+                ("Content-Type", "application/json"),
+                ("Content-Length", str(len(body))),
+            ],
+        )
+        logger.info(
+            "%s %s -> %s (%dms)",
+            "POST",
+            BERECHNUNGS_PFAD,
+            status_code,
+            int((time.perf_counter() - start) * 1000),
+        )
+        return [body]
+
+    def _berechne(self, daten: bytes) -> Tuple[int, bytes]:
+        """Wie ``request.get_json(force=True, silent=True) or {}`` plus Service."""
+        try:
+            nutzlast = self.app.json.loads(daten)
+        except ValueError:
+            nutzlast = None
+        response = verarbeite_berechnungsanfrage(nutzlast or {})
+        return response.status_code, response.to_bytes()
+
+
+def _ist_json(content_type: str) -> bool:
+    """Entspricht ``request.is_json`` (``application/json`` oder ``+json``)."""
+    if content_type == "application/json":
+        return True
+    mimetype = parse_options_header(content_type)[0].lower()
+    return mimetype == "application/json" or (
+        mimetype.startswith("application/") and mimetype.endswith("+json")
+    )
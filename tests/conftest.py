@@ -0,0 +1,13 @@
+"""Gemeinsame Pytest-Fixtures für alle Tests."""
+
+import pytest
+
+from src.api import leere_ergebnis_cache
+
+
+@pytest.fixture(autouse=True)
+def _leerer_ergebnis_cache():
+    """Stellt sicher, dass jeder Test mit leerem Ergebniscache startet."""
+    leere_ergebnis_cache()
+    yield
+    leere_ergebnis_cache()
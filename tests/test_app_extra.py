@@ -23,7 +23,8 @@ def test_method_not_allowed(client):
     resp = client.put("/api/calculate", json={})
     assert resp.status_code == 405
 
-def test_get_api_calculate_not_allowed(client):
-    """GET /api/calculate liefert Status 405 (Method Not Allowed)."""
+def test_get_api_calculate_ohne_parameter(client):
+    """GET /api/calculate ohne Query-Parameter liefert 400 (fehlende Felder)."""
     resp = client.get("/api/calculate")
-    assert resp.status_code == 405
+    assert resp.status_code == 400
+    assert resp.get_json()["error"]["code"] == "missing_fields"
@@ -0,0 +1,146 @@
+"""
+Unit-Tests für die vektorisierte Batch-Berechnung (batch_calculation.py)
+
+Die Batch-Ergebnisse werden Zeile für Zeile mit `berechne_gesamtdauer()`
+verglichen und müssen bitgleich sein.
+
+Testabdeckung:
+- Prozent- und Stunden-Eingaben über den gesamten Definitionsbereich
+- Verkürzungsgründe als Bitmaske (inkl. berufliche Felder und Legacy-Feld)
+- Fehlercodes je Zeile
+"""
+
+import numpy as np
+import pytest
+
+from src.batch_calculation import (FEHLER_AO_DAUER, FEHLER_EINGABETYP,
+                                   FEHLER_KEINER, FEHLER_STUNDEN_MAXIMUM,
+                                   FEHLER_STUNDEN_MINIMUM,
+                                   FEHLER_TEILZEIT_PROZENT, FEHLER_VOLLZEIT,
+                                   berechne_gesamtdauer_batch)
+from src.calculation_logic import (BERUF_MONATE_SHIFT, BERUF_Q2_STUFE_SHIFT,
+                                   GRUND_ABITUR, GRUND_ALTER_21,
+                                   GRUND_BERUF_FELDER, GRUND_BERUF_Q2,
+                                   GRUND_BERUF_Q4, GRUND_REALSCHULE,
+                                   GRUND_VORKENNTNISSE, berechne_gesamtdauer)
+
+# Paare aus Bitmaske und gleichwertigem verkuerzungsgruende-Dict
+MASKEN_UND_GRUENDE = [
+    (0, {}),
+    (GRUND_ABITUR, {"abitur": True}),
+    (GRUND_REALSCHULE, {"realschule": True}),
+    (GRUND_ABITUR | GRUND_ALTER_21, {"abitur": True, "alter_ueber_21": True}),
+    (GRUND_VORKENNTNISSE, {"vorkenntnisse_monate": 6}),
+    (
+        GRUND_BERUF_FELDER | GRUND_BERUF_Q2 | GRUND_BERUF_Q4
+        | (1 << BERUF_Q2_STUFE_SHIFT),
+        {"beruf_q2": True, "beruf_q2_dauer_monate": 8, "beruf_q4": True},
+    ),
+    (
+        GRUND_BERUF_FELDER | (3 << BERUF_MONATE_SHIFT),
+        {"berufliche_verkuerzung_monate": 3, "beruf_q1": True},
+    ),
+    (
+        GRUND_BERUF_FELDER | (-4 << BERUF_MONATE_SHIFT),
+        {"berufliche_verkuerzung_monate": -4},
+    ),
+]
+
+
+def _vergleiche_mit_skalar(spalten, zeilen):
+    """Vergleicht jede Batch-Zeile mit dem Ergebnis der Skalar-Funktion."""
+    for i, (basis, vollzeit, teilzeit, typ, gruende) in enumerate(zeilen):
+        erwartet = berechne_gesamtdauer(basis, vollzeit, teilzeit, gruende, typ)
+        for key, wert in erwartet.items():
+            assert spalten[key][i] == wert, (key, basis, vollzeit, teilzeit, typ)
+        assert spalten["fehlercode"][i] == FEHLER_KEINER
+
+
+def test_batch_prozent_bitgleich_zur_skalar_funktion():
+    """Alle AO-Dauern × Prozentwerte × Verkürzungsmasken sind bitgleich."""
+    zeilen, masken = [], []
+    for maske, gruende in MASKEN_UND_GRUENDE:
+        for basis in range(24, 43):
+            for prozent in (50, 55.5, 68, 70, 75, 83, 90, 99, 100):
+                zeilen.append((basis, 40.0, prozent, "prozent", gruende))
+                masken.append(maske)
+    basis, vollzeit, teilzeit, typ, _ = zip(*zeilen)
+
+    spalten = berechne_gesamtdauer_batch(basis, vollzeit, teilzeit, typ, masken)
+
+    _vergleiche_mit_skalar(spalten, zeilen)
+
+
+def test_batch_stunden_bitgleich_zur_skalar_funktion():
+    """Stunden-Eingaben (inkl. ungerader Vollzeit) sind bitgleich."""
+    zeilen, masken = [], []
+    for maske, gruende in MASKEN_UND_GRUENDE[:4]:
+        for vollzeit in (10, 23, 37.5, 40, 48):
+            for stunden in np.linspace(vollzeit / 2, vollzeit, 7):
+                zeilen.append((36, vollzeit, float(stunden), "stunden", gruende))
+                masken.append(maske)
+    basis, vollzeit, teilzeit, typ, _ = zip(*zeilen)
+
+    spalten = berechne_gesamtdauer_batch(basis, vollzeit, teilzeit, typ, masken)
+
+    _vergleiche_mit_skalar(spalten, zeilen)
+
+
+def test_batch_fehlercodes_je_zeile():
+    """Ungültige Zeilen werden markiert, ohne die Batch-Berechnung abzubrechen."""
+    spalten = berechne_gesamtdauer_batch(
+        [36, 20, 36, 36, 36, 36, 36],
+        [40, 40, 60, 40, 40, 40, 40],
+        [75, 75, 75, 40, 10, 45, 75],
+        ["prozent", "prozent", "prozent", "prozent", "stunden", "stunden", "x"],
+        0,
+    )
+
+    assert spalten["fehlercode"].tolist() == [
+        FEHLER_KEINER,
+        FEHLER_AO_DAUER,
+        FEHLER_VOLLZEIT,
+        FEHLER_TEILZEIT_PROZENT,
+        FEHLER_STUNDEN_MINIMUM,
+        FEHLER_STUNDEN_MAXIMUM,
+        FEHLER_EINGABETYP,
+    ]
+    assert spalten["finale_dauer_monate"].tolist() == [48, 0, 0, 0, 0, 0, 0]
+    assert np.isnan(spalten["nach_schritt1_monate"][1:]).all()
+
+
+def test_batch_eingabetyp_als_code():
+    """Eingabetyp kann auch numerisch (0 = Prozent, 1 = Stunden) übergeben werden."""
+    spalten = berechne_gesamtdauer_batch(36, 40, [75, 30], [0, 1], 0)
+
+    assert spalten["finale_dauer_monate"].tolist() == [48, 48]
+
+
+def test_batch_nicht_numerische_ao_dauer():
+    """Nicht-numerische AO-Dauer löst wie in der Skalar-API einen TypeError aus."""
+    with pytest.raises(TypeError):
+        berechne_gesamtdauer_batch(["36"], [40], [75], ["prozent"], [0])
+
+
+def test_exakte_abrundung():
+    """Rechnerisch ganzzahlige Dauern (Gleitkomma knapp darunter) exakt."""
+    spalten = berechne_gesamtdauer_batch(
+        [36, 34], [45, 40], [37.5, 68], ["stunden", "prozent"],
+        [GRUND_REALSCHULE, 0],
+    )
+    assert spalten["finale_dauer_monate"].tolist() == [36, 50]
+
+
+@pytest.mark.parametrize("toleranz, angewendet", [(6, True), (3, False)])
+def test_regel_8_abs_3_nutzt_gemeinsame_toleranz(monkeypatch, toleranz, angewendet):
+    """Die Batch-Maske liest REGEL_8_ABS_3_TOLERANZ_MONATE statt einer Zahl."""
+    import src.batch_calculation as batch_calculation
+
+    monkeypatch.setattr(
+        batch_calculation, "REGEL_8_ABS_3_TOLERANZ_MONATE", toleranz
+    )
+    # 36 / 0,9 = 40 Monate: 4 Monate über der AO-Dauer
+    spalten = berechne_gesamtdauer_batch([36], [40], [90], ["prozent"], [0])
+
+    assert bool(spalten["regel_8_abs_3_angewendet"][0]) is angewendet
+    assert spalten["finale_dauer_monate"][0] == (36 if angewendet else 40)
@@ -0,0 +1,142 @@
+"""
+Tests für die Sammelberechnung (batch_service.py)
+
+Testabdeckung:
+- Ergebnisse je Eintrag identisch zu Einzelanfragen
+- Deduplizierung gleichwertiger Einträge (kanonischer Schlüssel)
+- Fehlerantworten (400/422) je Eintrag und ungültige Listen
+- Konfigurierbare Obergrenze (BATCH_MAX_SIZE)
+- POST /api/calculate/batch
+"""
+
+import pytest
+
+import src.api.batch_service as bs
+from src.api import verarbeite_batchanfrage, verarbeite_berechnungsanfrage
+from src.app import create_app
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def _anfrage(**aenderungen):
+    """Kopie der Standardanfrage mit geänderten Feldern."""
+    anfrage = dict(TEILZEIT_75_MIT_ABITUR)
+    anfrage.update(aenderungen)
+    return anfrage
+
+
+def test_batch_ergebnisse_wie_einzelanfragen():
+    """Jeder Eintrag liefert dasselbe Ergebnis wie /api/calculate."""
+    anfragen = [
+        _anfrage(),
+        _anfrage(teilzeit_eingabe=50),
+        _anfrage(verkuerzungsgruende={}, teilzeit_eingabe=90),
+    ]
+    response = verarbeite_batchanfrage(anfragen)
+
+    assert response.status_code == 200
+    result = response.body["result"]
+    assert result["anzahl"] == 3
+    assert result["fehler"] == 0
+    for index, (zeile, anfrage) in enumerate(zip(result["ergebnisse"], anfragen)):
+        assert zeile["index"] == index
+        assert zeile["status_code"] == 200
+        assert zeile["duplikat_von"] is None
+        assert zeile["result"] == verarbeite_berechnungsanfrage(anfrage).body["result"]
+
+
+def test_batch_dedupliziert_gleichwertige_eintraege():
+    """75 % und 30 von 40 Stunden werden nur einmal berechnet."""
+    response = verarbeite_batchanfrage([
+        _anfrage(),
+        _anfrage(),
+        _anfrage(teilzeit_eingabe=30, eingabetyp="stunden"),
+        _anfrage(teilzeit_eingabe=60),
+    ])
+
+    result = response.body["result"]
+    assert result["eindeutige_anfragen"] == 2
+    zeilen = result["ergebnisse"]
+    assert [zeile["duplikat_von"] for zeile in zeilen] == [None, 0, 0, None]
+    assert zeilen[1]["result"] == zeilen[0]["result"]
+
+
+def test_batch_fehler_je_eintrag():
+    """Ungültige Einträge enthalten die Fehlerantwort einer Einzelanfrage."""
+    ungueltig = _anfrage(teilzeit_eingabe=40)
+    response = verarbeite_batchanfrage([
+        _anfrage(),
+        {"basis_dauer_monate": 36},
+        ungueltig,
+        "kein Objekt",
+    ])
+
+    assert response.status_code == 200
+    result = response.body["result"]
+    assert result["fehler"] == 3
+    _, fehlend, zu_klein, kein_objekt = result["ergebnisse"]
+    assert fehlend["status_code"] == 400
+    assert fehlend["error"]["code"] == "missing_fields"
+    einzeln = verarbeite_berechnungsanfrage(ungueltig)
+    assert zu_klein["status_code"] == einzeln.status_code == 422
+    assert zu_klein["error"] == einzeln.body["error"]
+    assert kein_objekt["status_code"] == 422
+    assert kein_objekt["error"]["details"] == {"field": "anfrage"}
+
+
+@pytest.mark.parametrize("payload", [{}, [], {"anfragen": []}, "x"])
+def test_batch_ungueltige_liste(payload):
+    """Keine oder leere Liste → 422."""
+    response = verarbeite_batchanfrage(payload)
+
+    assert response.status_code == 422
+    assert response.body["error"]["details"] == {"field": "payload"}
+
+
+def test_batch_obergrenze(monkeypatch):
+    """Listen über der konfigurierten Obergrenze werden abgelehnt."""
+    monkeypatch.setattr(bs, "MAX_BATCH_GROESSE", 2)
+
+    assert verarbeite_batchanfrage([_anfrage()] * 2).status_code == 200
+    response = verarbeite_batchanfrage([_anfrage()] * 3)
+    assert response.status_code == 422
+    assert response.body["error"]["details"]["max"] == 2
+
+
+def test_batch_groesse_aus_umgebung(monkeypatch):
+    """BATCH_MAX_SIZE setzt die Obergrenze; ungültige Werte → Default."""
+    monkeypatch.setenv("BATCH_MAX_SIZE", "50")
+    assert bs.batch_groesse_aus_umgebung() == 50
+    monkeypatch.setenv("BATCH_MAX_SIZE", "0")
+    assert bs.batch_groesse_aus_umgebung() == bs.STANDARD_MAX_BATCH_GROESSE
+    monkeypatch.setenv("BATCH_MAX_SIZE", "viele")
+    assert bs.batch_groesse_aus_umgebung() == bs.STANDARD_MAX_BATCH_GROESSE
+
+
+def test_api_batch(client):
+    """POST /api/calculate/batch liefert Ergebnisse je Eintrag."""
+    resp = client.post("/api/calculate/batch", json=[
+        _anfrage(),
+        _anfrage(eingabetyp="tage"),
+    ])
+
+    assert resp.status_code == 200
+    erfolg, fehler = resp.get_json()["result"]["ergebnisse"]
+    assert erfolg["result"]["finale_dauer_monate"] == 32
+    assert fehler["status_code"] == 422
+    assert fehler["error"]["code"] == "ungültiger_eingabetyp"
+
+
+def test_api_batch_ohne_json(client):
+    """Ohne JSON-Body antwortet der Endpoint mit 400."""
+    resp = client.post("/api/calculate/batch", data="x")
+
+    assert resp.status_code == 400
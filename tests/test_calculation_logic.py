@@ -17,9 +17,26 @@ Testabdeckung:
 - Formatierung der Ausgabe
 """
 
+import json
+import math
+from fractions import Fraction
+
 import pytest
 
-from src.calculation_logic import berechne_gesamtdauer, formatiere_ergebnis
+from src.calculation_logic import (
+    ERGEBNIS_KEYS,
+    GRUND_REALSCHULE,
+    Berechnungsergebnis,
+    _schritte_aus_tabelle,
+    berechne_gesamtdauer,
+    berechne_schritte_exakt,
+    berechne_schritte_ganzzahlig,
+    berechne_teilzeit_schritt1,
+    formatiere_ergebnis,
+    obergrenze_anwenden_schritt2,
+    rundung_anwenden_schritt3,
+    verifiziere_ergebnistabelle,
+)
 from tests.dummy_data import (
     DAUER_24_MONATE,
     DAUER_42_MONATE,
@@ -675,3 +692,133 @@ def test_sonderregel_8_abs_3_bei_mehr_als_6_monaten():
         output = formatiere_ergebnis({})
         assert isinstance(output, str)
         assert "BERECHNUNGSERGEBNIS" in output
+
+
+# ============================================================
+# Ergebnistabelle (vorberechneter Definitionsbereich)
+# ============================================================
+
+
+def test_ergebnistabelle_stimmt_mit_live_berechnung_ueberein():
+    """
+    Test: Jede Zelle der Ergebnistabelle entspricht der Live-Berechnung.
+
+    Erwartung: Keine Abweichungen über den gesamten tabellierten Bereich.
+    """
+    assert verifiziere_ergebnistabelle() == []
+
+
+def test_ergebnistabelle_nicht_ganzzahlige_eingabe_nutzt_live_pfad():
+    """
+    Test: Nicht ganzzahlige Eingaben werden nicht in der Tabelle nachgeschlagen.
+
+    Erwartung: Ergebnis entspricht den Einzelschritten (36 / 0.755 = 47.68 → 47).
+    """
+    data = VOLLZEIT_OHNE_VERKUERZUNG.copy()
+    data["teilzeit_eingabe"] = 75.5
+    assert _schritte_aus_tabelle(36, 36, 40, 75.5, "prozent") is None
+
+    result = berechne_gesamtdauer(**data)
+    assert result["nach_schritt1_monate"] == 36 / 0.755
+    assert result["finale_dauer_monate"] == 47
+
+
+def test_ergebnistabelle_liefert_obergrenze_und_sonderregel():
+    """
+    Test: Flags für Obergrenze und § 8 Abs. 3 werden aus der Tabelle rekonstruiert.
+
+    Erwartung: 36 Monate bei 50% → Obergrenze 54.0; 36 Monate bei 90% → 40 → 36.
+    """
+    assert _schritte_aus_tabelle(36, 36, 40, 50, "prozent") == (72.0, 54.0, 54, False)
+    assert _schritte_aus_tabelle(36, 36, 40, 36, "stunden") == (
+        36 / 0.9,
+        36 / 0.9,
+        36,
+        True,
+    )
+
+
+# ============================================================
+# Ganzzahl-Kernel und exakte Abrundung
+# ============================================================
+
+
+def test_rundung_gleicht_gleitkommafehler_aus():
+    """
+    Test: Rechnerisch ganzzahlige Dauern werden nicht um einen Monat zu tief gerundet.
+
+    Erwartung: 34 Monate bei 68% = exakt 50 Monate (Gleitkomma: 49,999...).
+    """
+    data = VOLLZEIT_OHNE_VERKUERZUNG.copy()
+    data["basis_dauer_monate"] = 34
+    data["teilzeit_eingabe"] = 68
+    result = berechne_gesamtdauer(**data)
+
+    assert result["finale_dauer_monate"] == 50
+    assert berechne_schritte_ganzzahlig(17, 36, 68) == 25
+
+
+def test_exakte_abrundung_bei_gleitkomma_eingaben():
+    """
+    Test: Nicht ganzzahlige Eingaben (live berechnet) werden ebenfalls exakt
+    abgerundet.
+
+    Erwartung: 30 Monate bei 37,5 von 45 Stunden = exakt 36 Monate
+    (Gleitkomma: 35,999...).
+    """
+    result = berechne_gesamtdauer(36, 45, 37.5, GRUND_REALSCHULE, "stunden")
+
+    assert result["finale_dauer_monate"] == 36
+    assert berechne_schritte_exakt(30, 36, 37.5, 45) == 36
+    assert berechne_schritte_exakt(30, 36, 62.5) == 48
+
+
+def test_ganzzahl_kernel_ist_exakt():
+    """
+    Test: Der Ganzzahl-Kernel entspricht im gesamten ganzzahligen Bereich der
+    exakten Rechnung mit Brüchen; die Gleitkomma-Kette weicht höchstens um
+    einen Monat nach unten ab (Prozent- und Stunden-Eingaben).
+    """
+    for basis in range(24, 43):
+        obergrenze = Fraction(basis * 3, 2)
+        for verkuerzte in range(basis - 12, basis + 1):
+            for zaehler, nenner in (
+                [(prozent, 100) for prozent in range(50, 101)]
+                + [
+                    (stunden, vollzeit)
+                    for vollzeit in (10, 23, 37, 40, 48)
+                    for stunden in range((vollzeit + 1) // 2, vollzeit + 1)
+                ]
+            ):
+                exakt = math.floor(
+                    min(Fraction(verkuerzte * nenner, zaehler), obergrenze)
+                )
+                kernel = berechne_schritte_ganzzahlig(
+                    verkuerzte, basis, zaehler, nenner
+                )
+                assert kernel == exakt
+                prozent = zaehler if nenner == 100 else zaehler / nenner * 100
+                gleitkomma = rundung_anwenden_schritt3(
+                    obergrenze_anwenden_schritt2(
+                        berechne_teilzeit_schritt1(verkuerzte, prozent), basis
+                    )
+                )
+                assert kernel - gleitkomma in (0, 1)
+
+
+def test_ergebnis_verhaelt_sich_wie_dictionary():
+    """
+    Test: Das Ergebnisobjekt ist ein Mapping mit den bisherigen Schlüsseln
+    und liefert Dictionary/JSON erst auf Anfrage.
+    """
+    ergebnis = berechne_gesamtdauer(36, 40, 75, {"abitur": True}, "prozent")
+
+    assert isinstance(ergebnis, Berechnungsergebnis)
+    assert list(ergebnis) == list(ERGEBNIS_KEYS)
+    assert ergebnis == ergebnis.to_dict()
+    assert ergebnis["wochenstunden"] == ergebnis["teilzeit_stunden"]
+    assert ergebnis["finale_dauer_jahre"] == ergebnis.finale_dauer_jahre
+    assert json.loads(ergebnis.to_json()) == ergebnis.to_dict()
+    with pytest.raises(KeyError):
+        ergebnis["unbekannt"]
+    assert not hasattr(ergebnis, "__dict__")
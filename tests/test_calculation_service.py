@@ -1,5 +1,7 @@
 """Unit-Tests für die Service-Schicht der Berechnung."""
 
+import json
+
 import pytest
 
 from src.api.calculation_service import verarbeite_berechnungsanfrage
@@ -8,6 +10,7 @@ from tests.dummy_data import (
     UNGUELTIG_TEILZEIT_UNTER_50,
 )
 import src.api.calculation_service as cs
+import src.api.validation as validation
 
 
 def test_berechnung_erfolgreich():
@@ -128,21 +131,21 @@ def test_invalid_int_string_in_berufliche_verkuerzung_monate():
 
 
 def test_coerce_float_with_bool():
-    """_coerce_float mit bool-Wert wirft NutzlastValidierungsFehler."""
+    """coerce_float mit bool-Wert wirft NutzlastValidierungsFehler."""
     with pytest.raises(cs.NutzlastValidierungsFehler):
-        cs._coerce_float(True, "testfeld")
+        validation.coerce_float(True, "testfeld")
 
 
 def test_coerce_int_with_non_integer_float():
-    """_coerce_int mit float, der keine Ganzzahl ist, wirft NutzlastValidierungsFehler."""
+    """coerce_int mit float, der keine Ganzzahl ist, wirft NutzlastValidierungsFehler."""
     with pytest.raises(cs.NutzlastValidierungsFehler):
-        cs._coerce_int(3.14, "testfeld")
+        validation.coerce_int(3.14, "testfeld")
 
 
 def test_benoetige_dictionary_with_list():
-    """_benoetige_dictionary mit falschem Typ (Liste) wirft NutzlastValidierungsFehler."""
+    """benoetige_dictionary mit falschem Typ (Liste) wirft NutzlastValidierungsFehler."""
     with pytest.raises(cs.NutzlastValidierungsFehler):
-        cs._benoetige_dictionary([1,2,3], "testfeld")
+        validation.benoetige_dictionary([1,2,3], "testfeld")
 
 
 def test_normalisiere_verkuerzungsgruende_missing_optional():
@@ -182,18 +185,190 @@ def test_nutzlast_validierungsfehler_custom_code_details():
         assert "result" in response.body
 
     def test_coerce_int_with_string_ganzzahl():
-        """_coerce_int akzeptiert Ganzzahl-String."""
-        assert cs._coerce_int("42", "testfeld") == 42
-        assert cs._coerce_int("1.000", "testfeld") == 1000
+        """coerce_int akzeptiert Ganzzahl-String."""
+        assert validation.coerce_int("42", "testfeld") == 42
+        assert validation.coerce_int("1.000", "testfeld") == 1000
 
     def test_coerce_int_with_string_keine_ganzzahl():
-        """_coerce_int mit String, der keine Ganzzahl ist, wirft Fehler."""
+        """coerce_int mit String, der keine Ganzzahl ist, wirft Fehler."""
         with pytest.raises(cs.NutzlastValidierungsFehler):
-            cs._coerce_int("3,14", "testfeld")
+            validation.coerce_int("3,14", "testfeld")
 
     def test_normalize_numeric_string_varianten():
-        """_normalize_numeric_string entfernt Leerzeichen, NBSP und wandelt Komma/Punkt."""
-        assert cs._normalize_numeric_string(" 1.234,5 ") == "1234.5"
-        assert cs._normalize_numeric_string("1 234,5") == "1234.5"
-        assert cs._normalize_numeric_string("1\u00A0234,5") == "1234.5"
-        assert cs._normalize_numeric_string("42") == "42"
+        """normalize_numeric_string entfernt Leerzeichen, NBSP und wandelt Komma/Punkt."""
+        assert validation.normalize_numeric_string(" 1.234,5 ") == "1234.5"
+        assert validation.normalize_numeric_string("1 234,5") == "1234.5"
+        assert validation.normalize_numeric_string("1\u00A0234,5") == "1234.5"
+        assert validation.normalize_numeric_string("42") == "42"
+
+
+def test_gleichwertige_anfragen_teilen_cache_eintrag():
+    """75 % und 30 von 40 Stunden bzw. Abitur und Alter über 21 treffen denselben Eintrag."""
+    verarbeite_berechnungsanfrage(TEILZEIT_75_MIT_ABITUR)
+
+    payload = dict(TEILZEIT_75_MIT_ABITUR)
+    payload["eingabetyp"] = "stunden"
+    payload["teilzeit_eingabe"] = "30,0"
+    payload["verkuerzungsgruende"] = dict(payload["verkuerzungsgruende"])
+    payload["verkuerzungsgruende"]["abitur"] = False
+    payload["verkuerzungsgruende"]["alter_ueber_21"] = True
+    response = verarbeite_berechnungsanfrage(payload)
+
+    assert response.status_code == 200
+    assert response.body["result"]["finale_dauer_monate"] == 32
+    statistik = cs.cache_statistik()
+    assert (statistik.treffer, statistik.fehlschlaege) == (1, 1)
+
+
+@pytest.mark.parametrize("reihenfolge", [(0, 1), (1, 0)])
+def test_gleiche_floats_verschiedener_anteil_eigener_cache_eintrag(reihenfolge):
+    """5,5 von 10 Stunden und 55.00000000000001 % runden verschieden."""
+    basis = {
+        "basis_dauer_monate": 28,
+        "vollzeit_stunden": 10,
+        "verkuerzungsgruende": {"realschule": True},
+    }
+    anfragen = [
+        dict(basis, teilzeit_eingabe=5.5, eingabetyp="stunden"),
+        dict(basis, teilzeit_eingabe=55.00000000000001, eingabetyp="prozent"),
+    ]
+    erwartet = [40, 39]
+
+    for index in reihenfolge:
+        response = verarbeite_berechnungsanfrage(anfragen[index])
+        assert response.status_code == 200
+        assert response.body["result"]["finale_dauer_monate"] == erwartet[index]
+    assert cs.cache_statistik().treffer == 0
+
+
+def test_cache_treffer_liefert_identisches_ergebnis():
+    """Ein Cache-Treffer liefert dasselbe Ergebnis wie die Erstberechnung."""
+    erste = verarbeite_berechnungsanfrage(TEILZEIT_75_MIT_ABITUR)
+    zweite = verarbeite_berechnungsanfrage(TEILZEIT_75_MIT_ABITUR)
+
+    assert zweite.body == erste.body
+    assert cs.cache_statistik().treffer == 1
+
+
+def test_unterschiedliche_verkuerzungssumme_eigener_cache_eintrag():
+    """Abweichende Verkürzungssumme (vor Begrenzung) ergibt eigenen Eintrag."""
+    verarbeite_berechnungsanfrage(TEILZEIT_75_MIT_ABITUR)
+    payload = dict(TEILZEIT_75_MIT_ABITUR)
+    payload["verkuerzungsgruende"] = dict(payload["verkuerzungsgruende"])
+    payload["verkuerzungsgruende"]["alter_ueber_21"] = True
+    response = verarbeite_berechnungsanfrage(payload)
+
+    assert response.body["result"]["verkuerzung_gesamt_ohne_begrenzung"] == 24
+    assert cs.cache_statistik().treffer == 0
+
+
+def test_fehler_werden_nicht_gecacht():
+    """Validierungsfehler landen nicht im Cache."""
+    verarbeite_berechnungsanfrage(UNGUELTIG_TEILZEIT_UNTER_50)
+    verarbeite_berechnungsanfrage(UNGUELTIG_TEILZEIT_UNTER_50)
+
+    assert cs.cache_statistik().eintraege == 0
+
+
+def test_verkuerzungsmaske_entspricht_dictionary_logik():
+    """Bitmaske und Dict-Logik liefern für alle Kombinationen dieselbe Verkürzung."""
+    from itertools import product
+
+    from src.calculation_logic import (berechne_verkuerzung,
+                                       berechne_verkuerzung_aus_maske)
+
+    bool_keys = [key for key, _ in cs.GRUND_BITS]
+    for flags in product((False, True), repeat=len(bool_keys)):
+        for vorkenntnisse, q2_dauer, berufliche in product(
+            (0, 5), (0, 5, 6, 11, 12, 20), (0, 3, -2, 20)
+        ):
+            data = dict(zip(bool_keys, flags))
+            data["vorkenntnisse_monate"] = vorkenntnisse
+            data["beruf_q2_dauer_monate"] = q2_dauer
+            data["berufliche_verkuerzung_monate"] = berufliche
+            maske = cs.kodiere_verkuerzungsgruende(data)
+
+            erwartet = berechne_verkuerzung(36, data)
+            assert berechne_verkuerzung_aus_maske(36, maske) == erwartet
+            dekodiert = cs.dekodiere_verkuerzungsmaske(maske)
+            assert berechne_verkuerzung(36, dekodiert) == erwartet
+            assert cs.kodiere_verkuerzungsgruende(dekodiert) == maske
+
+
+def test_anfrage_traegt_verkuerzungsmaske():
+    """from_dict kodiert die Gründe als Bitmaske; das Dict wird nur bei Bedarf erzeugt."""
+    anfrage = cs.BerechnungsAnfrage.from_dict(TEILZEIT_75_MIT_ABITUR)
+
+    assert anfrage.verkuerzungs_maske & cs.GRUND_ABITUR
+    assert anfrage.verkuerzungsgruende["abitur"] is True
+    assert anfrage.verkuerzungsgruende["realschule"] is False
+
+
+def test_ungueltige_beruf_q2_dauer_nicht_ganzzahlig():
+    """Nicht ganzzahlige beruf_q2_dauer_monate werden weiterhin abgelehnt."""
+    payload = dict(TEILZEIT_75_MIT_ABITUR)
+    payload["verkuerzungsgruende"] = dict(payload["verkuerzungsgruende"])
+    payload["verkuerzungsgruende"]["beruf_q2_dauer_monate"] = 7.5
+    response = verarbeite_berechnungsanfrage(payload)
+    assert response.status_code == 422
+    assert response.body["error"]["details"]["field"] == (
+        "verkuerzungsgruende.beruf_q2_dauer_monate"
+    )
+
+
+def test_antwort_body_wird_erst_bei_zugriff_erzeugt():
+    """Die Antwort hält das Ergebnisobjekt; der Body wird bei Zugriff gebaut."""
+    response = verarbeite_berechnungsanfrage(TEILZEIT_75_MIT_ABITUR)
+
+    assert not isinstance(response.ergebnis, dict)
+    assert response.fehler is None
+    assert response.body == {"result": response.ergebnis.to_dict()}
+    assert json.loads(response.to_json()) == response.body
+
+
+def test_fehlerantwort_body_aus_dienstfehler():
+    """Fehlerantworten serialisieren den DienstFehler in den Body."""
+    response = verarbeite_berechnungsanfrage({})
+
+    assert response.ergebnis is None
+    assert response.body == {"error": response.fehler.to_dict()}
+
+
+def test_kodiere_verkuerzungsgruende_fehlerreihenfolge():
+    """Der Durchlauf meldet Fehler in der bisherigen Reihenfolge."""
+    # Unbekannte Felder vor Typfehlern, Legacy-Felder werden ignoriert
+    with pytest.raises(cs.NutzlastValidierungsFehler) as exc:
+        cs.kodiere_verkuerzungsgruende({"foo": 1, "abitur": "ja", "beruf_q5": 1})
+    assert exc.value.details == {
+        "field": "verkuerzungsgruende",
+        "unexpected": ["foo"],
+    }
+
+    # Zahlprüfung aller Felder vor der Ganzzahlprüfung
+    with pytest.raises(cs.NutzlastValidierungsFehler) as exc:
+        cs.kodiere_verkuerzungsgruende({
+            "beruf_q2_dauer_monate": "7,5",
+            "berufliche_verkuerzung_monate": "abc",
+        })
+    assert str(exc.value) == (
+        "verkuerzungsgruende.berufliche_verkuerzung_monate muss eine Zahl sein"
+    )
+
+    with pytest.raises(cs.NutzlastValidierungsFehler) as exc:
+        cs.kodiere_verkuerzungsgruende(["abitur"])
+    assert exc.value.details == {"field": "verkuerzungsgruende"}
+
+
+def test_kodiere_verkuerzungsgruende_deutsche_zahlen():
+    """Deutsch formatierte Zahlen werden in einem Durchlauf gelesen."""
+    maske = cs.kodiere_verkuerzungsgruende({
+        "vorkenntnisse_monate": "0,5",
+        "beruf_q2": True,
+        "beruf_q2_dauer_monate": "12,0",
+        "berufliche_verkuerzung_monate": "1.000,0",
+    })
+
+    gruende = cs.dekodiere_verkuerzungsmaske(maske)
+    assert gruende["vorkenntnisse_monate"] == 12
+    assert gruende["beruf_q2_dauer_monate"] == 12
+    assert gruende["berufliche_verkuerzung_monate"] == 1000
@@ -0,0 +1,167 @@
+"""
+Tests für den Szenarienvergleich (comparison_service.py)
+
+Testabdeckung:
+- Deltas, Obergrenze/§ 8 Abs. 3 und geänderte Schritte gegenüber der Referenz
+- Deduplizierung gleichwertiger Szenarien (kanonischer Schlüssel)
+- Ungültige Einzelszenarien, ungültige Referenz und ungültige Payloads
+- POST /api/calculate/compare
+"""
+
+import pytest
+
+import src.api.calculation_service as cs
+from src.api import verarbeite_berechnungsanfrage, verarbeite_vergleichsanfrage
+from src.api.comparison_service import _schritt3
+from src.app import create_app
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def _szenario(**aenderungen):
+    """Kopie des Standardszenarios mit geänderten Feldern."""
+    szenario = dict(TEILZEIT_75_MIT_ABITUR)
+    szenario.update(aenderungen)
+    return szenario
+
+
+def test_vergleich_deltas_und_geaenderte_schritte():
+    """Jede Zeile enthält Delta, Flags und geänderte Schritte zur Referenz."""
+    response = verarbeite_vergleichsanfrage({"szenarien": [
+        _szenario(),
+        _szenario(teilzeit_eingabe=50),
+        _szenario(verkuerzungsgruende={}),
+        _szenario(verkuerzungsgruende={}, teilzeit_eingabe=90),
+    ]})
+
+    assert response.status_code == 200
+    referenz, halb, ohne_abitur, regel = response.body["result"]["szenarien"]
+    assert referenz["delta_finale_dauer_monate"] == 0
+    assert referenz["geaenderte_schritte"] == []
+    # 24 / 0.5 = 48 Monate
+    assert halb["delta_finale_dauer_monate"] == 16
+    assert halb["geaenderte_schritte"] == ["schritt1", "schritt2", "schritt3"]
+    assert ohne_abitur["geaenderte_schritte"][0] == "verkuerzung"
+    # 36 / 0.9 = 40 ≤ 36 + 6 → § 8 Abs. 3
+    assert regel["finale_dauer_monate"] == 36
+    assert regel["regel_8_abs_3_angewendet"] is True
+    assert "regel_8_abs_3" in regel["geaenderte_schritte"]
+
+
+def test_vergleich_obergrenze_und_referenzindex():
+    """Die Referenz ist wählbar; Obergrenze wird je Szenario markiert."""
+    response = verarbeite_vergleichsanfrage({
+        "szenarien": [
+            _szenario(),
+            _szenario(verkuerzungsgruende={}, teilzeit_eingabe=50),
+        ],
+        "referenz": 1,
+    })
+
+    zeilen = response.body["result"]["szenarien"]
+    assert response.body["result"]["referenz"] == 1
+    assert zeilen[1]["obergrenze_angewendet"] is True
+    assert zeilen[1]["finale_dauer_monate"] == 54
+    assert zeilen[0]["delta_finale_dauer_monate"] == 32 - 54
+
+
+def test_schritt3_bei_stundeneingabe_exakt():
+    """Schritt 3 vor § 8 Abs. 3 nutzt den exakten Stundenanteil."""
+    basis = {
+        "basis_dauer_monate": 25,
+        "vollzeit_stunden": 12,
+        "verkuerzungsgruende": {},
+    }
+    stunden = dict(basis, teilzeit_eingabe=10, eingabetyp="stunden")
+    # float von 10 / 12 · 100: 25 / 0.8333333333333334 < 30 → 29
+    prozent = dict(basis, teilzeit_eingabe=10 / 12 * 100, eingabetyp="prozent")
+    anfrage = cs.BerechnungsAnfrage.from_dict(stunden)
+    ergebnis = cs.berechne_anfrage(anfrage)
+
+    assert ergebnis.regel_8_abs_3_angewendet is True
+    assert _schritt3(anfrage, ergebnis) == 30
+    response = verarbeite_vergleichsanfrage({"szenarien": [stunden, prozent]})
+    zeilen = response.body["result"]["szenarien"]
+    assert zeilen[1]["finale_dauer_monate"] == 25
+    assert zeilen[1]["geaenderte_schritte"] == ["schritt3"]
+
+
+def test_gleichwertige_szenarien_werden_einmal_berechnet(monkeypatch):
+    """Gleichwertige Szenarien teilen sich eine Berechnung."""
+    aufrufe = []
+    original = cs.berechne_gesamtdauer
+
+    def zaehlend(*args, **kwargs):
+        aufrufe.append(kwargs)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(cs, "berechne_gesamtdauer", zaehlend)
+    response = verarbeite_vergleichsanfrage({"szenarien": [
+        _szenario(),
+        _szenario(teilzeit_eingabe="75,0"),
+        _szenario(eingabetyp="stunden", teilzeit_eingabe=30),
+        _szenario(teilzeit_eingabe=80),
+    ]})
+
+    result = response.body["result"]
+    assert len(aufrufe) == 2
+    assert result["eindeutige_szenarien"] == 2
+    assert [z["duplikat_von"] for z in result["szenarien"]] == [None, 0, 0, None]
+
+
+def test_ungueltiges_szenario_bricht_vergleich_nicht_ab():
+    """Ungültige Einzelszenarien erhalten eine Fehlerzeile."""
+    response = verarbeite_vergleichsanfrage({"szenarien": [
+        _szenario(),
+        _szenario(teilzeit_eingabe=40),
+        {"basis_dauer_monate": 36},
+        "kein Objekt",
+    ]})
+
+    assert response.status_code == 200
+    zeilen = response.body["result"]["szenarien"]
+    assert zeilen[1]["status_code"] == 422
+    assert zeilen[1]["error"] == verarbeite_berechnungsanfrage(
+        _szenario(teilzeit_eingabe=40)
+    ).body["error"]
+    assert zeilen[2]["status_code"] == 400
+    assert zeilen[2]["error"]["code"] == "missing_fields"
+    assert zeilen[3]["status_code"] == 422
+
+
+@pytest.mark.parametrize(
+    "payload, status",
+    [
+        ({}, 400),
+        ({"szenarien": []}, 422),
+        ({"szenarien": {}}, 422),
+        ({"szenarien": [TEILZEIT_75_MIT_ABITUR], "referenz": 1}, 422),
+        ({"szenarien": [TEILZEIT_75_MIT_ABITUR] * 101}, 422),
+        ({"szenarien": [{"basis_dauer_monate": 36}]}, 422),
+    ],
+)
+def test_ungueltige_vergleichsanfragen(payload, status):
+    """Fehlende Liste → 400; ungültige Liste/Referenz → 422."""
+    response = verarbeite_vergleichsanfrage(payload)
+
+    assert response.status_code == status
+    assert "error" in response.body
+
+
+def test_api_compare(client):
+    """POST /api/calculate/compare liefert die Vergleichstabelle."""
+    resp = client.post("/api/calculate/compare", json={
+        "szenarien": [_szenario(), _szenario(teilzeit_eingabe=100)],
+    })
+
+    assert resp.status_code == 200
+    zeilen = resp.get_json()["result"]["szenarien"]
+    assert zeilen[1]["delta_finale_dauer_monate"] == 24 - 32
@@ -0,0 +1,192 @@
+"""
+Tests für Prüfungskalender und Schritt 4 (exam_calendar.py)
+
+Testabdeckung:
+- Laden, Sortieren und Zwischenspeichern der Kalenderdateien
+- Binärsuche einzeln und im Stapel gegen lineare Suche
+- Monatsarithmetik und Verlängerung bis zur nächsten Prüfung
+- Service `verarbeite_pruefungsanfrage()` und POST /api/calculate/exam
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.api import verarbeite_pruefungsanfrage
+from src.app import create_app
+from src.exam_calendar import (addiere_monate, ausbildungsende,
+                               lade_pruefungskalender,
+                               leere_pruefungskalender_cache,
+                               verfuegbare_kammern, verlaengere_bis_pruefung,
+                               verlaengere_bis_pruefung_stapel)
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+
+@pytest.fixture()
+def kalender_verzeichnis(tmp_path, monkeypatch):
+    """Kalenderverzeichnis mit einer Beispielkammer ``ihk-test``."""
+    (tmp_path / "ihk-test.csv").write_text(
+        "datum,pruefungsteil\n"
+        "2027-06-15,Teil 2\n"
+        "2027-01-20,Teil 2\n"
+        "2027-11-25,Teil 2\n"
+        "2027-06-15,Teil 1\n"
+        "\n"
+        "2028-01-10,Teil 2\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setenv("PRUEFUNGSKALENDER_DIR", str(tmp_path))
+    leere_pruefungskalender_cache()
+    yield tmp_path
+    leere_pruefungskalender_cache()
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_kalender_wird_sortiert_und_zwischengespeichert(kalender_verzeichnis):
+    kalender = lade_pruefungskalender(" IHK-Test ")
+    assert kalender.kammer == "ihk-test"
+    assert kalender.termine == (
+        date(2027, 1, 20), date(2027, 6, 15), date(2027, 11, 25),
+        date(2028, 1, 10),
+    )
+    assert lade_pruefungskalender("ihk-test") is kalender
+    assert verfuegbare_kammern() == ("ihk-test",)
+
+
+def test_naechster_termin_stimmt_mit_linearer_suche_ueberein(
+    kalender_verzeichnis,
+):
+    zufall = random.Random(12)
+    termine = sorted({
+        date(2026, 1, 1) + timedelta(days=zufall.randrange(1500))
+        for _ in range(200)
+    })
+    (kalender_verzeichnis / "gross.csv").write_text(
+        "datum\n" + "\n".join(t.isoformat() for t in termine),
+        encoding="utf-8",
+    )
+    kalender = lade_pruefungskalender("gross")
+    anfragen = [
+        date(2025, 12, 1) + timedelta(days=zufall.randrange(1700))
+        for _ in range(500)
+    ]
+    erwartet = [next((t for t in termine if t >= a), None) for a in anfragen]
+    assert [kalender.naechster_termin(a) for a in anfragen] == erwartet
+    assert kalender.naechste_termine(anfragen) == erwartet
+
+
+def test_monatsarithmetik():
+    assert addiere_monate(date(2024, 1, 31), 1) == date(2024, 2, 29)
+    assert addiere_monate(date(2024, 11, 15), 14) == date(2026, 1, 15)
+    assert ausbildungsende(date(2024, 8, 1), 36) == date(2027, 7, 31)
+    assert ausbildungsende(date(2024, 8, 15), 1) == date(2024, 9, 14)
+
+
+def test_verlaengerung_bis_zum_naechsten_termin(kalender_verzeichnis):
+    ergebnis = verlaengere_bis_pruefung(date(2024, 8, 1), 32, "ihk-test")
+    assert ergebnis.regulaeres_ende == date(2027, 3, 31)
+    assert ergebnis.pruefungstermin == date(2027, 6, 15)
+    assert ergebnis.ende_nach_schritt4 == date(2027, 6, 15)
+    assert ergebnis.verlaengerung_tage == 76
+    assert ergebnis.verlaengerung_monate == 3
+    assert ergebnis.dauer_nach_schritt4_monate == 35
+
+    # Termin am letzten Ausbildungstag: keine Verlängerung
+    ohne = verlaengere_bis_pruefung(date(2024, 6, 16), 36, "ihk-test")
+    assert ohne.regulaeres_ende == date(2027, 6, 15)
+    assert not ohne.verlaengert
+    assert ohne.dauer_nach_schritt4_monate == 36
+
+
+def test_verlaengerte_dauer_ist_minimal(kalender_verzeichnis):
+    beginne = [date(2023, 1, 1) + timedelta(days=n * 7) for n in range(80)]
+    faelle = [(beginn, 24 + n % 12) for n, beginn in enumerate(beginne)]
+    for ergebnis in verlaengere_bis_pruefung_stapel(faelle, "ihk-test"):
+        beginn = ergebnis.ausbildungsbeginn
+        dauer = ergebnis.dauer_nach_schritt4_monate
+        assert ausbildungsende(beginn, dauer) >= ergebnis.pruefungstermin
+        if ergebnis.verlaengert:
+            assert ausbildungsende(beginn, dauer - 1) < ergebnis.pruefungstermin
+
+
+@pytest.mark.parametrize(
+    "beginn, dauer, kammer, fehler",
+    [
+        (date(2024, 8, 1), 32, "unbekannt", ValueError),
+        (date(2024, 8, 1), 32, "../ihk-test", ValueError),
+        (date(2026, 8, 1), 32, "ihk-test", ValueError),
+        (date(2024, 8, 1), 0, "ihk-test", ValueError),
+        ("2024-08-01", 32, "ihk-test", TypeError),
+        (date(2024, 8, 1), 32.0, "ihk-test", TypeError),
+    ],
+)
+def test_ungueltige_eingaben(kalender_verzeichnis, beginn, dauer, kammer, fehler):
+    with pytest.raises(fehler):
+        verlaengere_bis_pruefung(beginn, dauer, kammer)
+
+
+def test_fehlerhafte_kalenderdatei(kalender_verzeichnis):
+    (kalender_verzeichnis / "kaputt.csv").write_text(
+        "datum\n2027-13-01\n", encoding="utf-8"
+    )
+    with pytest.raises(ValueError, match="Zeile 2"):
+        lade_pruefungskalender("kaputt")
+
+
+def test_service_ergaenzt_schritt4(kalender_verzeichnis):
+    payload = {
+        **TEILZEIT_75_MIT_ABITUR,
+        "ausbildungsbeginn": "2024-08-01",
+        "kammer": "ihk-test",
+    }
+    antwort = verarbeite_pruefungsanfrage(payload)
+    assert antwort.status_code == 200
+    result = antwort.body["result"]
+    assert result["finale_dauer_monate"] == 32
+    assert result["schritt4"]["pruefungstermin"] == "2027-06-15"
+    assert result["schritt4"]["dauer_nach_schritt4_monate"] == 35
+
+
+@pytest.mark.parametrize(
+    "aenderung, status",
+    [
+        ({"ausbildungsbeginn": None}, 400),
+        ({"ausbildungsbeginn": "01.08.2024"}, 422),
+        ({"kammer": "unbekannt"}, 422),
+        ({"eingabetyp": "tage"}, 422),
+    ],
+)
+def test_service_fehlerfaelle(kalender_verzeichnis, aenderung, status):
+    payload = {
+        **TEILZEIT_75_MIT_ABITUR,
+        "ausbildungsbeginn": "2024-08-01",
+        "kammer": "ihk-test",
+        **aenderung,
+    }
+    payload = {k: v for k, v in payload.items() if v is not None}
+    assert verarbeite_pruefungsanfrage(payload).status_code == status
+
+
+def test_api_exam(client, kalender_verzeichnis):
+    response = client.post(
+        "/api/calculate/exam",
+        json={
+            **TEILZEIT_75_MIT_ABITUR,
+            "ausbildungsbeginn": "2024-08-01",
+            "kammer": "ihk-test",
+        },
+    )
+    assert response.status_code == 200
+    assert response.get_json()["result"]["schritt4"]["verlaengerung_monate"] == 3
+
+    response = client.post("/api/calculate/exam", data="x")
+    assert response.status_code == 400
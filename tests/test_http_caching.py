@@ -0,0 +1,158 @@
+"""
+Tests für GET /api/calculate (HTTP-Caching mit ETag und Cache-Control)
+
+Testabdeckung:
+- Query-Parameter liefern dasselbe Ergebnis wie POST /api/calculate
+- Starkes ETag aus dem kanonischen Schlüssel (gleichwertige Abfragen teilen es)
+- If-None-Match → 304 ohne Berechnung
+- Fehlerantworten ohne ETag/Cache-Control
+"""
+
+import pytest
+
+import src.api.calculation_service as cs
+from src.app import BERECHNUNG_CACHE_CONTROL, create_app
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+ABFRAGE = {
+    "basis_dauer_monate": "36",
+    "vollzeit_stunden": "40",
+    "teilzeit_eingabe": "75",
+    "eingabetyp": "prozent",
+    "abitur": "ja",
+}
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_get_wie_post(client):
+    """GET mit Query-Parametern liefert das Ergebnis von POST."""
+    resp = client.get("/api/calculate", query_string=ABFRAGE)
+    post = client.post("/api/calculate", json=TEILZEIT_75_MIT_ABITUR)
+
+    assert resp.status_code == 200
+    assert resp.get_json() == post.get_json()
+    assert resp.headers["Cache-Control"] == BERECHNUNG_CACHE_CONTROL
+    etag, schwach = resp.get_etag()
+    assert etag and not schwach
+
+
+def test_gleichwertige_abfragen_teilen_etag(client):
+    """75 % und 30 von 40 Stunden ergeben dasselbe ETag, 50 % ein anderes."""
+    prozent = client.get("/api/calculate", query_string=ABFRAGE)
+    stunden = client.get("/api/calculate", query_string=dict(
+        ABFRAGE, teilzeit_eingabe="30", eingabetyp="stunden", abitur="true"
+    ))
+    halb = client.get(
+        "/api/calculate", query_string=dict(ABFRAGE, teilzeit_eingabe="50")
+    )
+
+    assert prozent.get_etag() == stunden.get_etag()
+    assert prozent.get_etag() != halb.get_etag()
+
+
+def test_if_none_match_liefert_304_ohne_berechnung(client, monkeypatch):
+    """Bekanntes ETag → 304 ohne Body; berechnet wird nicht."""
+    etag, _ = client.get("/api/calculate", query_string=ABFRAGE).get_etag()
+
+    def nicht_berechnen(_):
+        raise AssertionError("darf nicht berechnet werden")
+
+    monkeypatch.setattr(cs, "berechne_anfrage", nicht_berechnen)
+    for kopf in (f'"{etag}"', f'W/"{etag}"', f'"anderes", "{etag}"'):
+        resp = client.get(
+            "/api/calculate",
+            query_string=ABFRAGE,
+            headers={"If-None-Match": kopf},
+        )
+        assert resp.status_code == 304
+        assert resp.data == b""
+        assert resp.get_etag() == (etag, False)
+        assert resp.headers["Cache-Control"] == BERECHNUNG_CACHE_CONTROL
+
+
+def test_geaendertes_etag_wird_neu_berechnet(client):
+    """Unbekanntes ETag → 200 mit aktuellem Ergebnis."""
+    resp = client.get(
+        "/api/calculate",
+        query_string=ABFRAGE,
+        headers={"If-None-Match": '"veraltet"'},
+    )
+
+    assert resp.status_code == 200
+    assert resp.get_json()["result"]["finale_dauer_monate"] == 32
+
+
+def test_etag_haengt_von_version_ab(monkeypatch):
+    """Eine neue ETAG_VERSION ändert alle ETags."""
+    anfrage = cs.BerechnungsAnfrage.from_dict(TEILZEIT_75_MIT_ABITUR)
+    alt = cs.etag_fuer_anfrage(anfrage)
+    monkeypatch.setattr(cs, "ETAG_VERSION", cs.ETAG_VERSION + 1)
+
+    assert cs.etag_fuer_anfrage(anfrage) != alt
+
+
+@pytest.mark.parametrize(
+    "abfrage, status",
+    [
+        ({"basis_dauer_monate": "36"}, 400),
+        (dict(ABFRAGE, teilzeit_eingabe="40"), 422),
+        (dict(ABFRAGE, abitur="vielleicht"), 422),
+        (dict(ABFRAGE, unbekannt="1"), 422),
+    ],
+)
+def test_fehler_ohne_cache_header(client, abfrage, status):
+    """Fehlerantworten tragen weder ETag noch Cache-Control."""
+    resp = client.get("/api/calculate", query_string=abfrage)
+
+    assert resp.status_code == status
+    assert "error" in resp.get_json()
+    assert "ETag" not in resp.headers
+    assert "Cache-Control" not in resp.headers
+
+
+def test_interner_fehler_wie_post(client, monkeypatch):
+    """Unerwartete Fehler liefern wie bei POST ein strukturiertes 500."""
+    def kaputt(*args, **kwargs):
+        raise RuntimeError("Simulierter interner Fehler")
+
+    cs.leere_ergebnis_cache()
+    monkeypatch.setattr(cs, "berechne_gesamtdauer", kaputt)
+
+    resp = client.get("/api/calculate", query_string=ABFRAGE)
+    post = client.post("/api/calculate", json=TEILZEIT_75_MIT_ABITUR)
+
+    assert resp.status_code == post.status_code == 500
+    assert resp.get_json() == post.get_json()
+    assert resp.get_json()["error"]["code"] == "internal_error"
+    assert "ETag" not in resp.headers
+
+
+def test_gleiche_floats_verschiedener_anteil_eigenes_etag(client):
+    """5,5 von 10 Stunden und 55.00000000000001 % haben verschiedene ETags."""
+    basis = {
+        "basis_dauer_monate": "28",
+        "vollzeit_stunden": "10",
+        "realschule": "true",
+    }
+    stunden = client.get(
+        "/api/calculate",
+        query_string=dict(basis, teilzeit_eingabe="5.5", eingabetyp="stunden"),
+    )
+    prozent = client.get(
+        "/api/calculate",
+        query_string=dict(
+            basis, teilzeit_eingabe="55.00000000000001", eingabetyp="prozent"
+        ),
+    )
+
+    assert stunden.get_json()["result"]["finale_dauer_monate"] == 40
+    assert prozent.get_json()["result"]["finale_dauer_monate"] == 39
+    assert stunden.headers["ETag"] != prozent.headers["ETag"]
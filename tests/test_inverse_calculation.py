@@ -0,0 +1,218 @@
+"""
+Tests für die Umkehrrechnung (inverse_calculation.py, inverse_service.py)
+
+Testabdeckung:
+- Geschlossene Schranke stimmt mit einer linearen Suche über
+  `berechne_gesamtdauer()` überein (Prozent und ganze Stunden)
+- Obergrenze § 7a und Sonderregel § 8 Abs. 3 BBiG
+- Nicht erreichbare Zieldauer und ungültige Eingaben
+- Service `verarbeite_mindest_teilzeit_anfrage()` und POST /api/calculate/inverse
+- Bruchstellenindex (`berechne_bruchstellen()`) gegen `berechne_gesamtdauer()`
+"""
+
+import math
+from fractions import Fraction
+
+import pytest
+
+from src.api import verarbeite_mindest_teilzeit_anfrage
+from src.app import create_app
+from src.calculation_logic import (BERUF_MONATE_SHIFT, GRUND_BERUF_FELDER,
+                                   berechne_gesamtdauer)
+from src.inverse_calculation import (berechne_bruchstellen,
+                                     berechne_mindest_teilzeit)
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.mark.parametrize("basis", [24, 33, 36, 42])
+@pytest.mark.parametrize("verkuerzung", [0, 6, 12])
+@pytest.mark.parametrize("vollzeit", [10, 37.5, 39, 40])
+def test_entspricht_linearer_suche(basis, verkuerzung, vollzeit):
+    """Minimaler Prozent-/Stundenwert entspricht dem ersten passenden Wert."""
+    maske = GRUND_BERUF_FELDER | (verkuerzung << BERUF_MONATE_SHIFT)
+
+    def dauer(wert, eingabetyp):
+        return berechne_gesamtdauer(
+            basis, vollzeit, wert, maske, eingabetyp
+        )["finale_dauer_monate"]
+
+    stunden_werte = list(
+        range(math.ceil(vollzeit / 2), math.floor(vollzeit) + 1)
+    ) + [vollzeit]
+    for ziel in range(dauer(100, "prozent"), dauer(50, "prozent") + 2):
+        ergebnis = berechne_mindest_teilzeit(basis, vollzeit, ziel, maske)
+
+        assert ergebnis.teilzeit_prozent == next(
+            p for p in range(50, 101) if dauer(p, "prozent") <= ziel
+        )
+        assert ergebnis.teilzeit_stunden == next(
+            h for h in stunden_werte if dauer(h, "stunden") <= ziel
+        )
+        assert ergebnis.finale_dauer_bei_prozent_monate <= ziel
+        assert ergebnis.finale_dauer_bei_stunden_monate <= ziel
+
+
+def test_sonderregel_8_abs_3_senkt_mindest_teilzeit():
+    """Ohne Verkürzung genügt eine Dauer ≤ AO + 6 für die Zieldauer AO."""
+    ergebnis = berechne_mindest_teilzeit(36, 40, 36)
+
+    # 36 / 0.84 = 42.86 → 42 ≤ 36 + 6 → Regeldauer 36 (§ 8 Abs. 3)
+    assert ergebnis.teilzeit_prozent == 84
+    assert ergebnis.finale_dauer_bei_prozent_monate == 36
+
+
+def test_obergrenze_erlaubt_minimale_teilzeit():
+    """Liegt die Obergrenze (1,5 × AO) unter der Zieldauer, genügen 50 %."""
+    ergebnis = berechne_mindest_teilzeit(36, 39, 54)
+
+    assert ergebnis.teilzeit_prozent == 50
+    assert ergebnis.teilzeit_stunden == 20
+
+
+def test_nicht_erreichbare_zieldauer():
+    """Eine Zieldauer unter der Vollzeit-Dauer löst ValueError aus."""
+    with pytest.raises(ValueError, match="nicht erreichbar"):
+        berechne_mindest_teilzeit(36, 40, 23, {"abitur": True})
+
+
+@pytest.mark.parametrize(
+    "args, fehler",
+    [
+        (("36", 40, 30), TypeError),
+        ((36, 40, True), TypeError),
+        ((20, 40, 30), ValueError),
+        ((36, 60, 30), ValueError),
+        ((36, 40, 30.5), ValueError),
+    ],
+)
+def test_ungueltige_eingaben(args, fehler):
+    """Ungültige Eingaben lösen TypeError/ValueError aus."""
+    with pytest.raises(fehler):
+        berechne_mindest_teilzeit(*args)
+
+
+def test_service_liefert_mindest_teilzeit():
+    """Der Service liefert Prozent und Stunden für die Zieldauer."""
+    response = verarbeite_mindest_teilzeit_anfrage({
+        "basis_dauer_monate": 36,
+        "vollzeit_stunden": "40",
+        "ziel_dauer_monate": 32,
+        "verkuerzungsgruende": {"abitur": True},
+    })
+
+    assert response.status_code == 200
+    assert response.body["result"] == {
+        "ziel_dauer_monate": 32,
+        "verkuerzte_dauer_monate": 24,
+        "teilzeit_prozent": 73,
+        "finale_dauer_bei_prozent_monate": 32,
+        "teilzeit_stunden": 30,
+        "finale_dauer_bei_stunden_monate": 32,
+    }
+
+
+@pytest.mark.parametrize(
+    "payload, status, code",
+    [
+        ({"basis_dauer_monate": 36}, 400, "missing_fields"),
+        ({"basis_dauer_monate": 36, "vollzeit_stunden": 40,
+          "ziel_dauer_monate": 20}, 422, "validation_error"),
+        ({"basis_dauer_monate": 36, "vollzeit_stunden": "x",
+          "ziel_dauer_monate": 40}, 422, "validation_error"),
+    ],
+)
+def test_service_fehlerfaelle(payload, status, code):
+    """Fehlende Felder → 400, ungültige oder unerreichbare Werte → 422."""
+    response = verarbeite_mindest_teilzeit_anfrage(payload)
+
+    assert response.status_code == status
+    assert response.body["error"]["code"] == code
+
+
+def test_api_inverse(client):
+    """POST /api/calculate/inverse liefert die minimale Teilzeit."""
+    resp = client.post("/api/calculate/inverse", json={
+        "basis_dauer_monate": 36,
+        "vollzeit_stunden": 40,
+        "ziel_dauer_monate": 36,
+    })
+
+    assert resp.status_code == 200
+    assert resp.get_json()["result"]["teilzeit_prozent"] == 84
+
+
+@pytest.mark.parametrize("basis", [24, 36, 42])
+@pytest.mark.parametrize("verkuerzung", [-4, 0, 6, 12])
+def test_bruchstellen_entsprechen_einzelberechnung(basis, verkuerzung):
+    """Der Index liefert für Prozent- und Stundenwerte dieselbe Dauer."""
+    index = berechne_bruchstellen(basis, verkuerzung)
+    maske = GRUND_BERUF_FELDER | (verkuerzung << BERUF_MONATE_SHIFT)
+
+    for viertel in range(200, 401):
+        prozent = viertel / 4
+        assert index.dauer_bei_prozent(prozent) == berechne_gesamtdauer(
+            basis, 40, prozent, maske, "prozent"
+        )["finale_dauer_monate"]
+    for vollzeit in (23, 37.5, 40):
+        for doppelt in range(math.ceil(vollzeit), int(vollzeit * 2) + 1):
+            stunden = doppelt / 2
+            assert index.dauer_bei_stunden(vollzeit, stunden) == (
+                berechne_gesamtdauer(
+                    basis, vollzeit, stunden, maske, "stunden"
+                )["finale_dauer_monate"]
+            )
+
+
+def test_bruchstellen_sind_exakte_spruenge():
+    """Genau oberhalb jeder Schwelle ändert sich die Dauer, an ihr noch nicht."""
+    index = berechne_bruchstellen(36, 12)
+    schwellen = index.anteil_schwellen
+
+    assert list(schwellen) == sorted(schwellen)
+    assert len(index.dauern) == len(schwellen) + 1
+    for i, schwelle in enumerate(schwellen):
+        assert index.dauer_bei_anteil(schwelle) == index.dauern[i]
+        assert index.dauer_bei_anteil(
+            schwelle + Fraction(1, 10**9)
+        ) == index.dauern[i + 1]
+
+
+def test_bruchstellen_intervall_bei_stunden():
+    """Zu einem Stundenwert werden die benachbarten Schwellen geliefert."""
+    index = berechne_bruchstellen(36, 12)
+
+    untere, obere = index.intervall_bei_stunden(40, 30)
+
+    # 24 / (30 / 40) = 32 Monate; 33 Monate unterhalb von 40 · 24 / 33 h
+    assert (untere, obere) == (Fraction(320, 11), Fraction(30))
+    assert index.dauer_bei_stunden(40, 30) == 32
+    assert index.dauer_bei_stunden(40, 29) == 33
+
+
+def test_bruchstellen_mit_sonderregel_und_obergrenze():
+    """Ohne Verkürzung fällt die Dauer von der Obergrenze direkt auf die AO."""
+    index = berechne_bruchstellen(36)
+
+    assert index.dauern[0] == 54
+    assert index.dauern[-1] == 36
+    assert 37 not in index.dauern
+    assert index.prozent_schwellen()[-1] == Fraction(36 * 100, 43)
+
+
+@pytest.mark.parametrize(
+    "args, fehler",
+    [(("36", 0), TypeError), ((36, 1.0), TypeError), ((20, 0), ValueError),
+     ((36, 13), ValueError)],
+)
+def test_bruchstellen_ungueltige_eingaben(args, fehler):
+    """Ungültige AO-Dauer oder Verkürzung lösen TypeError/ValueError aus."""
+    with pytest.raises(fehler):
+        berechne_bruchstellen(*args)
@@ -0,0 +1,148 @@
+"""
+Tests für die JSON-Kodierung der API-Antworten (json_encoding.py)
+
+Testabdeckung:
+- kodiere_json mit orjson und mit dem Encoder der Standardbibliothek
+- KodierungsCache: Wiederverwendung nach Objektidentität und LRU-Verdrängung
+- BerechnungsDienstAntwort.to_bytes entspricht dem Response-Body
+- Vorab kodierte Fehler-Bodies der App
+"""
+
+import json
+
+import pytest
+
+import src.api.json_encoding as je
+from src.api import verarbeite_berechnungsanfrage
+from src.api.calculation_service import leere_ergebnis_cache
+from src.app import create_app
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    """Führt einen Test mit beiden Encodern aus."""
+    if request.param == "orjson":
+        if je.orjson is None:
+            pytest.skip("orjson nicht installiert")
+    else:
+        monkeypatch.setattr(je, "orjson", None)
+    return request.param
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_kodiere_json_kompakt_und_sortiert(encoder):
+    """Beide Encoder liefern dieselben kompakten, sortierten UTF-8-Bytes."""
+    daten = je.kodiere_json({"b": [1, 2.5, None], "a": {"ü": "Prüfung"}})
+
+    assert je.encoder_name() == encoder
+    assert daten == '{"a":{"ü":"Prüfung"},"b":[1,2.5,null]}'.encode("utf-8")
+
+
+def test_kodiere_json_grosse_ganzzahl(encoder):
+    """Ganzzahlen über 64 Bit werden kodiert (orjson fällt auf json zurück)."""
+    assert je.kodiere_json({"n": 10**20}) == b'{"n":100000000000000000000}'
+
+
+def test_api_grosse_verkuerzung(client, encoder):
+    """Sehr große Monatsangaben liefern weiterhin 200 statt 500."""
+    anfrage = dict(
+        TEILZEIT_75_MIT_ABITUR,
+        verkuerzungsgruende={"berufliche_verkuerzung_monate": 10**20},
+    )
+
+    resp = client.post("/api/calculate", json=anfrage)
+
+    assert resp.status_code == 200
+    ergebnis = resp.get_json()["result"]
+    assert ergebnis["verkuerzung_gesamt_ohne_begrenzung"] == 10**20
+
+
+def test_kodierungs_cache_wiederverwendung():
+    """Dasselbe Objekt wird nur einmal kodiert."""
+    cache = je.KodierungsCache(4)
+    objekt = ("x",)
+    aufrufe = []
+
+    def erzeuge(wert):
+        aufrufe.append(wert)
+        return {"wert": list(wert)}
+
+    erste = cache.kodiere(objekt, erzeuge)
+    zweite = cache.kodiere(objekt, erzeuge)
+
+    assert erste is zweite
+    assert json.loads(erste) == {"wert": ["x"]}
+    assert len(aufrufe) == 1
+
+
+def test_kodierungs_cache_verdraengt_aeltesten_eintrag():
+    """Über der Obergrenze fällt der am längsten ungenutzte Eintrag heraus."""
+    cache = je.KodierungsCache(2)
+    objekte = [(1,), (2,), (3,)]
+    for objekt in objekte[:2]:
+        cache.kodiere(objekt, list)
+    cache.kodiere(objekte[0], list)
+    cache.kodiere(objekte[2], list)
+
+    assert len(cache) == 2
+    assert id(objekte[0]) in cache._eintraege
+    assert id(objekte[1]) not in cache._eintraege
+
+    cache.leere()
+    assert len(cache) == 0
+
+
+def test_kodierungs_cache_ohne_eintraege():
+    """Größe 0 kodiert jedes Mal neu, speichert aber nichts."""
+    cache = je.KodierungsCache(0)
+
+    assert cache.kodiere((1,), list) == b"[1]"
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        je.KodierungsCache(-1)
+
+
+def test_to_bytes_entspricht_body(encoder):
+    """to_bytes liefert den Body; Cache-Treffer teilen die kodierten Bytes."""
+    leere_ergebnis_cache()
+    erste = verarbeite_berechnungsanfrage(dict(TEILZEIT_75_MIT_ABITUR))
+    zweite = verarbeite_berechnungsanfrage(dict(TEILZEIT_75_MIT_ABITUR))
+    fehler = verarbeite_berechnungsanfrage({})
+
+    assert json.loads(erste.to_bytes()) == erste.body
+    assert zweite.to_bytes() is erste.to_bytes()
+    assert fehler.status_code == 400
+    assert json.loads(fehler.to_bytes()) == fehler.body
+    leere_ergebnis_cache()
+
+
+def test_konstante_fehlerantwort():
+    """Fehler-Bodies haben das Format von `fehlerantwort`."""
+    assert json.loads(je.konstante_fehlerantwort("c", "m")) == {
+        "error": {"code": "c", "message": "m"}
+    }
+    assert json.loads(je.konstante_fehlerantwort("c", "m", field="f")) == {
+        "error": {"code": "c", "message": "m", "details": {"field": "f"}}
+    }
+
+
+def test_api_antwort_als_json(client):
+    """Antworten und feste Fehler-Bodies werden als application/json geliefert."""
+    resp = client.post("/api/calculate", json=TEILZEIT_75_MIT_ABITUR)
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/json"
+    assert resp.get_json()["result"]["finale_dauer_monate"] == 32
+
+    resp = client.post("/api/calculate", data="x", content_type="text/plain")
+    assert resp.status_code == 400
+    assert resp.mimetype == "application/json"
+    assert resp.get_json()["error"]["code"] == "invalid_request"
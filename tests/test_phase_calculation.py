@@ -0,0 +1,214 @@
+"""
+Tests für die Phasenrechnung (phase_calculation.py)
+
+Testabdeckung:
+- Eine Phase entspricht `berechne_gesamtdauer()`; Aufteilen ändert nichts
+- Wechselnde Anteile, Unterbrechungen, Obergrenze und § 8 Abs. 3 BBiG
+- Validierung des Phasenplans und Stapelberechnung
+- Service `verarbeite_phasenanfrage()` und POST /api/calculate/phases
+"""
+
+import random
+
+import pytest
+
+from src.api import verarbeite_phasenanfrage
+from src.app import create_app
+from src.calculation_logic import (GRUND_ABITUR, GRUND_REALSCHULE,
+                                   berechne_gesamtdauer)
+from src.phase_calculation import (Teilzeitphase, berechne_phasen_dauer,
+                                   berechne_phasen_stapel)
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.mark.parametrize("basis", [24, 36, 42])
+@pytest.mark.parametrize("maske", [0, GRUND_REALSCHULE, GRUND_ABITUR])
+def test_eine_phase_entspricht_gesamtdauer(basis, maske):
+    for prozent in list(range(50, 101)) + [62.5, 87.5]:
+        erwartet = berechne_gesamtdauer(basis, 40, prozent, maske)
+        ergebnis = berechne_phasen_dauer(
+            basis, [Teilzeitphase(None, prozent)], maske
+        )
+        assert ergebnis.finale_dauer_monate == erwartet.finale_dauer_monate
+        assert ergebnis.nach_schritt1_monate == erwartet.nach_schritt1_monate
+        assert (
+            ergebnis.regel_8_abs_3_angewendet
+            == erwartet.regel_8_abs_3_angewendet
+        )
+
+
+def test_aufteilen_in_gleiche_phasen_aendert_nichts():
+    zufall = random.Random(3)
+    for _ in range(500):
+        basis = zufall.randint(24, 42)
+        prozent = zufall.randint(50, 100)
+        phasen = [
+            Teilzeitphase(zufall.randint(1, 18), prozent)
+            for _ in range(zufall.randint(1, 4))
+        ] + [Teilzeitphase(None, prozent)]
+        ergebnis = berechne_phasen_dauer(basis, phasen, GRUND_REALSCHULE)
+        erwartet = berechne_gesamtdauer(basis, 40, prozent, GRUND_REALSCHULE)
+        assert ergebnis.finale_dauer_monate == erwartet.finale_dauer_monate
+        assert sum(ergebnis.phasen_monate) == ergebnis.finale_dauer_monate
+
+
+def test_wechselnde_anteile_und_unterbrechung():
+    # 12 Monate 50 % = 6 Monate geleistet, 6 Monate Elternzeit,
+    # restliche 30 Monate bei 75 % = 40 Teilzeitmonate
+    ergebnis = berechne_phasen_dauer(36, [
+        Teilzeitphase(12, 50),
+        Teilzeitphase(6, 0),
+        Teilzeitphase(None, 75),
+    ])
+    assert ergebnis.nach_schritt1_monate == 52
+    assert ergebnis.teilzeit_monate == 52
+    assert ergebnis.unterbrechung_monate == 6
+    assert ergebnis.finale_dauer_monate == 58
+    assert ergebnis.phasen_monate == (12, 6, 40)
+
+
+def test_phasen_nach_dem_ende_zaehlen_nicht():
+    ergebnis = berechne_phasen_dauer(24, [
+        Teilzeitphase(30, 100),
+        Teilzeitphase(12, 0),
+        Teilzeitphase(None, 50),
+    ])
+    assert ergebnis.finale_dauer_monate == 24
+    assert ergebnis.unterbrechung_monate == 0
+    assert ergebnis.phasen_monate == (24, 0, 0)
+
+
+def test_obergrenze_gilt_nur_fuer_teilzeitmonate():
+    ergebnis = berechne_phasen_dauer(36, [
+        Teilzeitphase(10, 0),
+        Teilzeitphase(None, 50),
+    ])
+    assert ergebnis.nach_schritt1_monate == 72
+    assert ergebnis.obergrenze_angewendet
+    assert ergebnis.teilzeit_monate == 54
+    assert ergebnis.finale_dauer_monate == 64
+
+
+def test_regel_8_abs_3_auf_teilzeitmonate():
+    # 36 Monate: 12 Monate 80 %, danach 90 % -> 37,3 Teilzeitmonate -> 36
+    ergebnis = berechne_phasen_dauer(36, [
+        Teilzeitphase(12, 80),
+        Teilzeitphase(3, 0),
+        Teilzeitphase(None, 90),
+    ])
+    assert ergebnis.regel_8_abs_3_angewendet
+    assert ergebnis.teilzeit_monate == 36
+    assert ergebnis.finale_dauer_monate == 39
+
+
+@pytest.mark.parametrize(
+    "phasen, fehler",
+    [
+        ([], ValueError),
+        ([Teilzeitphase(12, 75)], ValueError),
+        ([Teilzeitphase(None, 75), Teilzeitphase(None, 75)], TypeError),
+        ([Teilzeitphase(0, 75), Teilzeitphase(None, 75)], ValueError),
+        ([Teilzeitphase(6, 40), Teilzeitphase(None, 75)], ValueError),
+        ([Teilzeitphase(6, 75), Teilzeitphase(None, 0)], ValueError),
+        ([(6, 75)], TypeError),
+    ],
+)
+def test_ungueltige_phasen(phasen, fehler):
+    with pytest.raises(fehler):
+        berechne_phasen_dauer(36, phasen)
+
+
+def test_stapel_liefert_fehler_je_vertrag():
+    plan = (Teilzeitphase(12, 50), Teilzeitphase(None, 75))
+    ergebnisse = list(berechne_phasen_stapel([
+        (36, plan, 0),
+        (20, plan, 0),
+        (36, list(plan), GRUND_ABITUR),
+        (36, plan, 0),
+    ]))
+    assert ergebnisse[0].finale_dauer_monate == 52
+    assert isinstance(ergebnisse[1], ValueError)
+    assert ergebnisse[2].finale_dauer_monate == 36
+    # Gleicher Plan wird nur einmal berechnet
+    assert ergebnisse[3] is ergebnisse[0]
+
+
+PHASEN_PAYLOAD = {
+    "basis_dauer_monate": 36,
+    "vollzeit_stunden": 40,
+    "phasen": [
+        {"monate": 12, "teilzeit_stunden": 20},
+        {"monate": 6, "unterbrechung": True},
+        {"teilzeit_prozent": 75},
+    ],
+}
+
+
+def test_service_einzelvertrag():
+    antwort = verarbeite_phasenanfrage(PHASEN_PAYLOAD)
+    assert antwort.status_code == 200
+    result = antwort.body["result"]
+    assert result["finale_dauer_monate"] == 58
+    assert [p["monate"] for p in result["phasen"]] == [12, 6, 40]
+    assert result["phasen"][1]["unterbrechung"] is True
+
+
+@pytest.mark.parametrize(
+    "aenderung, status",
+    [
+        ({"phasen": []}, 422),
+        ({"phasen": [{"teilzeit_prozent": 75, "teilzeit_stunden": 30}]}, 422),
+        ({"phasen": [{"monate": 6, "teilzeit_prozent": 75}]}, 422),
+        ({"phasen": [{"teilzeit_stunden": 30}], "vollzeit_stunden": None}, 400),
+        ({"basis_dauer_monate": None}, 400),
+    ],
+)
+def test_service_fehlerfaelle(aenderung, status):
+    payload = {**PHASEN_PAYLOAD, **aenderung}
+    payload = {k: v for k, v in payload.items() if v is not None}
+    assert verarbeite_phasenanfrage(payload).status_code == status
+
+
+def test_service_stapel():
+    antwort = verarbeite_phasenanfrage({
+        "vertraege": [
+            PHASEN_PAYLOAD,
+            {**PHASEN_PAYLOAD, "basis_dauer_monate": 50},
+            {"phasen": []},
+            PHASEN_PAYLOAD,
+        ]
+    })
+    assert antwort.status_code == 200
+    zeilen = antwort.body["result"]["vertraege"]
+    assert [z["index"] for z in zeilen] == [0, 1, 2, 3]
+    assert zeilen[0]["result"]["finale_dauer_monate"] == 58
+    assert zeilen[1]["status_code"] == 422
+    assert zeilen[2]["status_code"] == 400
+    assert zeilen[3]["result"] == zeilen[0]["result"]
+
+    assert verarbeite_phasenanfrage({"vertraege": []}).status_code == 422
+
+
+def test_api_phases(client):
+    response = client.post("/api/calculate/phases", json=PHASEN_PAYLOAD)
+    assert response.status_code == 200
+    assert response.get_json()["result"]["unterbrechung_monate"] == 6
+
+    response = client.post("/api/calculate/phases", data="x")
+    assert response.status_code == 400
+
+
+def test_exakte_abrundung():
+    """12 Monate Vollzeit, dann 17 Monate Ausbildungszeit bei 68 % = exakt 25."""
+    ergebnis = berechne_phasen_dauer(
+        29, [Teilzeitphase(12, 100), Teilzeitphase(None, 68)]
+    )
+    assert ergebnis.finale_dauer_monate == 37
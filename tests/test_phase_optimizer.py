@@ -0,0 +1,156 @@
+"""
+Tests für den Phasenplan-Optimierer (phase_optimizer.py)
+
+Testabdeckung:
+- Vorgeschlagene Pläne erreichen die Zieldauer mit den wenigsten Wechseln
+- Verfügbarkeitsprofil mit Obergrenzen und festen Unterbrechungen
+- Nicht erreichbare Zieldauern und ungültige Eingaben
+- Service `verarbeite_phasenplananfrage()` und POST /api/calculate/phases/plan
+"""
+
+import pytest
+
+from src.api import verarbeite_phasenplananfrage
+from src.app import create_app
+from src.calculation_logic import GRUND_ABITUR, berechne_gesamtdauer
+from src.phase_optimizer import _optimiere, optimiere_phasenplan
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_ohne_profil_genuegt_eine_phase():
+    plan = optimiere_phasenplan(36, 48)
+    assert plan.wechsel == 0
+    assert len(plan.phasen) == 1
+    # 75 % ist der kleinste Anteil mit höchstens 48 Monaten
+    assert plan.phasen[0].teilzeit_prozent == 75
+    assert plan.ergebnis.finale_dauer_monate == 48
+    assert berechne_gesamtdauer(36, 40, 70, 0).finale_dauer_monate > 48
+
+
+def test_profil_mit_obergrenze():
+    plan = optimiere_phasenplan(36, 48, verfuegbarkeit=[(12, 50)])
+    assert plan.wechsel == 1
+    assert [(p.monate, p.teilzeit_prozent) for p in plan.phasen] == [
+        (16, 50), (None, 85)
+    ]
+    assert plan.ergebnis.finale_dauer_monate <= 48
+
+
+def test_unterbrechung_im_profil_bleibt_erhalten():
+    plan = optimiere_phasenplan(
+        36, 58, verfuegbarkeit=[(12, 50), (6, 0)]
+    )
+    assert plan.ergebnis.unterbrechung_monate == 6
+    assert plan.ergebnis.finale_dauer_monate <= 58
+    assert any(phase.unterbrechung for phase in plan.phasen)
+
+
+@pytest.mark.parametrize("ziel", [40, 44, 48, 52])
+def test_plan_ist_zulaessig_mit_verkuerzung(ziel):
+    plan = optimiere_phasenplan(
+        42, ziel, GRUND_ABITUR, verfuegbarkeit=[(6, 60), (6, 80)]
+    )
+    assert plan.ergebnis.finale_dauer_monate <= ziel
+    for phase, (_, max_prozent) in zip(plan.phasen, [(6, 60), (6, 80)]):
+        assert phase.teilzeit_prozent <= max_prozent
+
+
+def test_obergrenze_macht_jeden_plan_zulaessig():
+    # floor(1,5 × 24) = 36: bei Zieldauer 36 genügen 50 %
+    plan = optimiere_phasenplan(24, 36)
+    assert plan.wechsel == 0
+    assert plan.phasen[0].teilzeit_prozent == 50
+
+
+def test_nicht_erreichbare_zieldauer():
+    with pytest.raises(ValueError):
+        optimiere_phasenplan(36, 30)
+    with pytest.raises(ValueError):
+        optimiere_phasenplan(42, 50, verfuegbarkeit=[(12, 50), (30, 0)])
+
+
+@pytest.mark.parametrize(
+    "argumente, fehler",
+    [
+        ({"ziel_dauer_monate": "48"}, TypeError),
+        ({"schrittweite_prozent": 7}, ValueError),
+        ({"verfuegbarkeit": [(12, 40)]}, ValueError),
+        ({"verfuegbarkeit": [12]}, TypeError),
+    ],
+)
+def test_ungueltige_eingaben(argumente, fehler):
+    with pytest.raises(fehler):
+        optimiere_phasenplan(**{"basis_dauer_monate": 36, "ziel_dauer_monate": 48,
+                                **argumente})
+
+
+def test_ergebnisse_werden_zwischengespeichert():
+    _optimiere.cache_clear()
+    optimiere_phasenplan(36, 48, verfuegbarkeit=[(12, 50)])
+    optimiere_phasenplan(36, 48, verfuegbarkeit=[(12, 50)])
+    assert _optimiere.cache_info().hits == 1
+
+
+PLAN_PAYLOAD = {
+    "basis_dauer_monate": 36,
+    "ziel_dauer_monate": 58,
+    "verfuegbarkeit": [
+        {"monate": 12, "max_prozent": 50},
+        {"monate": 6, "unterbrechung": True},
+    ],
+}
+
+
+def test_service_plan():
+    antwort = verarbeite_phasenplananfrage(PLAN_PAYLOAD)
+    assert antwort.status_code == 200
+    result = antwort.body["result"]
+    assert result["finale_dauer_monate"] <= 58
+    assert result["phasen"][-1]["monate"] is None
+    assert result["ergebnis"]["unterbrechung_monate"] == 6
+
+
+@pytest.mark.parametrize(
+    "aenderung, status",
+    [
+        ({"ziel_dauer_monate": None}, 400),
+        ({"ziel_dauer_monate": 30}, 422),
+        ({"verfuegbarkeit": [{"max_prozent": 50}]}, 400),
+        ({"verfuegbarkeit": [{"monate": 6}]}, 400),
+        ({"verfuegbarkeit": "12x50"}, 422),
+        ({"schrittweite_prozent": 3}, 422),
+    ],
+)
+def test_service_fehlerfaelle(aenderung, status):
+    payload = {**PLAN_PAYLOAD, **aenderung}
+    payload = {k: v for k, v in payload.items() if v is not None}
+    assert verarbeite_phasenplananfrage(payload).status_code == status
+
+
+def test_api_phases_plan(client):
+    response = client.post("/api/calculate/phases/plan", json=PLAN_PAYLOAD)
+    assert response.status_code == 200
+    phasen = response.get_json()["result"]["phasen"]
+
+    # Der Vorschlag lässt sich direkt nachrechnen
+    response = client.post("/api/calculate/phases", json={
+        "basis_dauer_monate": 36,
+        "phasen": [
+            {"monate": p["monate"], "unterbrechung": True} if p["unterbrechung"]
+            else {"monate": p["monate"], "teilzeit_prozent": p["teilzeit_prozent"]}
+            for p in phasen
+        ],
+    })
+    assert response.status_code == 200
+    assert response.get_json()["result"]["finale_dauer_monate"] <= 58
+
+    response = client.post("/api/calculate/phases/plan", data="x")
+    assert response.status_code == 400
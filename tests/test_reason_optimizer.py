@@ -0,0 +1,167 @@
+"""
+Tests für den Optimierer der Verkürzungsgründe (reason_optimizer.py)
+
+Testabdeckung:
+- Kleinste Auswahl stimmt mit vollständiger Aufzählung aller Teilmengen überein
+- Zieldauer, § 8 Abs. 3 BBiG und unerreichbare Ziele
+- Zerlegung der Bitmaske (berufliche Fragen, vorkalkulierte Monate, Legacy)
+- Service `verarbeite_optimierungsanfrage()` und POST /api/calculate/optimize
+"""
+
+import itertools
+
+import pytest
+
+from src.api import verarbeite_optimierungsanfrage
+from src.app import create_app
+from src.calculation_logic import (BERUF_MONATE_SHIFT, BERUF_Q2_STUFE_SHIFT,
+                                   GRUND_ABITUR, GRUND_ALTER_21,
+                                   GRUND_BERUF_FELDER, GRUND_BERUF_Q1,
+                                   GRUND_BERUF_Q2, GRUND_BERUF_Q4,
+                                   GRUND_KINDERBETREUUNG, GRUND_REALSCHULE,
+                                   GRUND_VORKENNTNISSE, berechne_gesamtdauer)
+from src.reason_optimizer import (optimiere_verkuerzungsgruende,
+                                  zerlege_verkuerzungsmaske)
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+ALLE_GRUENDE = (
+    GRUND_BERUF_FELDER | GRUND_ABITUR | GRUND_REALSCHULE | GRUND_ALTER_21
+    | GRUND_KINDERBETREUUNG | GRUND_BERUF_Q1 | GRUND_BERUF_Q4
+    | GRUND_BERUF_Q2 | (1 << BERUF_Q2_STUFE_SHIFT)
+)
+
+
+def _alle_teilmengen(maske, basis, prozent):
+    """Vollständige Aufzählung: (Anzahl Gründe, finale Dauer) je Teilmenge."""
+    basis_bits, gruende = zerlege_verkuerzungsmaske(maske)
+    for anzahl in range(len(gruende) + 1):
+        for auswahl in itertools.combinations(gruende, anzahl):
+            teilmaske = basis_bits
+            for _, bits, _ in auswahl:
+                teilmaske |= bits
+            yield anzahl, berechne_gesamtdauer(
+                basis, 40, prozent, teilmaske, "prozent"
+            )["finale_dauer_monate"]
+
+
+@pytest.mark.parametrize("basis", [24, 36, 42])
+@pytest.mark.parametrize("prozent", [50, 75, 90, 100])
+def test_entspricht_vollstaendiger_aufzaehlung(basis, prozent):
+    """Anzahl der Gründe und beste Dauer wie bei Prüfung aller 2^k Teilmengen."""
+    teilmengen = list(_alle_teilmengen(ALLE_GRUENDE, basis, prozent))
+    beste = min(dauer for _, dauer in teilmengen)
+
+    optimum = optimiere_verkuerzungsgruende(basis, 40, prozent, ALLE_GRUENDE)
+
+    assert optimum.beste_dauer_monate == beste
+    assert optimum.finale_dauer_monate == beste
+    assert len(optimum.gruende) == min(
+        anzahl for anzahl, dauer in teilmengen if dauer == beste
+    )
+    # 2 Klassen (6 Monate: 3 Gründe, 12 Monate: 4 Gründe) statt 2^7 Teilmengen
+    assert optimum.gepruefte_kombinationen == 4 * 5 < 2 ** 7
+
+
+def test_ein_grund_genuegt_bei_begrenzung():
+    """Abitur allein erreicht bereits die volle Verkürzung von 12 Monaten."""
+    optimum = optimiere_verkuerzungsgruende(
+        36, 40, 75, GRUND_ABITUR | GRUND_REALSCHULE | GRUND_ALTER_21
+    )
+
+    assert optimum.gruende == ("abitur",)
+    assert optimum.verkuerzungs_maske == GRUND_ABITUR
+    assert optimum.ergebnis["verkuerzung_gesamt_monate"] == 12
+    assert optimum.ergebnis["verkuerzung_gesamt_ohne_begrenzung"] == 12
+
+
+def test_zieldauer_ohne_gruende_durch_sonderregel():
+    """Bei 90 % erreicht schon § 8 Abs. 3 (ohne Gründe) die Zieldauer 36."""
+    optimum = optimiere_verkuerzungsgruende(
+        36, 40, 90, GRUND_REALSCHULE, ziel_dauer_monate=36
+    )
+
+    assert optimum.gruende == ()
+    assert optimum.finale_dauer_monate == 36
+    assert optimum.ergebnis["regel_8_abs_3_angewendet"] is True
+    assert optimum.beste_dauer_monate == 33
+
+
+def test_zieldauer_nicht_erreichbar():
+    """Eine zu kurze Zieldauer löst ValueError aus."""
+    with pytest.raises(ValueError, match="nicht erreichbar"):
+        optimiere_verkuerzungsgruende(
+            36, 40, 75, GRUND_REALSCHULE, ziel_dauer_monate=30
+        )
+
+
+def test_zerlegung_der_maske():
+    """Vorkalkulierte Monate ersetzen Einzelfragen; Legacy ohne Berufsfelder."""
+    vorkalkuliert = (
+        GRUND_BERUF_FELDER | GRUND_BERUF_Q1 | (6 << BERUF_MONATE_SHIFT)
+    )
+    assert zerlege_verkuerzungsmaske(vorkalkuliert) == (
+        GRUND_BERUF_FELDER,
+        [("berufliche_verkuerzung_monate", 6 << BERUF_MONATE_SHIFT, 6)],
+    )
+    assert zerlege_verkuerzungsmaske(GRUND_VORKENNTNISSE) == (
+        0, [("vorkenntnisse_monate", GRUND_VORKENNTNISSE, 12)]
+    )
+    # beruf_q2 unter 6 Monaten verkürzt nicht und ist kein wählbarer Grund
+    assert zerlege_verkuerzungsmaske(GRUND_BERUF_FELDER | GRUND_BERUF_Q2) == (
+        GRUND_BERUF_FELDER, []
+    )
+
+
+def test_service_liefert_gruende_als_payload():
+    """Der Service liefert die gewählten Gründe auch als Payload-Dictionary."""
+    payload = dict(TEILZEIT_75_MIT_ABITUR)
+    payload["verkuerzungsgruende"] = {
+        "abitur": True, "realschule": True, "alter_ueber_21": True,
+    }
+
+    response = verarbeite_optimierungsanfrage(payload)
+
+    assert response.status_code == 200
+    result = response.body["result"]
+    assert result["gruende"] == ["abitur"]
+    assert result["anzahl_gruende"] == 1
+    assert result["verkuerzungsgruende"]["abitur"] is True
+    assert result["verkuerzungsgruende"]["alter_ueber_21"] is False
+    assert result["ergebnis"]["finale_dauer_monate"] == 32
+
+
+@pytest.mark.parametrize(
+    "aenderung, status",
+    [
+        ({"ziel_dauer_monate": 20}, 422),
+        ({"ziel_dauer_monate": "x"}, 422),
+        ({"teilzeit_eingabe": 40}, 422),
+        ({"eingabetyp": None}, 422),
+    ],
+)
+def test_service_fehlerfaelle(aenderung, status):
+    """Ungültige Eingaben und unerreichbare Ziele liefern 422."""
+    payload = dict(TEILZEIT_75_MIT_ABITUR)
+    payload.update(aenderung)
+
+    response = verarbeite_optimierungsanfrage(payload)
+
+    assert response.status_code == status
+
+
+def test_api_optimize(client):
+    """POST /api/calculate/optimize liefert die kleinste Auswahl."""
+    resp = client.post("/api/calculate/optimize", json=TEILZEIT_75_MIT_ABITUR)
+
+    assert resp.status_code == 200
+    assert resp.get_json()["result"]["gruende"] == ["abitur"]
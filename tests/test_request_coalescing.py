@@ -0,0 +1,157 @@
+"""
+Tests für die Bündelung gleichzeitiger Berechnungen (request_coalescing.py)
+
+Testabdeckung:
+- Gleichzeitige Aufrufe mit gleichem Schlüssel rechnen nur einmal
+- Ausnahmen erreichen jeden wartenden Aufrufer
+- verarbeite_berechnungsanfrage unter parallelen identischen Anfragen
+"""
+
+import threading
+import time
+
+import pytest
+
+import src.api.calculation_service as cs
+from src.api import buendelungs_statistik, verarbeite_berechnungsanfrage
+from src.api.request_coalescing import Buendelung
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+ANZAHL = 8
+
+
+def _warte_bis(bedingung, zeitlimit=5.0):
+    """Wartet, bis `bedingung()` wahr ist (sonst schlägt der Test fehl)."""
+    ende = time.monotonic() + zeitlimit
+    while not bedingung():
+        assert time.monotonic() < ende, "Zeitlimit überschritten"
+        time.sleep(0.001)
+
+
+def _parallel(funktion, anzahl=ANZAHL):
+    """Startet `funktion` in mehreren Threads; liefert Threads und Ergebnisse."""
+    ergebnisse = [None] * anzahl
+
+    def lauf(index):
+        try:
+            ergebnisse[index] = funktion()
+        except Exception as exc:  # noqa: BLE001 - Ausnahme ist das Ergebnis
+            ergebnisse[index] = exc
+
+    threads = [
+        threading.Thread(target=lauf, args=(index,)) for index in range(anzahl)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads, ergebnisse
+
+
+def _blockierende_berechnung(ergebnis):
+    """Berechnung, die bis zur Freigabe blockiert und ihre Aufrufe zählt."""
+    freigabe = threading.Event()
+    aufrufe = []
+
+    def berechne(*args, **kwargs):
+        aufrufe.append(args or kwargs)
+        freigabe.wait(5)
+        if isinstance(ergebnis, Exception):
+            raise ergebnis
+        return ergebnis(*args, **kwargs) if callable(ergebnis) else ergebnis
+
+    return berechne, freigabe, aufrufe
+
+
+def test_gleicher_schluessel_wird_einmal_berechnet():
+    """Wartende Aufrufe erhalten das Ergebnis der laufenden Berechnung."""
+    buendelung = Buendelung()
+    berechne, freigabe, aufrufe = _blockierende_berechnung(object())
+
+    threads, ergebnisse = _parallel(lambda: buendelung.fuehre_aus("k", berechne))
+    _warte_bis(lambda: buendelung.statistik().gebuendelt == ANZAHL - 1)
+    freigabe.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(aufrufe) == 1
+    assert all(ergebnis is ergebnisse[0] for ergebnis in ergebnisse)
+    statistik = buendelung.statistik()
+    assert (statistik.berechnungen, statistik.gebuendelt) == (1, ANZAHL - 1)
+    assert statistik.laufend == 0
+
+
+def test_ausnahme_erreicht_alle_wartenden():
+    """Jeder Aufrufer erhält die Ausnahme (Wartende als eigene Kopie)."""
+    buendelung = Buendelung()
+    berechne, freigabe, aufrufe = _blockierende_berechnung(ValueError("kaputt"))
+
+    threads, ergebnisse = _parallel(lambda: buendelung.fuehre_aus("k", berechne))
+    _warte_bis(lambda: buendelung.statistik().gebuendelt == ANZAHL - 1)
+    freigabe.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(aufrufe) == 1
+    assert all(isinstance(fehler, ValueError) for fehler in ergebnisse)
+    assert {str(fehler) for fehler in ergebnisse} == {"kaputt"}
+    assert len({id(fehler) for fehler in ergebnisse}) == ANZAHL
+    assert buendelung.statistik().fehler == 1
+
+
+def test_nach_abschluss_wird_neu_berechnet():
+    """Nur gleichzeitige Aufrufe werden gebündelt, spätere rechnen selbst."""
+    buendelung = Buendelung()
+    with pytest.raises(ValueError):
+        buendelung.fuehre_aus("k", lambda: int("x"))
+
+    assert buendelung.fuehre_aus("k", lambda: 1) == 1
+    assert buendelung.fuehre_aus("j", lambda: 2) == 2
+    statistik = buendelung.statistik()
+    assert (statistik.berechnungen, statistik.gebuendelt) == (3, 0)
+
+
+def test_parallele_identische_anfragen(monkeypatch):
+    """Identische Anfragen während einer laufenden Berechnung rechnen einmal."""
+    cs.leere_ergebnis_cache()
+    berechne, freigabe, aufrufe = _blockierende_berechnung(cs.berechne_gesamtdauer)
+    monkeypatch.setattr(cs, "berechne_gesamtdauer", berechne)
+    vorher = buendelungs_statistik()
+
+    threads, antworten = _parallel(
+        lambda: verarbeite_berechnungsanfrage(dict(TEILZEIT_75_MIT_ABITUR))
+    )
+    _warte_bis(
+        lambda: buendelungs_statistik().gebuendelt - vorher.gebuendelt == ANZAHL - 1
+    )
+    freigabe.set()
+    for thread in threads:
+        thread.join()
+    cs.leere_ergebnis_cache()
+
+    assert len(aufrufe) == 1
+    assert {antwort.status_code for antwort in antworten} == {200}
+    assert all(antwort.ergebnis is antworten[0].ergebnis for antwort in antworten)
+    assert antworten[0].body["result"]["finale_dauer_monate"] == 32
+
+
+def test_parallele_anfragen_mit_fehler(monkeypatch):
+    """Ein Fehler der Berechnung wird jeder wartenden Anfrage als 422 geliefert."""
+    cs.leere_ergebnis_cache()
+    berechne, freigabe, aufrufe = _blockierende_berechnung(ValueError("ungültig"))
+    monkeypatch.setattr(cs, "berechne_gesamtdauer", berechne)
+    vorher = buendelungs_statistik()
+
+    threads, antworten = _parallel(
+        lambda: verarbeite_berechnungsanfrage(dict(TEILZEIT_75_MIT_ABITUR))
+    )
+    _warte_bis(
+        lambda: buendelungs_statistik().gebuendelt - vorher.gebuendelt == ANZAHL - 1
+    )
+    freigabe.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(aufrufe) == 1
+    assert {antwort.status_code for antwort in antworten} == {422}
+    assert {antwort.fehler.message for antwort in antworten} == {"ungültig"}
+    assert cs.cache_statistik().eintraege == 0
+    assert buendelungs_statistik().fehler - vorher.fehler == 1
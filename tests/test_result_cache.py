@@ -0,0 +1,54 @@
+"""Unit-Tests für den LRU-Ergebniscache (src/api/result_cache.py)."""
+
+import pytest
+
+from src.api.result_cache import ErgebnisCache, cache_groesse_aus_umgebung
+
+
+def test_lru_verdraengt_aeltesten_eintrag():
+    """Bei voller Kapazität wird der am längsten nicht genutzte Eintrag verdrängt."""
+    cache = ErgebnisCache(max_eintraege=2)
+    cache.speichere("a", 1)
+    cache.speichere("b", 2)
+    assert cache.hole("a") == 1  # "a" ist jetzt der jüngste Eintrag
+    cache.speichere("c", 3)
+
+    assert cache.hole("b") is None
+    assert cache.hole("a") == 1
+    assert cache.hole("c") == 3
+    statistik = cache.statistik()
+    assert (statistik.treffer, statistik.fehlschlaege) == (3, 1)
+    assert statistik.verdraengungen == 1
+    assert statistik.eintraege == 2
+    assert statistik.trefferquote == 0.75
+
+
+def test_groesse_null_deaktiviert_cache():
+    """Mit Maximalgröße 0 wird nichts gespeichert."""
+    cache = ErgebnisCache(max_eintraege=0)
+    cache.speichere("a", 1)
+    assert cache.hole("a") is None
+    assert cache.statistik().eintraege == 0
+
+
+def test_konfiguriere_verkleinert_cache():
+    """Verkleinern verdrängt überzählige Einträge in LRU-Reihenfolge."""
+    cache = ErgebnisCache(max_eintraege=3)
+    for schluessel in "abc":
+        cache.speichere(schluessel, schluessel)
+    cache.konfiguriere(1)
+
+    assert cache.hole("c") == "c"
+    assert cache.statistik().verdraengungen == 2
+    with pytest.raises(ValueError):
+        cache.konfiguriere(-1)
+
+
+def test_cache_groesse_aus_umgebung(monkeypatch):
+    """RESULT_CACHE_SIZE wird gelesen, ungültige Werte fallen auf den Default."""
+    monkeypatch.setenv("RESULT_CACHE_SIZE", "16")
+    assert cache_groesse_aus_umgebung() == 16
+    monkeypatch.setenv("RESULT_CACHE_SIZE", "abc")
+    assert cache_groesse_aus_umgebung(default=8) == 8
+    monkeypatch.setenv("RESULT_CACHE_SIZE", "-1")
+    assert cache_groesse_aus_umgebung(default=8) == 8
@@ -0,0 +1,236 @@
+"""
+Tests für die versionierten Regelwerke (rule_sets.py)
+
+Testabdeckung:
+- Mitgeliefertes Regelwerk entspricht den Konstanten von calculation_logic
+- Abweichende Regelwerke (Verkürzung, Obergrenze, § 8 Abs. 3 BBiG)
+- Einmaliges Laden je Version und Validierung der Dateien
+- Feld ``regelwerk`` in POST /api/calculate inkl. Ergebniscache
+- Optimierer mit Regelwerk; 422 bei Endpunkten ohne Regelwerk-Unterstützung
+"""
+
+import dataclasses
+import json
+import shutil
+
+import pytest
+
+from src.api import leere_ergebnis_cache, verarbeite_berechnungsanfrage
+from src.app import create_app
+from src.calculation_logic import (GRUND_ABITUR, GRUND_BERUF_FELDER,
+                                   GRUND_BERUF_Q1, GRUND_BERUF_Q4,
+                                   GRUND_REALSCHULE, GRUND_VORKENNTNISSE,
+                                   berechne_gesamtdauer)
+from src.reason_optimizer import (optimiere_verkuerzungsgruende,
+                                  zerlege_verkuerzungsmaske)
+from src.rule_sets import (STANDARD_REGELWERK, STANDARD_REGELWERK_VERZEICHNIS,
+                           lade_regelwerk, leere_regelwerk_cache,
+                           verfuegbare_regelwerke)
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+ALTES_REGELWERK = {
+    "version": "kammer-alt",
+    "bezeichnung": "Beispiel für Altverträge",
+    "verkuerzung_monate": {
+        "abitur": 6,
+        "realschule": 6,
+        "vorkenntnisse": 6,
+        "beruf_q1": 6,
+        "beruf_q2_stufen": [0, 3, 6],
+    },
+    "max_gesamt_verkuerzung_monate": 18,
+    "min_teilzeit_prozent": 60,
+    "max_verlaengerung_faktor": 2.0,
+    "ao_dauer_monate": [18, 42],
+    "regel_8_abs_3_toleranz_monate": 0,
+}
+
+
+@pytest.fixture()
+def regelwerk_verzeichnis(tmp_path, monkeypatch):
+    """Regelwerkverzeichnis mit ``bbig-2020`` und ``kammer-alt``."""
+    shutil.copy(STANDARD_REGELWERK_VERZEICHNIS / "bbig-2020.json", tmp_path)
+    (tmp_path / "kammer-alt.json").write_text(
+        json.dumps(ALTES_REGELWERK), encoding="utf-8"
+    )
+    monkeypatch.setenv("REGELWERK_DIR", str(tmp_path))
+    leere_regelwerk_cache()
+    leere_ergebnis_cache()
+    yield tmp_path
+    leere_regelwerk_cache()
+    leere_ergebnis_cache()
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_mitgeliefertes_regelwerk_entspricht_standard():
+    regelwerk = lade_regelwerk()
+    assert regelwerk.version == STANDARD_REGELWERK
+    assert regelwerk.entspricht_standard
+    assert STANDARD_REGELWERK in verfuegbare_regelwerke()
+    # Auch ohne Abkürzung über berechne_gesamtdauer identisch
+    live = dataclasses.replace(regelwerk, entspricht_standard=False)
+    for maske in (0, GRUND_ABITUR, GRUND_REALSCHULE | GRUND_VORKENNTNISSE,
+                  GRUND_BERUF_FELDER | GRUND_BERUF_Q1 | GRUND_BERUF_Q4):
+        for prozent in (50, 62.5, 75, 90, 100):
+            assert (
+                live.berechne(36, 40, prozent, maske).to_dict()
+                == berechne_gesamtdauer(36, 40, prozent, maske).to_dict()
+            )
+
+
+def test_abweichendes_regelwerk(regelwerk_verzeichnis):
+    regelwerk = lade_regelwerk("Kammer-Alt ")
+    assert not regelwerk.entspricht_standard
+
+    # Abitur verkürzt nur 6 Monate: 30 / 0,75 = 40
+    ergebnis = regelwerk.berechne(36, 40, 75, GRUND_ABITUR)
+    assert ergebnis.verkuerzte_dauer_monate == 30
+    assert ergebnis.finale_dauer_monate == 40
+
+    # Höchstgrenze 18 Monate statt 12
+    ergebnis = regelwerk.berechne(
+        36, 40, 100, GRUND_ABITUR | GRUND_REALSCHULE | GRUND_VORKENNTNISSE
+    )
+    assert ergebnis.verkuerzte_dauer_monate == 18
+
+    # Obergrenze 2,0 × AO-Dauer, keine Toleranz nach § 8 Abs. 3
+    assert regelwerk.berechne(36, 40, 60, 0).finale_dauer_monate == 60
+    ergebnis = regelwerk.berechne(36, 40, 90, 0)
+    assert ergebnis.finale_dauer_monate == 40
+    assert not ergebnis.regel_8_abs_3_angewendet
+
+    # Wertebereiche des Regelwerks
+    assert regelwerk.berechne(18, 40, 100, 0).finale_dauer_monate == 18
+    with pytest.raises(ValueError):
+        regelwerk.berechne(36, 40, 55, 0)
+    with pytest.raises(ValueError):
+        regelwerk.berechne(36, 40, 20, 0, "stunden")
+
+
+def test_regelwerk_wird_einmal_geladen(regelwerk_verzeichnis):
+    erstes = lade_regelwerk("kammer-alt")
+    (regelwerk_verzeichnis / "kammer-alt.json").write_text("{", encoding="utf-8")
+    assert lade_regelwerk("kammer-alt") is erstes
+    leere_regelwerk_cache()
+    with pytest.raises(ValueError, match="ungültiges JSON"):
+        lade_regelwerk("kammer-alt")
+
+
+@pytest.mark.parametrize(
+    "aenderung",
+    [
+        {"version": "andere"},
+        {"max_verlaengerung_faktor": 0.5},
+        {"min_teilzeit_prozent": 0},
+        {"ao_dauer_monate": [42, 24]},
+        {"regel_8_abs_3_toleranz_monate": -1},
+        {"verkuerzung_monate": {"abitur": 6, "meisterbrief": 12}},
+        {"verkuerzung_monate": {"beruf_q2_stufen": [0, 6]}},
+        {"max_gesamt_verkuerzung_monate": None},
+    ],
+)
+def test_ungueltige_regelwerke(regelwerk_verzeichnis, aenderung):
+    (regelwerk_verzeichnis / "kammer-alt.json").write_text(
+        json.dumps({**ALTES_REGELWERK, **aenderung}), encoding="utf-8"
+    )
+    with pytest.raises(ValueError, match="kammer-alt.json"):
+        lade_regelwerk("kammer-alt")
+
+
+@pytest.mark.parametrize("version", ["fehlt", "../bbig-2020", 2020])
+def test_unbekannte_version(regelwerk_verzeichnis, version):
+    with pytest.raises((TypeError, ValueError)):
+        lade_regelwerk(version)
+
+
+def test_service_regelwerk(regelwerk_verzeichnis):
+    standard = verarbeite_berechnungsanfrage(TEILZEIT_75_MIT_ABITUR)
+    alt = verarbeite_berechnungsanfrage(
+        {**TEILZEIT_75_MIT_ABITUR, "regelwerk": "kammer-alt"}
+    )
+    explizit = verarbeite_berechnungsanfrage(
+        {**TEILZEIT_75_MIT_ABITUR, "regelwerk": STANDARD_REGELWERK}
+    )
+    # Der Ergebniscache trennt die Regelwerke
+    assert standard.body["result"]["finale_dauer_monate"] == 32
+    assert alt.body["result"]["finale_dauer_monate"] == 40
+    assert explizit.body == standard.body
+
+    antwort = verarbeite_berechnungsanfrage(
+        {**TEILZEIT_75_MIT_ABITUR, "regelwerk": "fehlt"}
+    )
+    assert antwort.status_code == 422
+    fehler = antwort.body["error"]
+    assert fehler["code"] == "unbekanntes_regelwerk"
+    assert fehler["details"]["available"] == ("bbig-2020", "kammer-alt")
+
+
+def test_api_calculate_mit_regelwerk(client, regelwerk_verzeichnis):
+    response = client.post(
+        "/api/calculate",
+        json={**TEILZEIT_75_MIT_ABITUR, "regelwerk": "kammer-alt"},
+    )
+    assert response.status_code == 200
+    assert response.get_json()["result"]["verkuerzte_dauer_monate"] == 30
+
+
+def test_optimierer_mit_regelwerk(regelwerk_verzeichnis):
+    regelwerk = lade_regelwerk("kammer-alt")
+    maske = GRUND_ABITUR | GRUND_VORKENNTNISSE
+
+    assert zerlege_verkuerzungsmaske(maske, regelwerk) == (0, [
+        ("abitur", GRUND_ABITUR, 6),
+        ("vorkenntnisse_monate", GRUND_VORKENNTNISSE, 6),
+    ])
+    optimum = optimiere_verkuerzungsgruende(36, 40, 75, maske, regelwerk=regelwerk)
+    assert optimum.ergebnis == regelwerk.berechne(36, 40, 75, maske, "prozent")
+
+
+def test_api_optimize_mit_regelwerk(client, regelwerk_verzeichnis):
+    payload = {**TEILZEIT_75_MIT_ABITUR, "regelwerk": "kammer-alt"}
+    optimiert = client.post("/api/calculate/optimize", json=payload)
+    berechnet = client.post("/api/calculate", json=payload)
+
+    assert optimiert.status_code == 200
+    result = optimiert.get_json()["result"]
+    assert result["gruende"] == ["abitur"]
+    assert result["ergebnis"] == berechnet.get_json()["result"]
+    assert result["ergebnis"]["verkuerzte_dauer_monate"] == 30
+
+
+@pytest.mark.parametrize("pfad, payload", [
+    ("/api/calculate/sweep", {"basis_dauer_monate": 36}),
+    ("/api/calculate/inverse", {
+        "basis_dauer_monate": 36,
+        "vollzeit_stunden": 40,
+        "ziel_dauer_monate": 36,
+    }),
+    ("/api/calculate/phases", {
+        "basis_dauer_monate": 36,
+        "phasen": [{"teilzeit_prozent": 75}],
+    }),
+    ("/api/calculate/phases", {"vertraege": [{
+        "basis_dauer_monate": 36,
+        "phasen": [{"teilzeit_prozent": 75}],
+    }]}),
+    ("/api/calculate/phases/plan", {
+        "basis_dauer_monate": 36,
+        "ziel_dauer_monate": 48,
+    }),
+])
+def test_endpunkte_ohne_regelwerk(client, regelwerk_verzeichnis, pfad, payload):
+    """Endpunkte mit festen Standardwerten lehnen andere Regelwerke ab."""
+    abgelehnt = client.post(pfad, json={**payload, "regelwerk": "kammer-alt"})
+    assert abgelehnt.status_code == 422
+    assert abgelehnt.get_json()["error"]["code"] == "regelwerk_nicht_unterstuetzt"
+
+    standard = client.post(pfad, json={**payload, "regelwerk": STANDARD_REGELWERK})
+    assert standard.status_code == 200
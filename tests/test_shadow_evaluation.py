@@ -0,0 +1,221 @@
+"""Tests für die Schattenauswertung (src/api/shadow_evaluation.py)."""
+
+import hashlib
+import hmac
+import itertools
+import json
+import threading
+import time
+
+import pytest
+
+from src.api import (konfiguriere_schattenauswertung, leere_ergebnis_cache,
+                     schatten_abweichungen, schatten_statistik,
+                     verarbeite_berechnungsanfrage,
+                     warte_auf_schattenauswertung)
+from src.api.shadow_evaluation import (SchattenAuswertung, anteil_aus_umgebung,
+                                       geheimnis_aus_umgebung,
+                                       warteschlange_aus_umgebung)
+from src.calculation_logic import berechne_gesamtdauer
+from src.rule_sets import leere_regelwerk_cache
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+
+class _Ergebnis:
+    """Minimales Ergebnis mit `to_dict()`."""
+
+    def __init__(self, **werte):
+        self.werte = werte
+
+    def to_dict(self):
+        return dict(self.werte)
+
+
+@pytest.fixture()
+def schatten():
+    """Schattenauswertung mit Stichprobe jeder Anfrage; wird danach gestoppt."""
+    auswertung = SchattenAuswertung(max_warteschlange=2)
+    yield auswertung
+    auswertung.stoppe()
+
+
+@pytest.fixture()
+def regelwerk_kandidat(tmp_path, monkeypatch):
+    """Regelwerk ``kammer-alt`` (Abitur verkürzt nur 6 Monate) als Kandidat."""
+    (tmp_path / "kammer-alt.json").write_text(json.dumps({
+        "verkuerzung_monate": {"abitur": 6},
+        "max_gesamt_verkuerzung_monate": 12,
+        "min_teilzeit_prozent": 50,
+        "max_verlaengerung_faktor": 1.5,
+        "ao_dauer_monate": [24, 42],
+        "regel_8_abs_3_toleranz_monate": 6,
+    }), encoding="utf-8")
+    monkeypatch.setenv("REGELWERK_DIR", str(tmp_path))
+    leere_regelwerk_cache()
+    leere_ergebnis_cache()
+    yield "kammer-alt"
+    konfiguriere_schattenauswertung(None, 0.0)
+    leere_regelwerk_cache()
+
+
+def test_uebereinstimmung_und_abweichung(schatten):
+    schatten.konfiguriere(lambda anfrage: _Ergebnis(dauer=anfrage), 1.0, "id")
+    assert schatten.beobachte(48, _Ergebnis(dauer=48))
+    assert schatten.beobachte(50, _Ergebnis(dauer=51))
+    schatten.warte_bis_leer()
+
+    statistik = schatten.statistik()
+    assert (statistik.stichproben, statistik.ausgewertet) == (2, 2)
+    assert (statistik.uebereinstimmungen, statistik.abweichungen) == (1, 1)
+    assert statistik.abweichungsquote == 0.5
+    [datensatz] = schatten.abweichungen()
+    assert datensatz["kandidat"] == "id"
+    assert datensatz["felder"] == {"dauer": {"primaer": 51, "kandidat": 50}}
+    assert len(datensatz["anfrage"]) == 64
+
+
+def test_pseudonym_mit_geheimem_schluessel():
+    def pseudonym(geheimnis):
+        schatten = SchattenAuswertung(geheimnis=geheimnis)
+        schatten.konfiguriere(lambda anfrage: _Ergebnis(dauer=0), 1.0)
+        schatten.beobachte(50, _Ergebnis(dauer=51))
+        schatten.stoppe()
+        return schatten.abweichungen()[0]["anfrage"]
+
+    # Schlüssel der Anfrage ist repr(50), gehasht wird dessen repr
+    nachricht = repr(repr(50)).encode("utf-8")
+    erwartet = hmac.new(b"geheim", nachricht, hashlib.sha256).hexdigest()
+    assert pseudonym(b"geheim") == pseudonym(b"geheim") == erwartet
+    assert pseudonym(b"anderes") != erwartet
+    # Ohne Schlüssel zufällig je Instanz
+    assert pseudonym(None) != pseudonym(None)
+    assert hashlib.sha256(nachricht).hexdigest() not in {pseudonym(None), erwartet}
+
+
+def test_eingabefelder_werden_nicht_verglichen(schatten):
+    def kandidat(anfrage):
+        return _Ergebnis(
+            original_dauer_monate=anfrage, teilzeit_stunden=30, dauer=anfrage
+        )
+
+    schatten.konfiguriere(kandidat, 1.0)
+    schatten.beobachte(36, _Ergebnis(
+        original_dauer_monate=24, teilzeit_stunden=20, dauer=36
+    ))
+    schatten.beobachte(36, _Ergebnis(
+        original_dauer_monate=24, teilzeit_stunden=20, dauer=40
+    ))
+    schatten.warte_bis_leer()
+
+    statistik = schatten.statistik()
+    assert (statistik.uebereinstimmungen, statistik.abweichungen) == (1, 1)
+    [datensatz] = schatten.abweichungen()
+    assert datensatz["felder"] == {"dauer": {"primaer": 40, "kandidat": 36}}
+
+
+def test_fehler_des_kandidaten_werden_gezaehlt(schatten):
+    def kandidat(anfrage):
+        raise ValueError("kaputt")
+
+    schatten.konfiguriere(kandidat, 1.0)
+    schatten.beobachte(1, _Ergebnis(dauer=1))
+    schatten.warte_bis_leer()
+    assert schatten.statistik().fehler == 1
+    assert schatten.abweichungen()[0]["fehler"] == "ValueError"
+
+
+def test_stichprobenanteil():
+    zufall = itertools.cycle([0.05, 0.5, 0.95, 0.15]).__next__
+    schatten = SchattenAuswertung(zufall=zufall)
+    assert not schatten.beobachte(1, _Ergebnis())  # ohne Kandidat: aus
+    schatten.konfiguriere(lambda anfrage: _Ergebnis(), 0.2)
+    gezogen = [schatten.beobachte(n, _Ergebnis()) for n in range(8)]
+    schatten.stoppe()
+    assert gezogen == [True, False, False, True] * 2
+    assert schatten.statistik().uebereinstimmungen == 4
+    with pytest.raises(ValueError):
+        schatten.konfiguriere(None, 1.5)
+
+
+def test_volle_warteschlange_verwirft_statt_zu_blockieren(schatten):
+    freigabe = threading.Event()
+
+    def langsamer_kandidat(anfrage):
+        freigabe.wait(5)
+        return _Ergebnis()
+
+    schatten.konfiguriere(langsamer_kandidat, 1.0)
+    start = time.perf_counter()
+    gezogen = [schatten.beobachte(n, _Ergebnis()) for n in range(20)]
+    assert time.perf_counter() - start < 1.0
+    statistik = schatten.statistik()
+    # höchstens eine Stichprobe in Arbeit plus zwei wartende
+    assert statistik.stichproben == sum(gezogen) <= 3
+    assert statistik.verworfen == 20 - statistik.stichproben
+
+    freigabe.set()
+    schatten.warte_bis_leer()
+    assert schatten.statistik().ausgewertet == statistik.stichproben
+
+
+def test_service_mit_regelwerk_als_kandidat(regelwerk_kandidat):
+    konfiguriere_schattenauswertung(regelwerk_kandidat, 1.0)
+    antwort = verarbeite_berechnungsanfrage(TEILZEIT_75_MIT_ABITUR)
+    stunden = verarbeite_berechnungsanfrage({
+        **TEILZEIT_75_MIT_ABITUR, "eingabetyp": "stunden", "teilzeit_eingabe": 30,
+    })
+    warte_auf_schattenauswertung()
+
+    # Die primäre Antwort bleibt unverändert
+    assert antwort.body["result"]["finale_dauer_monate"] == 32
+    statistik = schatten_statistik()
+    assert statistik.kandidat == "regelwerk:kammer-alt"
+    assert statistik.abweichungen == 2
+    erster, zweiter = schatten_abweichungen()
+    assert erster["felder"]["finale_dauer_monate"] == {
+        "primaer": 32, "kandidat": 40,
+    }
+    # Anonymisiert: keine Eingabewerte, gleichwertige Anfragen gleiches Pseudonym
+    assert set(erster) == {"kandidat", "anfrage", "felder", "fehler"}
+    assert erster["anfrage"] == zweiter["anfrage"]
+    assert stunden.status_code == 200
+
+
+def test_service_ohne_kandidat():
+    konfiguriere_schattenauswertung(None, 1.0)
+    verarbeite_berechnungsanfrage(TEILZEIT_75_MIT_ABITUR)
+    assert schatten_statistik().stichproben == 0
+    with pytest.raises(ValueError):
+        konfiguriere_schattenauswertung("gibt-es-nicht", 0.1)
+
+
+def test_kernel_als_kandidat(regelwerk_kandidat):
+    def kernel(anfrage):
+        return berechne_gesamtdauer(
+            anfrage.basis_dauer_monate,
+            anfrage.vollzeit_stunden,
+            anfrage.teilzeit_eingabe,
+            anfrage.verkuerzungs_maske,
+            anfrage.eingabetyp,
+        )
+
+    konfiguriere_schattenauswertung(kernel, 1.0)
+    verarbeite_berechnungsanfrage(TEILZEIT_75_MIT_ABITUR)
+    warte_auf_schattenauswertung()
+    statistik = schatten_statistik()
+    assert (statistik.uebereinstimmungen, statistik.abweichungen) == (1, 0)
+
+
+def test_werte_aus_umgebung(monkeypatch):
+    monkeypatch.delenv("SHADOW_PSEUDONYM_KEY", raising=False)
+    assert geheimnis_aus_umgebung() is None
+    monkeypatch.setenv("SHADOW_SAMPLE_RATE", "0.25")
+    monkeypatch.setenv("SHADOW_QUEUE_SIZE", "32")
+    monkeypatch.setenv("SHADOW_PSEUDONYM_KEY", "geheim")
+    assert anteil_aus_umgebung() == 0.25
+    assert warteschlange_aus_umgebung() == 32
+    assert geheimnis_aus_umgebung() == b"geheim"
+    monkeypatch.setenv("SHADOW_SAMPLE_RATE", "2")
+    monkeypatch.setenv("SHADOW_QUEUE_SIZE", "0")
+    assert anteil_aus_umgebung(default=0.1) == 0.1
+    assert warteschlange_aus_umgebung(default=8) == 8
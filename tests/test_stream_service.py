@@ -0,0 +1,161 @@
+"""
+Tests für die gestreamte Massenberechnung (stream_service.py)
+
+Testabdeckung:
+- CSV (Trenner, deutsche Zahlen, Ja/Nein-Spalten, Kennung) und NDJSON
+- Fehlerzeilen (ungültiges JSON, Spaltenzahl, zu lange Zeilen) ohne Abbruch
+- Eingabe wird nur so weit gelesen, wie Ausgabe abgeholt wird
+- POST /api/calculate/stream
+"""
+
+import csv
+import io
+import itertools
+import json
+
+import pytest
+
+import src.api.stream_service as ss
+from src.api import verarbeite_berechnungsanfrage, verarbeite_stromanfrage
+from src.app import create_app
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+class _ZaehlenderStrom(io.BytesIO):
+    """BytesIO, das die Anzahl gelesener Zeilen mitzählt."""
+
+    gelesen = 0
+
+    def readline(self, size=-1):
+        self.gelesen += 1
+        return super().readline(size)
+
+
+def _ndjson(*zeilen):
+    return io.BytesIO(b"".join(json.dumps(z).encode() + b"\n" for z in zeilen))
+
+
+def _zeilen(bloecke):
+    return [json.loads(z) for z in "".join(bloecke).splitlines()]
+
+
+def test_ndjson_wie_einzelanfragen():
+    """Jede NDJSON-Zeile liefert dasselbe Ergebnis wie /api/calculate."""
+    anfragen = [TEILZEIT_75_MIT_ABITUR, dict(TEILZEIT_75_MIT_ABITUR, kennung="B")]
+    zeilen = _zeilen(verarbeite_stromanfrage(_ndjson(*anfragen), "ndjson"))
+
+    erwartet = verarbeite_berechnungsanfrage(TEILZEIT_75_MIT_ABITUR).body["result"]
+    assert [z["zeile"] for z in zeilen] == [1, 2]
+    assert "kennung" not in zeilen[0]
+    assert zeilen[1]["kennung"] == "B"
+    assert all(z["status_code"] == 200 and z["result"] == erwartet for z in zeilen)
+
+
+def test_ndjson_fehlerzeilen_brechen_nicht_ab(monkeypatch):
+    """Ungültige Zeilen erhalten Fehlerobjekte; Leerzeilen entfallen."""
+    monkeypatch.setattr(ss, "MAX_ZEILENLAENGE", 50)
+    body = b"".join([
+        b"kein json\n",
+        b"\n",
+        b'{"basis_dauer_monate": 36}\n',
+        b'{"kennung": "' + b"x" * 200 + b'"}\n',
+        json.dumps(TEILZEIT_75_MIT_ABITUR).replace(" ", "").encode()[:50] + b"\n",
+    ])
+    zeilen = _zeilen(verarbeite_stromanfrage(io.BytesIO(body), "ndjson"))
+
+    assert [(z["zeile"], z["status_code"]) for z in zeilen] == [
+        (1, 422), (3, 400), (4, 422), (5, 422),
+    ]
+    assert zeilen[0]["error"]["details"] == {"zeile": 1}
+    assert zeilen[1]["error"]["code"] == "missing_fields"
+    assert zeilen[2]["error"]["details"] == {"zeile": 4, "max": 50}
+
+
+def test_csv_eingabe_und_ausgabe():
+    """CSV mit Semikolon, BOM, deutschen Zahlen und Ja/Nein-Spalten."""
+    body = (
+        "﻿kennung;basis_dauer_monate;vollzeit_stunden;teilzeit_eingabe;"
+        "eingabetyp;abitur;beruf_q1\n"
+        "A1;36;38,5;75;prozent;ja;\n"
+        "A2;36;40;30;stunden;nein;1\n"
+        "A3;36;40;75;prozent;vielleicht;\n"
+        "A4;36\n"
+    ).encode()
+    zeilen = list(csv.DictReader(io.StringIO("".join(
+        verarbeite_stromanfrage(io.BytesIO(body), "csv", "csv")
+    ))))
+
+    assert [z["kennung"] for z in zeilen] == ["A1", "A2", "A3", ""]
+    assert [z["status_code"] for z in zeilen] == ["200", "200", "422", "422"]
+    assert zeilen[0]["finale_dauer_monate"] == "32"
+    assert zeilen[0]["teilzeit_stunden"] == "28.875"
+    # beruf_q1 = 1 ergibt 12 Monate Verkürzung
+    assert zeilen[1]["verkuerzung_gesamt_monate"] == "12"
+    assert zeilen[2]["fehler_meldung"] == "abitur muss bool sein"
+    assert zeilen[3]["zeile"] == "5"
+
+
+def test_eingabe_wird_erst_bei_bedarf_gelesen(monkeypatch):
+    """Ein langsam lesender Client bremst das Lesen des Bodies."""
+    monkeypatch.setattr(ss, "ZEILEN_JE_BLOCK", 2)
+    strom = _ZaehlenderStrom(b"".join(
+        json.dumps(TEILZEIT_75_MIT_ABITUR).encode() + b"\n" for _ in range(1000)
+    ))
+
+    bloecke = verarbeite_stromanfrage(strom, "ndjson")
+    assert strom.gelesen == 0
+    erster = next(bloecke)
+    assert len(erster.splitlines()) == 2
+    assert strom.gelesen == 2
+    assert sum(1 for _ in itertools.islice(bloecke, 3)) == 3
+    assert strom.gelesen == 8
+
+
+def test_unbekanntes_format():
+    """Unbekannte Formate werden abgelehnt."""
+    with pytest.raises(ValueError):
+        verarbeite_stromanfrage(io.BytesIO(), "xml")
+    with pytest.raises(ValueError):
+        verarbeite_stromanfrage(io.BytesIO(), "csv", "xml")
+
+
+def test_api_stream(client):
+    """POST /api/calculate/stream streamt NDJSON bzw. CSV."""
+    body = json.dumps(TEILZEIT_75_MIT_ABITUR).encode() + b"\n"
+    resp = client.post(
+        "/api/calculate/stream", data=body, content_type="application/x-ndjson"
+    )
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    assert resp.is_streamed
+    assert _zeilen([resp.get_data(as_text=True)])[0]["status_code"] == 200
+
+    resp = client.post(
+        "/api/calculate/stream?format=csv",
+        data=body,
+        content_type="application/x-ndjson",
+    )
+    assert resp.mimetype == "text/csv"
+    assert resp.get_data(as_text=True).startswith("zeile,kennung,status_code")
+
+
+def test_api_stream_fehler(client):
+    """Falscher Content-Type → 400, unbekanntes Ausgabeformat → 422."""
+    resp = client.post("/api/calculate/stream", json=TEILZEIT_75_MIT_ABITUR)
+    assert resp.status_code == 400
+    assert resp.get_json()["error"]["code"] == "invalid_request"
+
+    resp = client.post(
+        "/api/calculate/stream?format=xml", data=b"", content_type="text/csv"
+    )
+    assert resp.status_code == 422
+    assert resp.get_json()["error"]["details"] == {"field": "format"}
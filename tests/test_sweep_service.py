@@ -0,0 +1,144 @@
+"""
+Tests für Dauerkurven und -raster (Teilzeit-Sweep)
+
+Testabdeckung:
+- `berechne_teilzeit_kurve()` / `berechne_teilzeit_raster()` stimmen Zelle für
+  Zelle mit `berechne_gesamtdauer()` überein
+- Service `verarbeite_kurvenanfrage()` (Kurve, Raster, Fehlerfälle)
+- POST /api/calculate/sweep
+"""
+
+import pytest
+
+from src.api import verarbeite_kurvenanfrage
+from src.app import create_app
+from src.calculation_logic import (BERUF_MONATE_SHIFT, GRUND_ABITUR,
+                                   GRUND_BERUF_FELDER, TEILZEIT_PROZENTE,
+                                   VERKUERZUNGEN_MONATE, berechne_gesamtdauer,
+                                   berechne_teilzeit_kurve,
+                                   berechne_teilzeit_raster)
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_raster_entspricht_einzelberechnung():
+    """Jede Rasterzelle entspricht der finalen Dauer der Einzelberechnung."""
+    for basis in (24, 30, 36, 42):
+        raster = berechne_teilzeit_raster(basis)
+        assert len(raster) == len(VERKUERZUNGEN_MONATE)
+        for verkuerzung, kurve in zip(VERKUERZUNGEN_MONATE, raster):
+            gruende = GRUND_BERUF_FELDER | (verkuerzung << BERUF_MONATE_SHIFT)
+            for prozent, dauer in zip(TEILZEIT_PROZENTE, kurve):
+                erwartet = berechne_gesamtdauer(
+                    basis, 40, prozent, gruende, "prozent"
+                )["finale_dauer_monate"]
+                assert dauer == erwartet, (basis, verkuerzung, prozent)
+
+
+def test_raster_wird_je_ao_dauer_wiederverwendet():
+    """Wiederholte Aufrufe liefern dasselbe (zwischengespeicherte) Objekt."""
+    assert berechne_teilzeit_raster(36) is berechne_teilzeit_raster(36.0)
+    assert berechne_teilzeit_kurve(36, 12) is berechne_teilzeit_raster(36)[12]
+
+
+def test_kurve_mit_negativer_verkuerzung():
+    """Negative Verkürzungen (vorkalkulierte Monate) werden live berechnet."""
+    kurve = berechne_teilzeit_kurve(36, -4)
+    erwartet = berechne_gesamtdauer(
+        36, 40, 75, GRUND_BERUF_FELDER | (-4 << BERUF_MONATE_SHIFT), "prozent"
+    )["finale_dauer_monate"]
+    assert kurve[TEILZEIT_PROZENTE.index(75)] == erwartet
+
+
+@pytest.mark.parametrize(
+    "basis, verkuerzung, fehler",
+    [
+        ("36", 0, TypeError),
+        (36.5, 0, ValueError),
+        (20, 0, ValueError),
+        (36, 13, ValueError),
+        (36, 1.5, TypeError),
+    ],
+)
+def test_kurve_ungueltige_eingaben(basis, verkuerzung, fehler):
+    """Ungültige AO-Dauer oder Verkürzung lösen TypeError/ValueError aus."""
+    with pytest.raises(fehler):
+        berechne_teilzeit_kurve(basis, verkuerzung)
+
+
+def test_service_kurve_aus_verkuerzungsgruenden():
+    """Verkürzungsgründe werden wie bei /api/calculate ausgewertet."""
+    response = verarbeite_kurvenanfrage(
+        {"basis_dauer_monate": 36, "verkuerzungsgruende": {"abitur": True}}
+    )
+
+    assert response.status_code == 200
+    result = response.body["result"]
+    assert result["verkuerzung_monate"] == 12
+    assert list(result["teilzeit_prozente"]) == list(range(50, 101))
+    index = result["teilzeit_prozente"].index(75)
+    assert result["finale_dauer_monate"][index] == berechne_gesamtdauer(
+        36, 40, 75, GRUND_ABITUR, "prozent"
+    )["finale_dauer_monate"]
+
+
+def test_service_raster_ohne_verkuerzung():
+    """Ohne Verkürzungsangabe wird das vollständige Raster geliefert."""
+    response = verarbeite_kurvenanfrage({"basis_dauer_monate": "36"})
+
+    assert response.status_code == 200
+    result = response.body["result"]
+    assert list(result["verkuerzungen_monate"]) == list(range(13))
+    assert result["finale_dauer_monate"] == berechne_teilzeit_raster(36)
+
+
+@pytest.mark.parametrize(
+    "payload, status, code",
+    [
+        ({}, 400, "missing_fields"),
+        ({"basis_dauer_monate": 50}, 422, "validation_error"),
+        ({"basis_dauer_monate": 36, "verkuerzung_monate": -1}, 422,
+         "validation_error"),
+        ({"basis_dauer_monate": 36, "verkuerzung_monate": 20}, 422,
+         "validation_error"),
+        ({"basis_dauer_monate": 36, "verkuerzung_monate": 6,
+          "verkuerzungsgruende": {}}, 422, "validation_error"),
+        ({"basis_dauer_monate": 36, "verkuerzungsgruende": []}, 422,
+         "validation_error"),
+    ],
+)
+def test_service_fehlerfaelle(payload, status, code):
+    """Fehlende oder ungültige Felder liefern 400 bzw. 422."""
+    response = verarbeite_kurvenanfrage(payload)
+
+    assert response.status_code == status
+    assert response.body["error"]["code"] == code
+
+
+def test_api_sweep_liefert_kurve(client):
+    """POST /api/calculate/sweep liefert die Kurve als JSON."""
+    resp = client.post(
+        "/api/calculate/sweep",
+        json={"basis_dauer_monate": 36, "verkuerzung_monate": 0},
+    )
+
+    assert resp.status_code == 200
+    result = resp.get_json()["result"]
+    assert result["finale_dauer_monate"] == list(berechne_teilzeit_kurve(36))
+
+
+def test_api_sweep_ohne_json(client):
+    """POST /api/calculate/sweep ohne JSON liefert 400."""
+    resp = client.post(
+        "/api/calculate/sweep", data="x", content_type="text/plain"
+    )
+
+    assert resp.status_code == 400
+    assert resp.get_json()["error"]["code"] == "invalid_request"
@@ -0,0 +1,166 @@
+"""
+Tests für die Datums-Engine (timeline.py)
+
+Testabdeckung:
+- Ausbildungsende und lückenlose Monatsfolge inkl. Ausbildungsjahren
+- Art der Monate (Teilzeit- und Prüfungsverlängerung)
+- Gestreamter CSV- und ICS-Export, auch als Stapel
+- Service `verarbeite_zeitleistenanfrage()` und POST /api/calculate/timeline
+"""
+
+import csv
+import itertools
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.api import verarbeite_zeitleistenanfrage
+from src.app import create_app
+from src.calculation_logic import GRUND_ABITUR, berechne_gesamtdauer
+from src.exam_calendar import leere_pruefungskalender_cache
+from src.timeline import (CSV_SPALTEN, MONAT_AUSBILDUNG,
+                          MONAT_PRUEFUNGSVERLAENGERUNG,
+                          MONAT_TEILZEITVERLAENGERUNG, erstelle_zeitleiste,
+                          zeitleisten_als_csv)
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+
+@pytest.fixture()
+def client():
+    """Test-Client der Flask-App."""
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_monate_sind_lueckenlos():
+    ergebnis = berechne_gesamtdauer(36, 40, 75, 0)
+    zeitleiste = erstelle_zeitleiste(date(2024, 1, 31), ergebnis)
+    monate = list(zeitleiste.monate())
+
+    assert len(monate) == 48
+    assert monate[0].beginn == date(2024, 1, 31)
+    assert monate[0].ende == date(2024, 2, 28)
+    for vorher, nachher in zip(monate, monate[1:]):
+        assert nachher.beginn == vorher.ende + timedelta(days=1)
+    assert monate[-1].ende == zeitleiste.ausbildungsende == date(2028, 1, 30)
+    assert [m.ausbildungsjahr for m in monate[11:13]] == [1, 2]
+    assert monate[12].monat_im_ausbildungsjahr == 1
+
+
+def test_art_der_monate():
+    ergebnis = berechne_gesamtdauer(36, 40, 75, GRUND_ABITUR)
+    zeitleiste = erstelle_zeitleiste(date(2024, 8, 1), ergebnis, 35)
+    arten = [monat.art for monat in zeitleiste.monate()]
+    assert arten.count(MONAT_AUSBILDUNG) == 24
+    assert arten.count(MONAT_TEILZEITVERLAENGERUNG) == 8
+    assert arten.count(MONAT_PRUEFUNGSVERLAENGERUNG) == 3
+
+    with pytest.raises(ValueError):
+        erstelle_zeitleiste(date(2024, 8, 1), ergebnis, 31)
+    with pytest.raises(TypeError):
+        erstelle_zeitleiste("2024-08-01", ergebnis)
+
+
+def test_monate_werden_erst_bei_bedarf_erzeugt():
+    ergebnis = berechne_gesamtdauer(42, 40, 50, 0)
+    monate = erstelle_zeitleiste(date(2024, 8, 1), ergebnis).monate()
+    erster = next(monate)
+    assert erster.monat == 1
+    assert sum(1 for _ in monate) == ergebnis.finale_dauer_monate - 1
+
+
+def test_csv_export():
+    ergebnis = berechne_gesamtdauer(36, 40, 75, GRUND_ABITUR)
+    zeitleiste = erstelle_zeitleiste(date(2024, 8, 1), ergebnis)
+    zeilen = list(csv.reader(zeitleiste.als_csv()))
+    assert tuple(zeilen[0]) == CSV_SPALTEN
+    assert len(zeilen) == 33
+    assert zeilen[1][:3] == ["1", "2024-08-01", "2024-08-31"]
+    assert zeilen[-1][2] == "2027-03-31"
+
+
+def test_csv_stapel_wird_gestreamt():
+    ergebnis = berechne_gesamtdauer(24, 40, 50, 0)
+    # Unendlicher Generator: nur die gelesenen Zeilen werden erzeugt
+    faelle = (
+        (f"azubi-{n}", erstelle_zeitleiste(date(2024, 8, 1), ergebnis))
+        for n in itertools.count()
+    )
+    zeilen = list(itertools.islice(zeitleisten_als_csv(faelle), 1 + 36 + 2))
+    assert zeilen[0].startswith("kennung,monat,")
+    assert zeilen[36].startswith("azubi-0,36,")
+    assert zeilen[38].startswith("azubi-1,2,")
+
+
+def test_ics_export():
+    ergebnis = berechne_gesamtdauer(36, 40, 75, GRUND_ABITUR)
+    zeitleiste = erstelle_zeitleiste(date(2024, 8, 1), ergebnis)
+    ics = "".join(
+        zeitleiste.als_ics(datetime(2024, 1, 1, tzinfo=timezone.utc))
+    )
+    assert ics.startswith("BEGIN:VCALENDAR\r\n")
+    assert ics.endswith("END:VCALENDAR\r\n")
+    assert ics.count("BEGIN:VEVENT") == 4
+    assert "SUMMARY:3. Ausbildungsjahr\r\n" in ics
+    assert "DTSTART;VALUE=DATE:20260801\r\nDTEND;VALUE=DATE:20270401" in ics
+    assert "DTSTAMP:20240101T000000Z" in ics
+
+
+def test_service_mit_schritt4(tmp_path, monkeypatch):
+    (tmp_path / "ihk-test.csv").write_text(
+        "datum\n2027-06-15\n", encoding="utf-8"
+    )
+    monkeypatch.setenv("PRUEFUNGSKALENDER_DIR", str(tmp_path))
+    leere_pruefungskalender_cache()
+    payload = {
+        **TEILZEIT_75_MIT_ABITUR,
+        "ausbildungsbeginn": "2024-08-01",
+        "kammer": "ihk-test",
+    }
+    try:
+        antwort = verarbeite_zeitleistenanfrage(payload)
+    finally:
+        leere_pruefungskalender_cache()
+    assert antwort.status_code == 200
+    result = antwort.body["result"]
+    assert result["dauer_monate"] == 35
+    assert result["ausbildungsende"] == "2027-06-30"
+    assert result["ausbildungsjahre"] == 3
+    assert result["monate"][-1]["art"] == MONAT_PRUEFUNGSVERLAENGERUNG
+
+
+def test_service_fehlerfaelle():
+    assert verarbeite_zeitleistenanfrage(TEILZEIT_75_MIT_ABITUR).status_code == 400
+    payload = {**TEILZEIT_75_MIT_ABITUR, "ausbildungsbeginn": "2024-02-30"}
+    assert verarbeite_zeitleistenanfrage(payload).status_code == 422
+
+
+@pytest.mark.parametrize(
+    "ausgabeformat, mimetype, anfang",
+    [
+        ("json", "application/json", "{"),
+        ("csv", "text/csv", "monat,beginn,ende"),
+        ("ics", "text/calendar", "BEGIN:VCALENDAR"),
+    ],
+)
+def test_api_timeline(client, ausgabeformat, mimetype, anfang):
+    response = client.post(
+        f"/api/calculate/timeline?format={ausgabeformat}",
+        json={**TEILZEIT_75_MIT_ABITUR, "ausbildungsbeginn": "2024-08-01"},
+    )
+    assert response.status_code == 200
+    assert response.mimetype == mimetype
+    assert response.get_data(as_text=True).lstrip().startswith(anfang)
+
+
+def test_api_timeline_fehler(client):
+    payload = {**TEILZEIT_75_MIT_ABITUR, "ausbildungsbeginn": "2024-08-01"}
+    response = client.post("/api/calculate/timeline?format=pdf", json=payload)
+    assert response.status_code == 422
+    response = client.post(
+        "/api/calculate/timeline?format=csv", json=TEILZEIT_75_MIT_ABITUR
+    )
+    assert response.status_code == 400
+    assert response.get_json()["error"]["code"] == "missing_fields"
@@ -0,0 +1,69 @@
+"""
+Tests für den Golden Snapshot des Definitionsbereichs (scripts/verify_domain.py)
+
+Testabdeckung:
+- Aufzählung der Verkürzungsgründe und des Prozent-/Stundenrasters
+- Schreiben und Prüfen eines Snapshots (eine AO-Dauer)
+- Jede geänderte Zelle wird mit alten und neuen Werten gemeldet
+"""
+
+import pytest
+
+from scripts import verify_domain
+from src.calculation_logic import berechne_gesamtdauer
+
+
+def test_aufzaehlung():
+    masken = verify_domain.verkuerzungs_masken()
+    assert len(masken) == len(set(masken)) == 32 * 46
+    zellen = list(verify_domain.zellen_fuer_ao_dauer(36))
+    # Nur die 100-%-Zellen des Rasters liegen auch im Teil der Gründe
+    assert len(zellen) - len(set(zellen)) == 13
+    prozente = {z[2] for z in zellen if z[3] == "prozent" and z[2] != 100}
+    assert min(prozente) == 50 and 62.5 in prozente
+    assert (36, 48, 24.0, "stunden") in {z[:4] for z in zellen}
+    assert (36, 48, 23.5, "stunden") not in {z[:4] for z in zellen}
+
+
+def test_schreiben_und_pruefen(tmp_path, capsys):
+    snapshot = tmp_path / "golden.zip"
+    argumente = ["--snapshot", str(snapshot), "--prozesse", "1"]
+    assert verify_domain.main(["schreiben", "--ao-dauer", "24", *argumente]) == 0
+    assert verify_domain.main(["pruefen", *argumente]) == 0
+    assert "Abweichungen:   0" in capsys.readouterr().out
+
+
+def test_geaenderte_zellen_werden_gemeldet(tmp_path, monkeypatch, capsys):
+    snapshot = tmp_path / "golden.zip"
+    argumente = ["--snapshot", str(snapshot), "--prozesse", "1"]
+    verify_domain.main(["schreiben", "--ao-dauer", "24", *argumente])
+
+    def veraendert(basis, vollzeit, teilzeit, gruende, eingabetyp):
+        ergebnis = berechne_gesamtdauer(basis, vollzeit, teilzeit, gruende, eingabetyp)
+        if eingabetyp == "prozent" and teilzeit == 62.5:
+            # z.B. ein Optimierungsfehler im Rundungsschritt
+            ergebnis = type(ergebnis)(**{
+                **{k: getattr(ergebnis, k) for k in ergebnis.__slots__},
+                "finale_dauer_monate": ergebnis.finale_dauer_monate + 1,
+            })
+        return ergebnis
+
+    monkeypatch.setattr(verify_domain, "berechne_gesamtdauer", veraendert)
+    assert verify_domain.main(["pruefen", "--max-ausgabe", "3", *argumente]) == 1
+    ausgabe = capsys.readouterr().out
+    # eine Zelle je effektiver Verkürzung 0-12
+    assert "Abweichungen:   13" in ausgabe
+    assert "AO=24 vollzeit=40 prozent=62.5 maske=0x40: finale_dauer_monate" in ausgabe
+    assert "... 10 weitere" in ausgabe
+
+
+def test_unbekanntes_format(tmp_path, monkeypatch):
+    snapshot = tmp_path / "golden.zip"
+    verify_domain.schreibe_snapshot(snapshot, [], {
+        name: verify_domain.array(typ) for name, typ in verify_domain.SPALTEN
+    })
+    meta, _ = verify_domain.lese_snapshot(snapshot)
+    assert meta["zellen"] == 0
+    monkeypatch.setattr(verify_domain, "SNAPSHOT_FORMAT", 2)
+    with pytest.raises(ValueError):
+        verify_domain.lese_snapshot(snapshot)
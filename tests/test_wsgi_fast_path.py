@@ -0,0 +1,146 @@
+"""
+Tests für den schnellen WSGI-Pfad (wsgi_fast_path.py)
+
+Testabdeckung:
+- POST /api/calculate: Status, Content-Type und Body identisch zur Flask-Route
+- Ungültiger Content-Type, ungültiges JSON, leerer Body, Nicht-Objekte
+- Unerwartete Ausnahmen und übrige Routen werden an Flask weitergereicht
+- WSGI_FAST_PATH=1 schaltet den Pfad ein (Default: aus)
+"""
+
+import json
+
+import pytest
+from werkzeug.test import Client
+
+import src.wsgi_fast_path as wfp
+from src.app import create_app
+from tests.dummy_data import TEILZEIT_75_MIT_ABITUR
+
+ANFRAGEN = [
+    {"json": TEILZEIT_75_MIT_ABITUR},
+    {"json": dict(TEILZEIT_75_MIT_ABITUR, teilzeit_eingabe=40)},
+    {"json": dict(TEILZEIT_75_MIT_ABITUR, eingabetyp="tage")},
+    {"json": dict(
+        TEILZEIT_75_MIT_ABITUR,
+        verkuerzungsgruende={"berufliche_verkuerzung_monate": 10**20},
+    )},
+    {"json": {"basis_dauer_monate": 36}},
+    {"json": {}},
+    {"json": [1, 2]},
+    {"json": None},
+    {"data": "kein json", "content_type": "application/json"},
+    {"data": "", "content_type": "application/json"},
+    {"data": b"\xff\xfe", "content_type": "application/json"},
+    {
+        "data": json.dumps(TEILZEIT_75_MIT_ABITUR),
+        "content_type": "application/json; charset=utf-8",
+    },
+    {
+        "data": json.dumps(TEILZEIT_75_MIT_ABITUR),
+        "content_type": "Application/Problem+JSON",
+    },
+    {"data": json.dumps(TEILZEIT_75_MIT_ABITUR), "content_type": "text/plain"},
+    {"data": "x"},
+]
+
+
+@pytest.fixture()
+def clients():
+    """Client über den schnellen Pfad und Client der reinen Flask-App."""
+    app = create_app()
+    return Client(wfp.SchnellerPfad(app)), Client(app)
+
+
+def _vergleiche(schnell, flask):
+    """Status, Content-Type und Body beider Antworten sind identisch."""
+    assert schnell.status == flask.status
+    assert schnell.headers["Content-Type"] == flask.headers["Content-Type"]
+    assert schnell.headers["Content-Length"] == flask.headers["Content-Length"]
+    assert schnell.get_data() == flask.get_data()
+
+
+@pytest.mark.parametrize("kwargs", ANFRAGEN)
+def test_identisch_zur_flask_route(clients, kwargs):
+    """Jede Anfrage liefert dieselbe Antwort wie die Flask-Route."""
+    schnell, flask = clients
+
+    _vergleiche(
+        schnell.post("/api/calculate", **kwargs),
+        flask.post("/api/calculate", **kwargs),
+    )
+
+
+def test_schneller_pfad_umgeht_flask(clients, monkeypatch):
+    """POST /api/calculate erreicht Flask nicht, andere Requests schon."""
+    schnell, _ = clients
+    app = schnell.application.app
+    wsgi_app = app.wsgi_app
+    aufrufe = []
+
+    def zaehle(environ, start_response):
+        aufrufe.append(environ["PATH_INFO"])
+        return wsgi_app(environ, start_response)
+
+    monkeypatch.setattr(app, "wsgi_app", zaehle)
+
+    resp = schnell.post("/api/calculate", json=TEILZEIT_75_MIT_ABITUR)
+    assert resp.status_code == 200
+    assert resp.get_json()["result"]["finale_dauer_monate"] == 32
+    assert aufrufe == []
+    schnell.post("/api/calculate/batch", json=[TEILZEIT_75_MIT_ABITUR])
+    assert aufrufe == ["/api/calculate/batch"]
+
+
+def test_unerwartete_ausnahme_ueber_flask(clients):
+    """Ausnahmen außerhalb der Service-Fehlerbehandlung beantwortet Flask."""
+    schnell, flask = clients
+
+    _vergleiche(
+        schnell.post("/api/calculate", data="5", content_type="application/json"),
+        flask.post("/api/calculate", data="5", content_type="application/json"),
+    )
+
+
+@pytest.mark.parametrize(
+    "methode, pfad",
+    [
+        ("GET", "/api/calculate?basis_dauer_monate=36"),
+        ("GET", "/api/calculate"),
+        ("PUT", "/api/calculate"),
+        ("POST", "/api/calculate/"),
+        ("POST", "/api/calculate/batch"),
+        ("GET", "/gibt-es-nicht"),
+    ],
+)
+def test_uebrige_requests_an_flask(clients, methode, pfad):
+    """Andere Pfade und Methoden werden unverändert an Flask gereicht."""
+    schnell, flask = clients
+
+    _vergleiche(
+        schnell.open(pfad, method=methode, json=[TEILZEIT_75_MIT_ABITUR]),
+        flask.open(pfad, method=methode, json=[TEILZEIT_75_MIT_ABITUR]),
+    )
+
+
+def test_max_content_length_ueber_flask(clients):
+    """Mit MAX_CONTENT_LENGTH gilt die Größenprüfung von Flask (413)."""
+    schnell, flask = clients
+    schnell.application.app.config["MAX_CONTENT_LENGTH"] = 10
+    flask.application.config["MAX_CONTENT_LENGTH"] = 10
+
+    resp = schnell.post("/api/calculate", json=TEILZEIT_75_MIT_ABITUR)
+    assert resp.status_code == 413
+    _vergleiche(resp, flask.post("/api/calculate", json=TEILZEIT_75_MIT_ABITUR))
+
+
+def test_schneller_pfad_aus_umgebung(monkeypatch):
+    """Nur WSGI_FAST_PATH=1 (o.ä.) schaltet den Pfad ein, Default ist aus."""
+    monkeypatch.delenv("WSGI_FAST_PATH", raising=False)
+    assert wfp.schneller_pfad_aus_umgebung() is False
+    for wert in ("", "0", "off", "vielleicht"):
+        monkeypatch.setenv("WSGI_FAST_PATH", wert)
+        assert wfp.schneller_pfad_aus_umgebung() is False
+    for wert in ("1", "true", " On "):
+        monkeypatch.setenv("WSGI_FAST_PATH", wert)
+        assert wfp.schneller_pfad_aus_umgebung() is True
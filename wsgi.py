@@ -8,17 +8,23 @@ WSGI (Web Server Gateway Interface) ist der Standard für Python-Web-Apps.
 
 Verwendung:
     gunicorn 'wsgi:app' --bind 0.0.0.0:8000 --workers 2
-    
+
 Oder in Docker:
     CMD ["gunicorn", "wsgi:app", "--bind", "0.0.0.0:8000", "--workers", "2"]
+
+Mit WSGI_FAST_PATH=1 beantwortet der schnelle WSGI-Pfad POST /api/calculate
+direkt (src/wsgi_fast_path.py), ohne Flask-Hooks; standardmäßig aus.
 """
 
 from src.app import create_app
+from src.wsgi_fast_path import SchnellerPfad, schneller_pfad_aus_umgebung
+
+# Flask-App-Instanz (alle übrigen Routen)
+flask_app = create_app()
 
 # App-Instanz erstellen - wird vom WSGI-Server importiert
 # Der WSGI-Server sucht nach einer Variable namens "app"
-app = create_app()
+app = SchnellerPfad(flask_app) if schneller_pfad_aus_umgebung() else flask_app
 
 # Für WSGI-Server wie gunicorn:
 # gunicorn 'wsgi:app'
-